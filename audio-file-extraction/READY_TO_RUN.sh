@@ -133,14 +133,15 @@ echo "==========================================================================
 echo ""
 echo "Summary:"
 echo "  - All suspicious files reprocessed with speaker detection"
-echo "  - Backups preserved in *.backup directories"
+echo "  - Previous statements kept as snapshots in output/statements/.generations/<module>/"
 echo "  - Original files untouched in input/"
 echo "  - Enhanced statements ready in output/statements/"
 echo ""
 echo "Next steps:"
 echo "  - Review the enhanced statement files"
-echo "  - If satisfied, you can remove .backup directories"
-echo "  - If issues, backups can be restored"
+echo "  - If satisfied, you can remove output/statements/.generations"
+echo "  - If issues, restore a module's previous statements with:"
+echo "      python -c \"from scripts.utils.staged_output import StagedOutput; StagedOutput('output/statements/<module>').restore()\""
 echo ""
 echo "Documentation:"
 echo "  - SUMMARY.md - Quick overview"
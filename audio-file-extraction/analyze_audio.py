@@ -2,11 +2,14 @@
 """
 Audio Analysis Tool
 Analyzes audio files for potential multi-statement issues using waveform and energy analysis
+
+Metrics (duration, energy, potential splits) are computed without matplotlib;
+it is only imported when a visualization is actually drawn.
 """
 
 import subprocess
 import numpy as np
-import matplotlib.pyplot as plt
+from numpy.lib.stride_tricks import sliding_window_view
 from pathlib import Path
 import argparse
 import sys
@@ -36,14 +39,23 @@ def load_audio(file_path):
 
 
 def calculate_energy(samples, window_size=512, hop_size=256):
-    """Calculate energy (RMS) over time."""
-    energy = []
-    for i in range(0, len(samples) - window_size, hop_size):
-        window = samples[i:i + window_size]
-        rms = np.sqrt(np.mean(window**2))
-        energy.append(rms)
+    """
+    Calculate energy (RMS) over time.
+
+    Windows start every hop_size samples while a full window plus at least
+    one more sample remains. They are read through a strided view, so no
+    per-window copies are made.
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    if len(samples) <= window_size:
+        return np.array([])
 
-    return np.array(energy)
+    windows = sliding_window_view(samples, window_size)[:len(samples) - window_size:hop_size]
+
+    # Row-wise sum of squares without materializing windows**2
+    energy = np.einsum('ij,ij->i', windows, windows) / window_size
+
+    return np.sqrt(energy)
 
 
 def detect_potential_splits(energy, frame_rate, hop_size, threshold_percentile=30):
@@ -52,25 +64,86 @@ def detect_potential_splits(energy, frame_rate, hop_size, threshold_percentile=3
 
     Returns list of (time, energy_drop) tuples
     """
-    # Calculate energy drops (where energy decreases significantly)
-    energy_diff = np.diff(energy)
-
     # Find local minima in energy
     threshold = np.percentile(energy, threshold_percentile)
 
-    potential_splits = []
-    for i in range(1, len(energy) - 1):
-        # Check if this is a local minimum and below threshold
-        if energy[i] < threshold:
-            if energy[i] < energy[i-1] and energy[i] < energy[i+1]:
-                time_sec = (i * hop_size) / frame_rate
-                potential_splits.append((time_sec, energy[i]))
+    # Strict local minima below threshold, excluding the first and last frame
+    middle = energy[1:-1]
+    is_split = (middle < threshold) & (middle < energy[:-2]) & (middle < energy[2:])
+    indices = np.flatnonzero(is_split) + 1
+
+    times = indices * hop_size / frame_rate
+    return list(zip(times.tolist(), energy[indices]))
+
+
+def minmax_envelope(values, max_points=4000):
+    """
+    Decimate a signal for plotting while keeping its peaks.
+
+    Each bucket contributes its minimum and maximum sample in time order,
+    so the drawn outline matches the full-resolution plot.
+
+    Returns (indices, values) into the original signal.
+    """
+    values = np.asarray(values)
+    if len(values) <= max_points:
+        return np.arange(len(values)), values
+
+    bucket = int(np.ceil(len(values) / (max_points // 2)))
+    padded = np.pad(values, (0, -len(values) % bucket), mode='edge')
+    buckets = padded.reshape(-1, bucket)
+
+    lows = buckets.argmin(axis=1)
+    highs = buckets.argmax(axis=1)
+    offsets = np.arange(len(buckets)) * bucket
+
+    indices = np.column_stack((
+        offsets + np.minimum(lows, highs),
+        offsets + np.maximum(lows, highs)
+    )).ravel()
+    indices = np.minimum(indices, len(values) - 1)
+
+    return indices, values[indices]
+
+
+def compute_metrics(samples, frame_rate, window_size=512, hop_size=256):
+    """
+    Compute energy and potential split points for loaded samples.
+
+    Returns (metrics dict, energy array).
+    """
+    energy = calculate_energy(samples, window_size, hop_size)
+    potential_splits = detect_potential_splits(energy, frame_rate, hop_size)
+
+    metrics = {
+        'duration': len(samples) / frame_rate,
+        'potential_splits': potential_splits,
+        'avg_energy': np.mean(energy),
+        'energy_std': np.std(energy)
+    }
+
+    return metrics, energy
+
+
+def analyze_metrics(file_path):
+    """Analyze a file without rendering anything."""
+    print(f"Analyzing: {file_path}")
+
+    samples, frame_rate = load_audio(file_path)
+    metrics, _ = compute_metrics(samples, frame_rate)
 
-    return potential_splits
+    print(f"  Duration: {metrics['duration']:.2f}s")
+    print(f"  Sample rate: {frame_rate} Hz")
+    print(f"  Samples: {len(samples)}")
+    print(f"  Potential split points: {len(metrics['potential_splits'])}")
+
+    return metrics
 
 
 def visualize_audio(file_path, output_path=None):
     """Create visualization of audio waveform and energy."""
+    import matplotlib.pyplot as plt
+
     print(f"Analyzing: {file_path}")
 
     # Load audio
@@ -81,23 +154,21 @@ def visualize_audio(file_path, output_path=None):
     print(f"  Sample rate: {frame_rate} Hz")
     print(f"  Samples: {len(samples)}")
 
-    # Calculate energy
+    # Calculate energy and detect potential splits
     hop_size = 256
     window_size = 512
-    energy = calculate_energy(samples, window_size, hop_size)
-    energy_times = np.arange(len(energy)) * hop_size / frame_rate
-
-    # Detect potential splits
-    potential_splits = detect_potential_splits(energy, frame_rate, hop_size)
+    metrics, energy = compute_metrics(samples, frame_rate, window_size, hop_size)
+    potential_splits = metrics['potential_splits']
+    energy_frame_rate = frame_rate / hop_size
 
     print(f"  Potential split points: {len(potential_splits)}")
 
     # Create visualization
     fig, axes = plt.subplots(3, 1, figsize=(14, 10))
 
-    # Plot 1: Waveform
-    time_axis = np.arange(len(samples)) / frame_rate
-    axes[0].plot(time_axis, samples, linewidth=0.5, alpha=0.7)
+    # Plot 1: Waveform (min/max envelope instead of every sample)
+    indices, values = minmax_envelope(samples)
+    axes[0].plot(indices / frame_rate, values, linewidth=0.5, alpha=0.7)
     axes[0].set_ylabel('Amplitude')
     axes[0].set_title(f'Waveform: {Path(file_path).name}')
     axes[0].grid(True, alpha=0.3)
@@ -108,7 +179,8 @@ def visualize_audio(file_path, output_path=None):
         axes[0].axvline(x=split_time, color='red', linestyle='--', alpha=0.5)
 
     # Plot 2: Energy (RMS)
-    axes[1].plot(energy_times, energy, linewidth=1, color='orange')
+    indices, values = minmax_envelope(energy)
+    axes[1].plot(indices / energy_frame_rate, values, linewidth=1, color='orange')
     axes[1].set_ylabel('Energy (RMS)')
     axes[1].set_title('Energy over Time')
     axes[1].grid(True, alpha=0.3)
@@ -126,9 +198,8 @@ def visualize_audio(file_path, output_path=None):
     axes[1].legend()
 
     # Plot 3: Energy derivative (to spot transitions)
-    energy_diff = np.diff(energy)
-    energy_diff_times = energy_times[:-1]
-    axes[2].plot(energy_diff_times, energy_diff, linewidth=1, color='purple')
+    indices, values = minmax_envelope(np.diff(energy))
+    axes[2].plot(indices / energy_frame_rate, values, linewidth=1, color='purple')
     axes[2].set_ylabel('Energy Change')
     axes[2].set_xlabel('Time (seconds)')
     axes[2].set_title('Energy Derivative (Rate of Change)')
@@ -150,19 +221,20 @@ def visualize_audio(file_path, output_path=None):
 
     plt.close()
 
-    return {
-        'duration': duration,
-        'potential_splits': potential_splits,
-        'avg_energy': np.mean(energy),
-        'energy_std': np.std(energy)
-    }
+    return metrics
 
 
-def analyze_directory(directory, output_dir=None):
-    """Analyze all MP3 files in directory."""
+def analyze_directory(directory, output_dir=None, metrics_only=False):
+    """
+    Analyze all MP3 files in directory.
+
+    Without an output directory there is nowhere to save plots, so only
+    metrics are computed.
+    """
     directory = Path(directory)
+    metrics_only = metrics_only or not output_dir
 
-    if output_dir:
+    if output_dir and not metrics_only:
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -176,11 +248,12 @@ def analyze_directory(directory, output_dir=None):
 
     results = []
     for mp3_file in mp3_files:
-        output_path = None
-        if output_dir:
+        if metrics_only:
+            result = analyze_metrics(str(mp3_file))
+        else:
             output_path = output_dir / f"{mp3_file.stem}_analysis.png"
+            result = visualize_audio(str(mp3_file), str(output_path))
 
-        result = visualize_audio(str(mp3_file), str(output_path) if output_path else None)
         result['filename'] = mp3_file.name
         results.append(result)
         print()
@@ -217,6 +290,11 @@ def main():
         help='Output directory for visualizations',
         default=None
     )
+    parser.add_argument(
+        '--metrics-only',
+        action='store_true',
+        help='Compute metrics without plotting (default for directories without --output-dir)'
+    )
 
     args = parser.parse_args()
 
@@ -226,7 +304,10 @@ def main():
         print(f"ERROR: Path not found: {input_path}")
         sys.exit(1)
 
-    if input_path.is_file():
+    if input_path.is_file() and args.metrics_only:
+        analyze_metrics(str(input_path))
+
+    elif input_path.is_file():
         # Single file
         output_path = None
         if args.output_dir:
@@ -238,7 +319,7 @@ def main():
 
     elif input_path.is_dir():
         # Directory
-        analyze_directory(input_path, args.output_dir)
+        analyze_directory(input_path, args.output_dir, args.metrics_only)
 
     else:
         print(f"ERROR: Invalid path: {input_path}")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark AudioProcessor backends on short statement-sized files.
+
+Generates N short MP3 files with ffmpeg, then times duration probes,
+validation and prefix concatenation for each available backend. The
+subprocess backend is measured with a cold metadata cache so every probe
+pays ffprobe startup, which is the cost the in-process backend removes.
+
+Usage:
+    python benchmarks/benchmark_audio_backends.py
+    python benchmarks/benchmark_audio_backends.py --files 200 --duration 3
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from utils.audio_backends import PYAV_AVAILABLE, PyAVBackend, SubprocessBackend
+from utils.media_metadata import MediaMetadataService
+
+
+def generate_files(directory: Path, count: int, duration: float) -> list:
+    """Create short test tones with ffmpeg."""
+    files = []
+    for i in range(count):
+        output_file = directory / f"statement_{i:03d}.mp3"
+        subprocess.run([
+            'ffmpeg',
+            '-f', 'lavfi',
+            '-i', f'sine=frequency={200 + i}:duration={duration}',
+            '-acodec', 'libmp3lame',
+            '-b:a', '128k',
+            '-y',
+            str(output_file)
+        ], capture_output=True, check=True)
+        files.append(str(output_file))
+    return files
+
+
+def time_operation(label: str, func, items: list) -> float:
+    """Run func over items and print per-item cost in milliseconds."""
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    elapsed = time.perf_counter() - start
+
+    per_item = elapsed / len(items) * 1000
+    print(f"  {label:<14} {elapsed:8.2f}s total  {per_item:8.2f} ms/file")
+    return per_item
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark audio backends')
+    parser.add_argument('--files', type=int, default=50, help='Number of test files (default: 50)')
+    parser.add_argument('--duration', type=float, default=3.0, help='Seconds per file (default: 3.0)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        print(f"Generating {args.files} files of {args.duration}s...")
+        files = generate_files(tmp, args.files, args.duration)
+        prefix = files[0]
+
+        backends = [
+            SubprocessBackend(metadata_service=MediaMetadataService(cache_file=tmp / "cold.json"))
+        ]
+        if PYAV_AVAILABLE:
+            backends.append(PyAVBackend())
+        else:
+            print("PyAV not installed; only benchmarking subprocess backend (pip install av)")
+
+        results = {}
+        for backend in backends:
+            print(f"\nBackend: {backend.name}")
+            # Fresh cache per run so subprocess probes are never served from disk
+            if isinstance(backend, SubprocessBackend):
+                backend.metadata_service = MediaMetadataService(cache_file=tmp / "dur.json")
+            duration_ms = time_operation('duration', backend.get_duration, files)
+
+            if isinstance(backend, SubprocessBackend):
+                backend.metadata_service = MediaMetadataService(cache_file=tmp / "val.json")
+            validate_ms = time_operation('validate', backend.validate, files)
+
+            out_dir = tmp / backend.name
+            out_dir.mkdir()
+            concat_ms = time_operation(
+                'concatenate',
+                lambda f: backend.concatenate([prefix, f], str(out_dir / Path(f).name)),
+                files
+            )
+            results[backend.name] = (duration_ms, validate_ms, concat_ms)
+
+        if len(results) == 2:
+            print("\nSpeedup (subprocess / pyav):")
+            for label, sub, pyav in zip(
+                ('duration', 'validate', 'concatenate'),
+                results['subprocess'],
+                results['pyav']
+            ):
+                print(f"  {label:<14} {sub / pyav:6.1f}x  ({sub - pyav:.2f} ms/file overhead removed)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark analyze_audio energy analysis against the original loop version.
+
+Uses a 10 minute synthetic 44.1 kHz signal (tone bursts separated by quiet
+gaps) by default, or any MP3 passed with --input.
+
+Usage:
+    python benchmarks/benchmark_energy.py
+    python benchmarks/benchmark_energy.py --input "path/to/module.mp3"
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analyze_audio import calculate_energy, detect_potential_splits, load_audio
+
+WINDOW_SIZE = 512
+HOP_SIZE = 256
+
+
+def calculate_energy_loop(samples, window_size=512, hop_size=256):
+    """Original per-window Python loop."""
+    energy = []
+    for i in range(0, len(samples) - window_size, hop_size):
+        window = samples[i:i + window_size]
+        rms = np.sqrt(np.mean(window**2))
+        energy.append(rms)
+
+    return np.array(energy)
+
+
+def detect_potential_splits_loop(energy, frame_rate, hop_size, threshold_percentile=30):
+    """Original per-frame Python loop."""
+    threshold = np.percentile(energy, threshold_percentile)
+
+    potential_splits = []
+    for i in range(1, len(energy) - 1):
+        if energy[i] < threshold:
+            if energy[i] < energy[i-1] and energy[i] < energy[i+1]:
+                time_sec = (i * hop_size) / frame_rate
+                potential_splits.append((time_sec, energy[i]))
+
+    return potential_splits
+
+
+def synthetic_signal(seconds: float, frame_rate: int = 44100) -> np.ndarray:
+    """Alternate 4 s tones and 0.5 s near-silent gaps."""
+    t = np.arange(int(seconds * frame_rate)) / frame_rate
+    tone = 0.5 * np.sin(2 * np.pi * 220 * t)
+    speaking = (t % 4.5) < 4.0
+    noise = np.random.default_rng(0).normal(0, 0.001, t.size)
+    return np.where(speaking, tone, 0).astype(np.float32) + noise.astype(np.float32)
+
+
+def timed(func, *args):
+    """Return (result, seconds) for func(*args)."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark energy analysis')
+    parser.add_argument('--input', help='MP3 file to analyze (default: 10 minute synthetic signal)')
+    parser.add_argument('--minutes', type=float, default=10, help='Synthetic signal length (default: 10)')
+    args = parser.parse_args()
+
+    if args.input:
+        samples, frame_rate = load_audio(args.input)
+    else:
+        frame_rate = 44100
+        samples = synthetic_signal(args.minutes * 60, frame_rate)
+
+    print(f"Signal: {len(samples) / frame_rate:.0f}s at {frame_rate} Hz ({len(samples):,} samples)\n")
+
+    energy_old, energy_old_time = timed(calculate_energy_loop, samples, WINDOW_SIZE, HOP_SIZE)
+    energy_new, energy_new_time = timed(calculate_energy, samples, WINDOW_SIZE, HOP_SIZE)
+
+    splits_old, splits_old_time = timed(detect_potential_splits_loop, energy_old, frame_rate, HOP_SIZE)
+    splits_new, splits_new_time = timed(detect_potential_splits, energy_new, frame_rate, HOP_SIZE)
+
+    print(f"{'':<24} {'loop':>10} {'vectorized':>12} {'speedup':>9}")
+    print(f"{'calculate_energy':<24} {energy_old_time:>9.3f}s {energy_new_time:>11.3f}s "
+          f"{energy_old_time / energy_new_time:>8.1f}x")
+    print(f"{'detect_potential_splits':<24} {splits_old_time:>9.3f}s {splits_new_time:>11.3f}s "
+          f"{splits_old_time / splits_new_time:>8.1f}x")
+
+    max_diff = float(np.max(np.abs(energy_old - energy_new))) if len(energy_old) else 0.0
+    print(f"\nEnergy frames: {len(energy_new):,} (max abs diff {max_diff:.2e})")
+    print(f"Split points: loop={len(splits_old)} vectorized={len(splits_new)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,18 +2,39 @@
 """
 Process Batch 100 Conversation Files with Narrator Prefixes
 Adapted from task2_mcp_orchestrator.py for batch 100.XX files
+
+Narrator files and any conversations missing from downloads/ are fetched in
+one concurrent, resumable batch through the Drive API when a saved token is
+available, and with curl otherwise (MCP mode, no credentials). Narrators are
+prepended by copying MP3 frames. Conversations whose format differs from
+the narrator's are queued and concatenated with ffmpeg afterwards, several
+at a time via AudioProcessor.concatenate_batch().
 """
 
+import asyncio
 import os
 import subprocess
+import sys
+import time
 from pathlib import Path
 from typing import List, Tuple
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from scripts.utils.audio_processor import DEFAULT_CONCAT_WORKERS, AudioProcessor, ConcatJob
+from scripts.utils.drive_manager import direct_api_manager
+from scripts.utils.drive_transfer import TransferResult, summarize
+from scripts.utils.media_metadata import get_metadata_service
+from scripts.utils.mp3_prefix import Mp3PrefixEngine, Mp3PrefixError, prefix_or_fallback
+
 # Directories
 DOWNLOADS_DIR = Path('downloads')
 OUTPUT_DIR = Path('data/processed')
 TEMP_DIR = Path('data/temp')
 
+# Concurrent Drive downloads
+DOWNLOAD_CONCURRENCY = 8
+
 TEMP_DIR.mkdir(parents=True, exist_ok=True)
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -49,6 +70,7 @@ def download_file_curl(file_id: str, output_path: Path) -> bool:
     cmd = ['curl', '-L', '-o', str(output_path), url]
 
     try:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
         subprocess.run(cmd, capture_output=True, check=True)
         if output_path.exists() and output_path.stat().st_size > 0:
             return True
@@ -60,50 +82,58 @@ def download_file_curl(file_id: str, output_path: Path) -> bool:
         return False
 
 
-def get_audio_duration(file_path: Path) -> float:
-    """Get duration of audio file in seconds using ffprobe."""
-    cmd = [
-        'ffprobe', '-v', 'error',
-        '-show_entries', 'format=duration',
-        '-of', 'default=noprint_wrappers=1:nokey=1',
-        str(file_path)
-    ]
-
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        return float(result.stdout.strip())
-    except (subprocess.CalledProcessError, ValueError):
-        return 0.0
-
+def download_files_curl(items: List[Tuple[str, Path]]) -> List[TransferResult]:
+    """Download files one at a time with curl, as TransferResults."""
+    results = []
+    for file_id, output_path in items:
+        started = time.monotonic()
+        ok = download_file_curl(file_id, output_path)
+        results.append(TransferResult(
+            path=output_path,
+            file_id=file_id,
+            bytes_transferred=output_path.stat().st_size if ok else 0,
+            seconds=time.monotonic() - started,
+            error=None if ok else 'curl download failed'
+        ))
+    return results
 
-def concatenate_audio_ffmpeg(input_files: List[Path], output_path: Path) -> bool:
-    """Concatenate audio files using ffmpeg concat demuxer."""
-    concat_list = TEMP_DIR / 'concat_list.txt'
 
-    with open(concat_list, 'w') as f:
-        for file_path in input_files:
-            f.write(f"file '{file_path.absolute()}'\n")
+def download_files(items: List[Tuple[str, Path]]) -> List[TransferResult]:
+    """
+    Download files from Google Drive concurrently.
+
+    Interrupted downloads leave a ".part" file that the next run resumes.
+    Without direct API access (MCP mode or no saved token) files are
+    fetched with curl instead.
+
+    Args:
+        items: (file_id, output_path) pairs
+
+    Returns:
+        Transfer results in input order
+    """
+    if not items:
+        return []
+
+    started = time.monotonic()
+    manager = direct_api_manager()
+    if manager is None:
+        print("  Drive API unavailable (MCP mode or no saved token), using curl")
+        results = download_files_curl(items)
+    else:
+        with manager.transfer(concurrency=DOWNLOAD_CONCURRENCY) as transfer:
+            results = asyncio.run(transfer.download_many(items))
+
+    print(f"  {summarize(results, time.monotonic() - started)}")
+    for result in results:
+        if not result.ok:
+            print(f"  ✗ Download failed: {result.path.name}: {result.error}")
+    return results
 
-    cmd = [
-        'ffmpeg', '-f', 'concat', '-safe', '0',
-        '-i', str(concat_list),
-        '-c', 'copy', '-y',
-        str(output_path)
-    ]
 
-    try:
-        subprocess.run(cmd, capture_output=True, check=True)
-        if output_path.exists() and output_path.stat().st_size > 0:
-            return True
-        else:
-            print(f"  ✗ Concatenation failed: output missing")
-            return False
-    except subprocess.CalledProcessError as e:
-        print(f"  ✗ ffmpeg failed: {e}")
-        return False
-    finally:
-        if concat_list.exists():
-            concat_list.unlink()
+def get_audio_duration(file_path: Path) -> float:
+    """Get duration of audio file in seconds via the shared metadata service."""
+    return get_metadata_service().get_duration(file_path)
 
 
 def download_narrator_files() -> dict:
@@ -112,30 +142,49 @@ def download_narrator_files() -> dict:
     print("DOWNLOADING NARRATOR FILES")
     print("=" * 80)
 
-    narrator_paths = {}
-
-    for narrator, file_id in NARRATOR_FILES.items():
-        output_path = TEMP_DIR / f"narrator_{narrator}.mp3"
+    narrator_paths = {
+        narrator: TEMP_DIR / f"narrator_{narrator}.mp3"
+        for narrator in NARRATOR_FILES
+    }
 
+    missing = []
+    for narrator, output_path in narrator_paths.items():
         if output_path.exists():
             print(f"✓ {narrator.capitalize()}: already exists ({output_path})")
-            narrator_paths[narrator] = output_path
-            continue
-
-        print(f"Downloading {narrator.capitalize()} narrator...")
-        if download_file_curl(file_id, output_path):
-            size = output_path.stat().st_size
-            print(f"✓ {narrator.capitalize()}: downloaded ({size:,} bytes)")
-            narrator_paths[narrator] = output_path
         else:
-            print(f"✗ {narrator.capitalize()}: FAILED")
+            print(f"Downloading {narrator.capitalize()} narrator...")
+            missing.append((NARRATOR_FILES[narrator], output_path))
+
+    for result in download_files(missing):
+        if not result.ok:
             return None
+        print(f"✓ Downloaded {result.path.name} ({result.path.stat().st_size:,} bytes)")
 
     return narrator_paths
 
 
-def process_conversations_from_downloads(narrator_paths: dict):
+def download_missing_conversations() -> None:
+    """Fetch conversation files that are not yet in downloads/ in one batch."""
+    missing = [
+        (file_id, DOWNLOADS_DIR / filename)
+        for filename, file_id in CONVERSATION_FILES
+        if not (DOWNLOADS_DIR / filename).exists()
+    ]
+    if not missing:
+        return
+
+    print(f"\nDownloading {len(missing)} conversation files missing from downloads/...")
+    download_files(missing)
+
+
+def process_conversations_from_downloads(narrator_paths: dict, concat_workers: int = DEFAULT_CONCAT_WORKERS):
     """Process conversation files that are already in downloads/ directory."""
+    try:
+        engine = Mp3PrefixEngine(narrator_paths)
+    except Mp3PrefixError as e:
+        print(f"⚠ Frame prefixing unavailable ({e}); using ffmpeg")
+        engine = None
+
     print("\n" + "=" * 80)
     print(f"PROCESSING {len(CONVERSATION_FILES)} CONVERSATION FILES")
     print("=" * 80)
@@ -144,6 +193,14 @@ def process_conversations_from_downloads(narrator_paths: dict):
     sorted_files = sorted(CONVERSATION_FILES, key=lambda x: x[0])
 
     results = []
+    pending = []  # Results whose output still has to be validated
+    ffmpeg_jobs: List[ConcatJob] = []
+    ffmpeg_results = []
+
+    def queue_ffmpeg(input_files: List[Path], output_path: Path) -> bool:
+        """Defer a concatenation to the concurrent ffmpeg batch."""
+        ffmpeg_jobs.append(([str(path) for path in input_files], str(output_path)))
+        return True
 
     for idx, (filename, file_id) in enumerate(sorted_files):
         # Alternating narrator assignment
@@ -154,63 +211,71 @@ def process_conversations_from_downloads(narrator_paths: dict):
         conversation_path = DOWNLOADS_DIR / filename
         output_path = OUTPUT_DIR / filename
 
+        result = {
+            'filename': filename,
+            'file_id': file_id,
+            'narrator': narrator,
+            'success': False,
+            'message': ''
+        }
+        results.append(result)
+
         # Check if conversation file exists in downloads
         if not conversation_path.exists():
             print(f"  ✗ File not found in downloads/: {filename}")
-            results.append({
-                'filename': filename,
-                'narrator': narrator,
-                'success': False,
-                'message': 'File not found in downloads/'
-            })
+            result['message'] = 'File not found in downloads/'
             continue
 
         try:
             # Get durations
-            orig_dur = get_audio_duration(conversation_path)
-            narr_dur = get_audio_duration(narrator_paths[narrator])
-            print(f"  Original: {orig_dur:.1f}s, Narrator: {narr_dur:.1f}s")
+            result['original_duration'] = get_audio_duration(conversation_path)
+            result['narrator_duration'] = get_audio_duration(narrator_paths[narrator])
+            print(f"  Original: {result['original_duration']:.1f}s, Narrator: {result['narrator_duration']:.1f}s")
 
             # Concatenate
-            print(f"  Concatenating {narrator} narrator + conversation...")
-            if not concatenate_audio_ffmpeg([narrator_paths[narrator], conversation_path], output_path):
-                results.append({
-                    'filename': filename,
-                    'narrator': narrator,
-                    'success': False,
-                    'message': 'Concatenation failed'
-                })
-                continue
-
-            # Validate output
-            out_dur = get_audio_duration(output_path)
-            expected_dur = orig_dur + narr_dur
-            dur_diff = abs(out_dur - expected_dur)
-
-            if dur_diff > 1.0:  # Allow 1 second tolerance
-                print(f"  ⚠ Duration mismatch: expected {expected_dur:.1f}s, got {out_dur:.1f}s")
-
-            print(f"  ✓ Output: {out_dur:.1f}s (expected ~{expected_dur:.1f}s)")
-
-            results.append({
-                'filename': filename,
-                'file_id': file_id,
-                'narrator': narrator,
-                'success': True,
-                'original_duration': orig_dur,
-                'narrator_duration': narr_dur,
-                'output_duration': out_dur,
-                'message': 'Successfully processed'
-            })
+            queued = len(ffmpeg_jobs)
+            prefix_or_fallback(engine, narrator, narrator_paths[narrator], conversation_path,
+                               output_path, queue_ffmpeg)
+            if len(ffmpeg_jobs) > queued:
+                print(f"  Queued {narrator} narrator + conversation for ffmpeg")
+                ffmpeg_results.append(result)
+            else:
+                print(f"  Prefixed {narrator} narrator by frame copy")
+            pending.append(result)
 
         except Exception as e:
             print(f"  ✗ Error: {e}")
-            results.append({
-                'filename': filename,
-                'narrator': narrator,
-                'success': False,
-                'message': f'Unexpected error: {e}'
-            })
+            result['message'] = f'Unexpected error: {e}'
+
+    if ffmpeg_jobs:
+        print(f"\nConcatenating {len(ffmpeg_jobs)} files with ffmpeg ({concat_workers} workers)...")
+        outcomes = AudioProcessor.concatenate_batch(ffmpeg_jobs, max_workers=concat_workers)
+        for result, (ok, error) in zip(ffmpeg_results, outcomes):
+            if not ok:
+                print(f"  ✗ {result['filename']}: {error}")
+                result['message'] = 'Concatenation failed'
+                pending.remove(result)
+
+    # Validate outputs
+    for result in pending:
+        try:
+            out_dur = get_audio_duration(OUTPUT_DIR / result['filename'])
+        except Exception as e:
+            print(f"  ✗ {result['filename']}: {e}")
+            result['message'] = f'Unexpected error: {e}'
+            continue
+
+        expected_dur = result['original_duration'] + result['narrator_duration']
+        dur_diff = abs(out_dur - expected_dur)
+
+        if dur_diff > 1.0:  # Allow 1 second tolerance
+            print(f"  ⚠ {result['filename']}: duration mismatch: expected {expected_dur:.1f}s, got {out_dur:.1f}s")
+
+        print(f"  ✓ {result['filename']}: {out_dur:.1f}s (expected ~{expected_dur:.1f}s)")
+
+        result['output_duration'] = out_dur
+        result['success'] = True
+        result['message'] = 'Successfully processed'
 
     # Print summary
     successful = sum(1 for r in results if r['success'])
@@ -256,6 +321,8 @@ def main():
         print("\n✗ Failed to download narrator files. Exiting.")
         return 1
 
+    download_missing_conversations()
+
     # Process conversations from downloads/ directory
     results = process_conversations_from_downloads(narrator_paths)
 
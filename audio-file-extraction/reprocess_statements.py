@@ -2,15 +2,32 @@
 """
 Reprocess Statement Files
 Re-split audio files that have multi-statement issues using improved speaker detection
+
+All directories in a batch are split in-process by one SpeakerAwareSplitter,
+so torch/pyannote are imported and the diarization model is loaded once.
+
+A manifest in the statements directory records each module's output
+durations, source fingerprint and splitter parameters. Unchanged outputs
+are not re-probed, and modules whose source and parameters match the last
+run are skipped unless --force is given.
+
+New statements are written to a stage directory and published with a single
+directory swap, so a module is never left half-written; the previous
+statements are kept as a snapshot under .generations/.
 """
 
-import subprocess
 import os
 import sys
 from pathlib import Path
 import argparse
 import json
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from scripts.utils.media_metadata import get_metadata_service
+from scripts.utils.staged_output import StagedOutput
+from scripts.utils.statement_manifest import StatementManifest, output_fingerprint
 
 
 def find_original_file(statement_dir: Path) -> Path:
@@ -45,10 +62,39 @@ def find_original_file(statement_dir: Path) -> Path:
     raise FileNotFoundError(f"Could not find original file: {original_filename}")
 
 
-def analyze_statements(statements_dir: Path) -> Dict[str, dict]:
+def probe_durations(module_dir: Path, names) -> Dict[str, Optional[float]]:
+    """
+    Probe the duration of statement files (cached files are not re-probed).
+
+    Args:
+        module_dir: Statement directory
+        names: File names within module_dir
+
+    Returns:
+        Dictionary mapping file name to duration, or None if unprobeable
+    """
+    paths = {name: module_dir / name for name in names}
+    infos = get_metadata_service().probe_many(paths.values())
+
+    durations = {}
+    for name, path in paths.items():
+        info = infos.get(str(path))
+        durations[name] = info.duration if info is not None else None
+    return durations
+
+
+def analyze_statements(
+    statements_dir: Path,
+    manifest: Optional[StatementManifest] = None
+) -> Dict[str, dict]:
     """
     Analyze all statement directories to identify problematic ones.
 
+    Args:
+        statements_dir: Directory of module statement directories
+        manifest: Manifest whose recorded durations are reused for unchanged
+            directories (and updated for changed ones)
+
     Returns:
         Dictionary mapping directory names to analysis results
     """
@@ -56,38 +102,36 @@ def analyze_statements(statements_dir: Path) -> Dict[str, dict]:
     print("="*80)
 
     results = {}
+    reused = 0
 
     for module_dir in sorted(statements_dir.iterdir()):
-        if not module_dir.is_dir():
+        # Hidden entries are stages and snapshots of published directories
+        if not module_dir.is_dir() or module_dir.name.startswith('.'):
             continue
 
-        mp3_files = list(module_dir.glob('*.mp3'))
-        if not mp3_files:
+        fingerprint = output_fingerprint(module_dir)
+        if not fingerprint:
             continue
 
-        # Get durations
-        durations = []
-        for mp3_file in mp3_files:
-            cmd = [
-                'ffprobe', '-v', 'error',
-                '-show_entries', 'format=duration',
-                '-of', 'default=noprint_wrappers=1:nokey=1',
-                str(mp3_file)
-            ]
+        file_durations = None
+        if manifest:
+            file_durations = manifest.cached_durations(module_dir.name, fingerprint)
 
-            try:
-                result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-                duration = float(result.stdout.strip())
-                durations.append(duration)
-            except:
-                pass
+        if file_durations is not None:
+            reused += 1
+        else:
+            file_durations = probe_durations(module_dir, list(fingerprint))
+            if manifest:
+                manifest.record_outputs(module_dir.name, fingerprint, file_durations)
+
+        durations = [d for d in file_durations.values() if d is not None]
 
         if not durations:
             continue
 
         avg_duration = sum(durations) / len(durations)
         max_duration = max(durations)
-        count = len(mp3_files)
+        count = len(fingerprint)
 
         # Flag suspicious directories
         # Criteria:
@@ -126,26 +170,70 @@ def analyze_statements(statements_dir: Path) -> Dict[str, dict]:
                 print(f"  └─ {reason}")
 
     print("="*80)
+
+    if manifest:
+        manifest.save()
+        print(f"Reused manifest durations for {reused} unchanged directories")
+
     return results
 
 
-def reprocess_directory(
-    module_dir: Path,
+def create_splitter(
     use_speaker_detection: bool = True,
     hf_token: str = None,
-    dry_run: bool = False
+    use_diarization_cache: bool = True,
+    diarization_window: float = None,
+    torch_threads: int = None,
+    speaker_backend: str = 'pyannote'
+):
+    """
+    Create the splitter shared by every directory in a batch.
+
+    split_with_speaker_detection is imported here rather than at module
+    level so --analyze-only runs never import torch.
+
+    Args:
+        use_speaker_detection: Whether to use speaker detection
+        hf_token: HuggingFace token
+        use_diarization_cache: Reuse cached speaker turns for unchanged audio
+        diarization_window: Diarize in overlapping windows of this many seconds
+        torch_threads: Cap on torch intra-op threads
+        speaker_backend: 'pyannote', 'spectral' or 'auto'
+
+    Returns:
+        SpeakerAwareSplitter instance
+    """
+    from split_with_speaker_detection import SpeakerAwareSplitter
+
+    return SpeakerAwareSplitter(
+        use_speaker_detection=use_speaker_detection,
+        hf_token=hf_token,
+        use_diarization_cache=use_diarization_cache,
+        diarization_window=diarization_window,
+        torch_threads=torch_threads,
+        speaker_backend=speaker_backend
+    )
+
+
+def reprocess_directory(
+    module_dir: Path,
+    splitter=None,
+    dry_run: bool = False,
+    manifest: Optional[StatementManifest] = None,
+    force: bool = False
 ) -> bool:
     """
     Reprocess a single statement directory with improved splitting.
 
     Args:
         module_dir: Path to statement directory
-        use_speaker_detection: Whether to use speaker detection
-        hf_token: HuggingFace token
+        splitter: Shared SpeakerAwareSplitter (required unless dry_run)
         dry_run: If True, show what would be done without doing it
+        manifest: Manifest used to skip unchanged modules and record new runs
+        force: Reprocess even if the manifest shows nothing changed
 
     Returns:
-        True if successful, False otherwise
+        True if successful or unchanged, False otherwise
     """
     print(f"\nReprocessing: {module_dir.name}")
     print("-"*80)
@@ -155,71 +243,73 @@ def reprocess_directory(
         original_file = find_original_file(module_dir)
         print(f"Original file: {original_file}")
 
+        if (manifest and splitter and not force
+                and manifest.is_current(module_dir.name, module_dir, original_file, splitter.params)):
+            print("✓ Unchanged since last run (same source and parameters), skipping")
+            return True
+
         if dry_run:
             print("[DRY RUN] Would reprocess this file")
             return True
 
-        # Backup existing statements
-        backup_dir = module_dir.parent / f"{module_dir.name}.backup"
-        if backup_dir.exists():
-            print(f"Backup already exists: {backup_dir}")
-        else:
-            print(f"Creating backup: {backup_dir}")
-            module_dir.rename(backup_dir)
-
-        # Run improved splitter
-        cmd = [
-            'python3',
-            'split_with_speaker_detection.py',
-            str(original_file),
-            '-o', str(module_dir)
-        ]
-
-        if not use_speaker_detection:
-            cmd.append('--no-speaker-detection')
-
-        if hf_token:
-            cmd.extend(['--hf-token', hf_token])
-
-        print(f"Running: {' '.join(cmd)}")
-
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True
-        )
+        old_count = len(list(module_dir.glob('*.mp3')))
 
-        if result.returncode == 0:
-            print("✓ Reprocessing successful")
+        # Split into a stage next to the module directory; the current
+        # statements stay untouched until the stage is published
+        with StagedOutput(module_dir) as stage:
+            print(f"Splitting in-process: {original_file} -> {stage.path}")
 
-            # Compare results
-            old_count = len(list(backup_dir.glob('*.mp3')))
-            new_count = len(list(module_dir.glob('*.mp3')))
-
-            print(f"\nComparison:")
-            print(f"  Old: {old_count} statements")
-            print(f"  New: {new_count} statements")
-
-            if new_count > old_count:
-                print(f"  Improvement: +{new_count - old_count} additional statements detected")
-            elif new_count == old_count:
-                print(f"  Same number of statements (may have better boundaries)")
-            else:
-                print(f"  Warning: Fewer statements detected (-{old_count - new_count})")
-
-            return True
+            try:
+                output_files, stats = splitter.process_file(str(original_file), str(stage.path))
+                error = None
+            except Exception as e:
+                output_files, stats = [], {}
+                error = str(e)
+
+            # Same success criteria as the splitter's command line exit status
+            if not output_files or stats.get('issues'):
+                if error:
+                    reason = error
+                elif output_files:
+                    reason = f"{len(stats['issues'])} potential issues detected"
+                else:
+                    reason = "no statement files created"
+                print(f"✗ Reprocessing failed: {reason}")
+                print("Existing statements left unchanged")
+                return False
+
+            durations = None
+            if manifest:
+                # Probe before publishing, while the files are still at their stage paths
+                durations = probe_durations(stage.path, [Path(f).name for f in output_files])
+
+            snapshot = stage.commit()
+
+        print("✓ Reprocessing successful")
+        if snapshot:
+            print(f"Previous statements kept in: {snapshot}")
+
+        if manifest:
+            manifest.record_run(
+                module_dir.name, module_dir, original_file, splitter.params, durations
+            )
+            manifest.save()
+
+        # Compare results
+        new_count = len(output_files)
+
+        print(f"\nComparison:")
+        print(f"  Old: {old_count} statements")
+        print(f"  New: {new_count} statements")
+
+        if new_count > old_count:
+            print(f"  Improvement: +{new_count - old_count} additional statements detected")
+        elif new_count == old_count:
+            print(f"  Same number of statements (may have better boundaries)")
         else:
-            print(f"✗ Reprocessing failed:\n{result.stderr}")
+            print(f"  Warning: Fewer statements detected (-{old_count - new_count})")
 
-            # Restore backup
-            if backup_dir.exists():
-                if module_dir.exists():
-                    import shutil
-                    shutil.rmtree(module_dir)
-                backup_dir.rename(module_dir)
-                print("Restored from backup")
-
-            return False
+        return True
 
     except Exception as e:
         print(f"ERROR: {e}")
@@ -250,6 +340,16 @@ def main():
         action='store_true',
         help='Show what would be done without actually doing it'
     )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Reprocess directories even if source and parameters are unchanged'
+    )
+    parser.add_argument(
+        '--no-manifest',
+        action='store_true',
+        help='Ignore the manifest: re-probe every file and reprocess every selected directory'
+    )
     parser.add_argument(
         '--no-speaker-detection',
         action='store_true',
@@ -260,6 +360,30 @@ def main():
         help='HuggingFace token for pyannote.audio',
         default=None
     )
+    parser.add_argument(
+        '--no-diarization-cache',
+        action='store_true',
+        help='Re-run speaker diarization even when cached results exist'
+    )
+    parser.add_argument(
+        '--speaker-backend',
+        choices=('pyannote', 'spectral', 'auto'),
+        default='pyannote',
+        help='Speaker change source: pyannote model, NumPy spectral detector, or auto '
+             '(default: pyannote)'
+    )
+    parser.add_argument(
+        '--diarization-window',
+        type=float,
+        default=None,
+        help='Diarize in overlapping windows of this many seconds (default: whole file)'
+    )
+    parser.add_argument(
+        '--torch-threads',
+        type=int,
+        default=None,
+        help='Maximum torch intra-op threads for diarization (default: torch default)'
+    )
 
     args = parser.parse_args()
 
@@ -269,8 +393,12 @@ def main():
         print(f"ERROR: Statements directory not found: {statements_dir}")
         sys.exit(1)
 
+    manifest = None
+    if not args.no_manifest:
+        manifest = StatementManifest.for_statements(statements_dir)
+
     # Analyze directories
-    results = analyze_statements(statements_dir)
+    results = analyze_statements(statements_dir, manifest)
 
     suspicious_count = sum(1 for r in results.values() if r['suspicious'])
     print(f"\nSummary:")
@@ -325,15 +453,29 @@ def main():
     if args.dry_run:
         print("\n[DRY RUN MODE - No actual changes will be made]\n")
 
+    # One splitter for the whole batch; the model loads on first use.
+    # Dry runs create it too, to compare parameters with the manifest.
+    splitter = None
+    if not args.dry_run or manifest:
+        splitter = create_splitter(
+            use_speaker_detection=not args.no_speaker_detection,
+            hf_token=args.hf_token,
+            use_diarization_cache=not args.no_diarization_cache,
+            diarization_window=args.diarization_window,
+            torch_threads=args.torch_threads,
+            speaker_backend=args.speaker_backend
+        )
+
     success_count = 0
     failure_count = 0
 
     for module_dir in to_reprocess:
         success = reprocess_directory(
             module_dir,
-            use_speaker_detection=not args.no_speaker_detection,
-            hf_token=args.hf_token,
-            dry_run=args.dry_run
+            splitter=splitter,
+            dry_run=args.dry_run,
+            manifest=manifest,
+            force=args.force
         )
 
         if success:
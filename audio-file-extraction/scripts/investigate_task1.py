@@ -8,8 +8,11 @@ This script searches for and analyzes "Listen and Choose" files to determine:
 3. Audio characteristics (duration, format)
 4. Whether they need splitting and how
 
+Files are looked up in a local index of the Drive folder (refreshed through
+the Drive changes feed) unless --no-drive-index is given.
+
 Usage:
-    python investigate_task1.py [--download-samples N]
+    python investigate_task1.py [--download-samples N] [--no-drive-index]
 """
 
 import os
@@ -25,6 +28,7 @@ import json
 sys.path.insert(0, str(Path(__file__).parent))
 
 from utils.drive_manager import GoogleDriveManager, DriveManagerError
+from utils.drive_index import TASK_LISTEN_AND_CHOOSE, DriveIndexError
 from utils.audio_processor import AudioProcessor, AudioProcessingError
 from utils.file_parser import TOEFLFileParser, TOEFLFileInfo
 from utils.logger import setup_logger
@@ -38,8 +42,15 @@ logger = setup_logger(__name__, level=os.getenv('LOG_LEVEL', 'INFO'))
 class Task1Investigator:
     """Investigates Listen and Choose files for Task 1 implementation."""
 
-    def __init__(self):
-        """Initialize Task 1 investigator."""
+    def __init__(self, drive_index: bool = False):
+        """
+        Initialize Task 1 investigator.
+
+        Args:
+            drive_index: Find files through the local Drive index instead of
+                searching the folder
+        """
+        self.drive_index = drive_index
         self.temp_dir = Path(os.getenv('TEMP_DIR', 'data/temp'))
         self.temp_dir.mkdir(parents=True, exist_ok=True)
 
@@ -65,6 +76,20 @@ class Task1Investigator:
         Returns:
             List of file metadata dictionaries
         """
+        if self.drive_index:
+            try:
+                index = self.drive_manager.index()
+                index.sync()
+                listen_choose_files = index.files(task=TASK_LISTEN_AND_CHOOSE, mime_type='audio/mpeg')
+                logger.info(f"Found {len(listen_choose_files)} valid 'Listen and Choose' files in Drive index")
+
+                self.findings['total_files'] = len(listen_choose_files)
+                self.findings['files'] = listen_choose_files
+
+                return listen_choose_files
+            except (DriveManagerError, DriveIndexError) as e:
+                logger.warning(f"Drive index unavailable, searching folder instead: {e}")
+
         logger.info("Searching for 'Listen and Choose' files...")
 
         # Search for files containing "Listen" or "Choose"
@@ -329,11 +354,16 @@ def main():
         default=5,
         help='Number of sample files to download and analyze (default: 5)'
     )
+    parser.add_argument(
+        '--no-drive-index',
+        action='store_true',
+        help='Search the Drive folder instead of querying the local index (DRIVE_INDEX_PATH)'
+    )
 
     args = parser.parse_args()
 
     try:
-        investigator = Task1Investigator()
+        investigator = Task1Investigator(drive_index=not args.no_drive_index)
 
         # Search for files
         files = investigator.search_listen_and_choose_files()
@@ -22,14 +22,27 @@ Usage:
     # Process first 3 files (testing)
     python task1_split_by_timecode.py --limit 3
 
+    # Emit every statement of a module from a single ffmpeg run
+    python task1_split_by_timecode.py --split-method single-pass
+
+    # Cut statements by slicing MP3 frames (no ffmpeg/ffprobe per statement)
+    python task1_split_by_timecode.py --split-method frame-index
+
+    # Process 8 MP3/CSV pairs concurrently
+    python task1_split_by_timecode.py --jobs 8
+
     # Process all valid CSV files
     python task1_split_by_timecode.py
 """
 
 import argparse
 import csv
+import mmap
+import shutil
 import subprocess
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional, Tuple
@@ -38,9 +51,14 @@ from typing import List, Optional, Tuple
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scripts.utils.logger import get_logger
+from scripts.utils.media_metadata import get_metadata_service
+from scripts.utils.mp3_frames import Mp3FrameError, Mp3FrameIndex
 
 logger = get_logger(__name__)
 
+# Supported strategies for TimecodeProcessor.split_audio
+SPLIT_METHODS = ('per-statement', 'single-pass', 'frame-index')
+
 
 @dataclass
 class TimecodeEntry:
@@ -54,6 +72,20 @@ class TimecodeEntry:
     duration: float
 
 
+@dataclass
+class FilePairResult:
+    """Outcome of splitting a single MP3/CSV pair."""
+    mp3_file: Path
+    csv_file: Path
+    statements: int = 0
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        """True if at least one statement was created without errors."""
+        return self.error is None and self.statements > 0
+
+
 class TimecodeProcessor:
     """Processes CSV timecode files and splits audio accordingly."""
 
@@ -193,29 +225,61 @@ class TimecodeProcessor:
         entries: List[TimecodeEntry],
         output_dir: Path,
         base_name: str,
-        dry_run: bool = False
+        dry_run: bool = False,
+        method: str = 'per-statement'
     ) -> List[Path]:
         """
         Split audio file based on timecode entries.
 
+        Three methods are supported:
+        - 'per-statement': one ffmpeg + one ffprobe process per entry
+        - 'single-pass': one ffmpeg segment-muxer run for the whole file,
+          with per-statement durations read from its segment list
+        - 'frame-index': index MP3 frames once and slice bytes per entry,
+          snapping cuts to the nearest frame boundary (no subprocesses)
+
         Args:
             input_audio: Path to source audio file
             entries: List of timecode entries
             output_dir: Directory for output files
             base_name: Base name for output files (e.g., "02.01.01, Listen and Choose, Module 1")
             dry_run: If True, only log actions without creating files
+            method: Splitting method, one of SPLIT_METHODS
 
         Returns:
             List of created output file paths
 
         Raises:
             FileNotFoundError: If input audio not found
+            ValueError: If method is not supported
             RuntimeError: If ffmpeg fails
         """
+        if method not in SPLIT_METHODS:
+            raise ValueError(
+                f"Unknown split method: {method}. Expected one of {SPLIT_METHODS}"
+            )
+
         if not input_audio.exists():
             raise FileNotFoundError(f"Input audio not found: {input_audio}")
 
         output_dir.mkdir(parents=True, exist_ok=True)
+
+        if method == 'frame-index' and not dry_run:
+            return self._split_audio_frame_index(
+                input_audio, entries, output_dir, base_name
+            )
+
+        if method == 'single-pass' and not dry_run:
+            if self._entries_are_sequential(entries):
+                return self._split_audio_single_pass(
+                    input_audio, entries, output_dir, base_name
+                )
+
+            logger.warning(
+                f"Entries in {input_audio.name} overlap or are out of order; "
+                f"falling back to per-statement splitting"
+            )
+
         output_files = []
 
         logger.info(f"Splitting {input_audio.name} into {len(entries)} statements")
@@ -267,16 +331,7 @@ class TimecodeProcessor:
 
                 # Verify duration (±0.2s tolerance for encoding variations)
                 actual_duration = self._get_duration(output_path)
-                expected_duration = entry.duration
-                duration_diff = abs(actual_duration - expected_duration)
-
-                if duration_diff > 0.2:
-                    logger.warning(
-                        f"Statement {idx}: Duration mismatch. "
-                        f"Expected: {expected_duration:.2f}s, "
-                        f"Actual: {actual_duration:.2f}s, "
-                        f"Diff: {duration_diff:.2f}s"
-                    )
+                self._check_duration(idx, entry.duration, actual_duration)
 
                 logger.info(f"✓ Created: {output_filename} ({actual_duration:.2f}s)")
                 output_files.append(output_path)
@@ -295,29 +350,228 @@ class TimecodeProcessor:
 
         return output_files
 
-    def _get_duration(self, audio_file: Path) -> float:
-        """Get duration of audio file using ffprobe."""
+    def _split_audio_single_pass(
+        self,
+        input_audio: Path,
+        entries: List[TimecodeEntry],
+        output_dir: Path,
+        base_name: str
+    ) -> List[Path]:
+        """
+        Split all entries with a single ffmpeg segment-muxer invocation.
+
+        The source is demuxed once and cut at every entry boundary. Gaps
+        between entries become throwaway segments. Durations are taken from
+        the segment list ffmpeg writes, so no ffprobe run is needed.
+
+        Args:
+            input_audio: Path to source audio file
+            entries: Sequential, non-overlapping timecode entries
+            output_dir: Directory for output files
+            base_name: Base name for output files
+
+        Returns:
+            List of created output file paths
+        """
+        cut_times, segment_indices = self._build_segment_plan(entries)
+
+        logger.info(
+            f"Splitting {input_audio.name} into {len(entries)} statements "
+            f"(single pass, {len(cut_times)} cut points)"
+        )
+
+        temp_dir = Path(tempfile.mkdtemp(prefix='.segments_', dir=output_dir))
+        segment_list = temp_dir / 'segments.csv'
+
+        cmd = [
+            'ffmpeg',
+            '-i', str(input_audio),
+            '-map', '0:a',
+            '-f', 'segment',
+            '-segment_times', ','.join(f'{t:.3f}' for t in cut_times),
+            '-segment_list', str(segment_list),
+            '-segment_list_type', 'csv',
+            '-reset_timestamps', '1',
+            '-c', 'copy',  # No re-encoding (preserves quality)
+            '-y',
+            str(temp_dir / 'segment_%04d.mp3')
+        ]
+
+        output_files = []
+
         try:
-            result = subprocess.run(
-                [
-                    'ffprobe',
-                    '-v', 'error',
-                    '-show_entries', 'format=duration',
-                    '-of', 'default=noprint_wrappers=1:nokey=1',
-                    str(audio_file)
-                ],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            try:
+                result = subprocess.run(
+                    cmd,
+                    capture_output=True,
+                    text=True,
+                    timeout=30 + 5 * len(entries)
+                )
+            except subprocess.TimeoutExpired:
+                logger.error(f"ffmpeg timeout splitting {input_audio.name}")
+                return []
 
             if result.returncode != 0:
-                return 0.0
+                logger.error(f"ffmpeg failed for {input_audio.name}: {result.stderr}")
+                return []
+
+            with open(segment_list, 'r', encoding='utf-8', newline='') as f:
+                segments = [row for row in csv.reader(f) if row]
+
+            for idx, (entry, segment_idx) in enumerate(zip(entries, segment_indices), start=1):
+                output_filename = f"{base_name}, Statement {idx:03d}.mp3"
+                output_path = output_dir / output_filename
+
+                if segment_idx >= len(segments):
+                    logger.error(f"Statement {idx}: ffmpeg produced no segment")
+                    continue
+
+                segment_name, seg_start, seg_end = segments[segment_idx][:3]
+                segment_path = temp_dir / segment_name
+
+                if not segment_path.exists() or segment_path.stat().st_size == 0:
+                    logger.error(f"Output file invalid: {output_path}")
+                    continue
+
+                segment_path.replace(output_path)
+
+                actual_duration = float(seg_end) - float(seg_start)
+                self._check_duration(idx, entry.duration, actual_duration)
+
+                logger.info(f"✓ Created: {output_filename} ({actual_duration:.2f}s)")
+                output_files.append(output_path)
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        logger.info(
+            f"Completed: {len(output_files)}/{len(entries)} statements created"
+        )
+
+        return output_files
+
+    def _split_audio_frame_index(
+        self,
+        input_audio: Path,
+        entries: List[TimecodeEntry],
+        output_dir: Path,
+        base_name: str
+    ) -> List[Path]:
+        """
+        Split entries by slicing frames out of a memory-mapped MP3.
+
+        The source is indexed once; every entry is then a byte range between
+        two frame boundaries, so its duration is exact and known up front.
+
+        Args:
+            input_audio: Path to source MP3 file
+            entries: Timecode entries (may overlap)
+            output_dir: Directory for output files
+            base_name: Base name for output files
+
+        Returns:
+            List of created output file paths
+        """
+        output_files = []
+
+        with open(input_audio, 'rb') as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                logger.error(f"Input audio is empty: {input_audio}")
+                return []
+
+            with data:
+                try:
+                    index = Mp3FrameIndex.build(data)
+                except Mp3FrameError as e:
+                    logger.error(f"Cannot index {input_audio.name}: {e}")
+                    return []
+
+                logger.info(
+                    f"Splitting {input_audio.name} into {len(entries)} statements "
+                    f"(frame index, {index.frame_count} frames)"
+                )
+
+                for idx, entry in enumerate(entries, start=1):
+                    output_filename = f"{base_name}, Statement {idx:03d}.mp3"
+                    output_path = output_dir / output_filename
+
+                    try:
+                        start_offset, end_offset, actual_duration = index.byte_range(
+                            entry.start_seconds, entry.end_seconds
+                        )
+                    except Mp3FrameError as e:
+                        logger.error(f"Statement {idx}: {e}")
+                        continue
+
+                    with open(output_path, 'wb') as out:
+                        out.write(data[start_offset:end_offset])
+
+                    self._check_duration(idx, entry.duration, actual_duration)
+
+                    logger.info(f"✓ Created: {output_filename} ({actual_duration:.2f}s)")
+                    output_files.append(output_path)
+
+        logger.info(
+            f"Completed: {len(output_files)}/{len(entries)} statements created"
+        )
+
+        return output_files
+
+    @staticmethod
+    def _entries_are_sequential(entries: List[TimecodeEntry]) -> bool:
+        """Check that entries are in order and do not overlap."""
+        return all(
+            current.start_seconds >= previous.end_seconds
+            for previous, current in zip(entries, entries[1:])
+        )
+
+    @staticmethod
+    def _build_segment_plan(
+        entries: List[TimecodeEntry]
+    ) -> Tuple[List[float], List[int]]:
+        """
+        Compute segment-muxer cut times for sequential entries.
+
+        Segment k spans cut_times[k-1] to cut_times[k] (segment 0 starts at
+        the beginning of the file). A cut is added before an entry only when
+        there is a gap after the previous cut.
+
+        Args:
+            entries: Sequential, non-overlapping timecode entries
+
+        Returns:
+            Tuple of (cut_times, segment index of each entry)
+        """
+        cut_times: List[float] = []
+        segment_indices: List[int] = []
 
-            return float(result.stdout.strip())
+        for entry in entries:
+            previous_cut = cut_times[-1] if cut_times else 0.0
+            if entry.start_seconds - previous_cut > 1e-6:
+                cut_times.append(entry.start_seconds)
 
-        except (subprocess.TimeoutExpired, ValueError):
-            return 0.0
+            segment_indices.append(len(cut_times))
+            cut_times.append(entry.end_seconds)
+
+        return cut_times, segment_indices
+
+    def _check_duration(self, idx: int, expected_duration: float, actual_duration: float) -> None:
+        """Warn when a statement's duration is off by more than 0.2s."""
+        duration_diff = abs(actual_duration - expected_duration)
+
+        if duration_diff > 0.2:
+            logger.warning(
+                f"Statement {idx}: Duration mismatch. "
+                f"Expected: {expected_duration:.2f}s, "
+                f"Actual: {actual_duration:.2f}s, "
+                f"Diff: {duration_diff:.2f}s"
+            )
+
+    def _get_duration(self, audio_file: Path) -> float:
+        """Get duration of audio file via the shared metadata service."""
+        return get_metadata_service().get_duration(audio_file)
 
 
 def find_matching_files(downloads_dir: Path) -> List[Tuple[Path, Path]]:
@@ -369,6 +623,71 @@ def extract_base_name(filename: str) -> str:
     return name
 
 
+def process_file_pair(
+    processor: TimecodeProcessor,
+    mp3_file: Path,
+    csv_file: Path,
+    output_dir: Path,
+    dry_run: bool = False,
+    method: str = 'per-statement',
+    position: str = ''
+) -> FilePairResult:
+    """
+    Parse one CSV and split its matching MP3.
+
+    Errors are logged and recorded on the result rather than raised, so a
+    single bad pair never stops a batch.
+
+    Args:
+        processor: Configured TimecodeProcessor
+        mp3_file: Source audio file
+        csv_file: Timecode CSV for the audio file
+        output_dir: Root output directory (a subdirectory is created per file)
+        dry_run: If True, only log actions without creating files
+        method: Splitting method, one of SPLIT_METHODS
+        position: Progress label for logging (e.g., "3/40")
+
+    Returns:
+        FilePairResult for this pair
+    """
+    result = FilePairResult(mp3_file=mp3_file, csv_file=csv_file)
+
+    logger.info(f"\n{'='*80}")
+    logger.info(f"Processing {position}: {mp3_file.name}")
+    logger.info(f"{'='*80}")
+
+    try:
+        # Parse CSV
+        entries = processor.parse_csv(csv_file)
+
+        # Extract base name for output
+        base_name = extract_base_name(mp3_file.name)
+
+        # Create output subdirectory
+        output_subdir = output_dir / base_name
+
+        # Split audio
+        output_files = processor.split_audio(
+            input_audio=mp3_file,
+            entries=entries,
+            output_dir=output_subdir,
+            base_name=base_name,
+            dry_run=dry_run,
+            method=method
+        )
+
+        result.statements = len(output_files)
+
+    except (ValueError, FileNotFoundError) as e:
+        logger.error(f"Error processing {csv_file.name}: {e}")
+        result.error = str(e)
+    except Exception as e:
+        logger.error(f"Unexpected error processing {mp3_file.name}: {e}")
+        result.error = f"Unexpected error: {e}"
+
+    return result
+
+
 def main():
     """Main execution function."""
     parser = argparse.ArgumentParser(
@@ -406,6 +725,20 @@ def main():
         action='store_true',
         help='Parse and validate without creating files'
     )
+    parser.add_argument(
+        '--split-method',
+        choices=SPLIT_METHODS,
+        default='per-statement',
+        help='per-statement: one ffmpeg run per statement; '
+             'single-pass: one ffmpeg run per source file; '
+             'frame-index: slice MP3 frames in-process (default: per-statement)'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Number of MP3/CSV pairs to process concurrently (default: 1)'
+    )
     parser.add_argument(
         '--fps',
         type=int,
@@ -424,6 +757,10 @@ def main():
     if args.verbose:
         logger.setLevel('DEBUG')
 
+    if args.jobs < 1:
+        logger.error("--jobs must be at least 1")
+        return 1
+
     # Check ffmpeg availability
     try:
         subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
@@ -467,44 +804,34 @@ def main():
             logger.info(f"Limited to first {args.limit} files")
 
     # Process each file pair
-    total_statements = 0
     total_files = len(file_pairs)
-    successful_files = 0
+    jobs = min(args.jobs, total_files)
+
+    def run_pair(indexed_pair):
+        idx, (mp3_file, csv_file) = indexed_pair
+        return process_file_pair(
+            processor,
+            mp3_file,
+            csv_file,
+            output_dir=args.output_dir,
+            dry_run=args.dry_run,
+            method=args.split_method,
+            position=f"{idx}/{total_files}"
+        )
 
-    for idx, (mp3_file, csv_file) in enumerate(file_pairs, start=1):
-        logger.info(f"\n{'='*80}")
-        logger.info(f"Processing {idx}/{total_files}: {mp3_file.name}")
-        logger.info(f"{'='*80}")
+    indexed_pairs = list(enumerate(file_pairs, start=1))
 
-        try:
-            # Parse CSV
-            entries = processor.parse_csv(csv_file)
-
-            # Extract base name for output
-            base_name = extract_base_name(mp3_file.name)
-
-            # Create output subdirectory
-            output_subdir = args.output_dir / base_name
-
-            # Split audio
-            output_files = processor.split_audio(
-                input_audio=mp3_file,
-                entries=entries,
-                output_dir=output_subdir,
-                base_name=base_name,
-                dry_run=args.dry_run
-            )
-
-            if output_files:
-                successful_files += 1
-                total_statements += len(output_files)
+    if jobs > 1:
+        logger.info(f"Processing with {jobs} parallel jobs")
+        # executor.map yields results in submission order
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(run_pair, indexed_pairs))
+    else:
+        results = [run_pair(pair) for pair in indexed_pairs]
 
-        except (ValueError, FileNotFoundError) as e:
-            logger.error(f"Error processing {csv_file.name}: {e}")
-            continue
-        except Exception as e:
-            logger.error(f"Unexpected error processing {mp3_file.name}: {e}")
-            continue
+    successful_files = sum(1 for r in results if r.success)
+    total_statements = sum(r.statements for r in results)
+    failed = [r for r in results if r.error]
 
     # Summary report
     logger.info(f"\n{'='*80}")
@@ -514,6 +841,11 @@ def main():
     logger.info(f"Total statements: {total_statements}")
     logger.info(f"Output directory: {args.output_dir}")
 
+    if failed:
+        logger.info(f"\nFailed files ({len(failed)}):")
+        for r in failed:
+            logger.info(f"  ✗ {r.mp3_file.name}: {r.error}")
+
     if args.dry_run:
         logger.info("\n[DRY RUN] No files were created")
 
@@ -6,18 +6,32 @@ This script:
 1. Lists all conversation files from Google Drive
 2. Downloads narrator files (Daniel/Matilda)
 3. Applies alphabetical sorting for deterministic 50/50 narrator rotation
-4. Concatenates narrator prefix with conversation file using ffmpeg concat demuxer
+4. Prepends the narrator prefix by copying MP3 frames (ffmpeg concat demuxer
+   for files whose format does not match the narrator's)
 5. Uploads updated files to Drive (version management - updates existing files)
 6. Generates processing report
 
+Download, concatenation and upload run as a pipeline: separate worker pools
+joined by bounded queues, so network transfers overlap with concatenation.
+Narrator files are parsed once into in-memory MP3 frames, so prefixing a
+conversation is a single file write with no subprocess.
+Downloads go through a local blob cache keyed by file ID and checksum, so
+files unchanged since an earlier run cost one metadata call.
+Conversation files are looked up in a local index of the Drive folder,
+refreshed through the Drive changes feed instead of relisting the folder.
+
 Usage:
-    python task2_add_prefix.py [--dry-run] [--limit N]
+    python task2_add_prefix.py [--dry-run] [--limit N] [--audio-backend pyav]
+                               [--download-workers 4] [--concat-workers 2] [--upload-workers 4]
+                               [--no-download-cache] [--ffmpeg-concat] [--no-drive-index]
 """
 
 import os
 import sys
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import argparse
 from dotenv import load_dotenv
 from tqdm import tqdm
@@ -25,28 +39,72 @@ from tqdm import tqdm
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
+from utils.drive_cache import DriveBlobCache
+from utils.drive_index import TASK_CONVERSATION, DriveIndexError
 from utils.drive_manager import GoogleDriveManager, DriveManagerError
 from utils.audio_processor import AudioProcessor, AudioProcessingError
+from utils.audio_backends import BACKENDS
+from utils.mp3_prefix import Mp3PrefixEngine, Mp3PrefixError
 from utils.file_parser import TOEFLFileParser, TOEFLFileInfo
 from utils.logger import setup_logger
+from utils.pipeline import Pipeline, PipelineStage
 
 # Load environment variables
 load_dotenv()
 
 logger = setup_logger(__name__, level=os.getenv('LOG_LEVEL', 'INFO'))
 
+# Default worker counts per pipeline stage
+DEFAULT_DOWNLOAD_WORKERS = 4
+DEFAULT_CONCAT_WORKERS = 2
+DEFAULT_UPLOAD_WORKERS = 4
+
+
+@dataclass
+class PrefixJob:
+    """One conversation file moving through the pipeline."""
+    file: Dict
+    narrator: str
+    conversation_path: Path
+    output_path: Path
+
 
 class Task2Processor:
     """Processes conversation files by adding narrator prefixes."""
 
-    def __init__(self, dry_run: bool = False):
+    def __init__(
+        self,
+        dry_run: bool = False,
+        download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+        concat_workers: int = DEFAULT_CONCAT_WORKERS,
+        upload_workers: int = DEFAULT_UPLOAD_WORKERS,
+        download_cache: Optional[DriveBlobCache] = None,
+        frame_prefix: bool = True,
+        drive_index: bool = False
+    ):
         """
         Initialize Task 2 processor.
 
         Args:
             dry_run: If True, simulate processing without uploading
+            download_workers: Concurrent conversation downloads
+            concat_workers: Concurrent concatenations
+            upload_workers: Concurrent uploads
+            download_cache: Blob cache for narrator and conversation downloads
+                (None downloads every file on every run)
+            frame_prefix: Prepend narrators by copying MP3 frames instead of
+                running ffmpeg (files with a different format still use ffmpeg)
+            drive_index: Find conversation files through the local Drive index
+                instead of listing the folder
         """
         self.dry_run = dry_run
+        self.download_workers = download_workers
+        self.concat_workers = concat_workers
+        self.upload_workers = upload_workers
+        self.download_cache = download_cache
+        self.frame_prefix = frame_prefix
+        self.drive_index = drive_index
+        self.prefix_engine = None
         self.temp_dir = Path(os.getenv('TEMP_DIR', 'data/temp'))
         self.processed_dir = Path(os.getenv('PROCESSED_DIR', 'data/processed'))
 
@@ -56,6 +114,7 @@ class Task2Processor:
 
         # Initialize managers
         self.drive_manager = GoogleDriveManager()
+        self._thread_state = threading.local()
         self.audio_processor = AudioProcessor()
 
         # Check ffmpeg
@@ -78,6 +137,24 @@ class Task2Processor:
             'failed': 0,
             'skipped': 0
         }
+        self.pipeline_metrics = None
+
+    def _drive(self) -> GoogleDriveManager:
+        """
+        Drive manager for the calling thread.
+
+        The Google API client's HTTP transport is not thread-safe, so each
+        pipeline worker thread authenticates its own manager (from the token
+        saved by the main one).
+        """
+        if threading.current_thread() is threading.main_thread():
+            return self.drive_manager
+
+        manager = getattr(self._thread_state, 'drive_manager', None)
+        if manager is None:
+            manager = GoogleDriveManager()
+            self._thread_state.drive_manager = manager
+        return manager
 
     def download_narrator_files(self) -> None:
         """Download narrator prefix files to temp directory."""
@@ -86,21 +163,34 @@ class Task2Processor:
         for narrator, file_id in self.narrator_files.items():
             output_path = self.temp_dir / f"narrator_{narrator}.mp3"
 
-            if output_path.exists():
-                logger.info(f"Narrator file already exists: {output_path}")
-            else:
-                try:
+            try:
+                if self.download_cache:
+                    # Revalidated every run, so an edited narrator file is picked up
+                    hit = self.drive_manager.download_file_cached(
+                        file_id, str(output_path), self.download_cache, show_progress=True
+                    )
+                    if hit:
+                        logger.info(f"Narrator file unchanged, using cached copy: {output_path}")
+                elif output_path.exists():
+                    logger.info(f"Narrator file already exists: {output_path}")
+                else:
                     self.drive_manager.download_file(
                         file_id=file_id,
                         output_path=str(output_path),
                         show_progress=True
                     )
-                except DriveManagerError as e:
-                    logger.error(f"Failed to download {narrator} narrator file: {e}")
-                    raise
+            except DriveManagerError as e:
+                logger.error(f"Failed to download {narrator} narrator file: {e}")
+                raise
 
             self.narrator_paths[narrator] = output_path
 
+        if self.frame_prefix:
+            try:
+                self.prefix_engine = Mp3PrefixEngine(self.narrator_paths)
+            except Mp3PrefixError as e:
+                logger.warning(f"Frame prefixing unavailable, using ffmpeg: {e}")
+
         logger.info(f"Narrator files ready: {list(self.narrator_paths.keys())}")
 
     def get_conversation_files(self) -> List[Dict]:
@@ -110,6 +200,16 @@ class Task2Processor:
         Returns:
             List of file metadata dictionaries
         """
+        if self.drive_index:
+            try:
+                index = self.drive_manager.index()
+                index.sync()
+                files = index.files(task=TASK_CONVERSATION, mime_type='audio/mpeg')
+                logger.info(f"Found {len(files)} valid conversation files in Drive index")
+                return files
+            except (DriveManagerError, DriveIndexError) as e:
+                logger.warning(f"Drive index unavailable, listing folder instead: {e}")
+
         logger.info("Listing conversation files from Drive...")
 
         # Query for audio files containing "conversation"
@@ -153,6 +253,94 @@ class Task2Processor:
 
         return assignments
 
+    def make_job(self, file: Dict, narrator: str) -> PrefixJob:
+        """Create the pipeline job for a conversation file."""
+        return PrefixJob(
+            file=file,
+            narrator=narrator,
+            conversation_path=self.temp_dir / file['name'],
+            output_path=self.processed_dir / file['name']
+        )
+
+    def download_conversation(self, job: PrefixJob) -> PrefixJob:
+        """
+        Download a conversation file (pipeline stage 1).
+
+        Raises:
+            DriveManagerError: If the download fails
+        """
+        if self.download_cache:
+            hit = self._drive().download_file_cached(
+                job.file['id'], str(job.conversation_path), self.download_cache
+            )
+            logger.info(f"{'Cached' if hit else 'Downloaded'} {job.file['name']}")
+            return job
+
+        logger.info(f"Downloading {job.file['name']}...")
+        self._drive().download_file(
+            file_id=job.file['id'],
+            output_path=str(job.conversation_path),
+            show_progress=False
+        )
+        return job
+
+    def concatenate_conversation(self, job: PrefixJob) -> PrefixJob:
+        """
+        Prepend the narrator and validate the result (pipeline stage 2).
+
+        Raises:
+            AudioProcessingError: If concatenation or validation fails
+        """
+        narrator_path = self.narrator_paths[job.narrator]
+        logger.info(f"Concatenating {job.narrator} narrator + {job.file['name']}...")
+
+        if self.prefix_engine:
+            try:
+                # Output is built from indexed frames, so it needs no separate validation
+                result = self.prefix_engine.prefix(job.narrator, job.conversation_path, job.output_path)
+                logger.debug(f"Prefixed {job.file['name']}: {result.duration:.2f}s")
+                job.conversation_path.unlink(missing_ok=True)
+                return job
+            except Mp3PrefixError as e:
+                logger.warning(f"Falling back to ffmpeg for {job.file['name']}: {e}")
+
+        self.audio_processor.concatenate_audio_files(
+            input_files=[str(narrator_path), str(job.conversation_path)],
+            output_file=str(job.output_path),
+            use_concat_demuxer=True
+        )
+
+        is_valid, error = self.audio_processor.validate_audio_file(str(job.output_path))
+        if not is_valid:
+            raise AudioProcessingError(f"Output validation failed: {error}")
+
+        # The download is no longer needed once the output exists
+        job.conversation_path.unlink(missing_ok=True)
+        return job
+
+    def upload_conversation(self, job: PrefixJob) -> PrefixJob:
+        """
+        Upload the prefixed file over the existing one (pipeline stage 3).
+
+        Raises:
+            DriveManagerError: If the upload fails
+        """
+        if not self.dry_run:
+            logger.info(f"Uploading {job.file['name']} to Drive...")
+            self._drive().upload_file(
+                file_path=str(job.output_path),
+                mime_type='audio/mpeg',
+                update_existing=True
+            )
+
+        job.output_path.unlink(missing_ok=True)
+        return job
+
+    def cleanup_job(self, job: PrefixJob) -> None:
+        """Remove a job's temp files (after a failure)."""
+        for path in (job.conversation_path, job.output_path):
+            path.unlink(missing_ok=True)
+
     def process_file(
         self,
         file: Dict,
@@ -169,63 +357,28 @@ class Task2Processor:
             Tuple of (success, message)
         """
         file_name = file['name']
-        file_id = file['id']
+        job = self.make_job(file, narrator)
 
         try:
-            # Download conversation file
-            conversation_path = self.temp_dir / file_name
-            logger.info(f"Downloading {file_name}...")
-
-            self.drive_manager.download_file(
-                file_id=file_id,
-                output_path=str(conversation_path),
-                show_progress=False
-            )
-
-            # Prepare output path
-            output_path = self.processed_dir / file_name
-
-            # Concatenate narrator + conversation
-            narrator_path = self.narrator_paths[narrator]
-            logger.info(f"Concatenating {narrator} narrator + {file_name}...")
-
-            self.audio_processor.concatenate_audio_files(
-                input_files=[str(narrator_path), str(conversation_path)],
-                output_file=str(output_path),
-                use_concat_demuxer=True
-            )
-
-            # Validate output
-            is_valid, error = self.audio_processor.validate_audio_file(str(output_path))
-            if not is_valid:
-                return False, f"Output validation failed: {error}"
-
-            # Upload to Drive (update existing file)
-            if not self.dry_run:
-                logger.info(f"Uploading {file_name} to Drive...")
-                self.drive_manager.upload_file(
-                    file_path=str(output_path),
-                    mime_type='audio/mpeg',
-                    update_existing=True
-                )
-
-            # Clean up temp files
-            conversation_path.unlink()
-            output_path.unlink()
+            self.download_conversation(job)
+            self.concatenate_conversation(job)
+            self.upload_conversation(job)
 
             return True, f"Successfully processed with {narrator} narrator"
 
         except (DriveManagerError, AudioProcessingError) as e:
             logger.error(f"Error processing {file_name}: {e}")
+            self.cleanup_job(job)
             return False, str(e)
 
         except Exception as e:
             logger.error(f"Unexpected error processing {file_name}: {e}")
+            self.cleanup_job(job)
             return False, f"Unexpected error: {e}"
 
     def process_all_files(self, limit: Optional[int] = None) -> None:
         """
-        Process all conversation files.
+        Process all conversation files through the download/concat/upload pipeline.
 
         Args:
             limit: Optional limit on number of files to process (for testing)
@@ -244,29 +397,51 @@ class Task2Processor:
 
         # Assign narrators
         assignments = self.assign_narrators(files)
+        jobs = [
+            self.make_job(file, narrator)
+            for narrator, narrator_files in assignments.items()
+            for file in narrator_files
+        ]
 
         # Process files
-        logger.info(f"Processing {len(files)} files...")
+        logger.info(
+            f"Processing {len(jobs)} files with {self.download_workers} download, "
+            f"{self.concat_workers} concat and {self.upload_workers} upload workers..."
+        )
 
-        results = []
+        pipeline = Pipeline([
+            PipelineStage('download', self.download_conversation, self.download_workers),
+            PipelineStage('concat', self.concatenate_conversation, self.concat_workers),
+            PipelineStage('upload', self.upload_conversation, self.upload_workers),
+        ])
 
-        for narrator, narrator_files in assignments.items():
-            logger.info(f"\nProcessing {len(narrator_files)} files with {narrator} narrator")
+        with tqdm(total=len(jobs), desc="Processing") as progress:
+            outcomes = pipeline.run(jobs, on_result=lambda _: progress.update(1))
 
-            for file in tqdm(narrator_files, desc=f"Processing ({narrator})"):
-                success, message = self.process_file(file, narrator)
+        results = []
+        for outcome in outcomes:
+            job = outcome.item
 
-                if success:
-                    self.processing_stats['successful'] += 1
+            if outcome.ok:
+                self.processing_stats['successful'] += 1
+                message = f"Successfully processed with {job.narrator} narrator"
+            else:
+                self.processing_stats['failed'] += 1
+                self.cleanup_job(job)
+                if isinstance(outcome.error, (DriveManagerError, AudioProcessingError)):
+                    message = f"{outcome.failed_stage}: {outcome.error}"
                 else:
-                    self.processing_stats['failed'] += 1
+                    message = f"{outcome.failed_stage}: Unexpected error: {outcome.error}"
+
+            results.append({
+                'file': job.file['name'],
+                'narrator': job.narrator,
+                'success': outcome.ok,
+                'message': message
+            })
 
-                results.append({
-                    'file': file['name'],
-                    'narrator': narrator,
-                    'success': success,
-                    'message': message
-                })
+        self.pipeline_metrics = pipeline.format_metrics()
+        logger.info(f"Pipeline metrics:\n{self.pipeline_metrics}")
 
         # Generate report
         self.generate_report(results)
@@ -310,6 +485,11 @@ Detailed Results:
                 print(line, end='')
                 f.write(line)
 
+            if self.pipeline_metrics:
+                metrics = f"\nPipeline Metrics:\n-----------------\n{self.pipeline_metrics}\n"
+                print(metrics, end='')
+                f.write(metrics)
+
         logger.info(f"\nReport saved to: {report_path}")
         logger.info("="*80)
 
@@ -329,11 +509,61 @@ def main():
         type=int,
         help='Limit number of files to process (for testing)'
     )
+    parser.add_argument(
+        '--audio-backend',
+        choices=sorted(BACKENDS),
+        help='Audio backend for concat/probe operations (default: AUDIO_BACKEND env var or subprocess)'
+    )
+    parser.add_argument(
+        '--download-workers',
+        type=int,
+        default=DEFAULT_DOWNLOAD_WORKERS,
+        help=f'Concurrent conversation downloads (default: {DEFAULT_DOWNLOAD_WORKERS})'
+    )
+    parser.add_argument(
+        '--concat-workers',
+        type=int,
+        default=DEFAULT_CONCAT_WORKERS,
+        help=f'Concurrent concatenations (default: {DEFAULT_CONCAT_WORKERS})'
+    )
+    parser.add_argument(
+        '--upload-workers',
+        type=int,
+        default=DEFAULT_UPLOAD_WORKERS,
+        help=f'Concurrent uploads (default: {DEFAULT_UPLOAD_WORKERS})'
+    )
+    parser.add_argument(
+        '--no-download-cache',
+        action='store_true',
+        help='Download every file instead of reusing unchanged ones from the local cache '
+             '(DRIVE_CACHE_DIR, limited to DRIVE_CACHE_MAX_BYTES)'
+    )
+    parser.add_argument(
+        '--ffmpeg-concat',
+        action='store_true',
+        help='Concatenate every file with ffmpeg instead of copying MP3 frames'
+    )
+    parser.add_argument(
+        '--no-drive-index',
+        action='store_true',
+        help='List the Drive folder instead of querying the local index (DRIVE_INDEX_PATH)'
+    )
 
     args = parser.parse_args()
 
     try:
-        processor = Task2Processor(dry_run=args.dry_run)
+        if args.audio_backend:
+            AudioProcessor.set_backend(args.audio_backend)
+
+        processor = Task2Processor(
+            dry_run=args.dry_run,
+            download_workers=args.download_workers,
+            concat_workers=args.concat_workers,
+            upload_workers=args.upload_workers,
+            download_cache=None if args.no_download_cache else DriveBlobCache(),
+            frame_prefix=not args.ffmpeg_concat,
+            drive_index=not args.no_drive_index
+        )
         processor.process_all_files(limit=args.limit)
 
         logger.info("\nTask 2 completed successfully!")
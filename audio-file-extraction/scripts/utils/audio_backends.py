@@ -0,0 +1,344 @@
+"""
+Audio Backends Module
+
+Pluggable implementations of the low-level operations used by AudioProcessor:
+duration, validation, stream-copy concatenation and stream-copy splitting.
+
+Backends:
+- subprocess: forks ffmpeg/ffprobe per operation (default, no extra dependencies)
+- pyav: runs libavformat in-process through PyAV (pip install av), avoiding
+  process startup cost on short files
+"""
+
+import os
+import subprocess
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from .logger import get_logger
+from .media_metadata import MediaMetadataService, MediaProbeError, get_metadata_service
+
+# PyAV is optional; only needed for the in-process backend
+try:
+    import av
+    PYAV_AVAILABLE = True
+except ImportError:
+    PYAV_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+# Default backend name (overridable via AUDIO_BACKEND env var)
+DEFAULT_BACKEND = 'subprocess'
+
+# A segment to extract: (start_seconds, duration_seconds, output_file)
+Segment = Tuple[float, float, str]
+
+
+class AudioProcessingError(Exception):
+    """Exception raised for audio processing errors."""
+    pass
+
+
+def concat_demuxer_list(input_files: List[str]) -> str:
+    """
+    Build an ffmpeg concat demuxer list for input files.
+
+    Entries are absolute file: URLs so the list can be read from a pipe,
+    where plain paths would be resolved relative to 'pipe:'.
+
+    Args:
+        input_files: Files to concatenate, in order
+
+    Returns:
+        Concat demuxer script text
+    """
+    lines = []
+    for file_path in input_files:
+        # Escape single quotes in path
+        escaped_path = str(Path(file_path).resolve()).replace("'", "'\\''")
+        lines.append(f"file 'file:{escaped_path}'\n")
+    return ''.join(lines)
+
+
+def run_concat_demuxer(input_files: List[str], output_file: str, timeout: float = 60) -> None:
+    """
+    Concatenate files with the ffmpeg concat demuxer without re-encoding.
+
+    The list is passed on ffmpeg's stdin rather than written to a file, so
+    any number of concatenations can run at once in the same directory.
+
+    Args:
+        input_files: Files to concatenate, in order
+        output_file: Output file (overwritten)
+        timeout: Seconds before ffmpeg is killed
+
+    Raises:
+        AudioProcessingError: If ffmpeg fails
+    """
+    result = subprocess.run(
+        [
+            'ffmpeg',
+            '-f', 'concat',
+            '-safe', '0',
+            '-protocol_whitelist', 'file,pipe',
+            '-i', 'pipe:0',
+            '-c', 'copy',  # Copy codec (no re-encoding)
+            '-y',  # Overwrite output file
+            output_file
+        ],
+        input=concat_demuxer_list(input_files),
+        capture_output=True,
+        text=True,
+        timeout=timeout
+    )
+
+    if result.returncode != 0:
+        raise AudioProcessingError(f"ffmpeg concatenation failed: {result.stderr}")
+
+
+class AudioBackend(ABC):
+    """Interface for audio operation backends."""
+
+    name = ''
+
+    @abstractmethod
+    def get_duration(self, file_path: str) -> float:
+        """
+        Get duration of an existing audio file in seconds.
+
+        Raises:
+            AudioProcessingError: If unable to get duration
+        """
+
+    @abstractmethod
+    def validate(self, file_path: str) -> Tuple[bool, Optional[str]]:
+        """Validate an existing file; returns (is_valid, error_message)."""
+
+    @abstractmethod
+    def concatenate(self, input_files: List[str], output_file: str) -> None:
+        """
+        Concatenate files without re-encoding.
+
+        Raises:
+            AudioProcessingError: If concatenation fails
+        """
+
+    @abstractmethod
+    def split(self, input_file: str, segments: List[Segment]) -> None:
+        """
+        Extract segments from a file without re-encoding.
+
+        Raises:
+            AudioProcessingError: If any segment fails
+        """
+
+
+class SubprocessBackend(AudioBackend):
+    """Backend that runs the ffmpeg/ffprobe command line tools."""
+
+    name = 'subprocess'
+
+    def __init__(self, metadata_service: Optional[MediaMetadataService] = None):
+        """
+        Initialize subprocess backend.
+
+        Args:
+            metadata_service: Metadata service for probes (defaults to shared instance)
+        """
+        self.metadata_service = metadata_service
+
+    @property
+    def _metadata(self) -> MediaMetadataService:
+        return self.metadata_service or get_metadata_service()
+
+    def get_duration(self, file_path: str) -> float:
+        try:
+            return self._metadata.probe(file_path).duration
+        except MediaProbeError as e:
+            raise AudioProcessingError(str(e))
+
+    def validate(self, file_path: str) -> Tuple[bool, Optional[str]]:
+        try:
+            self._metadata.probe(file_path)
+            return True, None
+
+        except MediaProbeError as e:
+            return False, f"Invalid audio file: {e}"
+        except Exception as e:
+            return False, f"Validation error: {str(e)}"
+
+    def concatenate(self, input_files: List[str], output_file: str) -> None:
+        run_concat_demuxer(input_files, output_file)
+
+    def split(self, input_file: str, segments: List[Segment]) -> None:
+        for segment_num, (start_time, duration, output_file) in enumerate(segments, 1):
+            result = subprocess.run(
+                [
+                    'ffmpeg',
+                    '-i', input_file,
+                    '-ss', str(start_time),
+                    '-t', str(duration),
+                    '-c', 'copy',  # Copy codec (no re-encoding)
+                    '-y',
+                    output_file
+                ],
+                capture_output=True,
+                text=True,
+                timeout=60
+            )
+
+            if result.returncode != 0:
+                raise AudioProcessingError(f"ffmpeg split failed for segment {segment_num}: {result.stderr}")
+
+
+class PyAVBackend(AudioBackend):
+    """Backend that demuxes and remuxes in-process with PyAV (no subprocesses)."""
+
+    name = 'pyav'
+
+    def __init__(self):
+        if not PYAV_AVAILABLE:
+            raise AudioProcessingError(
+                "PyAV backend requested but PyAV is not installed. Install with: pip install av"
+            )
+
+    @staticmethod
+    def _add_output_stream(container, template):
+        """Add a stream-copy output stream across PyAV versions."""
+        if hasattr(container, 'add_stream_from_template'):
+            return container.add_stream_from_template(template)
+        return container.add_stream(template=template)
+
+    @staticmethod
+    def _container_duration(container) -> float:
+        """Read duration from container or first audio stream."""
+        if container.duration is not None:
+            return container.duration / av.time_base
+
+        stream = container.streams.audio[0]
+        if stream.duration is None:
+            raise AudioProcessingError("File does not contain valid audio stream")
+        return float(stream.duration * stream.time_base)
+
+    def get_duration(self, file_path: str) -> float:
+        try:
+            with av.open(file_path) as container:
+                return self._container_duration(container)
+        except (av.FFmpegError, IndexError, OSError) as e:
+            raise AudioProcessingError(f"PyAV error reading {file_path}: {e}")
+
+    def validate(self, file_path: str) -> Tuple[bool, Optional[str]]:
+        try:
+            with av.open(file_path) as container:
+                if not container.streams.audio:
+                    return False, "File does not contain valid audio stream"
+                self._container_duration(container)
+            return True, None
+
+        except (av.FFmpegError, AudioProcessingError, OSError) as e:
+            return False, f"Invalid audio file: {e}"
+        except Exception as e:
+            return False, f"Validation error: {str(e)}"
+
+    def concatenate(self, input_files: List[str], output_file: str) -> None:
+        try:
+            with av.open(output_file, 'w', format='mp3') as output:
+                out_stream = None
+                offset = 0.0  # Seconds already written
+
+                for file_path in input_files:
+                    with av.open(file_path) as container:
+                        in_stream = container.streams.audio[0]
+                        if out_stream is None:
+                            out_stream = self._add_output_stream(output, in_stream)
+
+                        # Place this file's start time at the running offset,
+                        # like the ffmpeg concat demuxer does
+                        time_base = in_stream.time_base
+                        start_pts = in_stream.start_time or 0
+                        shift = int(round(offset / time_base)) - start_pts
+
+                        for packet in container.demux(in_stream):
+                            # Skip the flush packet emitted at end of stream
+                            if packet.dts is None:
+                                continue
+
+                            packet.pts += shift
+                            packet.dts += shift
+                            packet.stream = out_stream
+                            output.mux(packet)
+
+                        offset += self._container_duration(container)
+
+        except (av.FFmpegError, IndexError, OSError) as e:
+            raise AudioProcessingError(f"PyAV concatenation failed: {e}")
+
+    def split(self, input_file: str, segments: List[Segment]) -> None:
+        outputs: Dict[int, Tuple[object, object, int]] = {}
+
+        try:
+            with av.open(input_file) as container:
+                in_stream = container.streams.audio[0]
+                time_base = in_stream.time_base
+
+                for packet in container.demux(in_stream):
+                    if packet.dts is None:
+                        continue
+
+                    packet_time = float(packet.pts * time_base)
+
+                    for index, (start, duration, output_file) in enumerate(segments):
+                        if not start <= packet_time < start + duration:
+                            continue
+
+                        if index not in outputs:
+                            output = av.open(output_file, 'w', format='mp3')
+                            out_stream = self._add_output_stream(output, in_stream)
+                            outputs[index] = (output, out_stream, packet.pts)
+
+                        output, out_stream, first_pts = outputs[index]
+                        packet.pts -= first_pts
+                        packet.dts -= first_pts
+                        packet.stream = out_stream
+                        output.mux(packet)
+                        break
+
+        except (av.FFmpegError, IndexError, OSError) as e:
+            raise AudioProcessingError(f"PyAV split failed: {e}")
+
+        finally:
+            for output, _, _ in outputs.values():
+                output.close()
+
+        for segment_num, (_, _, output_file) in enumerate(segments, 1):
+            if not os.path.exists(output_file):
+                raise AudioProcessingError(f"PyAV split produced no audio for segment {segment_num}")
+
+
+BACKENDS = {
+    SubprocessBackend.name: SubprocessBackend,
+    PyAVBackend.name: PyAVBackend,
+}
+
+
+def get_backend(name: Optional[str] = None) -> AudioBackend:
+    """
+    Create an audio backend by name.
+
+    Args:
+        name: Backend name (defaults to AUDIO_BACKEND env var, then 'subprocess')
+
+    Returns:
+        AudioBackend instance
+
+    Raises:
+        AudioProcessingError: If the backend is unknown or unavailable
+    """
+    name = name or os.getenv('AUDIO_BACKEND', DEFAULT_BACKEND)
+
+    if name not in BACKENDS:
+        raise AudioProcessingError(
+            f"Unknown audio backend: {name}. Expected one of {sorted(BACKENDS)}"
+        )
+
+    return BACKENDS[name]()
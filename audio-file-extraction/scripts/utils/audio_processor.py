@@ -3,25 +3,68 @@ Audio Processor Module
 
 Wrapper for ffmpeg operations including concatenation and splitting.
 Uses ffmpeg concat demuxer method (no re-encoding) for high-quality, fast processing.
+
+The work is delegated to a pluggable backend (see audio_backends). The
+backend is chosen per run with AUDIO_BACKEND=subprocess|pyav or
+AudioProcessor.set_backend().
+
+Concatenation is safe to run concurrently (the subprocess backend passes
+the concat list to ffmpeg on stdin), and concatenate_batch() runs many
+independent jobs on a bounded thread pool.
 """
 
 import subprocess
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional, Tuple
 from .logger import get_logger
+from .audio_backends import AudioBackend, AudioProcessingError, get_backend
 
 logger = get_logger(__name__)
 
+# Default concurrent concatenations for concatenate_batch()
+DEFAULT_CONCAT_WORKERS = min(4, os.cpu_count() or 1)
 
-class AudioProcessingError(Exception):
-    """Exception raised for audio processing errors."""
-    pass
+# A concatenation job: (input_files, output_file)
+ConcatJob = Tuple[List[str], str]
 
 
 class AudioProcessor:
     """Handles audio file operations using ffmpeg."""
 
+    # Backend shared by all callers; created lazily on first use
+    _backend: Optional[AudioBackend] = None
+
+    @classmethod
+    def get_backend(cls) -> AudioBackend:
+        """
+        Get the active audio backend.
+
+        Returns:
+            AudioBackend instance (from AUDIO_BACKEND env var on first use)
+        """
+        if cls._backend is None:
+            cls._backend = get_backend()
+            logger.debug(f"Using {cls._backend.name} audio backend")
+        return cls._backend
+
+    @classmethod
+    def set_backend(cls, backend) -> None:
+        """
+        Select the audio backend for this run.
+
+        Args:
+            backend: Backend name ('subprocess', 'pyav') or AudioBackend instance
+
+        Raises:
+            AudioProcessingError: If the backend is unknown or unavailable
+        """
+        if isinstance(backend, str):
+            backend = get_backend(backend)
+        cls._backend = backend
+        logger.info(f"Audio backend: {backend.name}")
+
     @staticmethod
     def check_ffmpeg_installed() -> bool:
         """
@@ -41,8 +84,8 @@ class AudioProcessor:
         except (subprocess.TimeoutExpired, FileNotFoundError):
             return False
 
-    @staticmethod
-    def get_audio_duration(file_path: str) -> float:
+    @classmethod
+    def get_audio_duration(cls, file_path: str) -> float:
         """
         Get duration of audio file in seconds.
 
@@ -58,32 +101,11 @@ class AudioProcessor:
         if not Path(file_path).exists():
             raise AudioProcessingError(f"Audio file not found: {file_path}")
 
-        try:
-            result = subprocess.run(
-                [
-                    'ffprobe',
-                    '-v', 'error',
-                    '-show_entries', 'format=duration',
-                    '-of', 'default=noprint_wrappers=1:nokey=1',
-                    file_path
-                ],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-
-            if result.returncode != 0:
-                raise AudioProcessingError(f"ffprobe error: {result.stderr}")
-
-            return float(result.stdout.strip())
+        return cls.get_backend().get_duration(file_path)
 
-        except subprocess.TimeoutExpired:
-            raise AudioProcessingError(f"Timeout getting duration for {file_path}")
-        except ValueError as e:
-            raise AudioProcessingError(f"Invalid duration value: {e}")
-
-    @staticmethod
+    @classmethod
     def concatenate_audio_files(
+        cls,
         input_files: List[str],
         output_file: str,
         use_concat_demuxer: bool = True
@@ -117,43 +139,8 @@ class AudioProcessor:
         logger.info(f"Concatenating {len(input_files)} files to {output_file}")
 
         if use_concat_demuxer:
-            # Create temporary concat list file
-            concat_list_path = Path(output_file).parent / "concat_list.txt"
-
-            try:
-                with open(concat_list_path, 'w') as f:
-                    for file_path in input_files:
-                        # ffmpeg concat demuxer requires absolute paths or relative with 'file' prefix
-                        abs_path = Path(file_path).resolve()
-                        # Escape single quotes in path
-                        escaped_path = str(abs_path).replace("'", "'\\''")
-                        f.write(f"file '{escaped_path}'\n")
-
-                # Run ffmpeg concat demuxer
-                result = subprocess.run(
-                    [
-                        'ffmpeg',
-                        '-f', 'concat',
-                        '-safe', '0',
-                        '-i', str(concat_list_path),
-                        '-c', 'copy',  # Copy codec (no re-encoding)
-                        '-y',  # Overwrite output file
-                        output_file
-                    ],
-                    capture_output=True,
-                    text=True,
-                    timeout=60
-                )
-
-                if result.returncode != 0:
-                    raise AudioProcessingError(f"ffmpeg concatenation failed: {result.stderr}")
-
-                logger.info(f"Successfully concatenated to {output_file}")
-
-            finally:
-                # Clean up concat list file
-                if concat_list_path.exists():
-                    concat_list_path.unlink()
+            cls.get_backend().concatenate(input_files, output_file)
+            logger.info(f"Successfully concatenated to {output_file}")
 
         else:
             # Alternative: concat filter (re-encodes, slower but more flexible)
@@ -183,8 +170,46 @@ class AudioProcessor:
 
             logger.info(f"Successfully concatenated to {output_file}")
 
-    @staticmethod
+    @classmethod
+    def concatenate_batch(
+        cls,
+        jobs: List[ConcatJob],
+        max_workers: int = DEFAULT_CONCAT_WORKERS
+    ) -> List[Tuple[bool, Optional[str]]]:
+        """
+        Run independent concatenations concurrently.
+
+        Jobs may share an output directory. A failed job does not stop the
+        others.
+
+        Args:
+            jobs: List of (input_files, output_file) tuples
+            max_workers: Maximum concatenations running at once
+
+        Returns:
+            List of (success, error_message) tuples in job order
+        """
+        def run(job: ConcatJob) -> Tuple[bool, Optional[str]]:
+            input_files, output_file = job
+            try:
+                cls.concatenate_audio_files(input_files, output_file)
+                return True, None
+            except AudioProcessingError as e:
+                return False, str(e)
+            except subprocess.TimeoutExpired:
+                return False, f"Concatenation timed out: {output_file}"
+
+        if not jobs:
+            return []
+
+        logger.info(f"Concatenating {len(jobs)} jobs with {max_workers} workers")
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='concat') as executor:
+            return list(executor.map(run, jobs))
+
+    @classmethod
     def split_audio_file(
+        cls,
         input_file: str,
         output_prefix: str,
         split_times: List[float]
@@ -216,7 +241,7 @@ class AudioProcessor:
         logger.info(f"Splitting {input_file} at {len(split_times)} points")
 
         # Get total duration
-        total_duration = AudioProcessor.get_audio_duration(input_file)
+        total_duration = cls.get_audio_duration(input_file)
 
         # Create segments: [0 to split_times[0], split_times[0] to split_times[1], ..., split_times[-1] to end]
         segments = []
@@ -234,35 +259,20 @@ class AudioProcessor:
         output_dir = Path(output_prefix).parent
         output_dir.mkdir(parents=True, exist_ok=True)
 
+        jobs = []
         for start_time, duration, segment_num in segments:
             output_file = f"{output_prefix}_{segment_num}.mp3"
-
-            result = subprocess.run(
-                [
-                    'ffmpeg',
-                    '-i', input_file,
-                    '-ss', str(start_time),
-                    '-t', str(duration),
-                    '-c', 'copy',  # Copy codec (no re-encoding)
-                    '-y',
-                    output_file
-                ],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-
-            if result.returncode != 0:
-                raise AudioProcessingError(f"ffmpeg split failed for segment {segment_num}: {result.stderr}")
-
+            jobs.append((start_time, duration, output_file))
             output_files.append(output_file)
-            logger.debug(f"Created segment {segment_num}: {output_file}")
+            logger.debug(f"Segment {segment_num}: {output_file}")
+
+        cls.get_backend().split(input_file, jobs)
 
         logger.info(f"Successfully split into {len(output_files)} segments")
         return output_files
 
-    @staticmethod
-    def validate_audio_file(file_path: str) -> Tuple[bool, Optional[str]]:
+    @classmethod
+    def validate_audio_file(cls, file_path: str) -> Tuple[bool, Optional[str]]:
         """
         Validate that a file is a valid audio file.
 
@@ -275,31 +285,4 @@ class AudioProcessor:
         if not Path(file_path).exists():
             return False, f"File not found: {file_path}"
 
-        try:
-            result = subprocess.run(
-                [
-                    'ffprobe',
-                    '-v', 'error',
-                    '-show_entries', 'format=format_name,duration',
-                    '-of', 'default=noprint_wrappers=1',
-                    file_path
-                ],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-
-            if result.returncode != 0:
-                return False, f"Invalid audio file: {result.stderr}"
-
-            # Check that we got valid output
-            output = result.stdout.strip()
-            if not output or 'duration=' not in output:
-                return False, "File does not contain valid audio stream"
-
-            return True, None
-
-        except subprocess.TimeoutExpired:
-            return False, "Validation timeout"
-        except Exception as e:
-            return False, f"Validation error: {str(e)}"
+        return cls.get_backend().validate(file_path)
@@ -0,0 +1,286 @@
+"""
+Chunked Diarization Module
+
+Runs a pyannote diarization pipeline over long sources in overlapping
+windows instead of on the whole file.
+
+Audio is decoded once through a pipe and only one window of 16 kHz samples
+is held in memory at a time. Each window is passed to the pipeline as an
+in-memory waveform. Window turns are shifted to file time, and speaker
+labels are matched to those of the previous window by their overlap inside
+the shared region. The two windows are then joined at the middle of that
+region.
+
+torch is imported lazily so this module can be used (and its stitching
+logic tested) without it.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .diarization_cache import SpeakerTurn
+from .logger import get_logger
+from .silence_detection import stream_pcm
+
+logger = get_logger(__name__)
+
+PathLike = Union[str, Path]
+
+# pyannote segmentation and embedding models expect 16 kHz mono input
+SAMPLE_RATE = 16000
+
+# Turns touching across a window boundary closer than this are joined
+JOIN_TOLERANCE = 1e-3
+
+
+def iter_windows(
+    input_file: PathLike,
+    window_seconds: float,
+    overlap_seconds: float,
+    sample_rate: int = SAMPLE_RATE
+) -> Iterator[Tuple[float, np.ndarray]]:
+    """
+    Decode a file into overlapping windows of samples.
+
+    Args:
+        input_file: Path to audio file
+        window_seconds: Window length in seconds
+        overlap_seconds: Overlap between consecutive windows in seconds
+        sample_rate: Decode sample rate in Hz
+
+    Yields:
+        (window_start_seconds, float32 samples); the last window may be shorter
+
+    Raises:
+        ValueError: If overlap is not shorter than the window
+        FileNotFoundError: If ffmpeg is not installed
+        SilenceDetectionError: If the file cannot be decoded
+    """
+    if not 0 <= overlap_seconds < window_seconds:
+        raise ValueError("Overlap must be non-negative and shorter than the window")
+
+    window = int(window_seconds * sample_rate)
+    step = window - int(overlap_seconds * sample_rate)
+
+    buffer = np.empty(0, dtype=np.float32)
+    offset = 0  # Sample index of buffer[0]
+    emitted = False
+
+    for chunk in stream_pcm(input_file, sample_rate):
+        buffer = np.concatenate((buffer, chunk))
+
+        while buffer.size >= window:
+            yield offset / sample_rate, buffer[:window].copy()
+            emitted = True
+            buffer = buffer[step:]
+            offset += step
+
+    # Emit the tail unless it lies entirely inside the previous window
+    overlap = window - step
+    if buffer.size and (not emitted or buffer.size > overlap):
+        yield offset / sample_rate, buffer
+
+
+def _overlap(a_start: float, a_end: float, b_start: float, b_end: float) -> float:
+    return max(0.0, min(a_end, b_end) - max(a_start, b_start))
+
+
+def match_labels(
+    previous: List[SpeakerTurn],
+    current: List[SpeakerTurn],
+    region_start: float,
+    region_end: float,
+    known_labels: List[str]
+) -> Dict[str, str]:
+    """
+    Map a window's local speaker labels onto global labels.
+
+    Labels are paired greedily by the amount of speech they share inside
+    the overlap region. Labels with no partner get new global labels, so a
+    speaker silent throughout an overlap is treated as new; the overlap should
+    be long enough to contain speech from everyone active at the boundary.
+
+    Args:
+        previous: Stitched turns so far, with global labels
+        current: New window's turns in file time, with local labels
+        region_start: Start of the overlap region in seconds
+        region_end: End of the overlap region in seconds
+        known_labels: Global labels already in use (extended in place)
+
+    Returns:
+        Mapping from local label to global label
+    """
+    shared: Dict[Tuple[str, str], float] = {}
+
+    for g_start, g_end, g_label in previous:
+        if g_end <= region_start:
+            continue
+        for l_start, l_end, l_label in current:
+            amount = _overlap(
+                max(g_start, region_start), min(g_end, region_end), l_start, l_end
+            )
+            if amount > 0:
+                shared[(g_label, l_label)] = shared.get((g_label, l_label), 0.0) + amount
+
+    mapping: Dict[str, str] = {}
+    used = set()
+
+    for (g_label, l_label), _ in sorted(shared.items(), key=lambda item: -item[1]):
+        if l_label not in mapping and g_label not in used:
+            mapping[l_label] = g_label
+            used.add(g_label)
+
+    for _, _, l_label in current:
+        if l_label not in mapping:
+            mapping[l_label] = f"SPEAKER_{len(known_labels):02d}"
+            known_labels.append(mapping[l_label])
+
+    return mapping
+
+
+def stitch(
+    previous: List[SpeakerTurn],
+    current: List[SpeakerTurn],
+    cut: float
+) -> List[SpeakerTurn]:
+    """
+    Join two turn lists at a cut time.
+
+    Turns from previous are kept up to the cut and turns from current
+    from the cut on; a speaker talking across the cut becomes one turn.
+
+    Args:
+        previous: Earlier turns (global labels)
+        current: Later turns (global labels)
+        cut: Join time in seconds
+
+    Returns:
+        Combined turns sorted by start time
+    """
+    head = [
+        (start, min(end, cut), label)
+        for start, end, label in previous
+        if start < cut
+    ]
+    tail = [
+        (max(start, cut), end, label)
+        for start, end, label in current
+        if end > cut
+    ]
+
+    # Join turns of the same speaker that meet at the cut
+    joined = []
+    for t_start, t_end, t_label in tail:
+        for i, (h_start, h_end, h_label) in enumerate(head):
+            if (h_label == t_label and abs(h_end - cut) <= JOIN_TOLERANCE
+                    and abs(t_start - cut) <= JOIN_TOLERANCE):
+                head[i] = (h_start, t_end, h_label)
+                break
+        else:
+            joined.append((t_start, t_end, t_label))
+
+    return sorted(head + joined, key=lambda turn: (turn[0], turn[1]))
+
+
+class ChunkedDiarizer:
+    """Diarizes long files window by window with a shared pyannote pipeline."""
+
+    def __init__(
+        self,
+        pipeline,
+        window_seconds: float = 300.0,
+        overlap_seconds: float = 30.0
+    ):
+        """
+        Initialize chunked diarizer.
+
+        Thread and batch size limits are applied to the pipeline itself with
+        configure_pipeline(), so one configured pipeline can serve many files.
+
+        Args:
+            pipeline: Loaded pyannote SpeakerDiarization pipeline
+            window_seconds: Window length in seconds
+            overlap_seconds: Overlap between windows in seconds
+        """
+        if not 0 <= overlap_seconds < window_seconds:
+            raise ValueError("Overlap must be non-negative and shorter than the window")
+
+        self.pipeline = pipeline
+        self.window_seconds = window_seconds
+        self.overlap_seconds = overlap_seconds
+
+    @staticmethod
+    def _pipeline_input(samples: np.ndarray) -> dict:
+        """Wrap window samples in the in-memory form pyannote pipelines accept."""
+        import torch
+
+        return {'waveform': torch.from_numpy(samples).unsqueeze(0), 'sample_rate': SAMPLE_RATE}
+
+    def __call__(self, input_file: PathLike) -> List[SpeakerTurn]:
+        """
+        Diarize a file.
+
+        Args:
+            input_file: Path to audio file
+
+        Returns:
+            Speaker turns in file time with labels consistent across windows
+        """
+        turns: List[SpeakerTurn] = []
+        labels: List[str] = []
+        previous_end = None
+        windows = 0
+
+        for window_start, samples in iter_windows(
+            input_file, self.window_seconds, self.overlap_seconds
+        ):
+            diarization = self.pipeline(self._pipeline_input(samples))
+
+            window_turns = [
+                (window_start + turn.start, window_start + turn.end, speaker)
+                for turn, _, speaker in diarization.itertracks(yield_label=True)
+            ]
+            windows += 1
+            window_end = window_start + samples.size / SAMPLE_RATE
+
+            if previous_end is None:
+                mapping = match_labels([], window_turns, 0.0, 0.0, labels)
+                turns = [(s, e, mapping[l]) for s, e, l in window_turns]
+            else:
+                region_end = min(previous_end, window_end)
+                mapping = match_labels(turns, window_turns, window_start, region_end, labels)
+                window_turns = [(s, e, mapping[l]) for s, e, l in window_turns]
+                turns = stitch(turns, window_turns, (window_start + region_end) / 2)
+
+            previous_end = window_end
+
+        logger.debug(f"Diarized {input_file} in {windows} windows, {len(labels)} speakers")
+        return turns
+
+
+def configure_pipeline(
+    pipeline,
+    num_threads: Optional[int] = None,
+    embedding_batch_size: Optional[int] = None,
+    segmentation_batch_size: Optional[int] = None
+) -> None:
+    """
+    Apply CPU thread and batch size limits to a diarization pipeline.
+
+    Args:
+        pipeline: Loaded pyannote SpeakerDiarization pipeline
+        num_threads: Cap on torch intra-op threads
+        embedding_batch_size: Embedding inference batch size
+        segmentation_batch_size: Segmentation inference batch size
+    """
+    if num_threads:
+        import torch
+        torch.set_num_threads(num_threads)
+
+    # Attribute names as exposed by pyannote.audio 3.x SpeakerDiarization
+    if embedding_batch_size and hasattr(pipeline, 'embedding_batch_size'):
+        pipeline.embedding_batch_size = embedding_batch_size
+    if segmentation_batch_size and hasattr(pipeline, 'segmentation_batch_size'):
+        pipeline.segmentation_batch_size = segmentation_batch_size
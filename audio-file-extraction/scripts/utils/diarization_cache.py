@@ -0,0 +1,169 @@
+"""
+Diarization Cache Module
+
+Content-addressed on-disk cache for speaker diarization results.
+
+Entries are keyed by the SHA-256 of the audio bytes together with the
+pipeline name and version, so renaming or copying a file still hits the
+cache while a changed file or upgraded model misses it. Speaker turns are
+stored as compact NumPy arrays in one .npz file per entry.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+PathLike = Union[str, Path]
+
+# A speaker turn: (start_seconds, end_seconds, speaker_label)
+SpeakerTurn = Tuple[float, float, str]
+
+# Default cache location (overridable via DIARIZATION_CACHE_DIR env var)
+DEFAULT_CACHE_DIR = 'data/cache/diarization'
+
+# Bump when the stored array layout changes to invalidate old entries
+CACHE_VERSION = 1
+
+# Read size for hashing audio files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_audio(path: PathLike) -> str:
+    """
+    Compute the SHA-256 of a file's contents.
+
+    Args:
+        path: Path to audio file
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DiarizationCache:
+    """Stores speaker turns per (audio content, pipeline version)."""
+
+    def __init__(self, cache_dir: Optional[PathLike] = None):
+        """
+        Initialize diarization cache.
+
+        Args:
+            cache_dir: Directory for cache entries (defaults to DIARIZATION_CACHE_DIR env var)
+        """
+        self.cache_dir = Path(
+            cache_dir or os.getenv('DIARIZATION_CACHE_DIR', DEFAULT_CACHE_DIR)
+        )
+
+    def key(self, audio_path: PathLike, pipeline_id: str) -> str:
+        """
+        Build the cache key for an audio file and pipeline.
+
+        Args:
+            audio_path: Path to audio file
+            pipeline_id: Pipeline name and version, e.g. "pyannote/speaker-diarization-3.1@3.1.1"
+
+        Returns:
+            Hex key
+        """
+        digest = hashlib.sha256()
+        digest.update(f"v{CACHE_VERSION}\0{pipeline_id}\0".encode())
+        digest.update(hash_audio(audio_path).encode())
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.npz"
+
+    def get(self, audio_path: PathLike, pipeline_id: str) -> Optional[List[SpeakerTurn]]:
+        """
+        Look up cached speaker turns.
+
+        Args:
+            audio_path: Path to audio file
+            pipeline_id: Pipeline name and version
+
+        Returns:
+            List of speaker turns, or None on a cache miss
+        """
+        return self.load(self.key(audio_path, pipeline_id))
+
+    def load(self, key: str) -> Optional[List[SpeakerTurn]]:
+        """
+        Look up cached speaker turns by a key from key().
+
+        Lets a caller hash the audio once for both the lookup and a later store().
+
+        Args:
+            key: Cache key
+
+        Returns:
+            List of speaker turns, or None on a cache miss
+        """
+        entry = self._entry_path(key)
+        if not entry.exists():
+            return None
+
+        try:
+            with np.load(entry, allow_pickle=False) as data:
+                starts = data['starts']
+                ends = data['ends']
+                labels = data['labels']
+                speakers = data['speakers']
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable diarization cache entry {entry}: {e}")
+            return None
+
+        logger.debug(f"Diarization cache hit for {key}")
+        return [
+            (float(start), float(end), str(labels[speaker]))
+            for start, end, speaker in zip(starts, ends, speakers)
+        ]
+
+    def put(self, audio_path: PathLike, pipeline_id: str, turns: List[SpeakerTurn]) -> None:
+        """
+        Store speaker turns for an audio file.
+
+        Args:
+            audio_path: Path to audio file
+            pipeline_id: Pipeline name and version
+            turns: Speaker turns to store
+        """
+        self.store(self.key(audio_path, pipeline_id), turns)
+
+    def store(self, key: str, turns: List[SpeakerTurn]) -> None:
+        """
+        Store speaker turns under a key from key().
+
+        Args:
+            key: Cache key
+            turns: Speaker turns to store
+        """
+        entry = self._entry_path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+
+        labels = sorted({speaker for _, _, speaker in turns})
+        label_index = {label: i for i, label in enumerate(labels)}
+
+        # np.savez appends .npz unless the name already ends with it
+        temp_file = entry.with_name(f"{entry.stem}.{os.getpid()}.tmp.npz")
+        np.savez_compressed(
+            temp_file,
+            starts=np.array([t[0] for t in turns], dtype=np.float64),
+            ends=np.array([t[1] for t in turns], dtype=np.float64),
+            speakers=np.array([label_index[t[2]] for t in turns], dtype=np.int16),
+            labels=np.array(labels, dtype=str)
+        )
+        os.replace(temp_file, entry)
+
+        logger.debug(f"Cached {len(turns)} speaker turns under {key}")
@@ -0,0 +1,236 @@
+"""
+Drive Cache Module
+
+Size-bounded local blob cache for files downloaded from Google Drive.
+
+Blobs are keyed by Drive file ID plus a content token from the file's
+metadata (md5Checksum, or the version number for files without one), so an
+unchanged file costs one metadata call per run instead of a full download,
+while an edited file misses and replaces its stale blob.
+
+Each blob is a plain file at <cache_dir>/<file_id>/<token>. Its mtime is
+bumped on every hit and serves as the LRU clock: when the cache grows past
+its size limit, least recently used blobs are deleted first. Hits are
+hardlinked to the requested output path (copied where hardlinks are not
+supported), so callers can delete their copy without affecting the cache.
+"""
+
+import os
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+PathLike = Union[str, Path]
+
+# Default cache location and size (overridable via DRIVE_CACHE_DIR / DRIVE_CACHE_MAX_BYTES)
+DEFAULT_CACHE_DIR = 'data/cache/drive'
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+# Metadata fields needed to validate a cached blob
+CACHE_FIELDS = 'id, name, size, md5Checksum, version'
+
+# Characters allowed in blob path components
+_UNSAFE = re.compile(r'[^A-Za-z0-9_.-]')
+
+
+class DriveCacheError(Exception):
+    """Exception raised for Drive cache errors."""
+    pass
+
+
+def content_token(metadata: Dict) -> str:
+    """
+    Build the content token for a Drive file's metadata.
+
+    Args:
+        metadata: files().get() result including md5Checksum and/or version
+
+    Returns:
+        Token that changes whenever the file content changes
+
+    Raises:
+        DriveCacheError: If the metadata has neither field
+    """
+    if metadata.get('md5Checksum'):
+        return f"md5-{metadata['md5Checksum']}"
+    if metadata.get('version'):
+        return f"v{metadata['version']}"
+    raise DriveCacheError(f"No md5Checksum or version in metadata for {metadata.get('id')}")
+
+
+def _link_or_copy(source: Path, destination: Path) -> None:
+    """Hardlink source to destination, replacing it, or copy if linking fails."""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    if destination.exists():
+        destination.unlink()
+    try:
+        os.link(source, destination)
+    except OSError as e:
+        if not source.exists():
+            raise FileNotFoundError(e)
+        shutil.copy2(source, destination)
+
+
+class DriveBlobCache:
+    """LRU blob cache for Drive downloads, keyed by file ID and content token."""
+
+    def __init__(self, cache_dir: Optional[PathLike] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize Drive cache.
+
+        Args:
+            cache_dir: Cache directory (defaults to DRIVE_CACHE_DIR env var)
+            max_bytes: Size limit (defaults to DRIVE_CACHE_MAX_BYTES env var, then 2 GiB)
+        """
+        self.cache_dir = Path(cache_dir or os.getenv('DRIVE_CACHE_DIR', DEFAULT_CACHE_DIR))
+        if max_bytes is None:
+            max_bytes = int(os.getenv('DRIVE_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _blob_path(self, file_id: str, token: str) -> Path:
+        return self.cache_dir / _UNSAFE.sub('_', file_id) / _UNSAFE.sub('_', token)
+
+    def get(self, file_id: str, token: str) -> Optional[Path]:
+        """
+        Look up a blob and mark it as recently used.
+
+        Args:
+            file_id: Drive file ID
+            token: Content token from content_token()
+
+        Returns:
+            Blob path, or None on a miss
+        """
+        blob = self._blob_path(file_id, token)
+        try:
+            os.utime(blob)
+        except FileNotFoundError:
+            return None
+        return blob
+
+    def put(self, file_id: str, token: str, source: PathLike) -> Path:
+        """
+        Move a downloaded file into the cache, dropping stale versions.
+
+        Args:
+            file_id: Drive file ID
+            token: Content token the file was downloaded for
+            source: Downloaded file (moved, so it must be on the cache filesystem)
+
+        Returns:
+            Blob path
+        """
+        blob = self._blob_path(file_id, token)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(source, blob)
+
+        with self._lock:
+            for stale in blob.parent.iterdir():
+                if stale.name != blob.name and not stale.name.endswith('.tmp'):
+                    stale.unlink(missing_ok=True)
+                    logger.debug(f"Dropped stale cache blob {stale}")
+            self.evict(keep=blob)
+
+        return blob
+
+    def fetch(
+        self,
+        file_id: str,
+        output_path: PathLike,
+        metadata: Dict,
+        download: Callable[[str, Path], None]
+    ) -> bool:
+        """
+        Provide a Drive file at output_path, downloading only on a cache miss.
+
+        Args:
+            file_id: Drive file ID
+            output_path: Where the file should appear
+            metadata: Current files().get() metadata (see CACHE_FIELDS)
+            download: Called as download(file_id, path) to fetch a miss
+
+        Returns:
+            True on a cache hit, False if the file was downloaded
+        """
+        output_path = Path(output_path)
+        token = content_token(metadata)
+
+        blob = self.get(file_id, token)
+        if blob is not None:
+            try:
+                _link_or_copy(blob, output_path)
+                logger.debug(f"Drive cache hit for {file_id} ({token})")
+                return True
+            except FileNotFoundError:
+                # Evicted by another thread or process between lookup and link
+                pass
+
+        temp = self._blob_path(file_id, token).with_name(
+            f"{token}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        temp.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            download(file_id, temp)
+
+            expected = metadata.get('size')
+            if expected is not None and temp.stat().st_size != int(expected):
+                raise DriveCacheError(
+                    f"Downloaded {temp.stat().st_size} bytes for {file_id}, expected {expected}"
+                )
+
+            blob = self.put(file_id, token, temp)
+        finally:
+            temp.unlink(missing_ok=True)
+
+        _link_or_copy(blob, output_path)
+        return False
+
+    def total_bytes(self) -> int:
+        """Total size of cached blobs."""
+        if not self.cache_dir.exists():
+            return 0
+        return sum(p.stat().st_size for p in self.cache_dir.glob('*/*') if not p.name.endswith('.tmp'))
+
+    def evict(self, keep: Optional[Path] = None) -> int:
+        """
+        Delete least recently used blobs until the cache fits its size limit.
+
+        Args:
+            keep: Blob that must not be evicted (e.g. the one just added)
+
+        Returns:
+            Number of bytes freed
+        """
+        blobs = []
+        for blob in self.cache_dir.glob('*/*'):
+            if blob.name.endswith('.tmp'):
+                continue
+            try:
+                stat = blob.stat()
+            except FileNotFoundError:
+                continue
+            blobs.append((stat.st_mtime_ns, stat.st_size, blob))
+
+        total = sum(size for _, size, _ in blobs)
+        freed = 0
+        for _, size, blob in sorted(blobs, key=lambda b: b[0]):
+            if total - freed <= self.max_bytes:
+                break
+            if keep is not None and blob == keep:
+                continue
+            blob.unlink(missing_ok=True)
+            freed += size
+            logger.debug(f"Evicted {blob} ({size} bytes)")
+            try:
+                blob.parent.rmdir()
+            except OSError:
+                pass  # Other blobs or downloads still in this file's directory
+
+        return freed
@@ -0,0 +1,365 @@
+"""
+Drive Index Module
+
+Local SQLite index of a Drive folder's contents, kept fresh through the
+Drive changes feed.
+
+GoogleDriveManager.list_files pages through the whole folder on every call,
+and each caller then parses every filename again. DriveIndex instead stores
+one row per file (id, name, mimeType, size, md5Checksum, version,
+modifiedTime) together with the task parsed from its TOEFL filename, so
+queries such as "all conversation MP3s" are answered locally.
+
+The first sync lists the folder once and saves a start page token from
+changes().getStartPageToken(). Later syncs call changes().list() from the
+saved token and apply only what changed since: new or edited files are
+upserted, and files that were deleted, trashed or moved out of the folder
+are dropped. Changes and the new token are committed in one transaction, so
+an interrupted sync is simply repeated. If the token has expired, or the
+index was built for another folder or schema, the folder is listed again.
+"""
+
+import os
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .file_parser import TOEFLFileParser
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+PathLike = Union[str, Path]
+
+# Default index location (overridable via DRIVE_INDEX_PATH env var)
+DEFAULT_INDEX_PATH = 'data/cache/drive_index.sqlite'
+
+# Bump when the table layout changes to force a full rebuild
+SCHEMA_VERSION = 1
+
+# Values of the task column for the two task types the scripts process
+TASK_CONVERSATION = 'conversation'
+TASK_LISTEN_AND_CHOOSE = 'listen-and-choose'
+
+# File metadata stored per row
+FILE_FIELDS = 'id, name, mimeType, size, md5Checksum, version, modifiedTime'
+
+# Page size for both listing and the changes feed (Drive maximum)
+PAGE_SIZE = 1000
+
+# Changes-feed errors that mean the saved page token is no longer usable
+INVALID_TOKEN_STATUSES = (400, 404, 410)
+
+try:
+    from googleapiclient.errors import HttpError
+    _API_ERRORS = (HttpError,)
+except ImportError:
+    _API_ERRORS = ()
+
+# Drive metadata key -> column name
+_COLUMNS = {
+    'id': 'id',
+    'name': 'name',
+    'mimeType': 'mime_type',
+    'size': 'size',
+    'md5Checksum': 'md5_checksum',
+    'version': 'version',
+    'modifiedTime': 'modified_time',
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    mime_type TEXT,
+    size TEXT,
+    md5_checksum TEXT,
+    version TEXT,
+    modified_time TEXT,
+    task TEXT
+);
+CREATE INDEX IF NOT EXISTS files_task ON files (task, mime_type, name);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class DriveIndexError(Exception):
+    """Exception raised when the Drive index cannot be synced or read."""
+    pass
+
+
+def task_of(name: str) -> Optional[str]:
+    """
+    Classify a filename by its TOEFL task type.
+
+    Args:
+        name: Drive filename
+
+    Returns:
+        TASK_CONVERSATION, TASK_LISTEN_AND_CHOOSE, another lower-cased task
+        type, or None if the name does not follow the TOEFL pattern
+    """
+    info = TOEFLFileParser.parse(name)
+    if not info:
+        return None
+    if info.is_conversation:
+        return TASK_CONVERSATION
+    if info.is_listen_and_choose:
+        return TASK_LISTEN_AND_CHOOSE
+    return info.task_type.lower()
+
+
+@dataclass
+class SyncResult:
+    """Outcome of one DriveIndex.sync() call."""
+
+    full: bool
+    updated: int
+    removed: int
+
+
+class DriveIndex:
+    """SQLite metadata index of one Drive folder."""
+
+    def __init__(self, service: Any, folder_id: str, path: Optional[PathLike] = None):
+        """
+        Initialize Drive index.
+
+        Args:
+            service: Drive v3 API client (googleapiclient resource)
+            folder_id: Folder whose direct children are indexed
+            path: SQLite file (defaults to DRIVE_INDEX_PATH env var or
+                DEFAULT_INDEX_PATH)
+
+        Raises:
+            DriveIndexError: If the database cannot be opened
+        """
+        if not folder_id:
+            raise DriveIndexError("No folder_id provided")
+
+        self.service = service
+        self.folder_id = folder_id
+        self.path = Path(path or os.getenv('DRIVE_INDEX_PATH', DEFAULT_INDEX_PATH))
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(self._connect()) as conn:
+                conn.executescript(_SCHEMA)
+        except (OSError, sqlite3.Error) as e:
+            raise DriveIndexError(f"Cannot open Drive index {self.path}: {e}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the index database."""
+        return sqlite3.connect(self.path)
+
+    def _state(self) -> Dict[str, str]:
+        """Read the saved sync state."""
+        with closing(self._connect()) as conn:
+            return dict(conn.execute("SELECT key, value FROM state"))
+
+    @property
+    def page_token(self) -> Optional[str]:
+        """Changes-feed token to resume from, or None if the index needs a full listing."""
+        state = self._state()
+        if state.get('folder_id') != self.folder_id or state.get('schema') != str(SCHEMA_VERSION):
+            return None
+        return state.get('page_token')
+
+    def sync(self) -> SyncResult:
+        """
+        Bring the index up to date with Drive.
+
+        Returns:
+            SyncResult with the number of rows upserted and removed
+
+        Raises:
+            DriveIndexError: If a Drive API call or database write fails
+        """
+        started = time.perf_counter()
+        token = self.page_token
+
+        try:
+            result = None
+            if token:
+                result = self._apply_changes(token)
+            if result is None:
+                result = self._rebuild()
+        except _API_ERRORS as e:
+            raise DriveIndexError(f"Failed to sync Drive index for folder {self.folder_id}: {e}")
+        except sqlite3.Error as e:
+            raise DriveIndexError(f"Failed to write Drive index {self.path}: {e}")
+
+        logger.info(
+            f"Drive index {'rebuilt' if result.full else 'synced'} in "
+            f"{time.perf_counter() - started:.2f}s: {result.updated} updated, "
+            f"{result.removed} removed, {len(self)} files"
+        )
+        return result
+
+    def _rebuild(self) -> SyncResult:
+        """List the whole folder and replace the index contents."""
+        # Take the token first so changes made while listing are replayed next time
+        token = self.service.changes().getStartPageToken().execute()['startPageToken']
+
+        files = []
+        page_token = None
+        while True:
+            results = self.service.files().list(
+                q=f"'{self.folder_id}' in parents and trashed=false",
+                pageSize=PAGE_SIZE,
+                fields=f"nextPageToken, files({FILE_FIELDS})",
+                pageToken=page_token
+            ).execute()
+            files.extend(results.get('files', []))
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM files")
+            self._upsert(conn, files)
+            self._save_state(conn, token)
+
+        return SyncResult(full=True, updated=len(files), removed=0)
+
+    def _apply_changes(self, token: str) -> Optional[SyncResult]:
+        """
+        Apply the changes feed from token.
+
+        Returns:
+            SyncResult, or None if the token is no longer valid
+        """
+        upserts: Dict[str, Dict] = {}
+        removals = set()
+
+        page_token = token
+        while True:
+            try:
+                results = self.service.changes().list(
+                    pageToken=page_token,
+                    pageSize=PAGE_SIZE,
+                    spaces='drive',
+                    includeRemoved=True,
+                    fields=(
+                        "nextPageToken, newStartPageToken, "
+                        f"changes(changeType, fileId, removed, file({FILE_FIELDS}, parents, trashed))"
+                    )
+                ).execute()
+            except _API_ERRORS as e:
+                status = getattr(getattr(e, 'resp', None), 'status', None)
+                if status in INVALID_TOKEN_STATUSES:
+                    logger.warning(f"Drive changes token rejected (HTTP {status}), rebuilding index")
+                    return None
+                raise
+
+            for change in results.get('changes', []):
+                if change.get('changeType', 'file') != 'file':
+                    continue
+                file = change.get('file') or {}
+                if (
+                    change.get('removed')
+                    or file.get('trashed')
+                    or self.folder_id not in file.get('parents', [])
+                ):
+                    upserts.pop(change['fileId'], None)
+                    removals.add(change['fileId'])
+                else:
+                    removals.discard(change['fileId'])
+                    upserts[change['fileId']] = file
+
+            if 'newStartPageToken' in results:
+                new_token = results['newStartPageToken']
+                break
+            page_token = results['nextPageToken']
+
+        with closing(self._connect()) as conn, conn:
+            removed = 0
+            for file_id in removals:
+                removed += conn.execute("DELETE FROM files WHERE id = ?", (file_id,)).rowcount
+            self._upsert(conn, upserts.values())
+            self._save_state(conn, new_token)
+
+        return SyncResult(full=False, updated=len(upserts), removed=removed)
+
+    def _upsert(self, conn: sqlite3.Connection, files: Iterable[Dict]) -> None:
+        """Insert or replace rows for Drive file metadata."""
+        conn.executemany(
+            f"INSERT OR REPLACE INTO files ({', '.join(_COLUMNS.values())}, task) "
+            f"VALUES ({', '.join('?' * (len(_COLUMNS) + 1))})",
+            (
+                tuple(file.get(key) for key in _COLUMNS) + (task_of(file['name']),)
+                for file in files
+            )
+        )
+
+    def _save_state(self, conn: sqlite3.Connection, token: str) -> None:
+        """Record the token to resume from and what it belongs to."""
+        conn.executemany(
+            "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+            [
+                ('folder_id', self.folder_id),
+                ('schema', str(SCHEMA_VERSION)),
+                ('page_token', token),
+            ]
+        )
+
+    def files(
+        self,
+        task: Optional[str] = None,
+        mime_type: Optional[str] = None,
+        name_contains: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Query indexed files, ordered by name.
+
+        Args:
+            task: Task type (e.g. TASK_CONVERSATION); only files whose name
+                parses as that TOEFL task are returned
+            mime_type: Exact MIME type (e.g. 'audio/mpeg')
+            name_contains: Case-insensitive substring of the name
+
+        Returns:
+            File metadata dictionaries with the same keys as list_files()
+
+        Raises:
+            DriveIndexError: If the database cannot be read
+        """
+        clauses: List[str] = []
+        params: List[str] = []
+        if task:
+            clauses.append("task = ?")
+            params.append(task)
+        if mime_type:
+            clauses.append("mime_type = ?")
+            params.append(mime_type)
+        if name_contains:
+            clauses.append("instr(lower(name), ?) > 0")
+            params.append(name_contains.lower())
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        try:
+            with closing(self._connect()) as conn:
+                rows = conn.execute(
+                    f"SELECT {', '.join(_COLUMNS.values())} FROM files{where} ORDER BY name",
+                    params
+                ).fetchall()
+        except sqlite3.Error as e:
+            raise DriveIndexError(f"Failed to query Drive index {self.path}: {e}")
+
+        return [_row_to_metadata(row) for row in rows]
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+
+def _row_to_metadata(row: Tuple) -> Dict[str, str]:
+    """Convert a files row back to Drive metadata, omitting empty fields."""
+    return {key: value for key, value in zip(_COLUMNS, row) if value is not None}
@@ -7,6 +7,9 @@ Handles Google Drive operations including:
 - Downloading files
 - Uploading files with version management (update existing files)
 - File metadata management
+- Concurrent resumable bulk transfers (via DriveTransfer)
+- Cached downloads that skip unchanged files (via DriveBlobCache)
+- A local folder index synced through the changes feed (via DriveIndex)
 
 Supports two modes:
 1. Direct Google Drive API (legacy)
@@ -17,6 +20,8 @@ import os
 import io
 from pathlib import Path
 from typing import Optional, List, Dict, Any, Generator
+from .drive_cache import CACHE_FIELDS, DriveBlobCache, DriveCacheError
+from .drive_index import DriveIndex, DriveIndexError
 from .logger import get_logger
 
 # Only import Google API libraries if not using MCP
@@ -65,6 +70,7 @@ class GoogleDriveManager:
         """
         self.use_mcp = USE_MCP
         self.default_folder_id = folder_id or os.getenv('DRIVE_FOLDER_ID')
+        self.credentials = None
 
         if self.use_mcp:
             logger.info("Using Google Workspace MCP for Drive operations")
@@ -118,9 +124,58 @@ class GoogleDriveManager:
             logger.info(f"Credentials saved to {self.token_file}")
 
         # Build service
+        self.credentials = creds
         self.service = build('drive', 'v3', credentials=creds)
         logger.info("Google Drive API authenticated successfully")
 
+    def transfer(self, **kwargs) -> 'DriveTransfer':
+        """
+        Create a bulk transfer client sharing this manager's credentials.
+
+        Args:
+            **kwargs: DriveTransfer options (concurrency, chunk_size, ...)
+
+        Returns:
+            DriveTransfer instance
+
+        Raises:
+            DriveManagerError: If not authenticated (e.g. in MCP mode)
+        """
+        if self.credentials is None:
+            raise DriveManagerError("Bulk transfers require direct API authentication")
+
+        # Imported here so MCP mode does not need requests or google-auth
+        from .drive_transfer import DriveTransfer
+        return DriveTransfer(credentials=self.credentials, **kwargs)
+
+    def index(self, folder_id: Optional[str] = None, path: Optional[str] = None) -> 'DriveIndex':
+        """
+        Open the local metadata index of a folder.
+
+        Call sync() on the result before querying it.
+
+        Args:
+            folder_id: Folder to index (defaults to self.default_folder_id)
+            path: SQLite file (defaults to DRIVE_INDEX_PATH env var)
+
+        Returns:
+            DriveIndex instance
+
+        Raises:
+            DriveManagerError: If not authenticated (e.g. in MCP mode) or the
+                index cannot be opened
+        """
+        folder_id = folder_id or self.default_folder_id
+        if not folder_id:
+            raise DriveManagerError("No folder_id provided")
+        if self.service is None:
+            raise DriveManagerError("The Drive index requires direct API authentication")
+
+        try:
+            return DriveIndex(self.service, folder_id, path)
+        except DriveIndexError as e:
+            raise DriveManagerError(str(e))
+
     def _mcp_list_files(
         self,
         folder_id: str,
@@ -144,7 +199,7 @@ class GoogleDriveManager:
         self,
         folder_id: Optional[str] = None,
         query: Optional[str] = None,
-        page_size: int = 100,
+        page_size: int = 1000,
         order_by: Optional[str] = None
     ) -> Generator[Dict[str, Any], None, None]:
         """
@@ -153,7 +208,8 @@ class GoogleDriveManager:
         Args:
             folder_id: Folder ID to list (defaults to self.default_folder_id)
             query: Additional query filters (optional)
-            page_size: Number of files per page (max 1000)
+            page_size: Number of files per page (max and default 1000; pages are
+                fetched serially, so larger pages mean fewer round trips)
             order_by: Sort order (e.g., 'name', 'createdTime', 'modifiedTime')
 
         Yields:
@@ -307,6 +363,41 @@ class GoogleDriveManager:
         except Exception as e:
             raise DriveManagerError(f"Unexpected error downloading file: {e}")
 
+    def download_file_cached(
+        self,
+        file_id: str,
+        output_path: str,
+        cache: DriveBlobCache,
+        show_progress: bool = False
+    ) -> bool:
+        """
+        Download a file through a local blob cache.
+
+        One metadata call checks the file's md5Checksum/version; unchanged
+        files are served from the cache without downloading.
+
+        Args:
+            file_id: Google Drive file ID
+            output_path: Local path to save file
+            cache: Blob cache to use
+            show_progress: Whether to log download progress on a miss
+
+        Returns:
+            True if served from the cache, False if downloaded
+
+        Raises:
+            DriveManagerError: If the metadata call or download fails
+        """
+        metadata = self.get_file_metadata(file_id, fields=CACHE_FIELDS)
+
+        def download(fid: str, path: Path) -> None:
+            self.download_file(file_id=fid, output_path=str(path), show_progress=show_progress)
+
+        try:
+            return cache.fetch(file_id, output_path, metadata, download)
+        except (OSError, DriveCacheError) as e:
+            raise DriveManagerError(f"Cached download of {file_id} failed: {e}")
+
     def upload_file(
         self,
         file_path: str,
@@ -452,3 +543,23 @@ class GoogleDriveManager:
 
         except HttpError as e:
             raise DriveManagerError(f"Failed to delete file {file_id}: {e}")
+
+
+def direct_api_manager() -> Optional[GoogleDriveManager]:
+    """
+    Create a manager for direct API use if that needs no user interaction.
+
+    Returns:
+        GoogleDriveManager, or None in MCP mode, without a saved token
+        (authenticating would start an OAuth flow), or if authentication fails
+    """
+    if USE_MCP:
+        return None
+    if not Path(os.getenv('TOKEN_FILE', 'token.json')).exists():
+        return None
+
+    try:
+        return GoogleDriveManager()
+    except DriveManagerError as e:
+        logger.warning(f"Drive API unavailable: {e}")
+        return None
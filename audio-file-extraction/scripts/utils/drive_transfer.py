@@ -0,0 +1,743 @@
+"""
+Drive Transfer Module
+
+Concurrent, resumable bulk downloads and uploads against the Drive v3 REST
+API.
+
+GoogleDriveManager transfers one file at a time through the API client,
+whose HTTP transport is not thread-safe. DriveTransfer instead shares one
+pooled HTTP session (requests + urllib3, authorized with the manager's
+credentials) across many transfers:
+
+- download_many / upload_many are coroutines; each transfer runs in a worker
+  thread and a semaphore bounds how many are in flight.
+- Downloads fetch byte ranges into a ".part" file, so an interrupted
+  transfer (or a later run) continues where it stopped.
+- download_to / upload_stream transfer to and from open file objects (e.g.
+  a SpooledTemporaryFile), so content can pass through memory without
+  touching the disk.
+- Uploads use Drive resumable upload sessions; after an error the session
+  is queried for the committed offset and only the rest is re-sent. With an
+  UploadSessionStore, upload_many records each session URI as soon as it is
+  opened, so a batch that crashed can continue mid-file on the next run.
+- Connection errors, timeouts, 429 and 5xx responses are retried with
+  exponential backoff and jitter.
+
+The API root is configurable so tests can run against a local fake server.
+"""
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+PathLike = Union[str, Path]
+
+# Drive REST API root
+DRIVE_API_URL = 'https://www.googleapis.com'
+
+# Transfer chunk size; resumable upload chunks must be multiples of 256 KiB
+CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_CHUNK_MULTIPLE = 256 * 1024
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 32.0
+
+# Responses worth retrying
+RETRY_STATUSES = (408, 429, 500, 502, 503, 504)
+
+# Returned by Drive for an incomplete resumable upload
+RESUME_INCOMPLETE = 308
+
+# Suffix for partially downloaded files
+PART_SUFFIX = '.part'
+
+try:
+    from google.auth.transport.requests import AuthorizedSession
+    GOOGLE_AUTH_AVAILABLE = True
+except ImportError:
+    GOOGLE_AUTH_AVAILABLE = False
+
+
+class DriveTransferError(Exception):
+    """Exception raised when a transfer fails permanently."""
+    pass
+
+
+class _RetryableError(Exception):
+    """Transient failure; the transfer may continue after a backoff."""
+    pass
+
+
+class _SessionExpired(_RetryableError):
+    """Resumable upload session is gone; the upload restarts from byte 0."""
+    pass
+
+
+@dataclass
+class TransferResult:
+    """Outcome of one download or upload."""
+    path: Path
+    file_id: Optional[str] = None
+    bytes_transferred: int = 0
+    seconds: float = 0.0
+    attempts: int = 1
+    error: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+    resumed_from: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second actually transferred (excluding resumed bytes)."""
+        return self.bytes_transferred / self.seconds if self.seconds > 0 else 0.0
+
+
+def _total_from_content_range(header: Optional[str]) -> Optional[int]:
+    """Parse the total size from a "bytes a-b/total" Content-Range header."""
+    if not header or '/' not in header:
+        return None
+    total = header.rsplit('/', 1)[1]
+    return int(total) if total.isdigit() else None
+
+
+def _committed_from_range(header: Optional[str]) -> int:
+    """Parse the upload offset from a "bytes=0-N" Range header (none means 0)."""
+    if not header or '-' not in header:
+        return 0
+    return int(header.rsplit('-', 1)[1]) + 1
+
+
+class DriveTransfer:
+    """Concurrent resumable Drive transfers over one pooled HTTP session."""
+
+    def __init__(
+        self,
+        credentials=None,
+        session: Optional[requests.Session] = None,
+        base_url: str = DRIVE_API_URL,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        chunk_size: int = CHUNK_SIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+        timeout: float = 60.0
+    ):
+        """
+        Initialize transfer client.
+
+        Args:
+            credentials: google.auth credentials used to authorize requests
+                (ignored if session is given)
+            session: HTTP session to use (defaults to an authorized session
+                for credentials, or an anonymous one)
+            base_url: API root (override for testing)
+            concurrency: Maximum transfers in flight
+            chunk_size: Bytes per range request / upload chunk (rounded to
+                256 KiB for uploads)
+            max_retries: Retries per transfer after transient errors
+            backoff_seconds: Initial backoff, doubled on each retry
+            timeout: Per-request timeout in seconds
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        if session is None:
+            if credentials is not None:
+                if not GOOGLE_AUTH_AVAILABLE:
+                    raise DriveTransferError("google-auth is required for authorized transfers")
+                session = AuthorizedSession(credentials)
+            else:
+                session = requests.Session()
+
+        # One connection per concurrent transfer, reused across files
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        self.session = session
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.upload_chunk_size = max(
+            UPLOAD_CHUNK_MULTIPLE, chunk_size // UPLOAD_CHUNK_MULTIPLE * UPLOAD_CHUNK_MULTIPLE
+        )
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.timeout = timeout
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> 'DriveTransfer':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send one request, classifying transient failures.
+
+        Raises:
+            _RetryableError: On connection errors, timeouts and retryable statuses
+        """
+        try:
+            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+            raise _RetryableError(str(e))
+
+        if response.status_code in RETRY_STATUSES:
+            raise _RetryableError(f"HTTP {response.status_code}")
+        return response
+
+    def _with_retries(self, description: str, attempt_fn, state: Dict[str, Any]) -> Any:
+        """
+        Run attempt_fn until it succeeds, retrying transient errors with backoff.
+
+        attempt_fn must itself resume from whatever progress was made.
+
+        Args:
+            description: Transfer description for log messages
+            attempt_fn: Callable performing one attempt
+            state: Transfer state; state['attempts'] is updated
+
+        Returns:
+            Result of the successful attempt
+
+        Raises:
+            DriveTransferError: On a permanent error or when retries are exhausted
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            state['attempts'] = attempt
+            try:
+                return attempt_fn()
+            except _RetryableError as e:
+                if attempt > self.max_retries:
+                    raise DriveTransferError(f"{description} failed after {attempt} attempts: {e}")
+
+                delay = min(MAX_BACKOFF_SECONDS, self.backoff_seconds * 2 ** (attempt - 1))
+                delay *= random.uniform(0.5, 1.0)
+                logger.warning(f"{description}: {e}; retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    # Downloads
+
+    def _download_into(self, file_id: str, sink: BinaryIO) -> int:
+        """
+        One download attempt: fetch byte ranges from sink's current size on.
+
+        Args:
+            file_id: Drive file ID
+            sink: Binary file object positioned at the end of the bytes
+                received so far
+
+        Returns:
+            Total file size
+
+        Raises:
+            _RetryableError: On a transient failure (sink keeps its progress)
+            DriveTransferError: On a permanent failure
+        """
+        url = f"{self.base_url}/drive/v3/files/{file_id}"
+        offset = sink.tell()
+        total = None
+
+        while total is None or offset < total:
+            end = offset + self.chunk_size - 1
+            response = self._request(
+                'GET', url, params={'alt': 'media'},
+                headers={'Range': f"bytes={offset}-{end}"}
+            )
+
+            if response.status_code == 416:
+                # Range starts at the end: what we have is already complete
+                total = _total_from_content_range(response.headers.get('Content-Range'))
+                if total is not None and total == offset:
+                    break
+                raise DriveTransferError(f"Range not satisfiable for {file_id} at {offset}")
+
+            if response.status_code == 200:
+                # Server ignored the range and sent the whole file
+                sink.seek(0)
+                sink.truncate()
+                sink.write(response.content)
+                offset = total = len(response.content)
+                break
+
+            if response.status_code != 206:
+                raise DriveTransferError(
+                    f"Download of {file_id} failed: HTTP {response.status_code} {response.text[:200]}"
+                )
+
+            total = _total_from_content_range(response.headers.get('Content-Range'))
+            sink.write(response.content)
+            offset += len(response.content)
+
+            if total is None:
+                raise DriveTransferError(f"Missing Content-Range in response for {file_id}")
+            if not response.content and offset < total:
+                raise _RetryableError("empty range response")
+
+        sink.flush()
+        return total
+
+    def download_file(self, file_id: str, output_path: PathLike) -> TransferResult:
+        """
+        Download a file, resuming any ".part" file left by an earlier attempt.
+
+        Args:
+            file_id: Drive file ID
+            output_path: Local destination
+
+        Returns:
+            TransferResult (error is set instead of raising)
+        """
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        part_path = output_path.with_name(output_path.name + PART_SUFFIX)
+
+        started = time.monotonic()
+        state = {'attempts': 0}
+        error = None
+
+        # Append mode starts at the end of an existing part file
+        with open(part_path, 'ab') as part:
+            initial = part.tell()
+            if initial:
+                logger.info(f"Resuming {output_path.name} from byte {initial}")
+
+            try:
+                total = self._with_retries(
+                    f"Download {file_id}", lambda: self._download_into(file_id, part), state
+                )
+            except DriveTransferError as e:
+                error = str(e)
+                received = part.tell()
+
+        if error is not None:
+            # A non-empty part file is kept so the next attempt resumes from it
+            if received == 0:
+                part_path.unlink(missing_ok=True)
+            return TransferResult(
+                path=output_path, file_id=file_id, bytes_transferred=received - initial,
+                seconds=time.monotonic() - started, attempts=state['attempts'], error=error,
+                resumed_from=initial
+            )
+
+        part_path.replace(output_path)
+        return TransferResult(
+            path=output_path, file_id=file_id, bytes_transferred=total - initial,
+            seconds=time.monotonic() - started, attempts=state['attempts'], resumed_from=initial
+        )
+
+    def download_to(self, file_id: str, fileobj: BinaryIO, name: Optional[str] = None) -> TransferResult:
+        """
+        Download a file into an open binary file object.
+
+        Retries continue from the bytes already written, so fileobj must be
+        seekable (a SpooledTemporaryFile keeps small files in memory).
+
+        Args:
+            file_id: Drive file ID
+            fileobj: Writable, seekable binary file object (written from its
+                current end)
+            name: Name used in the result and log messages (defaults to file_id)
+
+        Returns:
+            TransferResult (error is set instead of raising)
+        """
+        started = time.monotonic()
+        state = {'attempts': 0}
+        fileobj.seek(0, 2)
+        initial = fileobj.tell()
+        path = Path(name or file_id)
+
+        try:
+            total = self._with_retries(
+                f"Download {file_id}", lambda: self._download_into(file_id, fileobj), state
+            )
+        except DriveTransferError as e:
+            return TransferResult(
+                path=path, file_id=file_id, bytes_transferred=fileobj.tell() - initial,
+                seconds=time.monotonic() - started, attempts=state['attempts'], error=str(e)
+            )
+
+        return TransferResult(
+            path=path, file_id=file_id, bytes_transferred=total - initial,
+            seconds=time.monotonic() - started, attempts=state['attempts']
+        )
+
+    # Uploads
+
+    def _start_upload_session(
+        self,
+        name: str,
+        size: int,
+        mime_type: str,
+        file_id: Optional[str],
+        folder_id: Optional[str]
+    ) -> str:
+        """Open a resumable upload session and return its URI."""
+        headers = {
+            'X-Upload-Content-Type': mime_type,
+            'X-Upload-Content-Length': str(size),
+        }
+        params = {'uploadType': 'resumable', 'fields': 'id, name, mimeType, size, version, modifiedTime, webViewLink'}
+
+        if file_id:
+            # Update in place so Drive keeps the file ID and version history
+            response = self._request(
+                'PATCH', f"{self.base_url}/upload/drive/v3/files/{file_id}",
+                params=params, headers=headers, json={}
+            )
+        else:
+            body = {'name': name}
+            if folder_id:
+                body['parents'] = [folder_id]
+            response = self._request(
+                'POST', f"{self.base_url}/upload/drive/v3/files",
+                params=params, headers=headers, json=body
+            )
+
+        if response.status_code != 200 or 'Location' not in response.headers:
+            raise DriveTransferError(
+                f"Could not start upload of {name}: HTTP {response.status_code} {response.text[:200]}"
+            )
+        return response.headers['Location']
+
+    def _query_upload(self, session_uri: str, size: int) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
+        """
+        Ask an upload session how many bytes it has committed.
+
+        Returns:
+            Tuple of (committed byte count, None) while incomplete, or
+            (None, file metadata) if the upload already completed
+
+        Raises:
+            _SessionExpired: If the session no longer exists
+        """
+        response = self._request('PUT', session_uri, headers={'Content-Range': f"bytes */{size}"})
+        if response.status_code in (200, 201):
+            return None, response.json()
+        if response.status_code == RESUME_INCOMPLETE:
+            return _committed_from_range(response.headers.get('Range')), None
+        if response.status_code in (404, 410):
+            raise _SessionExpired(f"HTTP {response.status_code}")
+        raise DriveTransferError(f"Upload status query failed: HTTP {response.status_code}")
+
+    def upload_file(
+        self,
+        file_path: PathLike,
+        file_id: Optional[str] = None,
+        folder_id: Optional[str] = None,
+        mime_type: str = 'audio/mpeg',
+        session_uri: Optional[str] = None,
+        on_session: Optional[Callable[[str], None]] = None
+    ) -> TransferResult:
+        """
+        Upload a file through a resumable session.
+
+        Args:
+            file_path: Local file
+            file_id: Existing Drive file to update (creates a new file if None)
+            folder_id: Parent folder for new files
+            mime_type: MIME type of the content
+            session_uri: Existing session to resume (e.g. from a previous run)
+            on_session: Called with the URI of each new session as soon as it
+                is opened (e.g. to persist it)
+
+        Returns:
+            TransferResult with the Drive file metadata (error is set instead
+            of raising); the session URI is kept in metadata['session_uri']
+            while the upload is incomplete
+        """
+        file_path = Path(file_path)
+        try:
+            f = open(file_path, 'rb')
+        except OSError as e:
+            return TransferResult(path=file_path, file_id=file_id, attempts=0, error=str(e))
+
+        with f:
+            result = self.upload_stream(
+                f, os.fstat(f.fileno()).st_size, file_path.name,
+                file_id=file_id, folder_id=folder_id, mime_type=mime_type,
+                session_uri=session_uri, on_session=on_session
+            )
+        result.path = file_path
+        return result
+
+    def upload_stream(
+        self,
+        fileobj: BinaryIO,
+        size: int,
+        name: str,
+        file_id: Optional[str] = None,
+        folder_id: Optional[str] = None,
+        mime_type: str = 'audio/mpeg',
+        session_uri: Optional[str] = None,
+        on_session: Optional[Callable[[str], None]] = None
+    ) -> TransferResult:
+        """
+        Upload the content of a seekable binary file object through a resumable session.
+
+        Args:
+            fileobj: Readable, seekable binary file object holding size bytes
+                from offset 0
+            size: Content length in bytes
+            name: File name for new files and log messages
+            file_id: Existing Drive file to update (creates a new file if None)
+            folder_id: Parent folder for new files
+            mime_type: MIME type of the content
+            session_uri: Existing session to resume
+            on_session: Called with the URI of each new session
+
+        Returns:
+            TransferResult as for upload_file
+        """
+        started = time.monotonic()
+        state = {'uri': session_uri, 'sent': 0, 'attempts': 0, 'resumed_from': 0}
+
+        def attempt() -> Dict[str, Any]:
+            try:
+                return send(state['uri'])
+            except _SessionExpired:
+                logger.warning(f"Upload session for {name} expired; starting a new one")
+                state['uri'] = None
+                raise
+
+        def send(session: Optional[str]) -> Dict[str, Any]:
+            if session is None:
+                session = state['uri'] = self._start_upload_session(
+                    name, size, mime_type, file_id, folder_id
+                )
+                if on_session:
+                    on_session(session)
+                offset = 0
+            else:
+                offset, metadata = self._query_upload(session, size)
+                if metadata is not None:
+                    # Finished before the final response was lost
+                    return metadata
+                if state['attempts'] == 1:
+                    state['resumed_from'] = offset
+
+            while True:
+                fileobj.seek(offset)
+                chunk = fileobj.read(min(self.upload_chunk_size, size - offset))
+                end = offset + len(chunk) - 1
+                content_range = f"bytes {offset}-{end}/{size}" if chunk else f"bytes */{size}"
+
+                response = self._request(
+                    'PUT', session, data=chunk,
+                    headers={'Content-Range': content_range}
+                )
+
+                if response.status_code in (200, 201):
+                    state['sent'] += len(chunk)
+                    return response.json()
+                if response.status_code in (404, 410):
+                    raise _SessionExpired(f"HTTP {response.status_code}")
+                if response.status_code != RESUME_INCOMPLETE:
+                    raise DriveTransferError(
+                        f"Upload of {name} failed: HTTP {response.status_code} "
+                        f"{response.text[:200]}"
+                    )
+
+                # The server may commit less than it was sent
+                committed = _committed_from_range(response.headers.get('Range'))
+                state['sent'] += committed - offset
+                offset = committed
+
+        path = Path(name)
+        try:
+            metadata = self._with_retries(f"Upload {name}", attempt, state)
+        except DriveTransferError as e:
+            return TransferResult(
+                path=path, file_id=file_id, bytes_transferred=state['sent'],
+                seconds=time.monotonic() - started, attempts=state['attempts'], error=str(e),
+                metadata={'session_uri': state['uri']} if state['uri'] else None,
+                resumed_from=state['resumed_from']
+            )
+
+        return TransferResult(
+            path=path, file_id=metadata.get('id', file_id), bytes_transferred=state['sent'],
+            seconds=time.monotonic() - started, attempts=state['attempts'], metadata=metadata,
+            resumed_from=state['resumed_from']
+        )
+
+    # Async batch API
+
+    async def _run_bounded(self, semaphore: asyncio.Semaphore, func, *args, **kwargs) -> TransferResult:
+        async with semaphore:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def download_many(self, items: Iterable[Tuple[str, PathLike]]) -> List[TransferResult]:
+        """
+        Download files concurrently.
+
+        Args:
+            items: (file_id, output_path) pairs
+
+        Returns:
+            TransferResults in input order
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        return list(await asyncio.gather(*(
+            self._run_bounded(semaphore, self.download_file, file_id, path)
+            for file_id, path in items
+        )))
+
+    def _upload_tracked(self, sessions: 'UploadSessionStore', **item) -> TransferResult:
+        """Upload one file, resuming and recording its session in a session store."""
+        file_path = Path(item['file_path'])
+        key = item.get('file_id') or str(file_path.resolve())
+
+        if item.get('session_uri') is None:
+            item['session_uri'] = sessions.get(key, file_path)
+            if item['session_uri']:
+                logger.info(f"Resuming upload session for {file_path.name}")
+
+        result = self.upload_file(on_session=lambda uri: sessions.save(key, file_path, uri), **item)
+        if result.ok:
+            sessions.discard(key)
+        return result
+
+    async def upload_many(
+        self,
+        items: Iterable[Dict[str, Any]],
+        sessions: Optional['UploadSessionStore'] = None
+    ) -> List[TransferResult]:
+        """
+        Upload files concurrently.
+
+        Args:
+            items: Keyword arguments for upload_file (file_path, and
+                optionally file_id, folder_id, mime_type, session_uri)
+            sessions: Store to resume sessions from and record new ones in
+                (completed uploads are removed from it)
+
+        Returns:
+            TransferResults in input order
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        if sessions is None:
+            return list(await asyncio.gather(*(
+                self._run_bounded(semaphore, self.upload_file, **item)
+                for item in items
+            )))
+        return list(await asyncio.gather(*(
+            self._run_bounded(semaphore, self._upload_tracked, sessions, **item)
+            for item in items
+        )))
+
+
+class UploadSessionStore:
+    """
+    JSON file of open resumable upload sessions, keyed by Drive file ID.
+
+    Each entry records the local file's size and mtime; a session is only
+    offered for resumption while the file is unchanged. Sessions Drive has
+    expired are restarted by the upload itself.
+    """
+
+    def __init__(self, path: PathLike):
+        """
+        Initialize session store.
+
+        Args:
+            path: JSON file (created on first save)
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            with open(self.path) as f:
+                self._sessions = json.load(f)
+        except FileNotFoundError:
+            self._sessions = {}
+        except json.JSONDecodeError:
+            logger.warning(f"Ignoring unreadable upload session file {self.path}")
+            self._sessions = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, key: str, file_path: PathLike) -> Optional[str]:
+        """Session URI for key, or None if absent or the file has changed since."""
+        entry = self._sessions.get(key)
+        if entry is None:
+            return None
+
+        try:
+            stat = Path(file_path).stat()
+        except FileNotFoundError:
+            return None
+        if (entry.get('size'), entry.get('mtime_ns')) != (stat.st_size, stat.st_mtime_ns):
+            logger.info(f"{Path(file_path).name} changed since its upload started; not resuming")
+            return None
+        return entry['session_uri']
+
+    def save(self, key: str, file_path: PathLike, session_uri: str) -> None:
+        """Record a newly opened session."""
+        stat = Path(file_path).stat()
+        with self._lock:
+            self._sessions[key] = {
+                'session_uri': session_uri,
+                'path': str(file_path),
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+            }
+            self._write()
+
+    def discard(self, key: str) -> None:
+        """Forget a session (e.g. after its upload completed)."""
+        with self._lock:
+            if self._sessions.pop(key, None) is not None:
+                self._write()
+
+    def _write(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(self._sessions, f, indent=2)
+        os.replace(temp_path, self.path)
+
+
+def summarize(results: List[TransferResult], wall_seconds: float) -> str:
+    """
+    Summarize a batch of transfers.
+
+    Args:
+        results: Transfer results
+        wall_seconds: Elapsed time for the whole batch
+
+    Returns:
+        One-line summary with counts and aggregate throughput
+    """
+    done = sum(1 for r in results if r.ok)
+    total_bytes = sum(r.bytes_transferred for r in results)
+    retries = sum(r.attempts - 1 for r in results)
+    rate = total_bytes / wall_seconds / 1024 / 1024 if wall_seconds > 0 else 0.0
+    return (
+        f"{done}/{len(results)} transferred, {total_bytes / 1024 / 1024:.1f} MiB "
+        f"in {wall_seconds:.1f}s ({rate:.1f} MiB/s), {retries} retries"
+    )
@@ -5,13 +5,20 @@ Parses and validates TOEFL audio filenames according to naming conventions.
 Supports patterns like:
 - TOEFL-Speaking-Conversation-Q1-v1-conversation.mp3
 - TOEFL-Speaking-Listen-and-Choose-Q1-v1.mp3
+
+Also names the statements split from local module recordings such as
+"02.03.02, Listen and Choose, Module 2 (no pauses).mp3".
 """
 
+import os
 import re
 from dataclasses import dataclass
 from typing import Optional, Tuple
 from pathlib import Path
 
+# Suffix of unsplit Listen and Choose module recordings
+NO_PAUSES_SUFFIX = ' (no pauses)'
+
 
 @dataclass
 class TOEFLFileInfo:
@@ -186,3 +193,28 @@ class TOEFLFileParser:
                     groups[base] = []
                 groups[base].append(filename)
         return groups
+
+
+def statement_base(input_file: str) -> str:
+    """
+    Name prefix shared by a module recording's statements.
+
+    "02.03.02, Listen and Choose, Module 2 (no pauses).mp3" becomes
+    "02.03.02, Listen and Choose, Module 2".
+    """
+    return Path(input_file).name.replace(f'{NO_PAUSES_SUFFIX}.mp3', '').replace('.mp3', '')
+
+
+def statement_output_dir(input_file: str, statements_dir: str) -> str:
+    """
+    Default output directory for a module recording's statements.
+
+    Args:
+        input_file: Module recording
+        statements_dir: Subdirectory of output/ (e.g. 'statements')
+
+    Returns:
+        output/<statements_dir>/<module name>
+    """
+    base_name = Path(input_file).stem.replace(NO_PAUSES_SUFFIX, '')
+    return os.path.join('output', statements_dir, base_name)
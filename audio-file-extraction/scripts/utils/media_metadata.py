@@ -0,0 +1,343 @@
+"""
+Media Metadata Module
+
+Shared ffprobe-backed metadata service with a persistent on-disk cache.
+
+Results are keyed by (path, size, mtime), so files that have not changed
+since they were last probed are answered from the cache without spawning
+ffprobe. Uncached files in a batch are probed concurrently.
+
+Saving drops entries for files that have since been deleted or modified,
+so probes of short-lived paths (stage directories, temp files) do not
+accumulate in the cache.
+"""
+
+import atexit
+import json
+import os
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+PathLike = Union[str, Path]
+
+# Project root (scripts/utils/ -> project), so every script shares one cache
+# regardless of the directory it is run from
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Default cache location (overridable via MEDIA_CACHE_FILE env var)
+DEFAULT_CACHE_FILE = PROJECT_ROOT / 'data' / 'cache' / 'media_metadata.json'
+
+# Bump when the stored MediaInfo layout changes to invalidate old caches
+CACHE_VERSION = 1
+
+
+class MediaProbeError(Exception):
+    """Exception raised when a media file cannot be probed."""
+    pass
+
+
+@dataclass
+class MediaInfo:
+    """Metadata for a single audio file."""
+
+    duration: float
+    format_name: str = ''
+    bit_rate: int = 0
+    codec_name: str = ''
+    sample_rate: int = 0
+    channels: int = 0
+
+
+class MediaMetadataService:
+    """Probes audio files with ffprobe and caches the results on disk."""
+
+    def __init__(
+        self,
+        cache_file: Optional[PathLike] = None,
+        max_workers: int = 8,
+        timeout: float = 10
+    ):
+        """
+        Initialize metadata service.
+
+        Args:
+            cache_file: Path to JSON cache file (defaults to MEDIA_CACHE_FILE env var)
+            max_workers: Maximum concurrent ffprobe processes for batch probes
+            timeout: Timeout in seconds for a single ffprobe call
+        """
+        self.cache_file = Path(
+            cache_file or os.getenv('MEDIA_CACHE_FILE', DEFAULT_CACHE_FILE)
+        )
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = self._load()
+        self._dirty = False
+
+        # Single-file probes are flushed at exit rather than one write per file
+        atexit.register(self.save)
+
+    def _load(self) -> Dict[str, dict]:
+        """Load cache entries from disk, ignoring missing or stale caches."""
+        if not self.cache_file.exists():
+            return {}
+
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable metadata cache {self.cache_file}: {e}")
+            return {}
+
+        if data.get('version') != CACHE_VERSION:
+            return {}
+
+        return data.get('entries', {})
+
+    def save(self) -> None:
+        """Write cache entries to disk if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+
+            # Merge with entries written by other processes since we loaded
+            entries = self._load()
+            entries.update(self._entries)
+            entries = self._current_entries(entries)
+
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.cache_file.with_name(
+                f"{self.cache_file.name}.{os.getpid()}.tmp"
+            )
+
+            with open(temp_file, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'entries': entries}, f)
+
+            os.replace(temp_file, self.cache_file)
+            self._entries = entries
+            self._dirty = False
+
+    @staticmethod
+    def _current_entries(entries: Dict[str, dict]) -> Dict[str, dict]:
+        """Keep only entries whose file still exists with the probed size and mtime."""
+        current = {}
+        for key, entry in entries.items():
+            try:
+                stat = os.stat(key)
+            except OSError:
+                continue
+            if entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                current[key] = entry
+
+        if len(current) < len(entries):
+            logger.debug(f"Dropping {len(entries) - len(current)} stale metadata cache entries")
+
+        return current
+
+    @staticmethod
+    def _cache_key(path: PathLike) -> str:
+        """Normalize a path into a cache key."""
+        return str(Path(path).resolve())
+
+    def _lookup(self, key: str, stat: os.stat_result) -> Optional[MediaInfo]:
+        """Return cached info if the file has not changed since it was probed."""
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is None:
+            return None
+
+        if entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns:
+            return None
+
+        return MediaInfo(**entry['info'])
+
+    def _store(self, key: str, stat: os.stat_result, info: MediaInfo) -> None:
+        """Record probe result for a file."""
+        with self._lock:
+            self._entries[key] = {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'info': asdict(info)
+            }
+            self._dirty = True
+
+    def _run_ffprobe(self, path: PathLike) -> MediaInfo:
+        """
+        Probe a single file with ffprobe.
+
+        Raises:
+            MediaProbeError: If ffprobe fails or returns no duration
+        """
+        try:
+            result = subprocess.run(
+                [
+                    'ffprobe',
+                    '-v', 'error',
+                    '-select_streams', 'a:0',
+                    '-show_entries',
+                    'format=duration,format_name,bit_rate:stream=codec_name,sample_rate,channels',
+                    '-of', 'json',
+                    str(path)
+                ],
+                capture_output=True,
+                text=True,
+                timeout=self.timeout
+            )
+        except subprocess.TimeoutExpired:
+            raise MediaProbeError(f"Timeout probing {path}")
+        except FileNotFoundError:
+            raise MediaProbeError("ffprobe not found. Please install ffmpeg.")
+
+        if result.returncode != 0:
+            raise MediaProbeError(f"ffprobe error: {result.stderr.strip()}")
+
+        try:
+            data = json.loads(result.stdout or '{}')
+            fmt = data.get('format', {})
+            streams = data.get('streams') or [{}]
+            stream = streams[0]
+
+            if 'duration' not in fmt:
+                raise MediaProbeError("File does not contain valid audio stream")
+
+            return MediaInfo(
+                duration=float(fmt['duration']),
+                format_name=fmt.get('format_name', ''),
+                bit_rate=int(fmt.get('bit_rate', 0)),
+                codec_name=stream.get('codec_name', ''),
+                sample_rate=int(stream.get('sample_rate', 0)),
+                channels=int(stream.get('channels', 0))
+            )
+
+        except (ValueError, TypeError) as e:
+            raise MediaProbeError(f"Invalid ffprobe output for {path}: {e}")
+
+    def probe(self, path: PathLike) -> MediaInfo:
+        """
+        Get metadata for a single file, using the cache when possible.
+
+        Args:
+            path: Path to audio file
+
+        Returns:
+            MediaInfo for the file
+
+        Raises:
+            MediaProbeError: If the file is missing or cannot be probed
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            raise MediaProbeError(f"Audio file not found: {path}")
+
+        key = self._cache_key(path)
+        info = self._lookup(key, stat)
+
+        if info is None:
+            info = self._run_ffprobe(path)
+            self._store(key, stat, info)
+
+        return info
+
+    def probe_many(self, paths: Iterable[PathLike]) -> Dict[str, Optional[MediaInfo]]:
+        """
+        Get metadata for many files in one call.
+
+        Cached files are answered immediately; the rest are probed
+        concurrently and the cache is written once at the end.
+
+        Args:
+            paths: Paths to audio files
+
+        Returns:
+            Dictionary mapping each path (as given, stringified) to its
+            MediaInfo, or None if it could not be probed
+        """
+        results: Dict[str, Optional[MediaInfo]] = {}
+        pending = []
+
+        for path in paths:
+            name = str(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                logger.debug(f"Cannot probe missing file: {path}")
+                results[name] = None
+                continue
+
+            key = self._cache_key(path)
+            info = self._lookup(key, stat)
+
+            if info is not None:
+                results[name] = info
+            else:
+                pending.append((name, key, stat))
+
+        if pending:
+            logger.debug(f"Probing {len(pending)} uncached files ({len(results)} cached)")
+
+            def probe_pending(item):
+                name, key, stat = item
+                try:
+                    info = self._run_ffprobe(name)
+                except MediaProbeError as e:
+                    logger.debug(f"Probe failed for {name}: {e}")
+                    return name, None
+
+                self._store(key, stat, info)
+                return name, info
+
+            workers = max(1, min(self.max_workers, len(pending)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for name, info in executor.map(probe_pending, pending):
+                    results[name] = info
+
+            self.save()
+
+        return results
+
+    def get_duration(self, path: PathLike, default: float = 0.0) -> float:
+        """
+        Get duration of an audio file in seconds.
+
+        Args:
+            path: Path to audio file
+            default: Value returned if the file cannot be probed
+
+        Returns:
+            Duration in seconds, or default on failure
+        """
+        try:
+            return self.probe(path).duration
+        except MediaProbeError as e:
+            logger.debug(f"Duration unavailable for {path}: {e}")
+            return default
+
+
+_default_service: Optional[MediaMetadataService] = None
+_default_service_lock = threading.Lock()
+
+
+def get_metadata_service() -> MediaMetadataService:
+    """
+    Get the shared metadata service with default configuration.
+
+    Returns:
+        Process-wide MediaMetadataService instance
+    """
+    global _default_service
+
+    with _default_service_lock:
+        if _default_service is None:
+            _default_service = MediaMetadataService()
+
+    return _default_service
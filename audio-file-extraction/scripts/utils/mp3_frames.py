@@ -0,0 +1,331 @@
+"""
+MP3 Frames Module
+
+Pure-Python MPEG audio frame indexer for cutting MP3 files without decoding.
+
+An index maps every audio frame to its byte offset and start time. Cuts are
+snapped to the nearest frame boundary and performed by slicing bytes, so
+segment boundaries and durations are known exactly before anything is
+written and no ffmpeg/ffprobe process is needed.
+
+The leading ID3v2 tag and the Xing/Info/VBRI header frame are excluded from
+the index; trailing ID3v1/APE tags stop the scan.
+"""
+
+import mmap
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple, Union
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+PathLike = Union[str, Path]
+
+# MPEG version bits -> version id (None = reserved)
+_VERSIONS = {0b00: '2.5', 0b01: None, 0b10: '2', 0b11: '1'}
+
+# Layer bits -> layer number (0 = reserved)
+_LAYERS = {0b00: 0, 0b01: 3, 0b10: 2, 0b11: 1}
+
+# Sample rates by version
+_SAMPLE_RATES = {
+    '1': (44100, 48000, 32000),
+    '2': (22050, 24000, 16000),
+    '2.5': (11025, 12000, 8000),
+}
+
+# Bitrates in kbps by (version family, layer); index 0 = free, 15 = bad
+_BITRATES = {
+    ('1', 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    ('1', 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    ('1', 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    ('2', 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    ('2', 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    ('2', 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+
+class Mp3FrameError(Exception):
+    """Exception raised when an MP3 stream cannot be indexed or cut."""
+    pass
+
+
+@dataclass(frozen=True)
+class FrameHeader:
+    """Decoded MPEG audio frame header."""
+
+    version: str
+    layer: int
+    bitrate: int
+    sample_rate: int
+    padding: int
+    channel_mode: int
+
+    @property
+    def samples_per_frame(self) -> int:
+        """Number of PCM samples per channel in this frame."""
+        if self.layer == 1:
+            return 384
+        if self.layer == 3 and self.version != '1':
+            return 576
+        return 1152
+
+    @property
+    def frame_length(self) -> int:
+        """Frame length in bytes including the 4 byte header."""
+        if self.layer == 1:
+            return (12 * self.bitrate // self.sample_rate + self.padding) * 4
+
+        coefficient = self.samples_per_frame // 8
+        return coefficient * self.bitrate // self.sample_rate + self.padding
+
+    @property
+    def side_info_length(self) -> int:
+        """Length of layer III side information following the header."""
+        mono = self.channel_mode == 0b11
+        if self.version == '1':
+            return 17 if mono else 32
+        return 9 if mono else 17
+
+
+def parse_frame_header(data, offset: int) -> Optional[FrameHeader]:
+    """
+    Decode the frame header at offset.
+
+    Args:
+        data: Buffer containing MP3 data
+        offset: Byte offset of candidate header
+
+    Returns:
+        FrameHeader, or None if the bytes are not a valid header
+    """
+    if offset + 4 > len(data):
+        return None
+
+    b0, b1, b2, b3 = data[offset], data[offset + 1], data[offset + 2], data[offset + 3]
+
+    # 11 bit frame sync
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version = _VERSIONS[(b1 >> 3) & 0b11]
+    layer = _LAYERS[(b1 >> 1) & 0b11]
+    bitrate_index = b2 >> 4
+    sample_rate_index = (b2 >> 2) & 0b11
+
+    if version is None or layer == 0:
+        return None
+    if bitrate_index in (0, 15) or sample_rate_index == 3:
+        # Free-format streams are not supported
+        return None
+
+    family = '1' if version == '1' else '2'
+
+    return FrameHeader(
+        version=version,
+        layer=layer,
+        bitrate=_BITRATES[(family, layer)][bitrate_index] * 1000,
+        sample_rate=_SAMPLE_RATES[version][sample_rate_index],
+        padding=(b2 >> 1) & 0b1,
+        channel_mode=b3 >> 6
+    )
+
+
+def _id3v2_length(data) -> int:
+    """Return total length of a leading ID3v2 tag, or 0 if absent."""
+    if len(data) < 10 or bytes(data[:3]) != b'ID3':
+        return 0
+
+    # Tag size is a 28 bit syncsafe integer excluding the 10 byte header
+    size = 0
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _is_info_frame(data, offset: int, header: FrameHeader) -> bool:
+    """Check whether a frame is a Xing/Info/VBRI header rather than audio."""
+    if header.layer != 3:
+        return False
+
+    xing_offset = offset + 4 + header.side_info_length
+    if bytes(data[xing_offset:xing_offset + 4]) in (b'Xing', b'Info'):
+        return True
+
+    return bytes(data[offset + 36:offset + 40]) == b'VBRI'
+
+
+class Mp3FrameIndex:
+    """Byte offset and timestamp table for the audio frames of an MP3 stream."""
+
+    def __init__(self, offsets: array, sample_counts: array, sample_rate: int, end_offset: int):
+        """
+        Initialize frame index. Use build() or from_file() instead.
+
+        Args:
+            offsets: Byte offset of each audio frame
+            sample_counts: Cumulative sample count at the start of each frame,
+                with one trailing entry for the end of the stream
+            sample_rate: Stream sample rate in Hz
+            end_offset: Byte offset just past the last audio frame
+        """
+        self.offsets = offsets
+        self.sample_counts = sample_counts
+        self.sample_rate = sample_rate
+        self.end_offset = end_offset
+
+    @classmethod
+    def build(cls, data) -> 'Mp3FrameIndex':
+        """
+        Index every audio frame in a buffer.
+
+        Args:
+            data: bytes, bytearray, memoryview or mmap of a complete MP3 file
+
+        Returns:
+            Mp3FrameIndex for the buffer
+
+        Raises:
+            Mp3FrameError: If no audio frames are found
+        """
+        offsets = array('q')
+        sample_counts = array('q', [0])
+        sample_rate = 0
+        end_offset = 0
+        skipped = 0
+
+        length = len(data)
+        offset = _id3v2_length(data)
+
+        while offset + 4 <= length:
+            header = parse_frame_header(data, offset)
+
+            if header is None or (sample_rate and header.sample_rate != sample_rate):
+                # Trailing ID3v1/APE tag ends the audio
+                if bytes(data[offset:offset + 3]) == b'TAG' or bytes(data[offset:offset + 8]) == b'APETAGEX':
+                    break
+
+                offset += 1
+                skipped += 1
+                continue
+
+            frame_end = offset + header.frame_length
+            if frame_end > length:
+                # Truncated final frame
+                break
+
+            # Confirm sync with the following header to reject false positives
+            if frame_end + 4 <= length and not offsets:
+                following = parse_frame_header(data, frame_end)
+                if following is None or following.sample_rate != header.sample_rate:
+                    offset += 1
+                    skipped += 1
+                    continue
+
+            if not offsets and not sample_rate and _is_info_frame(data, offset, header):
+                sample_rate = header.sample_rate
+                offset = frame_end
+                continue
+
+            sample_rate = header.sample_rate
+            offsets.append(offset)
+            sample_counts.append(sample_counts[-1] + header.samples_per_frame)
+            end_offset = frame_end
+            offset = frame_end
+
+        if not offsets:
+            raise Mp3FrameError("No MPEG audio frames found")
+
+        if skipped:
+            logger.debug(f"Skipped {skipped} bytes of non-frame data while indexing")
+
+        return cls(offsets, sample_counts, sample_rate, end_offset)
+
+    @classmethod
+    def from_file(cls, path: PathLike) -> 'Mp3FrameIndex':
+        """
+        Index an MP3 file on disk.
+
+        Raises:
+            Mp3FrameError: If the file is empty or contains no audio frames
+        """
+        with open(path, 'rb') as f:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    return cls.build(data)
+            except ValueError:
+                # mmap refuses empty files
+                raise Mp3FrameError(f"Empty MP3 file: {path}")
+
+    @property
+    def frame_count(self) -> int:
+        """Number of audio frames."""
+        return len(self.offsets)
+
+    @property
+    def duration(self) -> float:
+        """Total stream duration in seconds."""
+        return self.sample_counts[-1] / self.sample_rate
+
+    def frame_time(self, frame: int) -> float:
+        """Start time of a frame in seconds (frame_count gives the end time)."""
+        return self.sample_counts[frame] / self.sample_rate
+
+    def nearest_boundary(self, seconds: float) -> int:
+        """
+        Find the frame boundary closest to a time.
+
+        Args:
+            seconds: Time in seconds
+
+        Returns:
+            Frame number in the range 0..frame_count (frame_count is end of stream)
+        """
+        target = seconds * self.sample_rate
+        position = bisect_left(self.sample_counts, target)
+
+        if position == 0:
+            return 0
+        if position >= len(self.sample_counts):
+            return self.frame_count
+
+        before = self.sample_counts[position - 1]
+        after = self.sample_counts[position]
+        return position - 1 if target - before <= after - target else position
+
+    def byte_range(self, start: float, end: float) -> Tuple[int, int, float]:
+        """
+        Map a time range onto frame-aligned bytes.
+
+        Args:
+            start: Start time in seconds
+            end: End time in seconds
+
+        Returns:
+            Tuple of (start_offset, end_offset, exact duration in seconds)
+
+        Raises:
+            Mp3FrameError: If the range contains no whole frame
+        """
+        first = self.nearest_boundary(start)
+        last = self.nearest_boundary(end)
+
+        if last <= first:
+            raise Mp3FrameError(f"Range {start:.3f}-{end:.3f}s contains no audio frames")
+
+        start_offset = self.offsets[first]
+        end_offset = self.offsets[last] if last < self.frame_count else self.end_offset
+        duration = self.frame_time(last) - self.frame_time(first)
+
+        return start_offset, end_offset, duration
+
+    def slice(self, data, start: float, end: float) -> memoryview:
+        """Return the frame-aligned bytes of data between two times."""
+        start_offset, end_offset, _ = self.byte_range(start, end)
+        return memoryview(data)[start_offset:end_offset]
+
@@ -0,0 +1,389 @@
+"""
+MP3 Prefix Module
+
+Prepends narrator clips to MP3 files by copying MPEG audio frames, without
+decoding and without an ffmpeg process.
+
+Each narrator file is indexed once with Mp3FrameIndex and its audio frames
+are kept in memory. An output is written in a single pass: the
+conversation's ID3v2 tag (if any), the narrator frames, then the
+conversation's audio frames. For streaming, prefix_parts() returns those
+three pieces as memoryviews and PartsReader presents them as one seekable
+file object, so a prefixed file can be uploaded without being assembled.
+
+Frames can only be spliced between streams with the same MPEG version,
+layer, sample rate and channel layout, so these are checked before anything
+is written. A bitrate difference still decodes correctly but yields a VBR
+stream without a Xing header, whose duration players estimate from the
+first frame; it is logged, or rejected with strict_bitrate.
+prefix_or_fallback() hands such files to another concatenation method
+(e.g. the ffmpeg concat demuxer).
+"""
+
+import io
+import mmap
+import os
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .logger import get_logger
+from .mp3_frames import FrameHeader, Mp3FrameError, Mp3FrameIndex, _id3v2_length, parse_frame_header
+
+logger = get_logger(__name__)
+
+PathLike = Union[str, Path]
+
+
+class Mp3PrefixError(Exception):
+    """Exception raised when a prefix cannot be spliced onto an MP3 file."""
+    pass
+
+
+@dataclass(frozen=True)
+class StreamFormat:
+    """Stream parameters that must agree for frames to be spliced."""
+
+    version: str
+    layer: int
+    sample_rate: int
+    channels: int
+    bitrate: int
+
+    @classmethod
+    def from_header(cls, header: FrameHeader) -> 'StreamFormat':
+        """Build the format from a stream's first audio frame header."""
+        return cls(
+            version=header.version,
+            layer=header.layer,
+            sample_rate=header.sample_rate,
+            channels=1 if header.channel_mode == 0b11 else 2,
+            bitrate=header.bitrate
+        )
+
+    def mismatches(self, other: 'StreamFormat') -> List[str]:
+        """
+        List the parameters that prevent splicing two streams.
+
+        Args:
+            other: Format of the stream to splice onto this one
+
+        Returns:
+            Human-readable mismatches (empty if compatible); bitrate is not included
+        """
+        problems = []
+        if (self.version, self.layer) != (other.version, other.layer):
+            problems.append(
+                f"MPEG-{self.version} layer {self.layer} vs MPEG-{other.version} layer {other.layer}"
+            )
+        if self.sample_rate != other.sample_rate:
+            problems.append(f"{self.sample_rate} Hz vs {other.sample_rate} Hz")
+        if self.channels != other.channels:
+            problems.append(f"{self.channels} vs {other.channels} channels")
+        return problems
+
+
+def _index_buffer(data, source: PathLike):
+    """Index a buffer and read its stream format, wrapping frame errors."""
+    try:
+        index = Mp3FrameIndex.build(data)
+    except Mp3FrameError as e:
+        raise Mp3PrefixError(f"{source}: {e}")
+
+    header = parse_frame_header(data, index.offsets[0])
+    return index, StreamFormat.from_header(header)
+
+
+@dataclass(frozen=True)
+class NarratorFrames:
+    """A narrator clip's audio frames, validated and held in memory."""
+
+    name: str
+    frames: bytes
+    format: StreamFormat
+    duration: float
+    frame_count: int
+
+    @classmethod
+    def from_file(cls, name: str, path: PathLike) -> 'NarratorFrames':
+        """
+        Read and index a narrator file.
+
+        Args:
+            name: Narrator name (e.g. 'daniel')
+            path: Narrator MP3 file
+
+        Returns:
+            NarratorFrames with tags and Xing/Info header stripped
+
+        Raises:
+            Mp3PrefixError: If the file is missing or contains no audio frames
+        """
+        try:
+            data = Path(path).read_bytes()
+        except OSError as e:
+            raise Mp3PrefixError(f"Cannot read narrator file {path}: {e}")
+
+        index, stream_format = _index_buffer(data, path)
+
+        return cls(
+            name=name,
+            frames=data[index.offsets[0]:index.end_offset],
+            format=stream_format,
+            duration=index.duration,
+            frame_count=index.frame_count
+        )
+
+
+@dataclass
+class PrefixResult:
+    """Outcome of prefixing one file."""
+
+    output_path: Optional[Path]
+    narrator_duration: float
+    conversation_duration: float
+    bytes_written: int
+
+    @property
+    def duration(self) -> float:
+        """Exact output duration in seconds."""
+        return self.narrator_duration + self.conversation_duration
+
+
+class Mp3PrefixEngine:
+    """Prepends in-memory narrator frames to MP3 files."""
+
+    def __init__(self, narrator_paths: Dict[str, PathLike], strict_bitrate: bool = False):
+        """
+        Initialize prefix engine, reading every narrator file once.
+
+        Args:
+            narrator_paths: Dictionary mapping narrator name to MP3 file
+            strict_bitrate: Reject conversations whose bitrate differs from the
+                narrator's instead of logging a warning
+
+        Raises:
+            Mp3PrefixError: If a narrator file cannot be read or indexed
+        """
+        self.strict_bitrate = strict_bitrate
+        self.narrators = {
+            name: NarratorFrames.from_file(name, path)
+            for name, path in narrator_paths.items()
+        }
+
+        for narrator in self.narrators.values():
+            logger.debug(
+                f"Loaded {narrator.name} narrator: {narrator.frame_count} frames, "
+                f"{narrator.duration:.3f}s, {narrator.format.sample_rate} Hz, "
+                f"{narrator.format.bitrate // 1000} kbps"
+            )
+
+    def check_compatible(self, narrator: str, stream_format: StreamFormat) -> None:
+        """
+        Check that a conversation stream can follow a narrator's frames.
+
+        Args:
+            narrator: Narrator name
+            stream_format: Format of the conversation stream
+
+        Raises:
+            Mp3PrefixError: If the narrator is unknown or the formats differ
+        """
+        if narrator not in self.narrators:
+            raise Mp3PrefixError(f"Unknown narrator: {narrator}")
+
+        narrator_format = self.narrators[narrator].format
+        problems = narrator_format.mismatches(stream_format)
+
+        if narrator_format.bitrate != stream_format.bitrate:
+            mismatch = f"{narrator_format.bitrate // 1000} vs {stream_format.bitrate // 1000} kbps"
+            if self.strict_bitrate:
+                problems.append(mismatch)
+            else:
+                logger.warning(f"Bitrate differs from {narrator} narrator ({mismatch}); output will be VBR")
+
+        if problems:
+            raise Mp3PrefixError(f"Incompatible with {narrator} narrator: {', '.join(problems)}")
+
+    def prefix_parts(
+        self,
+        narrator: str,
+        data,
+        source: PathLike = '<buffer>'
+    ) -> Tuple[List[memoryview], PrefixResult]:
+        """
+        Plan a prefixed output over a conversation held in a buffer.
+
+        Args:
+            narrator: Narrator name
+            data: bytes or mmap of the complete conversation file
+            source: Name used in error messages
+
+        Returns:
+            Tuple of ([ID3v2 tag, narrator frames, conversation frames] as
+            memoryviews, PrefixResult without an output path). The views
+            reference data: release them before closing an mmap.
+
+        Raises:
+            Mp3PrefixError: If the buffer cannot be indexed or the formats are incompatible
+        """
+        index, stream_format = _index_buffer(data, source)
+        self.check_compatible(narrator, stream_format)
+        frames = self.narrators[narrator]
+
+        with memoryview(data) as view:
+            parts = [
+                view[:_id3v2_length(data)],
+                memoryview(frames.frames),
+                view[index.offsets[0]:index.end_offset]
+            ]
+
+        return parts, PrefixResult(
+            output_path=None,
+            narrator_duration=frames.duration,
+            conversation_duration=index.duration,
+            bytes_written=sum(len(part) for part in parts)
+        )
+
+    def prefix(self, narrator: str, input_path: PathLike, output_path: PathLike) -> PrefixResult:
+        """
+        Write input_path with the narrator's frames prepended to output_path.
+
+        The output is written to a temporary file beside output_path and
+        renamed into place, so a failure never leaves a partial output.
+
+        Args:
+            narrator: Narrator name
+            input_path: Conversation MP3 file
+            output_path: Output MP3 file (may not be input_path)
+
+        Returns:
+            PrefixResult with exact durations
+
+        Raises:
+            Mp3PrefixError: If the input cannot be indexed, the formats are
+                incompatible, or the output cannot be written
+        """
+        input_path = Path(input_path)
+        output_path = Path(output_path)
+        temp_path = output_path.with_name(
+            f".{output_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+
+        try:
+            with open(input_path, 'rb') as f:
+                try:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    # mmap refuses empty files
+                    raise Mp3PrefixError(f"Empty MP3 file: {input_path}")
+
+                with data:
+                    parts, result = self.prefix_parts(narrator, data, input_path)
+                    try:
+                        output_path.parent.mkdir(parents=True, exist_ok=True)
+                        with open(temp_path, 'wb') as out:
+                            for part in parts:
+                                out.write(part)
+                    finally:
+                        for part in parts:
+                            part.release()
+
+            os.replace(temp_path, output_path)
+
+        except OSError as e:
+            raise Mp3PrefixError(f"Failed to prefix {input_path}: {e}")
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+        result.output_path = output_path
+        return result
+
+
+def prefix_or_fallback(
+    engine: Optional[Mp3PrefixEngine],
+    narrator: str,
+    narrator_path: PathLike,
+    conversation_path: PathLike,
+    output_path: PathLike,
+    fallback: Callable[[List[Path], Path], bool]
+) -> bool:
+    """
+    Prepend a narrator by copying MP3 frames, falling back to another method.
+
+    Args:
+        engine: Prefix engine (None uses the fallback for every file)
+        narrator: Narrator name
+        narrator_path: Narrator MP3 file, for the fallback
+        conversation_path: Conversation MP3 file
+        output_path: Output MP3 file
+        fallback: Called as fallback([narrator_path, conversation_path], output_path)
+            when frames cannot be spliced; returns True on success
+
+    Returns:
+        True if the output was written
+    """
+    if engine is not None:
+        try:
+            engine.prefix(narrator, conversation_path, output_path)
+            return True
+        except Mp3PrefixError as e:
+            logger.warning(f"Frame prefix of {Path(conversation_path).name} failed ({e}), using fallback")
+
+    return fallback([Path(narrator_path), Path(conversation_path)], Path(output_path))
+
+
+class PartsReader(io.RawIOBase):
+    """Read-only, seekable file object over a sequence of buffers, without copying them."""
+
+    def __init__(self, parts: Sequence[memoryview]):
+        """
+        Initialize reader.
+
+        Args:
+            parts: Buffers presented back to back (e.g. from prefix_parts())
+        """
+        super().__init__()
+        self._parts = [part for part in parts if len(part)]
+        self._starts = []
+        position = 0
+        for part in self._parts:
+            self._starts.append(position)
+            position += len(part)
+        self.size = position
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: self.size}[whence]
+        if base + offset < 0:
+            raise ValueError(f"Negative seek position {base + offset}")
+        self._position = base + offset
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        with memoryview(buffer) as target:
+            target = target.cast('B')
+            written = 0
+            part_number = bisect_right(self._starts, self._position) - 1
+
+            while written < len(target) and self._position < self.size:
+                part = self._parts[part_number]
+                offset = self._position - self._starts[part_number]
+                count = min(len(part) - offset, len(target) - written)
+                target[written:written + count] = part[offset:offset + count]
+                written += count
+                self._position += count
+                part_number += 1
+
+            return written
@@ -0,0 +1,251 @@
+"""
+Pipeline Module
+
+Threaded multi-stage executor for batch jobs that mix network and local work.
+
+Each stage has its own worker threads and reads from a bounded queue filled
+by the previous stage, so downloads, ffmpeg runs and uploads for different
+items overlap instead of alternating. The bounds keep a fast stage from
+running far ahead of a slow one (e.g. filling the disk with downloads while
+uploads lag).
+
+Per-stage metrics record how long workers spent working, waiting for input
+(starved by the stage before) and waiting for queue space (held back by the
+stage after), which shows where the bottleneck is.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Marks the end of a stage's input
+_DONE = object()
+
+
+@dataclass
+class PipelineStage:
+    """One stage of a pipeline."""
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+    queue_size: int = 0  # Input queue bound (0 = twice the worker count)
+
+    @property
+    def capacity(self) -> int:
+        return self.queue_size or 2 * self.workers
+
+
+@dataclass
+class StageMetrics:
+    """Counters and timings for one stage."""
+    name: str
+    workers: int
+    processed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    starved_seconds: float = 0.0
+    blocked_seconds: float = 0.0
+    max_queue_depth: int = 0
+
+    def utilization(self, wall_seconds: float) -> float:
+        """Fraction of worker time spent working."""
+        if wall_seconds <= 0 or self.workers <= 0:
+            return 0.0
+        return self.busy_seconds / (wall_seconds * self.workers)
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of one input item."""
+    index: int
+    item: Any
+    value: Any = None
+    error: Optional[Exception] = None
+    failed_stage: Optional[str] = None
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class Pipeline:
+    """Runs items through stages of worker threads joined by bounded queues."""
+
+    def __init__(self, stages: List[PipelineStage]):
+        """
+        Initialize pipeline.
+
+        Args:
+            stages: Stages in order; each stage's func receives the previous
+                stage's return value (the first receives the input item)
+
+        Raises:
+            ValueError: If there are no stages or a stage has no workers
+        """
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+        for stage in stages:
+            if stage.workers < 1:
+                raise ValueError(f"Stage {stage.name} needs at least one worker")
+
+        self.stages = stages
+        self.metrics: Dict[str, StageMetrics] = {}
+        self.wall_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        items: Iterable[Any],
+        on_result: Optional[Callable[[PipelineResult], None]] = None
+    ) -> List[PipelineResult]:
+        """
+        Process items through all stages.
+
+        An exception raised by a stage fails that item only; it is not passed
+        to later stages and the remaining items carry on.
+
+        Args:
+            items: Input items
+            on_result: Called in the calling thread as each item finishes
+                (e.g. to advance a progress bar)
+
+        Returns:
+            Results in input order
+        """
+        self.metrics = {s.name: StageMetrics(s.name, s.workers) for s in self.stages}
+        queues = [queue.Queue(maxsize=s.capacity) for s in self.stages]
+        results_queue: queue.Queue = queue.Queue()
+        remaining = [s.workers for s in self.stages]
+
+        def put(stage_index: int, entry, metrics: Optional[StageMetrics]) -> None:
+            """Hand an entry to a stage (or to the results), timing any wait for space."""
+            if stage_index == len(self.stages):
+                results_queue.put(entry)
+                return
+
+            started = time.monotonic()
+            queues[stage_index].put(entry)
+            waited = time.monotonic() - started
+
+            depth = queues[stage_index].qsize()
+            with self._lock:
+                if metrics is not None:
+                    metrics.blocked_seconds += waited
+                downstream = self.metrics[self.stages[stage_index].name]
+                downstream.max_queue_depth = max(downstream.max_queue_depth, depth)
+
+        def worker(stage_index: int) -> None:
+            stage = self.stages[stage_index]
+            metrics = self.metrics[stage.name]
+
+            while True:
+                started = time.monotonic()
+                entry = queues[stage_index].get()
+                with self._lock:
+                    metrics.starved_seconds += time.monotonic() - started
+
+                if entry is _DONE:
+                    with self._lock:
+                        remaining[stage_index] -= 1
+                        last = remaining[stage_index] == 0
+                    if last:
+                        # Every worker of this stage is done; close the next one
+                        if stage_index + 1 == len(self.stages):
+                            results_queue.put(_DONE)
+                        else:
+                            for _ in range(self.stages[stage_index + 1].workers):
+                                put(stage_index + 1, _DONE, None)
+                    return
+
+                result, value = entry
+                started = time.monotonic()
+                try:
+                    value = stage.func(value)
+                    error = None
+                except Exception as e:
+                    error = e
+                elapsed = time.monotonic() - started
+                result.stage_seconds[stage.name] = elapsed
+
+                with self._lock:
+                    metrics.busy_seconds += elapsed
+                    if error is None:
+                        metrics.processed += 1
+                    else:
+                        metrics.failed += 1
+
+                if error is not None:
+                    logger.error(f"{stage.name} failed for item {result.index}: {error}")
+                    result.error = error
+                    result.failed_stage = stage.name
+                    results_queue.put(result)
+                elif stage_index + 1 == len(self.stages):
+                    result.value = value
+                    results_queue.put(result)
+                else:
+                    put(stage_index + 1, (result, value), metrics)
+
+        def feed() -> None:
+            for index, item in enumerate(items):
+                put(0, (PipelineResult(index=index, item=item), item), None)
+            for _ in range(self.stages[0].workers):
+                put(0, _DONE, None)
+
+        started = time.monotonic()
+        # Daemon threads so an interrupted run does not hang the interpreter
+        threads = [threading.Thread(target=feed, name='pipeline-feed', daemon=True)]
+        for stage_index, stage in enumerate(self.stages):
+            threads.extend(
+                threading.Thread(
+                    target=worker, args=(stage_index,),
+                    name=f"pipeline-{stage.name}-{n}", daemon=True
+                )
+                for n in range(stage.workers)
+            )
+        for thread in threads:
+            thread.start()
+
+        results = []
+        while True:
+            result = results_queue.get()
+            if result is _DONE:
+                break
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+
+        for thread in threads:
+            thread.join()
+
+        self.wall_seconds = time.monotonic() - started
+        return sorted(results, key=lambda r: r.index)
+
+    def format_metrics(self) -> str:
+        """
+        Format per-stage metrics of the last run as a table.
+
+        Returns:
+            Multi-line table
+        """
+        lines = [
+            f"{'Stage':<12} {'Workers':>7} {'Done':>6} {'Failed':>6} {'Busy s':>9} "
+            f"{'Starved s':>10} {'Blocked s':>10} {'Max queue':>9} {'Util':>6}"
+        ]
+        for stage in self.stages:
+            m = self.metrics.get(stage.name)
+            if m is None:
+                continue
+            lines.append(
+                f"{m.name:<12} {m.workers:>7} {m.processed:>6} {m.failed:>6} {m.busy_seconds:>9.1f} "
+                f"{m.starved_seconds:>10.1f} {m.blocked_seconds:>10.1f} {m.max_queue_depth:>9} "
+                f"{m.utilization(self.wall_seconds):>6.0%}"
+            )
+        lines.append(f"Wall time: {self.wall_seconds:.1f}s")
+        return '\n'.join(lines)
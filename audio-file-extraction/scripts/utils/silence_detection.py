@@ -0,0 +1,655 @@
+"""
+Silence Detection Module
+
+Streaming silence detection on decoded PCM.
+
+ffmpeg decodes the source to 16 kHz mono 16-bit PCM on a pipe. Samples are
+read in fixed-size chunks and reduced to per-frame RMS levels in dB with
+NumPy, so memory use does not grow with file length. Stateful detectors turn
+the level stream into silence intervals, and several detectors with
+different threshold settings can share one decode.
+
+SilenceIndex answers nearest-silence and longest-silence-in-range queries
+over detected periods with binary search, for boundary placement.
+
+For parameter tuning, sweep_envelope() evaluates a whole grid of
+(threshold_db, min_duration) settings against a precomputed level envelope
+and reports the resulting segmentation for each; run_sweep() prints that
+report for the splitters' --sweep mode.
+"""
+
+import argparse
+import subprocess
+import threading
+from bisect import bisect_left, bisect_right
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+PathLike = Union[str, Path]
+
+# A silence setting: (threshold_db, min_duration_seconds)
+Setting = Tuple[float, float]
+
+# A silence period: (silence_start, silence_end) in seconds
+Interval = Tuple[float, float]
+
+# Analysis defaults: 16 kHz mono, 10 ms frames, 10 s read chunks
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.01
+CHUNK_SECONDS = 10.0
+
+# Floor for dB conversion of digital silence
+MIN_DB = -120.0
+
+# ffmpeg error lines kept for exception messages
+STDERR_TAIL_LINES = 20
+
+
+class SilenceDetectionError(Exception):
+    """Exception raised when audio cannot be decoded for silence detection."""
+    pass
+
+
+def stream_pcm(
+    input_file: PathLike,
+    sample_rate: int = SAMPLE_RATE,
+    chunk_seconds: float = CHUNK_SECONDS,
+    timeout: Optional[float] = None
+) -> Iterator[np.ndarray]:
+    """
+    Decode an audio file to mono float samples in fixed-size chunks.
+
+    Args:
+        input_file: Path to audio file
+        sample_rate: Output sample rate in Hz
+        chunk_seconds: Seconds of audio per yielded chunk
+        timeout: Kill ffmpeg if decoding takes longer than this many seconds
+
+    Yields:
+        float32 arrays of samples in [-1, 1]; the last chunk may be shorter
+
+    Raises:
+        FileNotFoundError: If ffmpeg is not installed
+        SilenceDetectionError: If ffmpeg cannot decode the file or times out
+    """
+    chunk_bytes = int(chunk_seconds * sample_rate) * 2
+
+    process = subprocess.Popen(
+        [
+            'ffmpeg',
+            '-v', 'error',
+            '-i', str(input_file),
+            '-ac', '1',
+            '-ar', str(sample_rate),
+            '-f', 's16le',
+            '-'
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+
+    # Drain stderr concurrently so a noisy decode cannot fill the pipe and
+    # block ffmpeg (and with it the stdout read); keep the last lines
+    stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
+    stderr_reader = threading.Thread(
+        target=lambda: stderr_tail.extend(process.stderr),
+        daemon=True
+    )
+    stderr_reader.start()
+
+    # Killing ffmpeg unblocks the pipe read below with EOF
+    timer = None
+    if timeout is not None:
+        timer = threading.Timer(timeout, process.kill)
+        timer.daemon = True
+        timer.start()
+
+    try:
+        while True:
+            data = process.stdout.read(chunk_bytes)
+            if not data:
+                break
+
+            # A pipe read never splits a sample unless the stream ends mid-sample
+            usable = len(data) - len(data) % 2
+            yield np.frombuffer(data[:usable], dtype='<i2').astype(np.float32) / 32768.0
+
+        returncode = process.wait()
+        stderr_reader.join()
+        stderr = b''.join(stderr_tail).decode(errors='replace').strip()
+
+        if timer is not None and not timer.is_alive() and returncode != 0:
+            raise SilenceDetectionError(f"ffmpeg timed out after {timeout}s decoding {input_file}")
+        if returncode != 0:
+            raise SilenceDetectionError(f"ffmpeg could not decode {input_file}: {stderr}")
+
+    finally:
+        if timer is not None:
+            timer.cancel()
+
+        # Stop ffmpeg if the consumer abandons the generator early
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        stderr_reader.join()
+        process.stdout.close()
+        process.stderr.close()
+
+
+def frame_levels(
+    chunks: Iterable[np.ndarray],
+    sample_rate: int = SAMPLE_RATE,
+    frame_seconds: float = FRAME_SECONDS
+) -> Iterator[np.ndarray]:
+    """
+    Reduce sample chunks to RMS levels in dB per fixed-length frame.
+
+    Samples that do not fill a whole frame are carried into the next chunk;
+    a final partial frame is measured on its own.
+
+    Args:
+        chunks: Iterable of sample arrays
+        sample_rate: Sample rate of the chunks in Hz
+        frame_seconds: Analysis frame length in seconds
+
+    Yields:
+        float64 arrays of frame levels in dBFS
+    """
+    frame_length = max(1, int(round(frame_seconds * sample_rate)))
+    remainder = np.empty(0, dtype=np.float32)
+
+    for chunk in chunks:
+        samples = np.concatenate((remainder, chunk)) if remainder.size else chunk
+        whole = samples.size - samples.size % frame_length
+
+        if whole:
+            frames = samples[:whole].reshape(-1, frame_length).astype(np.float64)
+            yield _to_db(np.sqrt(np.mean(frames * frames, axis=1)))
+
+        remainder = samples[whole:]
+
+    if remainder.size:
+        tail = remainder.astype(np.float64)
+        yield _to_db(np.sqrt(np.array([np.mean(tail * tail)])))
+
+
+def _to_db(rms: np.ndarray) -> np.ndarray:
+    """Convert linear RMS to dBFS, clamped at MIN_DB."""
+    floor = 10 ** (MIN_DB / 20)
+    return 20 * np.log10(np.maximum(rms, floor))
+
+
+class SilenceDetector:
+    """Turns a stream of frame levels into silence intervals for one setting."""
+
+    def __init__(
+        self,
+        threshold_db: float = -50,
+        min_duration: float = 0.2,
+        frame_seconds: float = FRAME_SECONDS,
+        include_trailing: bool = False
+    ):
+        """
+        Initialize silence detector.
+
+        Args:
+            threshold_db: Frames below this level (dBFS) count as silent
+            min_duration: Minimum silence duration in seconds
+            frame_seconds: Length of each level frame in seconds
+            include_trailing: Emit a silence still open at end of stream
+        """
+        self.threshold_db = threshold_db
+        self.min_duration = min_duration
+        self.frame_seconds = frame_seconds
+        self.include_trailing = include_trailing
+
+        self._frames_seen = 0
+        self._silence_start: Optional[int] = None
+
+    def feed(self, levels: np.ndarray) -> List[Interval]:
+        """
+        Process the next block of frame levels.
+
+        Args:
+            levels: Frame levels in dBFS following the previous block
+
+        Returns:
+            Silence intervals that closed within this block
+        """
+        silent = (levels < self.threshold_db).astype(np.int8)
+        previous = 1 if self._silence_start is not None else 0
+
+        # +1 where silence starts, -1 where it ends (frame index within block)
+        edges = np.diff(silent, prepend=previous)
+        positions = np.flatnonzero(edges)
+
+        intervals = []
+        for position in positions:
+            frame = self._frames_seen + int(position)
+            if edges[position] > 0:
+                self._silence_start = frame
+            else:
+                self._close(frame, intervals)
+
+        self._frames_seen += levels.size
+        return intervals
+
+    def finish(self) -> List[Interval]:
+        """
+        Signal end of stream.
+
+        Returns:
+            The trailing silence if include_trailing is set and one is open
+        """
+        intervals = []
+        if self.include_trailing and self._silence_start is not None:
+            self._close(self._frames_seen, intervals)
+        self._silence_start = None
+        return intervals
+
+    def _close(self, end_frame: int, intervals: List[Interval]) -> None:
+        """Record the open silence if it is long enough."""
+        start_frame = self._silence_start
+        self._silence_start = None
+
+        if (end_frame - start_frame) * self.frame_seconds >= self.min_duration - 1e-9:
+            intervals.append((
+                round(start_frame * self.frame_seconds, 6),
+                round(end_frame * self.frame_seconds, 6)
+            ))
+
+
+def iter_silences(
+    levels: Iterable[np.ndarray],
+    detector: SilenceDetector
+) -> Iterator[Interval]:
+    """
+    Run a detector over a level stream.
+
+    Args:
+        levels: Iterable of frame level blocks
+        detector: Fresh SilenceDetector
+
+    Yields:
+        (silence_start, silence_end) tuples in order
+    """
+    for block in levels:
+        yield from detector.feed(block)
+    yield from detector.finish()
+
+
+def detect_silences(
+    input_file: PathLike,
+    threshold_db: float = -50,
+    min_duration: float = 0.2,
+    include_trailing: bool = False,
+    frame_seconds: float = FRAME_SECONDS,
+    timeout: Optional[float] = None
+) -> Iterator[Interval]:
+    """
+    Detect silence periods in an audio file.
+
+    Args:
+        input_file: Path to audio file
+        threshold_db: Noise threshold in dBFS
+        min_duration: Minimum silence duration in seconds
+        include_trailing: Also yield a silence running to the end of the file
+        frame_seconds: Analysis frame length in seconds
+        timeout: Maximum seconds to spend decoding the file
+
+    Yields:
+        (silence_start, silence_end) tuples in seconds, as they are found
+
+    Raises:
+        FileNotFoundError: If ffmpeg is not installed
+        SilenceDetectionError: If the file cannot be decoded or times out
+    """
+    levels = frame_levels(stream_pcm(input_file, timeout=timeout), frame_seconds=frame_seconds)
+    detector = SilenceDetector(threshold_db, min_duration, frame_seconds, include_trailing)
+    yield from iter_silences(levels, detector)
+
+
+def detect_silences_multi(
+    input_file: PathLike,
+    settings: Sequence[Setting],
+    include_trailing: bool = False,
+    frame_seconds: float = FRAME_SECONDS
+) -> Dict[Setting, List[Interval]]:
+    """
+    Detect silences for several threshold settings from a single decode.
+
+    Args:
+        input_file: Path to audio file
+        settings: (threshold_db, min_duration) pairs
+        include_trailing: Also report silences running to the end of the file
+        frame_seconds: Analysis frame length in seconds
+
+    Returns:
+        Dictionary mapping each setting to its silence intervals
+
+    Raises:
+        FileNotFoundError: If ffmpeg is not installed
+        SilenceDetectionError: If the file cannot be decoded
+    """
+    detectors = {
+        setting: SilenceDetector(setting[0], setting[1], frame_seconds, include_trailing)
+        for setting in settings
+    }
+    results: Dict[Setting, List[Interval]] = {setting: [] for setting in settings}
+
+    for block in frame_levels(stream_pcm(input_file), frame_seconds=frame_seconds):
+        for setting, detector in detectors.items():
+            results[setting].extend(detector.feed(block))
+
+    for setting, detector in detectors.items():
+        results[setting].extend(detector.finish())
+
+    logger.debug(f"Detected silences for {len(settings)} settings in {input_file}")
+    return results
+
+
+class SilenceIndex:
+    """Sorted lookup tables over silence periods for boundary placement queries."""
+
+    def __init__(self, silence_periods: Sequence[Interval]):
+        """
+        Initialize silence index.
+
+        Ties in either query resolve to the period listed first in
+        silence_periods, matching a linear scan with min()/max().
+
+        Args:
+            silence_periods: (silence_start, silence_end) periods in any order
+        """
+        self.periods = list(silence_periods)
+
+        midpoints = [(start + end) / 2.0 for start, end in self.periods]
+        self._by_midpoint = sorted(range(len(self.periods)), key=midpoints.__getitem__)
+        self._midpoints = [midpoints[i] for i in self._by_midpoint]
+
+        self._by_start = sorted(range(len(self.periods)), key=lambda i: self.periods[i][0])
+        self._starts = [self.periods[i][0] for i in self._by_start]
+
+    def __len__(self) -> int:
+        return len(self.periods)
+
+    def nearest(self, timestamp: float, window: float) -> Optional[Interval]:
+        """
+        Find the period whose midpoint is closest to a time.
+
+        Args:
+            timestamp: Time in seconds
+            window: Maximum distance between midpoint and timestamp
+
+        Returns:
+            (silence_start, silence_end), or None if no midpoint is within window
+        """
+        midpoints = self._midpoints
+        position = bisect_left(midpoints, timestamp)
+
+        best = None  # (distance, original index)
+
+        # Walk outwards from the insertion point over every period at the
+        # smallest distance, so rounding ties still pick the first listed
+        for step in (-1, 1):
+            i = position - 1 if step < 0 else position
+            while 0 <= i < len(midpoints):
+                distance = abs(midpoints[i] - timestamp)
+                candidate = (distance, self._by_midpoint[i])
+                if best is not None and distance > best[0]:
+                    break
+                if best is None or candidate < best:
+                    best = candidate
+                i += step
+
+        if best is None or best[0] > window:
+            return None
+        return self.periods[best[1]]
+
+    def longest_within(self, start: float, end: float) -> Optional[Interval]:
+        """
+        Find the longest period starting strictly between two times.
+
+        Args:
+            start: Range start in seconds (exclusive)
+            end: Range end in seconds (exclusive)
+
+        Returns:
+            (silence_start, silence_end), or None if no period starts in range
+        """
+        low = bisect_right(self._starts, start)
+        high = bisect_left(self._starts, end)
+
+        if low >= high:
+            return None
+
+        def rank(i: int) -> Tuple[float, int]:
+            s_start, s_end = self.periods[i]
+            return s_end - s_start, -i
+
+        return self.periods[max(self._by_start[low:high], key=rank)]
+
+
+@dataclass
+class SweepResult:
+    """Segmentation produced by one (threshold_db, min_duration) setting."""
+
+    threshold_db: float
+    min_duration: float
+    silence_count: int
+    segment_count: int
+    min_segment: float
+    mean_segment: float
+    max_segment: float
+    short_segments: int
+    long_segments: int
+    total_duration: float
+
+
+def compute_envelope(
+    input_file: PathLike,
+    frame_seconds: float = FRAME_SECONDS
+) -> np.ndarray:
+    """
+    Decode a file once into its full frame-level envelope.
+
+    The envelope holds one float per frame (100 per second by default), so
+    even hour-long sources stay small.
+
+    Args:
+        input_file: Path to audio file
+        frame_seconds: Analysis frame length in seconds
+
+    Returns:
+        Frame levels in dBFS
+
+    Raises:
+        FileNotFoundError: If ffmpeg is not installed
+        SilenceDetectionError: If the file cannot be decoded
+    """
+    blocks = list(frame_levels(stream_pcm(input_file), frame_seconds=frame_seconds))
+    return np.concatenate(blocks) if blocks else np.empty(0)
+
+
+def sweep_envelope(
+    levels: np.ndarray,
+    thresholds: Sequence[float],
+    durations: Sequence[float],
+    frame_seconds: float = FRAME_SECONDS,
+    short_segment: float = 1.0,
+    long_segment: float = 30.0
+) -> List[SweepResult]:
+    """
+    Evaluate a grid of silence settings against one envelope.
+
+    Silence runs for every threshold are found in a single vectorized pass
+    over a (thresholds x frames) mask. Each duration then filters those runs,
+    and segments are formed by splitting at silence midpoints, as the
+    splitters do. Silences still open at the end of the envelope are ignored.
+
+    Args:
+        levels: Frame levels in dBFS from compute_envelope()
+        thresholds: Thresholds in dBFS to evaluate
+        durations: Minimum silence durations in seconds to evaluate
+        frame_seconds: Frame length the envelope was computed with
+        short_segment: Segments shorter than this are counted as short
+        long_segment: Segments longer than this are counted as long
+
+    Returns:
+        One SweepResult per (threshold, duration), thresholds outermost
+    """
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    total_duration = levels.size * frame_seconds
+
+    silent = (levels[np.newaxis, :] < thresholds[:, np.newaxis]).astype(np.int8)
+    edges = np.diff(silent, axis=1, prepend=0, append=0)
+
+    # Starts and ends come out row-major, so they pair up within each row
+    start_rows, start_frames = np.nonzero(edges == 1)
+    _, end_frames = np.nonzero(edges == -1)
+
+    closed = end_frames < levels.size
+    run_rows = start_rows[closed]
+    run_starts = start_frames[closed]
+    run_ends = end_frames[closed]
+    run_lengths = (run_ends - run_starts) * frame_seconds
+
+    results = []
+    for row, threshold in enumerate(thresholds):
+        in_row = run_rows == row
+
+        for duration in durations:
+            keep = in_row & (run_lengths >= duration - 1e-9)
+            midpoints = (run_starts[keep] + run_ends[keep]) * (frame_seconds / 2)
+
+            bounds = np.concatenate(([0.0], midpoints, [total_duration]))
+            segments = np.diff(bounds)
+
+            results.append(SweepResult(
+                threshold_db=float(threshold),
+                min_duration=float(duration),
+                silence_count=int(keep.sum()),
+                segment_count=int(segments.size),
+                min_segment=float(segments.min()),
+                mean_segment=float(segments.mean()),
+                max_segment=float(segments.max()),
+                short_segments=int((segments < short_segment).sum()),
+                long_segments=int((segments > long_segment).sum()),
+                total_duration=total_duration
+            ))
+
+    return results
+
+
+def combine_sweeps(sweeps: Sequence[List[SweepResult]]) -> List[SweepResult]:
+    """
+    Aggregate per-file sweeps over the same grid into directory totals.
+
+    Args:
+        sweeps: One sweep_envelope() result list per file
+
+    Returns:
+        One SweepResult per setting with counts summed across files
+    """
+    combined = []
+
+    for per_setting in zip(*sweeps):
+        segment_count = sum(r.segment_count for r in per_setting)
+        total_duration = sum(r.total_duration for r in per_setting)
+
+        combined.append(SweepResult(
+            threshold_db=per_setting[0].threshold_db,
+            min_duration=per_setting[0].min_duration,
+            silence_count=sum(r.silence_count for r in per_setting),
+            segment_count=segment_count,
+            min_segment=min(r.min_segment for r in per_setting),
+            mean_segment=total_duration / segment_count if segment_count else 0.0,
+            max_segment=max(r.max_segment for r in per_setting),
+            short_segments=sum(r.short_segments for r in per_setting),
+            long_segments=sum(r.long_segments for r in per_setting),
+            total_duration=total_duration
+        ))
+
+    return combined
+
+
+def format_sweep_table(results: Sequence[SweepResult]) -> str:
+    """Render sweep results as a fixed-width text table."""
+    lines = [
+        f"{'thresh':>7} {'min_dur':>7} {'silences':>8} {'segments':>8} "
+        f"{'min':>6} {'mean':>6} {'max':>6} {'short':>5} {'long':>5}"
+    ]
+
+    for r in results:
+        lines.append(
+            f"{r.threshold_db:>5.0f}dB {r.min_duration:>6.2f}s {r.silence_count:>8} "
+            f"{r.segment_count:>8} {r.min_segment:>6.1f} {r.mean_segment:>6.1f} "
+            f"{r.max_segment:>6.1f} {r.short_segments:>5} {r.long_segments:>5}"
+        )
+
+    return '\n'.join(lines)
+
+
+def parse_float_list(value: str) -> List[float]:
+    """Parse a comma-separated list of numbers for argparse."""
+    try:
+        return [float(v) for v in value.split(',') if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected comma-separated numbers, got: {value}")
+
+
+def run_sweep(input_path: PathLike, thresholds: List[float], durations: List[float], short_segment: float) -> bool:
+    """
+    Print segmentation for a grid of silence settings without splitting.
+
+    Each file is decoded once; every (threshold, duration) pair is then
+    evaluated against its level envelope.
+
+    Args:
+        input_path: Audio file or directory of MP3 files
+        thresholds: Silence thresholds in dB
+        durations: Minimum silence durations in seconds
+        short_segment: Segments shorter than this are reported as short
+
+    Returns:
+        True if at least one file was analyzed
+    """
+    path = Path(input_path)
+    files = sorted(path.glob('*.mp3')) if path.is_dir() else [path]
+
+    if not files:
+        print(f"ERROR: No MP3 files found in {input_path}")
+        return False
+
+    print(f"Sweeping {len(thresholds)} thresholds x {len(durations)} durations over {len(files)} file(s)")
+
+    sweeps = []
+    for file_path in files:
+        try:
+            levels = compute_envelope(file_path)
+        except FileNotFoundError:
+            print("ERROR: ffmpeg not found. Please install ffmpeg.")
+            return False
+        except SilenceDetectionError as e:
+            print(f"ERROR: {e}")
+            continue
+
+        results = sweep_envelope(levels, thresholds, durations, short_segment=short_segment)
+        sweeps.append(results)
+
+        print(f"\n{file_path.name} ({levels.size * FRAME_SECONDS:.1f}s)")
+        print(format_sweep_table(results))
+
+    if len(sweeps) > 1:
+        print(f"\nAll files ({len(sweeps)})")
+        print(format_sweep_table(combine_sweeps(sweeps)))
+
+    return bool(sweeps)
@@ -0,0 +1,369 @@
+"""
+Speaker Change Module
+
+Lightweight speaker-change detection with NumPy only, as a fast alternative
+to neural diarization.
+
+Audio is decoded through the shared ffmpeg PCM pipe and reduced to MFCC
+frames. Quiet frames are dropped. Each candidate point is then scored by
+comparing the feature windows on either side, either with the Bayesian
+Information Criterion (diagonal Gaussians) or with the cosine distance
+between window means. Running sums make every score O(1), so a file costs
+one pass over its frames. The segments between accepted change points are
+labelled by greedy centroid matching so that returning speakers get their
+earlier label.
+
+Results are far coarser than pyannote's but run many times faster than
+real time on a single core.
+"""
+
+from bisect import bisect_left, insort
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from .diarization_cache import SpeakerTurn
+from .logger import get_logger
+from .silence_detection import SAMPLE_RATE, stream_pcm
+
+logger = get_logger(__name__)
+
+PathLike = Union[str, Path]
+
+# Feature extraction defaults: 25 ms frames every 10 ms, 26 mel bands, 13 MFCCs
+FRAME_SECONDS = 0.025
+HOP_SECONDS = 0.01
+N_FFT = 512
+N_MELS = 26
+N_MFCC = 13
+PRE_EMPHASIS = 0.97
+
+METHODS = ('bic', 'cosine')
+
+
+def mel_filterbank(
+    sample_rate: int = SAMPLE_RATE,
+    n_fft: int = N_FFT,
+    n_mels: int = N_MELS
+) -> np.ndarray:
+    """
+    Build triangular mel filters.
+
+    Args:
+        sample_rate: Sample rate in Hz
+        n_fft: FFT length
+        n_mels: Number of mel bands
+
+    Returns:
+        Array of shape (n_mels, n_fft // 2 + 1)
+    """
+    def to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def to_hz(mel):
+        return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+    edges = to_hz(np.linspace(0.0, to_mel(sample_rate / 2), n_mels + 2))
+    bins = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+
+    lower = (bins[None, :] - edges[:-2, None]) / (edges[1:-1, None] - edges[:-2, None])
+    upper = (edges[2:, None] - bins[None, :]) / (edges[2:, None] - edges[1:-1, None])
+
+    return np.maximum(0.0, np.minimum(lower, upper))
+
+
+def dct_matrix(n_mels: int = N_MELS, n_mfcc: int = N_MFCC) -> np.ndarray:
+    """Orthonormal DCT-II basis of shape (n_mfcc, n_mels)."""
+    k = np.arange(n_mfcc)[:, None]
+    n = np.arange(n_mels)[None, :]
+    basis = np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels)) * np.sqrt(2.0 / n_mels)
+    basis[0] /= np.sqrt(2.0)
+    return basis
+
+
+class MfccExtractor:
+    """Computes MFCC frames from a stream of sample chunks."""
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, n_mfcc: int = N_MFCC):
+        """
+        Initialize MFCC extractor.
+
+        Args:
+            sample_rate: Sample rate of the chunks in Hz
+            n_mfcc: Number of cepstral coefficients per frame
+        """
+        self.frame_length = int(FRAME_SECONDS * sample_rate)
+        self.hop_length = int(HOP_SECONDS * sample_rate)
+
+        self._window = np.hamming(self.frame_length).astype(np.float32)
+        self._filters = mel_filterbank(sample_rate, N_FFT, N_MELS).astype(np.float32)
+        self._dct = dct_matrix(N_MELS, n_mfcc).astype(np.float32)
+
+        self._carry = np.empty(0, dtype=np.float32)
+        self._last_sample = 0.0
+
+    def feed(self, chunk: np.ndarray) -> np.ndarray:
+        """
+        Process the next chunk of samples.
+
+        Args:
+            chunk: float32 samples following the previous chunk
+
+        Returns:
+            Array of shape (frames, n_mfcc + 1); the last column is log frame energy
+        """
+        if not chunk.size:
+            return np.empty((0, self._dct.shape[0] + 1), dtype=np.float32)
+
+        # Pre-emphasis, continuing from the previous chunk's last sample
+        emphasized = np.empty_like(chunk)
+        emphasized[0] = chunk[0] - PRE_EMPHASIS * self._last_sample
+        emphasized[1:] = chunk[1:] - PRE_EMPHASIS * chunk[:-1]
+        self._last_sample = float(chunk[-1])
+
+        buffer = np.concatenate((self._carry, emphasized))
+        if buffer.size < self.frame_length:
+            self._carry = buffer
+            return np.empty((0, self._dct.shape[0] + 1), dtype=np.float32)
+
+        frames = np.lib.stride_tricks.sliding_window_view(buffer, self.frame_length)[::self.hop_length]
+        self._carry = buffer[frames.shape[0] * self.hop_length:]
+
+        power = np.abs(np.fft.rfft(frames * self._window, N_FFT)) ** 2 / N_FFT
+        log_mel = np.log(np.maximum(power @ self._filters.T, 1e-10))
+        energy = np.log(np.maximum(power.sum(axis=1), 1e-10))
+
+        return np.column_stack((log_mel @ self._dct.T, energy)).astype(np.float32)
+
+
+def _peaks(scores: np.ndarray, threshold: float, min_gap: int) -> List[int]:
+    """Pick the highest scores above threshold at least min_gap apart."""
+    accepted: List[int] = []
+
+    for index in np.argsort(-scores, kind='stable'):
+        if scores[index] <= threshold:
+            break
+
+        position = bisect_left(accepted, index)
+        if position > 0 and index - accepted[position - 1] < min_gap:
+            continue
+        if position < len(accepted) and accepted[position] - index < min_gap:
+            continue
+
+        insort(accepted, int(index))
+
+    return accepted
+
+
+def bic_scores(features: np.ndarray, window: int, penalty: float = 1.0) -> np.ndarray:
+    """
+    Delta-BIC for a change at each frame between two windows of features.
+
+    Positive values favour two diagonal Gaussians (a change) over one.
+
+    Args:
+        features: Array of shape (frames, dims)
+        window: Frames on each side of a candidate point
+        penalty: Weight of the model complexity term
+
+    Returns:
+        Scores for change points window..frames-window (may be empty)
+    """
+    frames, dims = features.shape
+    if frames < 2 * window:
+        return np.empty(0)
+
+    x = features.astype(np.float64)
+    sums = np.vstack((np.zeros(dims), np.cumsum(x, axis=0)))
+    squares = np.vstack((np.zeros(dims), np.cumsum(x * x, axis=0)))
+
+    points = np.arange(window, frames - window + 1)
+
+    def log_det(start, end):
+        count = (end - start)[:, None]
+        mean = (sums[end] - sums[start]) / count
+        variance = (squares[end] - squares[start]) / count - mean * mean
+        return np.log(np.maximum(variance, 1e-6)).sum(axis=1)
+
+    total = 2 * window
+    gain = 0.5 * (
+        total * log_det(points - window, points + window)
+        - window * log_det(points - window, points)
+        - window * log_det(points, points + window)
+    )
+    # One mean and one variance per dimension for the extra Gaussian
+    return gain - penalty * 0.5 * (2 * dims) * np.log(total)
+
+
+def cosine_scores(features: np.ndarray, window: int) -> np.ndarray:
+    """
+    Cosine distance between the mean features of two windows at each frame.
+
+    Args:
+        features: Array of shape (frames, dims), mean-normalized
+        window: Frames on each side of a candidate point
+
+    Returns:
+        Distances for change points window..frames-window (may be empty)
+    """
+    frames, dims = features.shape
+    if frames < 2 * window:
+        return np.empty(0)
+
+    sums = np.vstack((np.zeros(dims), np.cumsum(features.astype(np.float64), axis=0)))
+    points = np.arange(window, frames - window + 1)
+
+    left = sums[points] - sums[points - window]
+    right = sums[points + window] - sums[points]
+
+    norms = np.linalg.norm(left, axis=1) * np.linalg.norm(right, axis=1)
+    return 1.0 - np.einsum('ij,ij->i', left, right) / np.maximum(norms, 1e-12)
+
+
+class SpectralChangeDetector:
+    """Finds speaker turns from MFCC statistics without a neural model."""
+
+    def __init__(
+        self,
+        method: str = 'bic',
+        window_seconds: float = 1.5,
+        min_turn_seconds: float = 1.0,
+        penalty: float = 1.0,
+        cosine_threshold: float = 0.3,
+        label_threshold: float = 0.5,
+        energy_floor_db: float = 40.0
+    ):
+        """
+        Initialize speaker change detector.
+
+        Args:
+            method: 'bic' or 'cosine'
+            window_seconds: Speech on each side of a candidate change point
+            min_turn_seconds: Minimum speech between accepted change points
+            penalty: BIC model complexity weight (higher finds fewer changes)
+            cosine_threshold: Minimum cosine distance for a change
+            label_threshold: Minimum cosine similarity to reuse an earlier speaker label
+            energy_floor_db: Frames this far below the loud frames are ignored
+
+        Raises:
+            ValueError: If the method is unknown
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown speaker change method: {method}. Expected one of {METHODS}")
+
+        self.method = method
+        self.window_seconds = window_seconds
+        self.min_turn_seconds = min_turn_seconds
+        self.penalty = penalty
+        self.cosine_threshold = cosine_threshold
+        self.label_threshold = label_threshold
+        self.energy_floor_db = energy_floor_db
+
+    def detect(self, input_file: PathLike) -> List[SpeakerTurn]:
+        """
+        Detect speaker turns in an audio file.
+
+        Args:
+            input_file: Path to audio file
+
+        Returns:
+            Speaker turns (start, end, label) covering the speech in the file
+
+        Raises:
+            FileNotFoundError: If ffmpeg is not installed
+            SilenceDetectionError: If the file cannot be decoded
+        """
+        extractor = MfccExtractor()
+        blocks = [extractor.feed(chunk) for chunk in stream_pcm(input_file)]
+
+        features = np.concatenate(blocks) if blocks else np.empty((0, N_MFCC + 1), np.float32)
+        turns = self.detect_features(features)
+
+        logger.debug(f"Found {len(turns)} speaker turns in {input_file}")
+        return turns
+
+    def detect_samples(self, samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> List[SpeakerTurn]:
+        """Detect speaker turns in decoded mono float samples."""
+        return self.detect_features(MfccExtractor(sample_rate).feed(samples.astype(np.float32)))
+
+    def detect_features(self, features: np.ndarray) -> List[SpeakerTurn]:
+        """
+        Detect speaker turns from MfccExtractor output.
+
+        Args:
+            features: Array of shape (frames, n_mfcc + 1) at HOP_SECONDS spacing
+
+        Returns:
+            Speaker turns (start, end, label)
+        """
+        if not len(features):
+            return []
+
+        # Keep frames within energy_floor_db of the loud frames (log power is natural log)
+        energy = features[:, -1]
+        floor = np.percentile(energy, 95) - self.energy_floor_db / (10 * np.log10(np.e))
+        speech = np.flatnonzero(energy > floor)
+        if not speech.size:
+            return []
+
+        # Drop c0 and the energy column; loudness says little about the speaker
+        cepstra = features[speech, 1:-1]
+        cepstra = cepstra - cepstra.mean(axis=0)
+
+        window = max(1, int(self.window_seconds / HOP_SECONDS))
+        if self.method == 'bic':
+            scores = bic_scores(cepstra, window, self.penalty)
+            threshold = 0.0
+        else:
+            scores = cosine_scores(cepstra, window)
+            threshold = self.cosine_threshold
+
+        min_gap = max(1, int(self.min_turn_seconds / HOP_SECONDS))
+        changes = [window + peak for peak in _peaks(scores, threshold, min_gap)]
+
+        bounds = [0] + changes + [len(speech)]
+        labels = self._label_segments(cepstra, bounds)
+
+        turns: List[SpeakerTurn] = []
+        for (start, end), label in zip(zip(bounds[:-1], bounds[1:]), labels):
+            turn_end = round(float(speech[end - 1] + 1) * HOP_SECONDS, 3)
+
+            # Over-segmented runs of one speaker become a single turn
+            if turns and turns[-1][2] == label:
+                turns[-1] = (turns[-1][0], turn_end, label)
+            else:
+                turns.append((round(float(speech[start]) * HOP_SECONDS, 3), turn_end, label))
+
+        return turns
+
+    def _label_segments(self, cepstra: np.ndarray, bounds: List[int]) -> List[str]:
+        """Assign each segment to the most similar earlier speaker or a new one."""
+        centroids: List[np.ndarray] = []
+        counts: List[int] = []
+        labels = []
+
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            mean = cepstra[start:end].mean(axis=0)
+            best: Optional[Tuple[float, int]] = None
+
+            for index, centroid in enumerate(centroids):
+                similarity = float(
+                    mean @ centroid / max(np.linalg.norm(mean) * np.linalg.norm(centroid), 1e-12)
+                )
+                if best is None or similarity > best[0]:
+                    best = (similarity, index)
+
+            if best is not None and best[0] >= self.label_threshold:
+                index = best[1]
+                size = end - start
+                centroids[index] = (centroids[index] * counts[index] + mean * size) / (counts[index] + size)
+                counts[index] += size
+            else:
+                index = len(centroids)
+                centroids.append(mean)
+                counts.append(end - start)
+
+            labels.append(f"SPEAKER_{index:02d}")
+
+        return labels
@@ -0,0 +1,310 @@
+"""
+Staged Output Module
+
+Atomic publishing of generated output directories.
+
+Files are written into a hidden stage directory next to the target, on the
+same filesystem. Committing swaps the stage into place in one step: on
+Linux, renameat2(RENAME_EXCHANGE) exchanges the two directories atomically,
+and elsewhere two renames are used, with the displaced directory recorded
+for recovery. Readers therefore see either the old complete set of files or
+the new one, never a half-written folder.
+
+The displaced generation is moved (not copied) into a per-target
+generations directory and pruned to a fixed number of snapshots. Restoring
+a snapshot hardlinks its files into a fresh stage, so restores cost no data
+I/O and leave the snapshot intact.
+
+Stages left behind by crashed processes are removed the next time the same
+target is staged.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import glob
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import List, Optional, Union
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+PathLike = Union[str, Path]
+
+# Directory next to published targets holding old generations
+GENERATIONS_DIR = '.generations'
+
+# Number of displaced generations kept per target
+DEFAULT_KEEP_GENERATIONS = 1
+
+# renameat2() flag and AT_FDCWD from <linux/fs.h> / <fcntl.h>
+_RENAME_EXCHANGE = 2
+_AT_FDCWD = -100
+
+_libc = None
+if hasattr(os, 'uname') and os.uname().sysname == 'Linux':
+    try:
+        _libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        if not hasattr(_libc, 'renameat2'):
+            _libc = None
+    except OSError:
+        _libc = None
+
+
+class StagedOutputError(Exception):
+    """Exception raised when a staged output cannot be published or restored."""
+    pass
+
+
+def exchange_paths(first: PathLike, second: PathLike) -> bool:
+    """
+    Atomically exchange two existing paths.
+
+    Args:
+        first: Existing file or directory
+        second: Existing file or directory on the same filesystem
+
+    Returns:
+        True if exchanged, False if the platform or filesystem does not
+        support atomic exchange
+
+    Raises:
+        OSError: If the exchange fails for another reason
+    """
+    if _libc is None:
+        return False
+
+    result = _libc.renameat2(
+        _AT_FDCWD, os.fsencode(str(first)),
+        _AT_FDCWD, os.fsencode(str(second)),
+        _RENAME_EXCHANGE
+    )
+    if result == 0:
+        return True
+
+    error = ctypes.get_errno()
+    if error in (errno.EINVAL, errno.ENOSYS, errno.ENOTSUP):
+        return False
+    raise OSError(error, os.strerror(error), str(first))
+
+
+def escape_segment_pattern(text: str) -> str:
+    """Escape literal text for use in an ffmpeg output filename pattern."""
+    return text.replace('%', '%%')
+
+
+def hardlink_tree(source: PathLike, destination: PathLike) -> None:
+    """
+    Recreate a directory tree with hardlinks instead of copies.
+
+    Falls back to copying files where hardlinks are not supported.
+
+    Args:
+        source: Existing directory
+        destination: Directory to create
+    """
+    source = Path(source)
+    destination = Path(destination)
+    destination.mkdir(parents=True)
+
+    for entry in source.iterdir():
+        target = destination / entry.name
+        if entry.is_dir():
+            hardlink_tree(entry, target)
+            continue
+        try:
+            os.link(entry, target)
+        except OSError:
+            shutil.copy2(entry, target)
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process id is still running."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class StagedOutput:
+    """Stage directory that replaces a target directory atomically on commit."""
+
+    def __init__(self, target_dir: PathLike, keep_generations: int = DEFAULT_KEEP_GENERATIONS):
+        """
+        Initialize staged output.
+
+        Args:
+            target_dir: Directory to publish into (need not exist yet)
+            keep_generations: Displaced generations to keep as snapshots (0 keeps none)
+        """
+        self.target_dir = Path(target_dir)
+        self.keep_generations = keep_generations
+        self.path: Optional[Path] = None
+        self.committed = False
+
+    @property
+    def _prefix(self) -> str:
+        return f".{self.target_dir.name}"
+
+    @property
+    def generations_dir(self) -> Path:
+        """Directory holding this target's snapshots."""
+        return self.target_dir.parent / GENERATIONS_DIR / self.target_dir.name
+
+    def _sibling(self, kind: str) -> Path:
+        """Unique hidden path next to the target, tagged with this process id."""
+        return self.target_dir.parent / f"{self._prefix}.{kind}-{os.getpid()}-{time.monotonic_ns()}"
+
+    def __enter__(self) -> 'StagedOutput':
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # Anything not committed is discarded; the target is never touched
+        self.discard()
+
+    def open(self) -> Path:
+        """
+        Create the stage directory, recovering leftovers from crashed runs first.
+
+        Returns:
+            Path of the stage directory
+        """
+        self.target_dir.parent.mkdir(parents=True, exist_ok=True)
+        self.recover()
+
+        self.path = self._sibling('stage')
+        self.path.mkdir()
+        self.committed = False
+        return self.path
+
+    def recover(self) -> None:
+        """Finish publishes and delete stages abandoned by dead processes."""
+        for leftover in self.target_dir.parent.glob(f"{glob.escape(self._prefix)}.*-*"):
+            kind, _, rest = leftover.name[len(self._prefix) + 1:].partition('-')
+            pid = rest.split('-')[0]
+
+            if kind not in ('stage', 'displaced') or not pid.isdigit():
+                continue
+            if int(pid) == os.getpid() or _pid_alive(int(pid)):
+                continue
+
+            if kind == 'displaced' and not self.target_dir.exists():
+                # Crashed between the two fallback renames
+                leftover.rename(self.target_dir)
+                logger.warning(f"Restored {self.target_dir} from interrupted publish")
+            elif kind == 'displaced':
+                # Crashed after publishing but before snapshotting
+                self._retire(leftover)
+            else:
+                shutil.rmtree(leftover, ignore_errors=True)
+                logger.info(f"Removed abandoned stage {leftover}")
+
+    def commit(self) -> Optional[Path]:
+        """
+        Publish the stage as the target directory.
+
+        Returns:
+            Snapshot path of the displaced generation, or None if there was
+            no previous target or snapshots are disabled
+
+        Raises:
+            StagedOutputError: If the stage is not open or publishing fails
+        """
+        if self.path is None or self.committed:
+            raise StagedOutputError("Stage is not open")
+
+        displaced = None
+        try:
+            if not self.target_dir.exists():
+                self.path.rename(self.target_dir)
+            elif exchange_paths(self.path, self.target_dir):
+                # The stage path now holds the previous generation
+                displaced = self.path
+            else:
+                displaced = self._sibling('displaced')
+                self.target_dir.rename(displaced)
+                self.path.rename(self.target_dir)
+        except OSError as e:
+            raise StagedOutputError(f"Failed to publish {self.target_dir}: {e}")
+
+        self.committed = True
+        self.path = None
+
+        if displaced is None:
+            return None
+        return self._retire(displaced)
+
+    def discard(self) -> None:
+        """Delete the stage without publishing it."""
+        if self.path is not None:
+            shutil.rmtree(self.path, ignore_errors=True)
+            self.path = None
+
+    def _retire(self, displaced: Path) -> Optional[Path]:
+        """Move a displaced generation into the snapshots and prune old ones."""
+        if self.keep_generations <= 0:
+            shutil.rmtree(displaced, ignore_errors=True)
+            return None
+
+        self.generations_dir.mkdir(parents=True, exist_ok=True)
+        # Nanosecond UTC timestamps keep name order equal to age order (local
+        # time would repeat an hour when DST ends)
+        stamp = time.time_ns()
+        while True:
+            seconds, nanos = divmod(stamp, 10**9)
+            snapshot = self.generations_dir / (
+                f"{time.strftime('%Y%m%d-%H%M%S', time.gmtime(seconds))}.{nanos:09d}"
+            )
+            if not snapshot.exists():
+                break
+            stamp += 1
+
+        displaced.rename(snapshot)
+
+        for old in self.snapshots()[:-self.keep_generations]:
+            shutil.rmtree(old, ignore_errors=True)
+
+        return snapshot
+
+    def snapshots(self) -> List[Path]:
+        """Snapshots of previous generations, oldest first."""
+        if not self.generations_dir.exists():
+            return []
+        # Names are timestamps, so name order is age order
+        return sorted(p for p in self.generations_dir.iterdir() if p.is_dir())
+
+    def restore(self, snapshot: Optional[PathLike] = None) -> Optional[Path]:
+        """
+        Republish a snapshot as the target, keeping the snapshot itself.
+
+        Args:
+            snapshot: Snapshot to restore (defaults to the newest)
+
+        Returns:
+            Snapshot path of the generation displaced by the restore
+
+        Raises:
+            StagedOutputError: If there is no snapshot to restore
+        """
+        if snapshot is None:
+            available = self.snapshots()
+            if not available:
+                raise StagedOutputError(f"No snapshots of {self.target_dir}")
+            snapshot = available[-1]
+
+        self.open()
+        try:
+            # Hardlinks share the snapshot's data; replace the empty stage with them
+            self.path.rmdir()
+            hardlink_tree(snapshot, self.path)
+            return self.commit()
+        finally:
+            self.discard()
@@ -0,0 +1,234 @@
+"""
+Statement Manifest Module
+
+Persistent per-module record of how each statement directory was produced.
+
+For every module directory the manifest stores the source file fingerprint
+(size, mtime and SHA-256), the splitter parameters used, and the size, mtime
+and duration of every output file. A later run can then tell, from stat
+calls alone, whether a module's outputs are unchanged (reuse the stored
+durations instead of probing) and whether its source or parameters changed
+since it was last split (otherwise skip reprocessing).
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from .diarization_cache import hash_audio
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+PathLike = Union[str, Path]
+
+# Manifest file name inside the statements directory
+DEFAULT_MANIFEST_NAME = '.manifest.json'
+
+# Bump when the entry layout changes to invalidate old manifests
+MANIFEST_VERSION = 1
+
+
+def output_fingerprint(module_dir: PathLike) -> Dict[str, dict]:
+    """
+    Stat the MP3 outputs of a module directory.
+
+    Args:
+        module_dir: Statement directory
+
+    Returns:
+        Dictionary mapping file name to {'size', 'mtime_ns'}
+    """
+    fingerprint = {}
+    for path in sorted(Path(module_dir).glob('*.mp3')):
+        stat = path.stat()
+        fingerprint[path.name] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    return fingerprint
+
+
+class StatementManifest:
+    """JSON manifest of statement directory sources, parameters and outputs."""
+
+    def __init__(self, manifest_file: PathLike):
+        """
+        Initialize manifest.
+
+        Args:
+            manifest_file: Path to JSON manifest file (created on first save)
+        """
+        self.manifest_file = Path(manifest_file)
+        self._entries: Dict[str, dict] = self._load()
+        self._dirty = False
+
+    @classmethod
+    def for_statements(cls, statements_dir: PathLike) -> 'StatementManifest':
+        """Open the manifest kept inside a statements directory."""
+        return cls(Path(statements_dir) / DEFAULT_MANIFEST_NAME)
+
+    def _load(self) -> Dict[str, dict]:
+        """Load entries from disk, ignoring missing or stale manifests."""
+        if not self.manifest_file.exists():
+            return {}
+
+        try:
+            with open(self.manifest_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable manifest {self.manifest_file}: {e}")
+            return {}
+
+        if data.get('version') != MANIFEST_VERSION:
+            return {}
+
+        return data.get('modules', {})
+
+    def save(self) -> None:
+        """Write the manifest to disk if anything changed."""
+        if not self._dirty:
+            return
+
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.manifest_file.with_name(f"{self.manifest_file.name}.{os.getpid()}.tmp")
+
+        with open(temp_file, 'w') as f:
+            json.dump(
+                {'version': MANIFEST_VERSION, 'modules': self._entries}, f, indent=2, sort_keys=True
+            )
+
+        os.replace(temp_file, self.manifest_file)
+        self._dirty = False
+
+    def cached_durations(
+        self,
+        module: str,
+        fingerprint: Dict[str, dict]
+    ) -> Optional[Dict[str, Optional[float]]]:
+        """
+        Return recorded output durations if the outputs are unchanged.
+
+        Args:
+            module: Module directory name
+            fingerprint: Current output_fingerprint() of the directory
+
+        Returns:
+            Dictionary mapping file name to duration (None if unprobeable),
+            or None if any output was added, removed or modified
+        """
+        entry = self._entries.get(module)
+        if entry is None:
+            return None
+
+        outputs = entry.get('outputs', {})
+        if set(outputs) != set(fingerprint):
+            return None
+
+        for name, stat in fingerprint.items():
+            recorded = outputs[name]
+            if recorded['size'] != stat['size'] or recorded['mtime_ns'] != stat['mtime_ns']:
+                return None
+
+        return {name: outputs[name].get('duration') for name in outputs}
+
+    def record_outputs(
+        self,
+        module: str,
+        fingerprint: Dict[str, dict],
+        durations: Dict[str, Optional[float]]
+    ) -> None:
+        """
+        Record the current outputs of a module and their durations.
+
+        Args:
+            module: Module directory name
+            fingerprint: output_fingerprint() of the directory
+            durations: Duration per file name (None if unprobeable)
+        """
+        entry = self._entries.setdefault(module, {})
+        entry['outputs'] = {
+            name: dict(stat, duration=durations.get(name))
+            for name, stat in fingerprint.items()
+        }
+        self._dirty = True
+
+    def _source_matches(self, recorded: dict, source_file: Path) -> bool:
+        """Compare a source file with its recorded fingerprint, hashing only if stat differs."""
+        stat = source_file.stat()
+        if recorded['size'] != stat.st_size:
+            return False
+        if recorded['mtime_ns'] == stat.st_mtime_ns:
+            return True
+
+        # Touched but possibly unchanged; refresh the mtime if the content matches
+        if hash_audio(source_file) != recorded['sha256']:
+            return False
+
+        recorded['mtime_ns'] = stat.st_mtime_ns
+        self._dirty = True
+        return True
+
+    def is_current(
+        self,
+        module: str,
+        module_dir: PathLike,
+        source_file: PathLike,
+        params: dict
+    ) -> bool:
+        """
+        Check whether a module was produced from this source with these parameters.
+
+        Args:
+            module: Module directory name
+            module_dir: Statement directory
+            source_file: Original (no pauses) audio file
+            params: Splitter parameters that would be used now
+
+        Returns:
+            True if source, parameters and outputs all match the manifest
+        """
+        entry = self._entries.get(module)
+        if not entry or 'source' not in entry:
+            return False
+
+        if entry.get('params') != params:
+            return False
+
+        if self.cached_durations(module, output_fingerprint(module_dir)) is None:
+            return False
+
+        return self._source_matches(entry['source'], Path(source_file))
+
+    def record_run(
+        self,
+        module: str,
+        module_dir: PathLike,
+        source_file: PathLike,
+        params: dict,
+        durations: Dict[str, Optional[float]]
+    ) -> None:
+        """
+        Record a successful split of a module.
+
+        Args:
+            module: Module directory name
+            module_dir: Statement directory holding the new outputs
+            source_file: Original audio file that was split
+            params: Splitter parameters used
+            durations: Duration per output file name
+        """
+        source_file = Path(source_file)
+        stat = source_file.stat()
+
+        entry = self._entries.setdefault(module, {})
+        entry['source'] = {
+            'path': str(source_file),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': hash_audio(source_file)
+        }
+        entry['params'] = params
+        entry['updated'] = datetime.now().isoformat(timespec='seconds')
+        self._dirty = True
+
+        self.record_outputs(module, output_fingerprint(module_dir), durations)
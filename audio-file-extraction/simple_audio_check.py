@@ -2,16 +2,32 @@
 """
 Simple Audio Analysis using ffmpeg only
 Checks audio characteristics to identify potential multi-statement files
+
+Directories can be analyzed with a process pool (--jobs) and every result
+streamed to a JSON-lines report (--report) as soon as its file finishes.
 """
 
 import subprocess
 import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 import argparse
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from scripts.utils.silence_detection import SilenceDetectionError, detect_silences
+
+
+def get_audio_info(file_path, timeout=None):
+    """
+    Get detailed audio information using ffprobe.
 
-def get_audio_info(file_path):
-    """Get detailed audio information using ffprobe."""
+    Raises:
+        subprocess.CalledProcessError, subprocess.TimeoutExpired,
+        json.JSONDecodeError: If the file cannot be probed
+    """
     cmd = [
         'ffprobe',
         '-v', 'quiet',
@@ -21,109 +37,123 @@ def get_audio_info(file_path):
         str(file_path)
     ]
 
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)
-        return data
-    except (subprocess.CalledProcessError, json.JSONDecodeError) as e:
-        print(f"ERROR getting info for {file_path}: {e}")
-        return None
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=timeout)
+    return json.loads(result.stdout)
 
 
-def detect_silences_detailed(file_path, threshold_db=-50, min_duration=0.2):
-    """Detect silences with detailed information."""
-    cmd = [
-        'ffmpeg', '-i', str(file_path),
-        '-af', f'silencedetect=noise={threshold_db}dB:d={min_duration}',
-        '-f', 'null', '-'
+def detect_silences_detailed(file_path, threshold_db=-50, min_duration=0.2, timeout=None):
+    """
+    Detect silences with detailed information.
+
+    Raises:
+        FileNotFoundError: If ffmpeg is not installed
+        SilenceDetectionError: If the file cannot be decoded or times out
+    """
+    return [
+        {'start': start, 'end': end, 'duration': end - start}
+        for start, end in detect_silences(
+            file_path, threshold_db, min_duration, include_trailing=True, timeout=timeout
+        )
     ]
 
+
+def speech_segments_between(silences, duration):
+    """Calculate speech segments (between silences)."""
+    speech_segments = []
+    prev_end = 0
+
+    for silence in silences:
+        if silence['start'] > prev_end:
+            speech_segments.append({
+                'start': prev_end,
+                'end': silence['start'],
+                'duration': silence['start'] - prev_end
+            })
+        prev_end = silence['end']
+
+    # Add final segment if any
+    if prev_end < duration:
+        speech_segments.append({
+            'start': prev_end,
+            'end': duration,
+            'duration': duration - prev_end
+        })
+
+    return speech_segments
+
+
+def check_file(file_path, silence_threshold=-50, timeout=None):
+    """
+    Analyze a single audio file without printing.
+
+    Safe to run in a worker process. Failures are reported in the
+    'error' field rather than raised.
+    """
+    started = time.monotonic()
+    result = {
+        'filename': Path(file_path).name,
+        'path': str(file_path),
+        'error': None
+    }
+
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+        info = get_audio_info(file_path, timeout=timeout)
+    except (FileNotFoundError, subprocess.CalledProcessError, subprocess.TimeoutExpired,
+            json.JSONDecodeError) as e:
+        result['error'] = f'ffprobe failed: {e}'
+        result['elapsed'] = time.monotonic() - started
+        return result
+
+    duration = float(info['format']['duration'])
+
+    # Whatever remains of the per-file budget goes to silence detection
+    remaining = None
+    if timeout is not None:
+        remaining = max(0.1, timeout - (time.monotonic() - started))
 
+    try:
+        silences = detect_silences_detailed(file_path, silence_threshold, timeout=remaining)
+    except (FileNotFoundError, SilenceDetectionError) as e:
         silences = []
-        lines = result.stderr.split('\n')
-
-        silence_start = None
-        for line in lines:
-            if 'silence_start' in line:
-                parts = line.split()
-                for i, part in enumerate(parts):
-                    if part == 'silence_start:':
-                        silence_start = float(parts[i+1])
-
-            elif 'silence_end' in line and silence_start is not None:
-                parts = line.split()
-                silence_end = None
-                silence_duration = None
-
-                for i, part in enumerate(parts):
-                    if part == 'silence_end:':
-                        silence_end = float(parts[i+1])
-                    elif part == 'silence_duration:':
-                        silence_duration = float(parts[i+1])
-
-                if silence_end:
-                    silences.append({
-                        'start': silence_start,
-                        'end': silence_end,
-                        'duration': silence_duration or (silence_end - silence_start)
-                    })
-                silence_start = None
-
-        return silences
-
-    except Exception as e:
-        print(f"ERROR detecting silences in {file_path}: {e}")
-        return []
-
-
-def analyze_file(file_path, silence_threshold=-50):
+        result['error'] = str(e)
+
+    result.update({
+        'duration': duration,
+        'bitrate_kbps': int(info['format'].get('bit_rate', 0)) / 1000,
+        'size': int(info['format']['size']),
+        'silence_count': len(silences),
+        'silences': silences,
+        'speech_segments': speech_segments_between(silences, duration) if silences else [],
+        'elapsed': time.monotonic() - started
+    })
+    return result
+
+
+def analyze_file(file_path, silence_threshold=-50, timeout=None):
     """Analyze a single audio file."""
     print(f"\nAnalyzing: {Path(file_path).name}")
     print("-" * 80)
 
-    # Get basic info
-    info = get_audio_info(file_path)
-    if not info:
-        return None
+    result = check_file(file_path, silence_threshold, timeout)
+    if 'duration' not in result:
+        print(f"ERROR getting info for {file_path}: {result['error']}")
+        return result
 
-    duration = float(info['format']['duration'])
-    bitrate = int(info['format'].get('bit_rate', 0)) / 1000  # Convert to kbps
+    print(f"  Duration: {result['duration']:.2f}s")
+    print(f"  Bitrate: {result['bitrate_kbps']:.0f} kbps")
+    print(f"  Size: {result['size'] / 1024:.1f} KB")
 
-    print(f"  Duration: {duration:.2f}s")
-    print(f"  Bitrate: {bitrate:.0f} kbps")
-    print(f"  Size: {int(info['format']['size']) / 1024:.1f} KB")
+    if result['error']:
+        print(f"ERROR detecting silences in {file_path}: {result['error']}")
 
-    # Detect silences
-    silences = detect_silences_detailed(file_path, threshold_db=silence_threshold)
+    silences = result['silences']
+    speech_segments = result['speech_segments']
 
     if silences:
         print(f"\n  Detected {len(silences)} silence periods:")
         for i, silence in enumerate(silences, 1):
             print(f"    {i}. {silence['start']:.2f}s - {silence['end']:.2f}s (duration: {silence['duration']:.2f}s)")
 
-        # Calculate speech segments (between silences)
-        speech_segments = []
-        prev_end = 0
-
-        for silence in silences:
-            if silence['start'] > prev_end:
-                speech_segments.append({
-                    'start': prev_end,
-                    'end': silence['start'],
-                    'duration': silence['start'] - prev_end
-                })
-            prev_end = silence['end']
-
-        # Add final segment if any
-        if prev_end < duration:
-            speech_segments.append({
-                'start': prev_end,
-                'end': duration,
-                'duration': duration - prev_end
-            })
-
         if speech_segments:
             print(f"\n  Speech segments: {len(speech_segments)}")
             for i, seg in enumerate(speech_segments, 1):
@@ -141,18 +171,40 @@ def analyze_file(file_path, silence_threshold=-50):
     else:
         print("  No silences detected")
 
-    return {
-        'filename': Path(file_path).name,
-        'duration': duration,
-        'silence_count': len(silences),
-        'silences': silences
-    }
-
-
-def analyze_directory(directory, threshold=-50):
-    """Analyze all MP3 files in a directory."""
+    return result
+
+
+def iter_parallel_checks(mp3_files, threshold, timeout, jobs):
+    """Yield check_file results from a process pool in completion order."""
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(check_file, str(mp3_file), threshold, timeout): mp3_file
+            for mp3_file in mp3_files
+        }
+
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                mp3_file = futures[future]
+                yield {'filename': mp3_file.name, 'path': str(mp3_file), 'error': f"Worker failed: {e}"}
+
+
+def analyze_directory(directory, threshold=-50, jobs=1, timeout=None, report_path=None, recursive=False):
+    """
+    Analyze all MP3 files in a directory.
+
+    Args:
+        directory: Directory to scan
+        threshold: Silence detection threshold in dB
+        jobs: Worker processes; 1 analyzes in-process with detailed output
+        timeout: Per-file time limit in seconds
+        report_path: JSON-lines file that receives one record per file as it finishes
+        recursive: Also scan subdirectories
+    """
     directory = Path(directory)
-    mp3_files = sorted(directory.glob('*.mp3'))
+    pattern = '**/*.mp3' if recursive else '*.mp3'
+    mp3_files = sorted(directory.glob(pattern))
 
     if not mp3_files:
         print(f"No MP3 files found in {directory}")
@@ -163,11 +215,38 @@ def analyze_directory(directory, threshold=-50):
     print(f"Found {len(mp3_files)} MP3 files")
     print(f"{'='*80}")
 
+    if jobs > 1:
+        checks = iter_parallel_checks(mp3_files, threshold, timeout, jobs)
+    else:
+        checks = (analyze_file(str(mp3_file), threshold, timeout) for mp3_file in mp3_files)
+
+    report = open(report_path, 'w', encoding='utf-8') if report_path else None
     results = []
-    for mp3_file in mp3_files:
-        result = analyze_file(str(mp3_file), threshold)
-        if result:
-            results.append(result)
+    failures = []
+    started = time.monotonic()
+
+    try:
+        for done, result in enumerate(checks, 1):
+            if report:
+                report.write(json.dumps(result) + '\n')
+                report.flush()
+
+            if 'duration' in result:
+                results.append(result)
+            if result['error']:
+                failures.append(result)
+
+            if jobs > 1:
+                status = f"ERROR: {result['error']}" if result['error'] else (
+                    f"{result['duration']:.1f}s, {result['silence_count']} silences"
+                )
+                print(f"[{done}/{len(mp3_files)}] {result['filename']}: {status} "
+                      f"({time.monotonic() - started:.1f}s elapsed)")
+    finally:
+        if report:
+            report.close()
+
+    results.sort(key=lambda r: r['path'])
 
     # Summary
     print(f"\n\n{'='*80}")
@@ -189,6 +268,14 @@ def analyze_directory(directory, threshold=-50):
     else:
         print("  None detected")
 
+    if failures:
+        print(f"\n\nFailed files ({len(failures)}):")
+        for result in failures:
+            print(f"  - {result['filename']}: {result['error']}")
+
+    if report_path:
+        print(f"\nReport written to: {report_path}")
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -204,9 +291,33 @@ def main():
         default=-50,
         help='Silence detection threshold in dB (default: -50)'
     )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='Worker processes for directory analysis (default: 1)'
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=None,
+        help='Per-file time limit in seconds (default: none)'
+    )
+    parser.add_argument(
+        '--report',
+        help='Write one JSON line per file to this path as each file finishes'
+    )
+    parser.add_argument(
+        '-r', '--recursive',
+        action='store_true',
+        help='Include MP3 files in subdirectories'
+    )
 
     args = parser.parse_args()
 
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+
     input_path = Path(args.input)
 
     if not input_path.exists():
@@ -214,9 +325,16 @@ def main():
         return
 
     if input_path.is_file():
-        analyze_file(str(input_path), args.threshold)
+        analyze_file(str(input_path), args.threshold, args.timeout)
     elif input_path.is_dir():
-        analyze_directory(input_path, args.threshold)
+        analyze_directory(
+            input_path,
+            args.threshold,
+            jobs=args.jobs,
+            timeout=args.timeout,
+            report_path=args.report,
+            recursive=args.recursive
+        )
     else:
         print(f"ERROR: Invalid path: {input_path}")
 
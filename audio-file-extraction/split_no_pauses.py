@@ -5,13 +5,28 @@ Splits audio files at silence boundaries into individual statement files
 """
 
 import subprocess
-import re
 import os
 import sys
 from pathlib import Path
 from typing import List, Tuple
 import argparse
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from scripts.utils.file_parser import statement_base, statement_output_dir
+from scripts.utils.media_metadata import get_metadata_service
+from scripts.utils.silence_detection import (
+    SilenceDetectionError,
+    detect_silences,
+    parse_float_list,
+    run_sweep,
+)
+from scripts.utils.staged_output import StagedOutput, escape_segment_pattern
+
+
+# Subdirectory of output/ for statements when no output directory is given
+STATEMENTS_DIR = 'statements'
+
 
 class AudioSplitter:
     def __init__(self, threshold_db=-50, min_duration=0.2):
@@ -27,7 +42,7 @@ class AudioSplitter:
 
     def detect_silences(self, input_file: str) -> List[Tuple[float, float]]:
         """
-        Run ffmpeg silencedetect and parse output to find silence periods.
+        Stream decoded audio through the shared silence detector.
 
         Args:
             input_file: Path to the input audio file
@@ -38,40 +53,14 @@ class AudioSplitter:
         print(f"Detecting silences in: {input_file}")
         print(f"Parameters: threshold={self.threshold_db}dB, min_duration={self.min_duration}s")
 
-        cmd = [
-            'ffmpeg', '-i', input_file,
-            '-af', f'silencedetect=noise={self.threshold_db}dB:d={self.min_duration}',
-            '-f', 'null', '-'
-        ]
-
         try:
-            result = subprocess.run(
-                cmd,
-                stderr=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                text=True,
-                check=False
-            )
+            silence_periods = list(detect_silences(input_file, self.threshold_db, self.min_duration))
         except FileNotFoundError:
             print("ERROR: ffmpeg not found. Please install ffmpeg.")
             sys.exit(1)
-
-        # Parse silence_start and silence_end from output
-        silence_periods = []
-        silence_start = None
-
-        for line in result.stderr.split('\n'):
-            if 'silence_start' in line:
-                match = re.search(r'silence_start: ([\d.]+)', line)
-                if match:
-                    silence_start = float(match.group(1))
-
-            elif 'silence_end' in line and silence_start is not None:
-                match = re.search(r'silence_end: ([\d.]+)', line)
-                if match:
-                    silence_end = float(match.group(1))
-                    silence_periods.append((silence_start, silence_end))
-                    silence_start = None
+        except SilenceDetectionError as e:
+            print(f"ERROR: {e}")
+            return []
 
         print(f"Found {len(silence_periods)} silence periods")
         return silence_periods
@@ -98,6 +87,9 @@ class AudioSplitter:
         """
         Split audio at given timestamps using ffmpeg segment muxer.
 
+        Segments are written under their final statement names, so no
+        rename pass is needed.
+
         Args:
             input_file: Path to input audio file
             split_points: List of timestamps in seconds
@@ -115,8 +107,9 @@ class AudioSplitter:
         # Create segment times string
         segment_times = ','.join([f'{t:.3f}' for t in split_points])
 
-        # Temporary output pattern
-        temp_pattern = os.path.join(output_dir, 'segment_%03d.mp3')
+        # Final names: "{base}, Statement 001.mp3", ...
+        base = statement_base(input_file)
+        pattern = os.path.join(output_dir, f"{escape_segment_pattern(base)}, Statement %03d.mp3")
 
         print(f"Splitting audio into {len(split_points) + 1} segments...")
 
@@ -124,8 +117,9 @@ class AudioSplitter:
             'ffmpeg', '-i', input_file,
             '-f', 'segment',
             '-segment_times', segment_times,
+            '-segment_start_number', '1',
             '-c', 'copy',  # Copy codec (no re-encoding)
-            temp_pattern
+            pattern
         ]
 
         result = subprocess.run(
@@ -141,53 +135,22 @@ class AudioSplitter:
             return []
 
         # Find all created segments
+        prefix = f"{base}, Statement "
         output_files = sorted([
             os.path.join(output_dir, f)
             for f in os.listdir(output_dir)
-            if f.startswith('segment_') and f.endswith('.mp3')
+            if f.startswith(prefix) and f.endswith('.mp3')
         ])
 
         print(f"Created {len(output_files)} audio segments")
-        return output_files
-
-    def rename_outputs(self, segment_files: List[str], base_name: str) -> List[str]:
-        """
-        Rename segments to proper naming scheme.
-
-        Format: "{base}, Listen and Choose, Module X, Statement NNN.mp3"
-
-        Args:
-            segment_files: List of temporary segment file paths
-            base_name: Original filename (e.g., "02.03.02, Listen and Choose, Module 2 (no pauses).mp3")
-
-        Returns:
-            List of renamed file paths
-        """
-        # Extract base prefix and module number from filename
-        # Pattern: "02.03.02, Listen and Choose, Module 2 (no pauses).mp3"
-        # Result: "02.03.02, Listen and Choose, Module 2"
-        base = base_name.replace(' (no pauses).mp3', '').replace('.mp3', '')
-
-        renamed_files = []
-        output_dir = os.path.dirname(segment_files[0]) if segment_files else '.'
-
-        for i, old_path in enumerate(segment_files, start=1):
-            new_name = f"{base}, Statement {i:03d}.mp3"
-            new_path = os.path.join(output_dir, new_name)
+        for i, path in enumerate(output_files, start=1):
+            print(f"  [{i:3d}] {os.path.basename(path)}")
 
-            try:
-                os.rename(old_path, new_path)
-                renamed_files.append(new_path)
-                print(f"  [{i:3d}] {new_name}")
-            except OSError as e:
-                print(f"ERROR renaming {old_path} to {new_path}: {e}")
-                renamed_files.append(old_path)
-
-        return renamed_files
+        return output_files
 
     def get_audio_duration(self, file_path: str) -> float:
         """
-        Get duration of audio file using ffprobe.
+        Get duration of audio file via the shared metadata service.
 
         Args:
             file_path: Path to audio file
@@ -195,24 +158,7 @@ class AudioSplitter:
         Returns:
             Duration in seconds, or 0 if failed
         """
-        cmd = [
-            'ffprobe', '-v', 'error',
-            '-show_entries', 'format=duration',
-            '-of', 'default=noprint_wrappers=1:nokey=1',
-            file_path
-        ]
-
-        try:
-            result = subprocess.run(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                check=True
-            )
-            return float(result.stdout.strip())
-        except (subprocess.CalledProcessError, ValueError, FileNotFoundError):
-            return 0.0
+        return get_metadata_service().get_duration(file_path)
 
     def validate_segments(self, segment_files: List[str]) -> dict:
         """
@@ -230,6 +176,9 @@ class AudioSplitter:
         sizes = []
         issues = []
 
+        # Probe all segments in one batch; the loop below then hits the cache
+        get_metadata_service().probe_many(segment_files)
+
         for file_path in segment_files:
             # Check file exists and has size
             if not os.path.exists(file_path):
@@ -298,8 +247,7 @@ class AudioSplitter:
 
         # Auto-generate output directory if not provided
         if output_dir is None:
-            base_name = input_path.stem.replace(' (no pauses)', '')
-            output_dir = os.path.join('output', 'statements', base_name)
+            output_dir = statement_output_dir(input_file, STATEMENTS_DIR)
 
         print(f"\n{'='*80}")
         print(f"Processing: {input_path.name}")
@@ -323,18 +271,14 @@ class AudioSplitter:
             print("ERROR: No segments created")
             return [], {}
 
-        # Step 4: Rename to proper naming scheme
-        print(f"\nRenaming {len(segment_files)} segments...")
-        renamed_files = self.rename_outputs(segment_files, input_path.name)
-
         # Step 5: Validate
-        stats = self.validate_segments(renamed_files)
+        stats = self.validate_segments(segment_files)
 
         print(f"\n{'='*80}")
-        print(f"COMPLETE: {len(renamed_files)} statements created")
+        print(f"COMPLETE: {len(segment_files)} statements created")
         print(f"{'='*80}\n")
 
-        return renamed_files, stats
+        return segment_files, stats
 
 
 def main():
@@ -362,24 +306,51 @@ def main():
         default=0.2,
         help='Minimum silence duration in seconds (default: 0.2)'
     )
+    parser.add_argument(
+        '--sweep',
+        action='store_true',
+        help='Report segment counts for a grid of threshold/duration settings instead of '
+             'splitting (input may be a directory)'
+    )
+    parser.add_argument(
+        '--sweep-thresholds',
+        type=parse_float_list,
+        default=[-60, -55, -50, -45, -40],
+        help='Comma-separated thresholds in dB for --sweep (default: -60,-55,-50,-45,-40)'
+    )
+    parser.add_argument(
+        '--sweep-durations',
+        type=parse_float_list,
+        default=[0.1, 0.2, 0.3, 0.5, 0.75],
+        help='Comma-separated minimum silence durations for --sweep (default: 0.1,0.2,0.3,0.5,0.75)'
+    )
 
     args = parser.parse_args()
 
+    if args.sweep:
+        if not run_sweep(args.input_file, args.sweep_thresholds, args.sweep_durations, 1.0):
+            sys.exit(1)
+        return
+
     # Create splitter with specified parameters
     splitter = AudioSplitter(
         threshold_db=args.threshold,
         min_duration=args.duration
     )
 
-    # Process file
-    output_files, stats = splitter.process_file(
-        args.input_file,
-        args.output_dir
-    )
+    # Process file into a stage, then publish the whole directory at once
+    output_dir = args.output_dir or statement_output_dir(args.input_file, STATEMENTS_DIR)
+    with StagedOutput(output_dir) as stage:
+        output_files, stats = splitter.process_file(
+            args.input_file,
+            str(stage.path)
+        )
+        if output_files:
+            stage.commit()
 
     if output_files:
         print(f"\nSuccess! Created {len(output_files)} statement files.")
-        print(f"Output directory: {os.path.dirname(output_files[0])}")
+        print(f"Output directory: {output_dir}")
 
         if stats.get('issues'):
             print(f"\nNote: {len(stats['issues'])} potential issues detected. Review validation output above.")
@@ -5,17 +5,33 @@ Splits audio files using speaker detection + silence analysis for better stateme
 """
 
 import subprocess
-import re
 import os
 import sys
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import List, Tuple
 import argparse
 import json
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from scripts.utils.chunked_diarization import ChunkedDiarizer, configure_pipeline
+from scripts.utils.diarization_cache import DiarizationCache
+from scripts.utils.file_parser import statement_base, statement_output_dir
+from scripts.utils.media_metadata import get_metadata_service
+from scripts.utils.speaker_change import METHODS as SPECTRAL_METHODS, SpectralChangeDetector
+from scripts.utils.staged_output import StagedOutput, escape_segment_pattern
+from scripts.utils.silence_detection import (
+    SilenceDetectionError,
+    SilenceIndex,
+    detect_silences,
+    parse_float_list,
+    run_sweep,
+)
+
 # Check for speaker diarization libraries
 try:
     from pyannote.audio import Pipeline
+    import pyannote.audio
     PYANNOTE_AVAILABLE = True
 except ImportError:
     PYANNOTE_AVAILABLE = False
@@ -32,6 +48,17 @@ except ImportError:
     TORCH_AVAILABLE = False
     print("WARNING: torch/numpy not available for advanced processing")
 
+# Diarization model; cached results are keyed by this name and the library version
+PIPELINE_NAME = "pyannote/speaker-diarization-3.1"
+
+# Speaker change sources: the pyannote model, the NumPy spectral detector,
+# or pyannote with the spectral detector as fallback
+SPEAKER_BACKENDS = ('pyannote', 'spectral', 'auto')
+
+
+# Subdirectory of output/ for statements when no output directory is given
+STATEMENTS_DIR = 'statements_improved'
+
 
 class SpeakerAwareSplitter:
     """
@@ -45,7 +72,15 @@ class SpeakerAwareSplitter:
         silence_min_duration=0.2,
         min_segment_duration=1.5,
         use_speaker_detection=True,
-        hf_token=None
+        hf_token=None,
+        diarization_cache=None,
+        use_diarization_cache=True,
+        diarization_window=None,
+        diarization_overlap=30.0,
+        torch_threads=None,
+        diarization_batch_size=None,
+        speaker_backend='pyannote',
+        spectral_method='bic'
     ):
         """
         Initialize the splitter.
@@ -56,35 +91,136 @@ class SpeakerAwareSplitter:
             min_segment_duration: Minimum duration for output segments
             use_speaker_detection: Whether to use speaker diarization
             hf_token: HuggingFace token for pyannote.audio (or set HF_TOKEN env var)
+            diarization_cache: DiarizationCache to use (defaults to the standard location)
+            use_diarization_cache: Reuse cached speaker turns instead of re-running the model
+            diarization_window: Diarize in overlapping windows of this many seconds
+                (None runs the pipeline on the whole file)
+            diarization_overlap: Overlap between diarization windows in seconds
+            torch_threads: Cap on torch intra-op threads (None leaves torch's default)
+            diarization_batch_size: Segmentation/embedding inference batch size
+            speaker_backend: 'pyannote', 'spectral' (NumPy only, no model or token)
+                or 'auto' (pyannote, falling back to spectral when unavailable)
+            spectral_method: Change scoring for the spectral backend ('bic' or 'cosine')
         """
+        if speaker_backend not in SPEAKER_BACKENDS:
+            raise ValueError(
+                f"Unknown speaker backend: {speaker_backend}. Expected one of {SPEAKER_BACKENDS}"
+            )
+
         self.silence_threshold_db = silence_threshold_db
         self.silence_min_duration = silence_min_duration
         self.min_segment_duration = min_segment_duration
-        self.use_speaker_detection = use_speaker_detection and PYANNOTE_AVAILABLE
+        self.use_speaker_detection = (
+            use_speaker_detection and PYANNOTE_AVAILABLE and speaker_backend != 'spectral'
+        )
+        self.speaker_backend = speaker_backend
+        self.spectral_method = spectral_method
+        self.diarization_window = diarization_window
+        self.diarization_overlap = diarization_overlap
+        self.torch_threads = torch_threads
+        self.diarization_batch_size = diarization_batch_size
+
+        if diarization_window and not 0 <= diarization_overlap < diarization_window:
+            raise ValueError("Diarization overlap must be shorter than the window")
+
+        self.diarization_cache = None
+        if use_diarization_cache:
+            self.diarization_cache = diarization_cache or DiarizationCache()
 
+        # The model is loaded on the first cache miss, not here
         self.pipeline = None
+        self.hf_token = None
         if self.use_speaker_detection:
-            token = hf_token or os.environ.get('HF_TOKEN')
-            if not token:
+            self.hf_token = hf_token or os.environ.get('HF_TOKEN')
+            if not self.hf_token:
                 print("WARNING: No HuggingFace token provided. Speaker detection disabled.")
                 print("Set HF_TOKEN environment variable or pass --hf-token")
                 print("Get token at: https://huggingface.co/settings/tokens")
                 self.use_speaker_detection = False
+
+        # Spectral detection needs neither pyannote nor a token
+        self.spectral_detector = None
+        if use_speaker_detection and not self.use_speaker_detection and speaker_backend != 'pyannote':
+            self._use_spectral_detector()
+
+        # Fixed here so a later lazy model-load failure does not change params
+        self._speaker_detection_setting = self._speaker_detection_label()
+
+    def _use_spectral_detector(self) -> None:
+        """Switch speaker change detection to the NumPy spectral detector."""
+        if self.speaker_backend == 'auto':
+            print("Using spectral speaker change detection instead of pyannote")
+        self.spectral_detector = SpectralChangeDetector(method=self.spectral_method)
+        self.use_speaker_detection = True
+
+    @property
+    def pipeline_id(self) -> str:
+        """Pipeline name and library version used to key cached results."""
+        version = pyannote.audio.__version__ if PYANNOTE_AVAILABLE else 'unavailable'
+        pipeline_id = f"{PIPELINE_NAME}@{version}"
+
+        # Windowed runs can label turns near window edges differently
+        if self.diarization_window:
+            pipeline_id += f"+window{self.diarization_window:g}/{self.diarization_overlap:g}"
+
+        return pipeline_id
+
+    def _speaker_detection_label(self) -> str:
+        """Describe the speaker detection currently in use."""
+        if not self.use_speaker_detection:
+            return 'none'
+        if self.spectral_detector is not None:
+            return f"spectral:{self.spectral_method}"
+        return self.pipeline_id
+
+    @property
+    def params(self) -> dict:
+        """
+        Settings that determine the split output, for reprocessing manifests.
+
+        Built from the configuration resolved at construction, not from
+        whether the diarization model later loads, so a module processed
+        after a failed load still matches on the next run.
+        """
+        return {
+            'silence_threshold_db': self.silence_threshold_db,
+            'silence_min_duration': self.silence_min_duration,
+            'min_segment_duration': self.min_segment_duration,
+            'speaker_detection': self._speaker_detection_setting
+        }
+
+    def load_pipeline(self) -> bool:
+        """
+        Load the diarization model if it is not loaded yet.
+
+        Returns:
+            True if the pipeline is ready, False if loading failed
+        """
+        if self.pipeline is not None:
+            return True
+
+        try:
+            self.pipeline = Pipeline.from_pretrained(PIPELINE_NAME, token=self.hf_token)
+            configure_pipeline(
+                self.pipeline,
+                num_threads=self.torch_threads,
+                embedding_batch_size=self.diarization_batch_size,
+                segmentation_batch_size=self.diarization_batch_size
+            )
+            print("✓ Speaker diarization loaded successfully")
+            return True
+        except Exception as e:
+            print(f"WARNING: Failed to load speaker diarization: {e}")
+            if self.speaker_backend == 'auto':
+                self._use_spectral_detector()
             else:
-                try:
-                    self.pipeline = Pipeline.from_pretrained(
-                        "pyannote/speaker-diarization-3.1",
-                        token=token
-                    )
-                    print("✓ Speaker diarization loaded successfully")
-                except Exception as e:
-                    print(f"WARNING: Failed to load speaker diarization: {e}")
-                    print("Falling back to silence detection only")
-                    self.use_speaker_detection = False
+                print("Falling back to silence detection only")
+                self.use_speaker_detection = False
+            return False
 
     def detect_silences(self, input_file: str) -> List[Tuple[float, float]]:
         """
-        Run ffmpeg silencedetect to find silence periods.
+        Stream decoded audio through the shared silence detector.
 
         Args:
             input_file: Path to the input audio file
@@ -95,46 +231,23 @@ class SpeakerAwareSplitter:
         print(f"Detecting silences...")
         print(f"  Parameters: threshold={self.silence_threshold_db}dB, min_duration={self.silence_min_duration}s")
 
-        cmd = [
-            'ffmpeg', '-i', input_file,
-            '-af', f'silencedetect=noise={self.silence_threshold_db}dB:d={self.silence_min_duration}',
-            '-f', 'null', '-'
-        ]
-
         try:
-            result = subprocess.run(
-                cmd,
-                stderr=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                text=True,
-                check=False
-            )
+            silence_periods = list(detect_silences(
+                input_file, self.silence_threshold_db, self.silence_min_duration
+            ))
         except FileNotFoundError:
             print("ERROR: ffmpeg not found. Please install ffmpeg.")
             sys.exit(1)
-
-        silence_periods = []
-        silence_start = None
-
-        for line in result.stderr.split('\n'):
-            if 'silence_start' in line:
-                match = re.search(r'silence_start: ([\d.]+)', line)
-                if match:
-                    silence_start = float(match.group(1))
-
-            elif 'silence_end' in line and silence_start is not None:
-                match = re.search(r'silence_end: ([\d.]+)', line)
-                if match:
-                    silence_end = float(match.group(1))
-                    silence_periods.append((silence_start, silence_end))
-                    silence_start = None
+        except SilenceDetectionError as e:
+            print(f"  ERROR: {e}")
+            return []
 
         print(f"  Found {len(silence_periods)} silence periods")
         return silence_periods
 
     def detect_speaker_changes(self, input_file: str) -> List[Tuple[float, str]]:
         """
-        Use pyannote.audio to detect speaker changes.
+        Detect speaker changes with pyannote.audio or the spectral detector.
 
         Args:
             input_file: Path to the input audio file
@@ -145,16 +258,46 @@ class SpeakerAwareSplitter:
         if not self.use_speaker_detection:
             return []
 
-        print("Running speaker diarization...")
+        turns = None
+        cache_key = None
+        if self.diarization_cache and self.spectral_detector is None:
+            # Hash the audio once for both the lookup and the store on a miss
+            cache_key = self.diarization_cache.key(input_file, self.pipeline_id)
+            turns = self.diarization_cache.load(cache_key)
+            if turns is not None:
+                print("Using cached speaker diarization...")
 
         try:
-            # Run diarization
-            diarization = self.pipeline(input_file)
+            # Under 'auto' a failed model load switches to the spectral detector
+            if turns is None and self.spectral_detector is None:
+                if not self.load_pipeline() and self.spectral_detector is None:
+                    return []
+
+            if self.spectral_detector is not None:
+                # Fast enough that caching is not worthwhile
+                print(f"Detecting speaker changes from spectral features ({self.spectral_method})...")
+                turns = self.spectral_detector.detect(input_file)
+
+            elif turns is None:
+                if self.diarization_window:
+                    print(f"Running speaker diarization in {self.diarization_window:g}s windows...")
+                    turns = ChunkedDiarizer(
+                        self.pipeline, self.diarization_window, self.diarization_overlap
+                    )(input_file)
+                else:
+                    print("Running speaker diarization...")
+                    diarization = self.pipeline(input_file)
+
+                    turns = [
+                        (turn.start, turn.end, speaker)
+                        for turn, _, speaker in diarization.itertracks(yield_label=True)
+                    ]
+
+                if cache_key:
+                    self.diarization_cache.store(cache_key, turns)
 
             # Extract speaker change points
-            speaker_segments = []
-            for turn, _, speaker in diarization.itertracks(yield_label=True):
-                speaker_segments.append((turn.start, speaker))
+            speaker_segments = [(start, speaker) for start, _, speaker in turns]
 
             print(f"  Found {len(speaker_segments)} speaker segments")
 
@@ -195,6 +338,9 @@ class SpeakerAwareSplitter:
 
         split_points = []
 
+        # Binary-search lookups keep this O((changes + silences) log silences)
+        silence_index = SilenceIndex(silence_periods)
+
         if not speaker_segments:
             # Fallback to silence-only detection
             print("  No speaker segments - using silence only")
@@ -212,11 +358,7 @@ class SpeakerAwareSplitter:
                 # Only split on actual speaker changes
                 if prev_speaker != curr_speaker:
                     # Look for nearby silence within ±0.5 seconds
-                    nearby_silence = self._find_nearest_silence(
-                        speaker_change_time,
-                        silence_periods,
-                        window=0.5
-                    )
+                    nearby_silence = silence_index.nearest(speaker_change_time, window=0.5)
 
                     if nearby_silence:
                         # Use silence midpoint for clean cut
@@ -236,14 +378,10 @@ class SpeakerAwareSplitter:
 
                 # If segment is suspiciously long, check for internal silences
                 if seg_duration > 6.0:  # Threshold for "too long"
-                    internal_silences = [
-                        (s_start, s_end) for s_start, s_end in silence_periods
-                        if seg_start < s_start < seg_end
-                    ]
+                    longest_silence = silence_index.longest_within(seg_start, seg_end)
 
-                    if internal_silences:
+                    if longest_silence:
                         # Add strongest silence as split
-                        longest_silence = max(internal_silences, key=lambda x: x[1] - x[0])
                         split_time = (longest_silence[0] + longest_silence[1]) / 2.0
                         additional_splits.append(split_time)
                         print(f"  Adding silence split in long segment ({seg_duration:.1f}s) at {split_time:.2f}s")
@@ -259,24 +397,6 @@ class SpeakerAwareSplitter:
         print(f"  Final split points: {len(split_points)}")
         return split_points
 
-    def _find_nearest_silence(
-        self,
-        timestamp: float,
-        silence_periods: List[Tuple[float, float]],
-        window: float = 0.5
-    ) -> Optional[Tuple[float, float]]:
-        """Find silence period closest to given timestamp within window."""
-        candidates = [
-            (s_start, s_end) for s_start, s_end in silence_periods
-            if abs((s_start + s_end) / 2.0 - timestamp) <= window
-        ]
-
-        if not candidates:
-            return None
-
-        # Return closest silence
-        return min(candidates, key=lambda x: abs((x[0] + x[1]) / 2.0 - timestamp))
-
     def _segments_from_splits(
         self,
         split_points: List[float],
@@ -307,15 +427,18 @@ class SpeakerAwareSplitter:
         if not split_points:
             return split_points
 
-        segments = self._segments_from_splits(split_points, audio_duration)
         merged_splits = []
+        last = len(split_points)
 
-        prev_end = 0
-        for i, (seg_start, seg_end) in enumerate(segments):
+        # Walk (start, end) pairs in one pass; the final segment ends at audio_duration
+        starts = [0] + split_points
+        ends = split_points + [audio_duration]
+
+        for i, (seg_start, seg_end) in enumerate(zip(starts, ends)):
             seg_duration = seg_end - seg_start
 
             # If segment is too short and not the last segment, skip this split
-            if seg_duration < self.min_segment_duration and i < len(segments) - 1:
+            if seg_duration < self.min_segment_duration and i < last:
                 print(f"  Merging short segment ({seg_duration:.1f}s) at {seg_start:.2f}s")
                 continue
 
@@ -326,30 +449,16 @@ class SpeakerAwareSplitter:
         return merged_splits
 
     def get_audio_duration(self, file_path: str) -> float:
-        """Get duration of audio file using ffprobe."""
-        cmd = [
-            'ffprobe', '-v', 'error',
-            '-show_entries', 'format=duration',
-            '-of', 'default=noprint_wrappers=1:nokey=1',
-            file_path
-        ]
-
-        try:
-            result = subprocess.run(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                check=True
-            )
-            return float(result.stdout.strip())
-        except (subprocess.CalledProcessError, ValueError, FileNotFoundError):
-            return 0.0
+        """Get duration of audio file via the shared metadata service."""
+        return get_metadata_service().get_duration(file_path)
 
     def split_audio(self, input_file: str, split_points: List[float], output_dir: str) -> List[str]:
         """
         Split audio at given timestamps using ffmpeg segment muxer.
 
+        Segments are written under their final statement names, so no
+        rename pass is needed.
+
         Args:
             input_file: Path to input audio file
             split_points: List of timestamps in seconds
@@ -367,8 +476,9 @@ class SpeakerAwareSplitter:
         # Create segment times string
         segment_times = ','.join([f'{t:.3f}' for t in split_points])
 
-        # Temporary output pattern
-        temp_pattern = os.path.join(output_dir, 'segment_%03d.mp3')
+        # Final names: "{base}, Statement 001.mp3", ...
+        base = statement_base(input_file)
+        pattern = os.path.join(output_dir, f"{escape_segment_pattern(base)}, Statement %03d.mp3")
 
         print(f"Splitting audio into {len(split_points) + 1} segments...")
 
@@ -376,8 +486,9 @@ class SpeakerAwareSplitter:
             'ffmpeg', '-i', input_file,
             '-f', 'segment',
             '-segment_times', segment_times,
+            '-segment_start_number', '1',
             '-c', 'copy',  # Copy codec (no re-encoding)
-            temp_pattern
+            pattern
         ]
 
         result = subprocess.run(
@@ -393,35 +504,18 @@ class SpeakerAwareSplitter:
             return []
 
         # Find all created segments
+        prefix = f"{base}, Statement "
         output_files = sorted([
             os.path.join(output_dir, f)
             for f in os.listdir(output_dir)
-            if f.startswith('segment_') and f.endswith('.mp3')
+            if f.startswith(prefix) and f.endswith('.mp3')
         ])
 
         print(f"Created {len(output_files)} audio segments")
-        return output_files
-
-    def rename_outputs(self, segment_files: List[str], base_name: str) -> List[str]:
-        """Rename segments to proper naming scheme."""
-        base = base_name.replace(' (no pauses).mp3', '').replace('.mp3', '')
-
-        renamed_files = []
-        output_dir = os.path.dirname(segment_files[0]) if segment_files else '.'
-
-        for i, old_path in enumerate(segment_files, start=1):
-            new_name = f"{base}, Statement {i:03d}.mp3"
-            new_path = os.path.join(output_dir, new_name)
+        for i, path in enumerate(output_files, start=1):
+            print(f"  [{i:3d}] {os.path.basename(path)}")
 
-            try:
-                os.rename(old_path, new_path)
-                renamed_files.append(new_path)
-                print(f"  [{i:3d}] {new_name}")
-            except OSError as e:
-                print(f"ERROR renaming {old_path} to {new_path}: {e}")
-                renamed_files.append(old_path)
-
-        return renamed_files
+        return output_files
 
     def validate_segments(self, segment_files: List[str]) -> dict:
         """Validate segment characteristics."""
@@ -430,6 +524,9 @@ class SpeakerAwareSplitter:
         durations = []
         issues = []
 
+        # Probe all segments in one batch; the loop below then hits the cache
+        get_metadata_service().probe_many(segment_files)
+
         for file_path in segment_files:
             if not os.path.exists(file_path):
                 issues.append(f"Missing: {file_path}")
@@ -488,8 +585,7 @@ class SpeakerAwareSplitter:
             return [], {}
 
         if output_dir is None:
-            base_name = input_path.stem.replace(' (no pauses)', '')
-            output_dir = os.path.join('output', 'statements_improved', base_name)
+            output_dir = statement_output_dir(input_file, STATEMENTS_DIR)
 
         print(f"\n{'='*80}")
         print(f"Processing: {input_path.name}")
@@ -527,18 +623,14 @@ class SpeakerAwareSplitter:
             print("ERROR: No segments created")
             return [], {}
 
-        # Step 5: Rename
-        print(f"\nRenaming {len(segment_files)} segments...")
-        renamed_files = self.rename_outputs(segment_files, input_path.name)
-
         # Step 6: Validate
-        stats = self.validate_segments(renamed_files)
+        stats = self.validate_segments(segment_files)
 
         print(f"\n{'='*80}")
-        print(f"COMPLETE: {len(renamed_files)} statements created")
+        print(f"COMPLETE: {len(segment_files)} statements created")
         print(f"{'='*80}\n")
 
-        return renamed_files, stats
+        return segment_files, stats
 
 
 def main():
@@ -564,6 +656,54 @@ def main():
         help='HuggingFace token for pyannote.audio (or set HF_TOKEN env var)',
         default=None
     )
+    parser.add_argument(
+        '--speaker-backend',
+        choices=SPEAKER_BACKENDS,
+        default='pyannote',
+        help='Speaker change source: pyannote model, NumPy spectral detector, or auto '
+             '(pyannote, falling back to spectral) (default: pyannote)'
+    )
+    parser.add_argument(
+        '--spectral-method',
+        choices=SPECTRAL_METHODS,
+        default='bic',
+        help='Change scoring for the spectral backend (default: bic)'
+    )
+    parser.add_argument(
+        '--no-diarization-cache',
+        action='store_true',
+        help='Always re-run speaker diarization instead of reusing cached results'
+    )
+    parser.add_argument(
+        '--diarization-cache-dir',
+        help='Diarization cache directory (default: DIARIZATION_CACHE_DIR env var or data/cache/diarization)',
+        default=None
+    )
+    parser.add_argument(
+        '--diarization-window',
+        type=float,
+        default=None,
+        help='Diarize in overlapping windows of this many seconds to bound memory on long files '
+             '(default: whole file at once)'
+    )
+    parser.add_argument(
+        '--diarization-overlap',
+        type=float,
+        default=30.0,
+        help='Overlap between diarization windows in seconds (default: 30)'
+    )
+    parser.add_argument(
+        '--torch-threads',
+        type=int,
+        default=None,
+        help='Maximum torch intra-op threads for diarization (default: torch default)'
+    )
+    parser.add_argument(
+        '--diarization-batch-size',
+        type=int,
+        default=None,
+        help='Segmentation/embedding batch size for diarization (default: pipeline default)'
+    )
     parser.add_argument(
         '-t', '--threshold',
         type=int,
@@ -582,27 +722,62 @@ def main():
         default=1.5,
         help='Minimum segment duration in seconds (default: 1.5)'
     )
+    parser.add_argument(
+        '--sweep',
+        action='store_true',
+        help='Report segment counts for a grid of threshold/duration settings instead of '
+             'splitting (input may be a directory)'
+    )
+    parser.add_argument(
+        '--sweep-thresholds',
+        type=parse_float_list,
+        default=[-60, -55, -50, -45, -40],
+        help='Comma-separated thresholds in dB for --sweep (default: -60,-55,-50,-45,-40)'
+    )
+    parser.add_argument(
+        '--sweep-durations',
+        type=parse_float_list,
+        default=[0.1, 0.2, 0.3, 0.5, 0.75],
+        help='Comma-separated minimum silence durations for --sweep (default: 0.1,0.2,0.3,0.5,0.75)'
+    )
 
     args = parser.parse_args()
 
+    if args.sweep:
+        if not run_sweep(args.input_file, args.sweep_thresholds, args.sweep_durations, args.min_segment):
+            sys.exit(1)
+        return
+
     # Create splitter
     splitter = SpeakerAwareSplitter(
         silence_threshold_db=args.threshold,
         silence_min_duration=args.duration,
         min_segment_duration=args.min_segment,
         use_speaker_detection=not args.no_speaker_detection,
-        hf_token=args.hf_token
+        hf_token=args.hf_token,
+        diarization_cache=DiarizationCache(args.diarization_cache_dir),
+        use_diarization_cache=not args.no_diarization_cache,
+        diarization_window=args.diarization_window,
+        diarization_overlap=args.diarization_overlap,
+        torch_threads=args.torch_threads,
+        diarization_batch_size=args.diarization_batch_size,
+        speaker_backend=args.speaker_backend,
+        spectral_method=args.spectral_method
     )
 
-    # Process file
-    output_files, stats = splitter.process_file(
-        args.input_file,
-        args.output_dir
-    )
+    # Process file into a stage, then publish the whole directory at once
+    output_dir = args.output_dir or statement_output_dir(args.input_file, STATEMENTS_DIR)
+    with StagedOutput(output_dir) as stage:
+        output_files, stats = splitter.process_file(
+            args.input_file,
+            str(stage.path)
+        )
+        if output_files:
+            stage.commit()
 
     if output_files:
         print(f"\nSuccess! Created {len(output_files)} statement files.")
-        print(f"Output directory: {os.path.dirname(output_files[0])}")
+        print(f"Output directory: {output_dir}")
 
         if stats.get('issues'):
             print(f"\nNote: {len(stats['issues'])} potential issues detected.")
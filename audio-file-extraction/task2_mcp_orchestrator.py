@@ -9,18 +9,47 @@ handles the actual MCP tool calls for Drive operations.
 Usage (from Claude):
     1. Run this script to get the conversation file list and narrator assignments
     2. Download files manually via curl (MCP doesn't support binary downloads)
-    3. Process files with ffmpeg
+    3. Prepend narrators (MP3 frame copy, ffmpeg for mismatched formats)
     4. Upload back to Drive preserving file IDs (version management)
+
+When a Drive API token is available, downloads go through a local blob cache
+keyed by file ID and checksum: files unchanged since an earlier run cost one
+metadata call instead of a download. Without a token, files are fetched
+with curl as before.
+
+Narrator files are parsed once into in-memory MP3 frames and prepended to
+each conversation by a single file write; conversations whose format does
+not match the narrator's are concatenated with ffmpeg instead.
+
+With --stream (Drive API token required), each file goes Drive-to-Drive
+without temp files: the download is received in memory, the narrator frames
+are spliced in by reference and the result is sent straight into a
+resumable upload over the original file. Files larger than STREAM_SPOOL_MB
+spill to a temp file while they are processed.
 """
 
 import os
 import sys
 import json
+import mmap
 import subprocess
+import tempfile
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from scripts.utils.audio_backends import AudioProcessingError, run_concat_demuxer
+from scripts.utils.drive_cache import DriveBlobCache
+from scripts.utils.drive_manager import DriveManagerError, GoogleDriveManager, direct_api_manager
+from scripts.utils.media_metadata import get_metadata_service
+from scripts.utils.mp3_prefix import Mp3PrefixEngine, Mp3PrefixError, PartsReader, prefix_or_fallback
+
+if TYPE_CHECKING:
+    # Only --stream needs DriveTransfer (and requests); it comes from manager.transfer()
+    from scripts.utils.drive_transfer import DriveTransfer
+
 # Load environment
 load_dotenv()
 
@@ -30,6 +59,9 @@ PROCESSED_DIR = Path('data/processed')
 TEMP_DIR.mkdir(parents=True, exist_ok=True)
 PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
 
+# Largest file kept in memory by --stream before spilling to TEMP_DIR
+STREAM_SPOOL_BYTES = int(os.getenv('STREAM_SPOOL_MB', '64')) * 1024 * 1024
+
 # Narrator file IDs
 NARRATOR_FILES = {
     'daniel': os.getenv('NARRATOR_DANIEL_FILE_ID'),
@@ -82,60 +114,52 @@ def download_file_curl(file_id: str, output_path: Path) -> bool:
         return False
 
 
-def get_audio_duration(file_path: Path) -> float:
-    """Get duration of audio file in seconds using ffprobe."""
-    cmd = [
-        'ffprobe',
-        '-v', 'error',
-        '-show_entries', 'format=duration',
-        '-of', 'default=noprint_wrappers=1:nokey=1',
-        str(file_path)
-    ]
+_drive_manager = None
 
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        return float(result.stdout.strip())
-    except (subprocess.CalledProcessError, ValueError):
-        return 0.0
 
+def get_drive_manager() -> Optional[GoogleDriveManager]:
+    """Drive API manager for cached downloads, or None in MCP mode or without a saved token."""
+    global _drive_manager
 
-def concatenate_audio_ffmpeg(input_files: List[Path], output_path: Path) -> bool:
-    """Concatenate audio files using ffmpeg concat demuxer."""
-    # Create concat list file
-    concat_list = TEMP_DIR / 'concat_list.txt'
-
-    with open(concat_list, 'w') as f:
-        for file_path in input_files:
-            f.write(f"file '{file_path.absolute()}'\n")
-
-    # Run ffmpeg
-    cmd = [
-        'ffmpeg',
-        '-f', 'concat',
-        '-safe', '0',
-        '-i', str(concat_list),
-        '-c', 'copy',
-        '-y',  # Overwrite output
-        str(output_path)
-    ]
+    if _drive_manager is None:
+        _drive_manager = direct_api_manager()
+
+    return _drive_manager
+
+
+def fetch_drive_file(file_id: str, output_path: Path, cache: Optional[DriveBlobCache]) -> bool:
+    """Download a file, through the blob cache when the Drive API is available."""
+    manager = get_drive_manager() if cache else None
+    if manager is None:
+        return download_file_curl(file_id, output_path)
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        if manager.download_file_cached(file_id, str(output_path), cache):
+            print(f"  ✓ Unchanged since last run, using cached copy")
+        return True
+    except DriveManagerError as e:
+        print(f"  ✗ Download failed: {e}")
+        return False
 
-        # Verify output exists
-        if output_path.exists() and output_path.stat().st_size > 0:
-            return True
-        else:
-            print(f"  ✗ Concatenation failed: output file missing or empty")
-            return False
 
-    except subprocess.CalledProcessError as e:
-        print(f"  ✗ ffmpeg failed: {e.stderr}")
+def get_audio_duration(file_path: Path) -> float:
+    """Get duration of audio file in seconds via the shared metadata service."""
+    return get_metadata_service().get_duration(file_path)
+
+
+def concatenate_audio_ffmpeg(input_files: List[Path], output_path: Path) -> bool:
+    """Concatenate audio files using ffmpeg concat demuxer (list passed on stdin)."""
+    try:
+        run_concat_demuxer([str(path) for path in input_files], str(output_path))
+    except (AudioProcessingError, subprocess.TimeoutExpired) as e:
+        print(f"  ✗ ffmpeg failed: {e}")
         return False
-    finally:
-        # Clean up concat list
-        if concat_list.exists():
-            concat_list.unlink()
+
+    if output_path.exists() and output_path.stat().st_size > 0:
+        return True
+
+    print(f"  ✗ Concatenation failed: output file missing or empty")
+    return False
 
 
 def assign_narrators(files: List[Tuple[str, str]]) -> Dict[str, List[Tuple[str, str]]]:
@@ -152,8 +176,8 @@ def assign_narrators(files: List[Tuple[str, str]]) -> Dict[str, List[Tuple[str,
     return assignments
 
 
-def download_narrator_files() -> Dict[str, Path]:
-    """Download narrator files from Drive."""
+def download_narrator_files(cache: Optional[DriveBlobCache] = None) -> Dict[str, Path]:
+    """Download narrator files from Drive (revalidated against the cache on every run)."""
     print("=" * 80)
     print("DOWNLOADING NARRATOR FILES")
     print("=" * 80)
@@ -163,13 +187,13 @@ def download_narrator_files() -> Dict[str, Path]:
     for narrator, file_id in NARRATOR_FILES.items():
         output_path = TEMP_DIR / f"narrator_{narrator}.mp3"
 
-        if output_path.exists():
+        if output_path.exists() and (cache is None or get_drive_manager() is None):
             print(f"✓ {narrator.capitalize()}: already exists ({output_path})")
             narrator_paths[narrator] = output_path
             continue
 
         print(f"Downloading {narrator.capitalize()} narrator...")
-        if download_file_curl(file_id, output_path):
+        if fetch_drive_file(file_id, output_path, cache):
             print(f"✓ {narrator.capitalize()}: downloaded ({output_path.stat().st_size} bytes)")
             narrator_paths[narrator] = output_path
         else:
@@ -184,7 +208,9 @@ def process_file(
     file_id: str,
     narrator: str,
     narrator_path: Path,
-    dry_run: bool = False
+    dry_run: bool = False,
+    cache: Optional[DriveBlobCache] = None,
+    engine: Optional[Mp3PrefixEngine] = None
 ) -> Dict:
     """Process a single conversation file."""
     conversation_path = TEMP_DIR / filename
@@ -204,7 +230,7 @@ def process_file(
     try:
         # Download conversation file
         print(f"  Downloading conversation file...")
-        if not download_file_curl(file_id, conversation_path):
+        if not fetch_drive_file(file_id, conversation_path, cache):
             result['message'] = "Download failed"
             return result
 
@@ -215,7 +241,8 @@ def process_file(
 
         # Concatenate
         print(f"  Concatenating {narrator} narrator + conversation...")
-        if not concatenate_audio_ffmpeg([narrator_path, conversation_path], output_path):
+        if not prefix_or_fallback(engine, narrator, narrator_path, conversation_path, output_path,
+                                  concatenate_audio_ffmpeg):
             result['message'] = "Concatenation failed"
             return result
 
@@ -247,6 +274,79 @@ def process_file(
         return result
 
 
+def stream_process_file(
+    filename: str,
+    file_id: str,
+    narrator: str,
+    engine: Mp3PrefixEngine,
+    transfer: 'DriveTransfer',
+    dry_run: bool = False,
+    spool_bytes: int = STREAM_SPOOL_BYTES
+) -> Dict:
+    """Prefix a conversation Drive-to-Drive, holding it in memory instead of temp files."""
+    result = {
+        'filename': filename,
+        'file_id': file_id,
+        'narrator': narrator,
+        'success': False,
+        'message': '',
+        'original_duration': 0.0,
+        'narrator_duration': 0.0,
+        'output_duration': 0.0,
+        'uploaded': False
+    }
+
+    with tempfile.SpooledTemporaryFile(max_size=spool_bytes, dir=TEMP_DIR) as source:
+        print(f"  Streaming conversation from Drive...")
+        download = transfer.download_to(file_id, source, name=filename)
+        if not download.ok:
+            result['message'] = f"Download failed: {download.error}"
+            return result
+
+        size = source.tell()
+        source.seek(0)
+        # Spooled files over the limit were rolled over to disk; map those instead of reading them
+        data = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) if size > spool_bytes else source.read()
+        parts = []
+
+        try:
+            parts, prefixed = engine.prefix_parts(narrator, data, filename)
+
+            # Durations are exact from the frame index, so nothing is re-probed
+            result['original_duration'] = prefixed.conversation_duration
+            result['narrator_duration'] = prefixed.narrator_duration
+            result['output_duration'] = prefixed.duration
+            print(f"  Original: {result['original_duration']:.1f}s, Narrator: {result['narrator_duration']:.1f}s")
+
+            if dry_run:
+                result['success'] = True
+                result['message'] = "Successfully processed (DRY RUN - not uploaded)"
+                return result
+
+            print(f"  Streaming {narrator} narrator + conversation to Drive ({prefixed.bytes_written:,} bytes)...")
+            with PartsReader(parts) as reader:
+                upload = transfer.upload_stream(reader, reader.size, filename, file_id=file_id)
+
+            if not upload.ok:
+                result['message'] = f"Upload failed: {upload.error}"
+                return result
+
+            result['success'] = True
+            result['uploaded'] = True
+            result['message'] = f"Successfully processed and uploaded ({upload.seconds:.1f}s)"
+            return result
+
+        except Mp3PrefixError as e:
+            result['message'] = f"Frame prefix failed: {e} (run without --stream to use ffmpeg)"
+            return result
+
+        finally:
+            for part in parts:
+                part.release()
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+
 def main():
     import argparse
 
@@ -254,6 +354,13 @@ def main():
     parser.add_argument('--dry-run', action='store_true', help='Process files but do not upload')
     parser.add_argument('--limit', type=int, help='Limit number of files to process')
     parser.add_argument('--report-only', action='store_true', help='Only show narrator assignments')
+    parser.add_argument('--no-download-cache', action='store_true',
+                        help='Download every file instead of reusing unchanged ones from the local cache')
+    parser.add_argument('--ffmpeg-concat', action='store_true',
+                        help='Concatenate every file with ffmpeg instead of copying MP3 frames')
+    parser.add_argument('--stream', action='store_true',
+                        help='Stream each file Drive-to-Drive through memory and upload it directly '
+                             '(requires a Drive API token)')
 
     args = parser.parse_args()
 
@@ -274,12 +381,28 @@ def main():
     if args.report_only:
         return
 
+    cache = None if args.no_download_cache else DriveBlobCache()
+
     # Download narrator files
-    narrator_paths = download_narrator_files()
+    narrator_paths = download_narrator_files(cache)
     if not narrator_paths:
         print("\n✗ Failed to download narrator files. Exiting.")
         sys.exit(1)
 
+    engine = None
+    if not args.ffmpeg_concat:
+        try:
+            engine = Mp3PrefixEngine(narrator_paths)
+        except Mp3PrefixError as e:
+            print(f"⚠ Frame prefixing unavailable ({e}); using ffmpeg")
+
+    transfer = None
+    if args.stream:
+        if engine is None or get_drive_manager() is None:
+            print("\n✗ --stream needs frame prefixing and a Drive API token (token.json). Exiting.")
+            sys.exit(1)
+        transfer = get_drive_manager().transfer()
+
     # Process files
     files_to_process = CONVERSATION_FILES[:args.limit] if args.limit else CONVERSATION_FILES
 
@@ -295,13 +418,25 @@ def main():
 
         print(f"\n[{len(results)+1}/{len(files_to_process)}] {filename} ({narrator.upper()})")
 
-        result = process_file(
-            filename=filename,
-            file_id=file_id,
-            narrator=narrator,
-            narrator_path=narrator_paths[narrator],
-            dry_run=args.dry_run
-        )
+        if transfer is not None:
+            result = stream_process_file(
+                filename=filename,
+                file_id=file_id,
+                narrator=narrator,
+                engine=engine,
+                transfer=transfer,
+                dry_run=args.dry_run
+            )
+        else:
+            result = process_file(
+                filename=filename,
+                file_id=file_id,
+                narrator=narrator,
+                narrator_path=narrator_paths[narrator],
+                dry_run=args.dry_run,
+                cache=cache,
+                engine=engine
+            )
 
         results.append(result)
 
@@ -317,6 +452,7 @@ def main():
         'total': len(results),
         'successful': sum(1 for r in results if r['success']),
         'failed': sum(1 for r in results if not r['success']),
+        'uploaded': sum(1 for r in results if r.get('uploaded')),
         'dry_run': args.dry_run,
         'results': results
     }
@@ -330,6 +466,8 @@ def main():
     print(f"Total: {summary['total']}")
     print(f"Successful: {summary['successful']}")
     print(f"Failed: {summary['failed']}")
+    if args.stream:
+        print(f"Uploaded: {summary['uploaded']}")
     print(f"\nReport saved: {report_path}")
 
     # Show failed files
@@ -339,21 +477,21 @@ def main():
             if not r['success']:
                 print(f"  ✗ {r['filename']}: {r['message']}")
 
-    # Show files needing upload
-    if not args.dry_run and summary['successful'] > 0:
+    # Show files needing upload (streamed files were uploaded already)
+    pending = [r for r in results if r['success'] and not r.get('uploaded')]
+    if not args.dry_run and pending:
         print("\n" + "=" * 80)
         print("FILES READY FOR DRIVE UPLOAD")
         print("=" * 80)
         print("\nClaude should now upload these files to Google Drive using MCP tools:")
         print("Use mcp__google_workspace__create_drive_file with update_existing=True")
         print()
-        for r in results:
-            if r['success']:
-                output_file = PROCESSED_DIR / r['filename']
-                print(f"  • {r['filename']}")
-                print(f"    Path: {output_file}")
-                print(f"    File ID: {r['file_id']} (update this existing file)")
-                print()
+        for r in pending:
+            output_file = PROCESSED_DIR / r['filename']
+            print(f"  • {r['filename']}")
+            print(f"    Path: {output_file}")
+            print(f"    File ID: {r['file_id']} (update this existing file)")
+            print()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,49 @@
+"""
+Shared pytest fixtures.
+
+Note: make_tone requires ffmpeg to be installed.
+"""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+
+def _make_tone(
+    path: Path,
+    duration: float,
+    frequency: int = 440,
+    sample_rate: int = 44100,
+    bitrate: str = '128k',
+    extra_args=(),
+    fmt: str = 'mp3'
+) -> Path:
+    """
+    Create a sine tone in the given format, whatever the file extension.
+
+    fmt='mp3' writes CBR MP3 at bitrate; fmt='wav' writes 16-bit PCM, which
+    decodes to exactly duration * sample_rate samples.
+    """
+    if fmt == 'wav':
+        codec = ['-acodec', 'pcm_s16le']
+    else:
+        codec = ['-acodec', 'libmp3lame', '-b:a', bitrate]
+
+    subprocess.run([
+        'ffmpeg',
+        '-f', 'lavfi',
+        '-i', f'sine=frequency={frequency}:duration={duration}:sample_rate={sample_rate}',
+        *codec,
+        *extra_args,
+        '-f', fmt,
+        '-y',
+        str(path)
+    ], capture_output=True, check=True)
+    return Path(path)
+
+
+@pytest.fixture
+def make_tone():
+    """Factory for test tones: make_tone(path, duration, frequency=440, sample_rate=44100, bitrate='128k', extra_args=(), fmt='mp3')."""
+    return _make_tone
@@ -0,0 +1,145 @@
+"""
+Tests for analyze_audio energy analysis.
+
+The vectorized functions are checked against copies of the original
+loop implementations.
+"""
+
+import pytest
+import subprocess
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analyze_audio import calculate_energy, compute_metrics, detect_potential_splits, minmax_envelope
+
+
+def calculate_energy_loop(samples, window_size=512, hop_size=256):
+    """Reference: original per-window loop."""
+    energy = []
+    for i in range(0, len(samples) - window_size, hop_size):
+        window = samples[i:i + window_size]
+        energy.append(np.sqrt(np.mean(window**2)))
+
+    return np.array(energy)
+
+
+def detect_potential_splits_loop(energy, frame_rate, hop_size, threshold_percentile=30):
+    """Reference: original per-frame loop."""
+    threshold = np.percentile(energy, threshold_percentile)
+
+    potential_splits = []
+    for i in range(1, len(energy) - 1):
+        if energy[i] < threshold:
+            if energy[i] < energy[i-1] and energy[i] < energy[i+1]:
+                potential_splits.append(((i * hop_size) / frame_rate, energy[i]))
+
+    return potential_splits
+
+
+@pytest.fixture
+def samples():
+    """Three seconds of noisy tone bursts at 44.1 kHz."""
+    rng = np.random.default_rng(42)
+    t = np.arange(3 * 44100) / 44100
+    tone = 0.5 * np.sin(2 * np.pi * 220 * t) * ((t % 1.0) < 0.7)
+    return (tone + rng.normal(0, 0.01, t.size)).astype(np.float32)
+
+
+class TestCalculateEnergy:
+    """Tests for calculate_energy."""
+
+    @pytest.mark.parametrize('length', [513, 768, 769, 1024, 5000, 44100])
+    def test_matches_loop(self, samples, length):
+        """Test frame count and values match the original loop."""
+        expected = calculate_energy_loop(samples[:length])
+        actual = calculate_energy(samples[:length])
+
+        assert actual.shape == expected.shape
+        np.testing.assert_allclose(actual, expected, rtol=1e-5, atol=1e-7)
+
+    @pytest.mark.parametrize('window_size,hop_size', [(1024, 512), (400, 160), (256, 256)])
+    def test_matches_loop_other_windows(self, samples, window_size, hop_size):
+        """Test non-default window and hop sizes."""
+        expected = calculate_energy_loop(samples, window_size, hop_size)
+        actual = calculate_energy(samples, window_size, hop_size)
+
+        np.testing.assert_allclose(actual, expected, rtol=1e-5, atol=1e-7)
+
+    def test_short_input(self):
+        """Test input no longer than one window yields no frames."""
+        assert calculate_energy(np.zeros(512, dtype=np.float32)).size == 0
+        assert calculate_energy(np.zeros(10, dtype=np.float32)).size == 0
+
+
+class TestDetectPotentialSplits:
+    """Tests for detect_potential_splits."""
+
+    def test_matches_loop(self, samples):
+        """Test split points match the original loop on the same energy."""
+        energy = calculate_energy(samples)
+
+        expected = detect_potential_splits_loop(energy, 44100, 256)
+        actual = detect_potential_splits(energy, 44100, 256)
+
+        assert len(actual) == len(expected)
+        for (t_actual, e_actual), (t_expected, e_expected) in zip(actual, expected):
+            assert t_actual == pytest.approx(t_expected)
+            assert e_actual == e_expected
+
+    def test_plateau_is_not_minimum(self):
+        """Test equal neighbours do not count as a strict minimum."""
+        energy = np.array([5.0, 1.0, 1.0, 5.0, 0.5, 5.0, 5.0, 5.0, 5.0, 5.0])
+
+        splits = detect_potential_splits(energy, 1000, 100)
+
+        assert splits == [(0.4, 0.5)]
+
+
+class TestMetricsOnly:
+    """Tests for the headless metrics path."""
+
+    def test_import_does_not_load_matplotlib(self):
+        """Test matplotlib is only imported when plotting."""
+        project_root = Path(__file__).parent.parent
+        result = subprocess.run(
+            [sys.executable, '-c', "import sys, analyze_audio; print('matplotlib' in sys.modules)"],
+            cwd=project_root, capture_output=True, text=True
+        )
+
+        assert result.stdout.strip() == 'False'
+
+    def test_compute_metrics(self, samples):
+        """Test metrics summary fields."""
+        metrics, energy = compute_metrics(samples, 44100)
+
+        assert metrics['duration'] == pytest.approx(3.0)
+        assert metrics['avg_energy'] == pytest.approx(np.mean(energy))
+        assert metrics['potential_splits'] == detect_potential_splits(energy, 44100, 256)
+
+
+class TestMinmaxEnvelope:
+    """Tests for plot decimation."""
+
+    def test_short_signal_unchanged(self):
+        """Test signals under the point budget are returned as-is."""
+        values = np.arange(10.0)
+        indices, decimated = minmax_envelope(values, max_points=100)
+
+        np.testing.assert_array_equal(decimated, values)
+
+    def test_keeps_extremes(self, samples):
+        """Test decimation keeps the global peaks and stays ordered."""
+        indices, decimated = minmax_envelope(samples, max_points=1000)
+
+        assert len(decimated) <= 1000
+        assert np.all(np.diff(indices) >= 0)
+        assert decimated.max() == samples.max()
+        assert decimated.min() == samples.min()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
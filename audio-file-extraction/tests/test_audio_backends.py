@@ -0,0 +1,153 @@
+"""
+Tests for audio_backends module.
+
+Note: PyAV tests are skipped if PyAV is not installed.
+"""
+
+import pytest
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from utils.audio_backends import (
+    PYAV_AVAILABLE,
+    AudioBackend,
+    AudioProcessingError,
+    SubprocessBackend,
+    get_backend,
+)
+from utils.audio_processor import AudioProcessor
+
+
+requires_pyav = pytest.mark.skipif(not PYAV_AVAILABLE, reason="PyAV not installed")
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def sample_audio(temp_dir, make_tone):
+    """Create a 2 second test tone."""
+    return make_tone(temp_dir / "sample.mp3", 2)
+
+
+@pytest.fixture
+def restore_backend():
+    """Reset AudioProcessor backend after a test changes it."""
+    yield
+    AudioProcessor._backend = None
+
+
+class TestGetBackend:
+    """Tests for backend selection."""
+
+    def test_default_backend(self, monkeypatch):
+        """Test subprocess backend is the default."""
+        monkeypatch.delenv('AUDIO_BACKEND', raising=False)
+        assert isinstance(get_backend(), SubprocessBackend)
+
+    def test_env_backend(self, monkeypatch):
+        """Test AUDIO_BACKEND selects the backend."""
+        monkeypatch.setenv('AUDIO_BACKEND', 'subprocess')
+        assert get_backend().name == 'subprocess'
+
+    def test_unknown_backend(self):
+        """Test unknown backend name raises error."""
+        with pytest.raises(AudioProcessingError, match="Unknown audio backend"):
+            get_backend('gstreamer')
+
+    def test_incomplete_backend_rejected(self):
+        """Test a backend missing an operation cannot be instantiated."""
+        class DurationOnlyBackend(AudioBackend):
+            def get_duration(self, file_path):
+                return 0.0
+
+        with pytest.raises(TypeError):
+            DurationOnlyBackend()
+
+    def test_set_backend_by_name(self, restore_backend):
+        """Test AudioProcessor.set_backend accepts a name."""
+        AudioProcessor.set_backend('subprocess')
+        assert AudioProcessor.get_backend().name == 'subprocess'
+
+
+class TestSubprocessBackend:
+    """Tests for the ffmpeg command line backend."""
+
+    def test_concurrent_concatenate_same_directory(self, sample_audio, temp_dir):
+        """Test concurrent concatenations into one directory leave no concat list files."""
+        backend = SubprocessBackend()
+        outputs = [temp_dir / f"output{i}.mp3" for i in range(4)]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(
+                lambda output: backend.concatenate([str(sample_audio)] * 2, str(output)),
+                outputs
+            ))
+
+        assert all(output.stat().st_size > sample_audio.stat().st_size for output in outputs)
+        assert not list(temp_dir.glob('concat_list*'))
+
+    def test_concatenate_quoted_path(self, sample_audio, temp_dir):
+        """Test inputs with quotes in their names survive the piped concat list."""
+        quoted = temp_dir / "it's here.mp3"
+        quoted.write_bytes(sample_audio.read_bytes())
+        output = temp_dir / "output.mp3"
+
+        SubprocessBackend().concatenate([str(quoted), str(sample_audio)], str(output))
+
+        assert output.stat().st_size > sample_audio.stat().st_size
+
+
+@requires_pyav
+class TestPyAVBackend:
+    """Tests for the in-process PyAV backend."""
+
+    def test_get_duration(self, sample_audio):
+        """Test duration is read without ffprobe."""
+        duration = get_backend('pyav').get_duration(str(sample_audio))
+        assert 1.9 < duration < 2.2
+
+    def test_validate_invalid_file(self, temp_dir):
+        """Test invalid files are rejected."""
+        invalid_file = temp_dir / "invalid.mp3"
+        invalid_file.write_text("not audio")
+
+        is_valid, error = get_backend('pyav').validate(str(invalid_file))
+
+        assert is_valid is False
+        assert error is not None
+
+    def test_concatenate(self, sample_audio, temp_dir):
+        """Test stream-copy concatenation of two files."""
+        backend = get_backend('pyav')
+        output_file = temp_dir / "output.mp3"
+
+        backend.concatenate([str(sample_audio), str(sample_audio)], str(output_file))
+
+        assert 3.9 < backend.get_duration(str(output_file)) < 4.3
+
+    def test_split(self, sample_audio, temp_dir):
+        """Test segments are extracted in one demux pass."""
+        backend = get_backend('pyav')
+        segments = [
+            (0.0, 1.0, str(temp_dir / "part1.mp3")),
+            (1.0, 1.0, str(temp_dir / "part2.mp3")),
+        ]
+
+        backend.split(str(sample_audio), segments)
+
+        for _, _, output_file in segments:
+            assert 0.8 < backend.get_duration(output_file) < 1.2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -234,6 +234,28 @@ class TestAudioProcessor:
         assert output_file.exists()
         assert output_dir.exists()
 
+    def test_concatenate_batch_same_directory(self, multiple_audio_files, temp_dir):
+        """Test batch jobs writing into one directory run concurrently and fail independently."""
+        output_dir = temp_dir / "out"
+        jobs = [
+            (multiple_audio_files[:2], str(output_dir / f"job_{i}.mp3"))
+            for i in range(6)
+        ]
+        jobs.insert(3, ([str(temp_dir / "missing.mp3")], str(output_dir / "bad.mp3")))
+
+        results = AudioProcessor.concatenate_batch(jobs, max_workers=3)
+
+        assert [success for success, _ in results] == [True] * 3 + [False] + [True] * 3
+        assert 'not found' in results[3][1]
+        assert sorted(p.name for p in output_dir.iterdir()) == [f"job_{i}.mp3" for i in range(6)]
+
+        single = Path(multiple_audio_files[0]).stat().st_size
+        assert all((output_dir / f"job_{i}.mp3").stat().st_size > single for i in range(6))
+
+    def test_concatenate_batch_empty(self):
+        """Test an empty batch returns no results."""
+        assert AudioProcessor.concatenate_batch([]) == []
+
 
 @pytest.mark.slow
 class TestAudioProcessorPerformance:
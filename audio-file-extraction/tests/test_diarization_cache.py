@@ -0,0 +1,96 @@
+"""
+Unit tests for diarization_cache module.
+"""
+
+import pytest
+import tempfile
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from utils.diarization_cache import DiarizationCache, hash_audio
+
+
+PIPELINE = "pyannote/speaker-diarization-3.1@3.1.1"
+TURNS = [(0.0, 2.5, 'SPEAKER_00'), (2.7, 5.0, 'SPEAKER_01'), (5.1, 7.25, 'SPEAKER_00')]
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def audio_file(temp_dir):
+    """Create placeholder audio content."""
+    path = temp_dir / "module.mp3"
+    path.write_bytes(b"\xff\xfb" + b"\x00" * 1000)
+    return path
+
+
+@pytest.fixture
+def cache(temp_dir):
+    """Create a cache in the temp directory."""
+    return DiarizationCache(temp_dir / "cache")
+
+
+class TestDiarizationCache:
+    """Tests for DiarizationCache."""
+
+    def test_miss(self, cache, audio_file):
+        """Test unknown audio returns None."""
+        assert cache.get(audio_file, PIPELINE) is None
+
+    def test_round_trip(self, cache, audio_file):
+        """Test stored turns are returned unchanged."""
+        cache.put(audio_file, PIPELINE, TURNS)
+
+        assert cache.get(audio_file, PIPELINE) == TURNS
+
+    def test_empty_turns(self, cache, audio_file):
+        """Test an empty diarization is cached as empty, not a miss."""
+        cache.put(audio_file, PIPELINE, [])
+
+        assert cache.get(audio_file, PIPELINE) == []
+
+    def test_content_addressed(self, cache, audio_file, temp_dir):
+        """Test a copy under another name hits the same entry."""
+        cache.put(audio_file, PIPELINE, TURNS)
+        copy = temp_dir / "renamed.mp3"
+        copy.write_bytes(audio_file.read_bytes())
+
+        assert cache.get(copy, PIPELINE) == TURNS
+
+    def test_changed_audio_misses(self, cache, audio_file):
+        """Test modified audio is not served stale turns."""
+        cache.put(audio_file, PIPELINE, TURNS)
+        audio_file.write_bytes(b"\xff\xfb" + b"\x01" * 1000)
+
+        assert cache.get(audio_file, PIPELINE) is None
+
+    def test_pipeline_version_misses(self, cache, audio_file):
+        """Test a different pipeline version is a separate entry."""
+        cache.put(audio_file, PIPELINE, TURNS)
+
+        assert cache.get(audio_file, "pyannote/speaker-diarization-3.1@3.2.0") is None
+
+    def test_corrupt_entry_ignored(self, cache, audio_file):
+        """Test an unreadable entry is treated as a miss."""
+        cache.put(audio_file, PIPELINE, TURNS)
+        entry = next(cache.cache_dir.rglob('*.npz'))
+        entry.write_bytes(b"garbage")
+
+        assert cache.get(audio_file, PIPELINE) is None
+
+    def test_hash_audio(self, audio_file):
+        """Test file hashing is deterministic."""
+        assert hash_audio(audio_file) == hash_audio(audio_file)
+        assert len(hash_audio(audio_file)) == 64
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
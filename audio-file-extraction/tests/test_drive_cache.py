@@ -0,0 +1,174 @@
+"""
+Tests for drive_cache module.
+"""
+
+import pytest
+import os
+import tempfile
+import time
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from utils.drive_cache import DriveBlobCache, DriveCacheError, content_token
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+class FakeRemote:
+    """Remote files with metadata and a download counter."""
+
+    def __init__(self):
+        self.files = {}
+        self.downloads = []
+
+    def metadata(self, file_id):
+        data = self.files[file_id]
+        return {'id': file_id, 'size': str(len(data)), 'md5Checksum': str(hash(data))}
+
+    def download(self, file_id, path):
+        self.downloads.append(file_id)
+        Path(path).write_bytes(self.files[file_id])
+
+
+@pytest.fixture
+def remote():
+    return FakeRemote()
+
+
+class TestContentToken:
+    """Tests for content tokens."""
+
+    def test_prefers_md5(self):
+        """Test md5Checksum is used when present."""
+        assert content_token({'md5Checksum': 'abc', 'version': '7'}) == 'md5-abc'
+
+    def test_falls_back_to_version(self):
+        """Test files without a checksum use their version."""
+        assert content_token({'version': '7'}) == 'v7'
+
+    def test_requires_a_field(self):
+        """Test metadata without either field is rejected."""
+        with pytest.raises(DriveCacheError):
+            content_token({'id': 'x'})
+
+
+class TestFetch:
+    """Tests for cached downloads."""
+
+    def test_second_fetch_is_a_hit(self, temp_dir, remote):
+        """Test an unchanged file is downloaded once and linked afterwards."""
+        remote.files['a'] = b"conversation"
+        cache = DriveBlobCache(temp_dir / 'cache')
+
+        first = cache.fetch('a', temp_dir / 'out1.mp3', remote.metadata('a'), remote.download)
+        second = cache.fetch('a', temp_dir / 'out2.mp3', remote.metadata('a'), remote.download)
+
+        assert (first, second) == (False, True)
+        assert remote.downloads == ['a']
+        assert (temp_dir / 'out2.mp3').read_bytes() == b"conversation"
+        assert (temp_dir / 'out2.mp3').stat().st_ino == cache.get('a', content_token(remote.metadata('a'))).stat().st_ino
+
+    def test_deleting_output_keeps_blob(self, temp_dir, remote):
+        """Test callers may delete their copy."""
+        remote.files['a'] = b"conversation"
+        cache = DriveBlobCache(temp_dir / 'cache')
+
+        cache.fetch('a', temp_dir / 'out.mp3', remote.metadata('a'), remote.download)
+        (temp_dir / 'out.mp3').unlink()
+
+        assert cache.fetch('a', temp_dir / 'out.mp3', remote.metadata('a'), remote.download)
+        assert (temp_dir / 'out.mp3').read_bytes() == b"conversation"
+
+    def test_changed_file_redownloaded(self, temp_dir, remote):
+        """Test a new checksum misses and replaces the stale blob."""
+        remote.files['a'] = b"old"
+        cache = DriveBlobCache(temp_dir / 'cache')
+        cache.fetch('a', temp_dir / 'out.mp3', remote.metadata('a'), remote.download)
+
+        remote.files['a'] = b"new content"
+        hit = cache.fetch('a', temp_dir / 'out.mp3', remote.metadata('a'), remote.download)
+
+        assert not hit
+        assert (temp_dir / 'out.mp3').read_bytes() == b"new content"
+        assert len(list((temp_dir / 'cache' / 'a').iterdir())) == 1
+
+    def test_size_mismatch_not_cached(self, temp_dir, remote):
+        """Test truncated downloads are rejected and leave nothing behind."""
+        remote.files['a'] = b"conversation"
+        metadata = dict(remote.metadata('a'), size='999')
+        cache = DriveBlobCache(temp_dir / 'cache')
+
+        with pytest.raises(DriveCacheError):
+            cache.fetch('a', temp_dir / 'out.mp3', metadata, remote.download)
+
+        assert cache.total_bytes() == 0
+        assert not list((temp_dir / 'cache' / 'a').iterdir())
+
+    def test_failed_download_leaves_no_temp(self, temp_dir):
+        """Test download errors propagate without leaving partial blobs."""
+        def failing(file_id, path):
+            Path(path).write_bytes(b"par")
+            raise OSError("connection reset")
+
+        cache = DriveBlobCache(temp_dir / 'cache')
+        with pytest.raises(OSError):
+            cache.fetch('a', temp_dir / 'out.mp3', {'md5Checksum': 'x'}, failing)
+
+        assert not list((temp_dir / 'cache' / 'a').iterdir())
+
+
+class TestEviction:
+    """Tests for LRU size limiting."""
+
+    def test_least_recently_used_evicted(self, temp_dir, remote):
+        """Test the blob not used for longest goes first."""
+        for name in 'abc':
+            remote.files[name] = name.encode() * 100
+        cache = DriveBlobCache(temp_dir / 'cache', max_bytes=250)
+
+        cache.fetch('a', temp_dir / 'a.mp3', remote.metadata('a'), remote.download)
+        cache.fetch('b', temp_dir / 'b.mp3', remote.metadata('b'), remote.download)
+
+        # Use 'a' again so 'b' becomes the least recently used
+        past = time.time() - 60
+        os.utime(cache.get('b', content_token(remote.metadata('b'))), (past, past))
+        cache.fetch('a', temp_dir / 'a.mp3', remote.metadata('a'), remote.download)
+
+        cache.fetch('c', temp_dir / 'c.mp3', remote.metadata('c'), remote.download)
+
+        assert cache.get('a', content_token(remote.metadata('a'))) is not None
+        assert cache.get('b', content_token(remote.metadata('b'))) is None
+        assert cache.get('c', content_token(remote.metadata('c'))) is not None
+        assert cache.total_bytes() <= 250
+
+    def test_new_blob_kept_even_if_too_large(self, temp_dir, remote):
+        """Test a blob larger than the limit is still usable."""
+        remote.files['big'] = b"x" * 500
+        cache = DriveBlobCache(temp_dir / 'cache', max_bytes=100)
+
+        cache.fetch('big', temp_dir / 'big.mp3', remote.metadata('big'), remote.download)
+
+        assert (temp_dir / 'big.mp3').stat().st_size == 500
+        assert cache.get('big', content_token(remote.metadata('big'))) is not None
+
+    def test_env_configuration(self, temp_dir, monkeypatch):
+        """Test defaults come from the environment."""
+        monkeypatch.setenv('DRIVE_CACHE_DIR', str(temp_dir / 'env-cache'))
+        monkeypatch.setenv('DRIVE_CACHE_MAX_BYTES', '1234')
+
+        cache = DriveBlobCache()
+
+        assert cache.cache_dir == temp_dir / 'env-cache'
+        assert cache.max_bytes == 1234
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,259 @@
+"""
+Tests for drive_index module.
+"""
+
+import pytest
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from googleapiclient.errors import HttpError
+
+from utils.drive_index import (
+    DriveIndex, DriveIndexError, TASK_CONVERSATION, TASK_LISTEN_AND_CHOOSE, task_of
+)
+
+
+FOLDER = 'folder'
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+class Request:
+    """Stand-in for an API request object."""
+
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self):
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class FakeDriveService:
+    """Drive v3 client over an in-memory folder with a changes log."""
+
+    def __init__(self, page_size=2):
+        self.page_size = page_size
+        self.items = {}
+        self.log = []
+        self.calls = []
+        self.expired = False
+
+    def put(self, file_id, name, mime_type='audio/mpeg', parents=(FOLDER,), trashed=False, version=1):
+        self.items[file_id] = {
+            'id': file_id, 'name': name, 'mimeType': mime_type, 'size': '100',
+            'md5Checksum': f'md5-{file_id}-{version}', 'version': str(version),
+            'modifiedTime': '2024-01-01T00:00:00.000Z',
+            'parents': list(parents), 'trashed': trashed
+        }
+        self.log.append(file_id)
+
+    def delete(self, file_id):
+        del self.items[file_id]
+        self.log.append(file_id)
+
+    def files(self):
+        return SimpleNamespace(list=self._list_files)
+
+    def changes(self):
+        return SimpleNamespace(getStartPageToken=self._start_token, list=self._list_changes)
+
+    def _start_token(self):
+        self.calls.append('getStartPageToken')
+        return Request({'startPageToken': str(len(self.log))})
+
+    def _list_files(self, q, pageSize, fields, pageToken=None):
+        self.calls.append('files.list')
+        matching = sorted(
+            (item for item in self.items.values() if FOLDER in item['parents'] and not item['trashed']),
+            key=lambda item: item['name']
+        )
+        start = int(pageToken or 0)
+        page = matching[start:start + self.page_size]
+        result = {'files': [
+            {key: value for key, value in item.items() if key not in ('parents', 'trashed')}
+            for item in page
+        ]}
+        if start + self.page_size < len(matching):
+            result['nextPageToken'] = str(start + self.page_size)
+        return Request(result)
+
+    def _list_changes(self, pageToken, pageSize, spaces, includeRemoved, fields):
+        self.calls.append('changes.list')
+        if self.expired:
+            return Request(HttpError(SimpleNamespace(status=404, reason='Not Found'), b'invalid token'))
+
+        start = int(pageToken)
+        end = min(start + self.page_size, len(self.log))
+        changes = []
+        for file_id in self.log[start:end]:
+            if file_id in self.items:
+                changes.append({'changeType': 'file', 'fileId': file_id, 'removed': False,
+                                'file': dict(self.items[file_id])})
+            else:
+                changes.append({'changeType': 'file', 'fileId': file_id, 'removed': True})
+
+        result = {'changes': changes}
+        if end < len(self.log):
+            result['nextPageToken'] = str(end)
+        else:
+            result['newStartPageToken'] = str(end)
+        return Request(result)
+
+
+CONVERSATION = 'TOEFL-Speaking-Conversation-Q{}-v1-conversation.mp3'
+LISTEN = 'TOEFL-Speaking-Listen-and-Choose-Q{}-v1.mp3'
+
+
+@pytest.fixture
+def service():
+    service = FakeDriveService()
+    for i in range(1, 4):
+        service.put(f'c{i}', CONVERSATION.format(i))
+        service.put(f'l{i}', LISTEN.format(i))
+    service.put('notes', 'notes.txt', mime_type='text/plain')
+    return service
+
+
+class TestTaskOf:
+    """Tests for filename classification."""
+
+    def test_known_tasks(self):
+        """Test the two processed task types map to their constants."""
+        assert task_of(CONVERSATION.format(1)) == TASK_CONVERSATION
+        assert task_of(LISTEN.format(1)) == TASK_LISTEN_AND_CHOOSE
+
+    def test_other_names(self):
+        """Test other TOEFL tasks are lower-cased and invalid names are None."""
+        assert task_of('TOEFL-Speaking-Interview-Q1-v1.mp3') == 'interview'
+        assert task_of('conversation.mp3') is None
+
+
+class TestSync:
+    """Tests for building and refreshing the index."""
+
+    def test_first_sync_lists_folder(self, temp_dir, service):
+        """Test the first sync pages through the folder and saves a token."""
+        index = DriveIndex(service, FOLDER, temp_dir / 'index.sqlite')
+
+        result = index.sync()
+
+        assert result.full and result.updated == 7
+        assert len(index) == 7
+        assert service.calls.count('files.list') == 4
+        assert index.page_token == str(len(service.log))
+
+    def test_incremental_sync(self, temp_dir, service):
+        """Test later syncs apply only changes: edits, additions, deletions, trash and moves."""
+        index = DriveIndex(service, FOLDER, temp_dir / 'index.sqlite')
+        index.sync()
+        service.calls.clear()
+
+        service.put('c1', CONVERSATION.format(1), version=2)
+        service.put('c4', CONVERSATION.format(4))
+        service.delete('c2')
+        service.put('l1', LISTEN.format(1), trashed=True)
+        service.put('l2', LISTEN.format(2), parents=('elsewhere',))
+        service.put('other', CONVERSATION.format(9), parents=('elsewhere',))
+
+        result = index.sync()
+
+        assert not result.full
+        assert (result.updated, result.removed) == (2, 3)
+        assert 'files.list' not in service.calls
+        assert [f['id'] for f in index.files(task=TASK_CONVERSATION)] == ['c1', 'c3', 'c4']
+        assert [f['id'] for f in index.files(task=TASK_LISTEN_AND_CHOOSE)] == ['l3']
+        assert index.files(task=TASK_CONVERSATION)[0]['version'] == '2'
+
+    def test_no_changes(self, temp_dir, service):
+        """Test an unchanged folder costs one changes call."""
+        index = DriveIndex(service, FOLDER, temp_dir / 'index.sqlite')
+        index.sync()
+        service.calls.clear()
+
+        result = index.sync()
+
+        assert (result.full, result.updated, result.removed) == (False, 0, 0)
+        assert service.calls == ['changes.list']
+
+    def test_expired_token_rebuilds(self, temp_dir, service):
+        """Test a rejected token falls back to a full listing."""
+        index = DriveIndex(service, FOLDER, temp_dir / 'index.sqlite')
+        index.sync()
+        service.expired = True
+        service.delete('c1')
+
+        result = index.sync()
+
+        assert result.full
+        assert 'c1' not in {f['id'] for f in index.files()}
+
+    def test_other_folder_rebuilds(self, temp_dir, service):
+        """Test an index built for another folder is not reused."""
+        DriveIndex(service, 'elsewhere', temp_dir / 'index.sqlite').sync()
+
+        index = DriveIndex(service, FOLDER, temp_dir / 'index.sqlite')
+
+        assert index.page_token is None
+        assert index.sync().full
+        assert len(index) == 7
+
+    def test_api_error_wrapped(self, temp_dir, service):
+        """Test other API failures raise DriveIndexError and keep the old token."""
+        index = DriveIndex(service, FOLDER, temp_dir / 'index.sqlite')
+        index.sync()
+        token = index.page_token
+        service._list_changes = lambda **kwargs: Request(
+            HttpError(SimpleNamespace(status=500, reason='Backend Error'), b'')
+        )
+
+        with pytest.raises(DriveIndexError):
+            index.sync()
+
+        assert index.page_token == token
+
+
+class TestQuery:
+    """Tests for local queries."""
+
+    def test_filters(self, temp_dir, service):
+        """Test task, MIME type and name filters combine."""
+        index = DriveIndex(service, FOLDER, temp_dir / 'index.sqlite')
+        index.sync()
+
+        assert [f['name'] for f in index.files(task=TASK_CONVERSATION, mime_type='audio/mpeg')] == [
+            CONVERSATION.format(i) for i in range(1, 4)
+        ]
+        assert index.files(mime_type='text/plain') == [
+            {key: value for key, value in service.items['notes'].items() if key not in ('parents', 'trashed')}
+        ]
+        assert [f['id'] for f in index.files(name_contains='q2')] == ['c2', 'l2']
+
+    def test_env_path(self, temp_dir, service, monkeypatch):
+        """Test the default location comes from the environment."""
+        monkeypatch.setenv('DRIVE_INDEX_PATH', str(temp_dir / 'env' / 'index.sqlite'))
+
+        index = DriveIndex(service, FOLDER)
+
+        assert index.path == temp_dir / 'env' / 'index.sqlite'
+        assert index.path.exists()
+
+    def test_requires_folder(self, temp_dir, service):
+        """Test a folder ID is required."""
+        with pytest.raises(DriveIndexError):
+            DriveIndex(service, '', temp_dir / 'index.sqlite')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
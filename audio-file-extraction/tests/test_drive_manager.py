@@ -13,7 +13,7 @@ import io
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
-from utils.drive_manager import GoogleDriveManager, DriveManagerError
+from utils.drive_manager import GoogleDriveManager, DriveManagerError, direct_api_manager
 
 
 @pytest.fixture
@@ -311,5 +311,31 @@ class TestDriveManagerErrorHandling:
             )
 
 
+
+class TestDirectApiManager:
+    """Tests for direct_api_manager."""
+
+    def test_mcp_mode(self, monkeypatch):
+        """Test MCP mode never authenticates."""
+        monkeypatch.setattr('utils.drive_manager.USE_MCP', True)
+        with patch('utils.drive_manager.GoogleDriveManager') as manager_class:
+            assert direct_api_manager() is None
+        manager_class.assert_not_called()
+
+    def test_no_saved_token(self, monkeypatch, tmp_path):
+        """Test a missing token does not start an OAuth flow."""
+        monkeypatch.setenv('TOKEN_FILE', str(tmp_path / 'token.json'))
+        with patch('utils.drive_manager.GoogleDriveManager') as manager_class:
+            assert direct_api_manager() is None
+        manager_class.assert_not_called()
+
+    def test_authentication_failure(self, monkeypatch, tmp_path):
+        """Test authentication errors are reported as no manager."""
+        (tmp_path / 'token.json').touch()
+        monkeypatch.setenv('TOKEN_FILE', str(tmp_path / 'token.json'))
+        with patch('utils.drive_manager.GoogleDriveManager', side_effect=DriveManagerError("expired")):
+            assert direct_api_manager() is None
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
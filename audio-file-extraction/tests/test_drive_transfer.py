@@ -0,0 +1,476 @@
+"""
+Tests for drive_transfer module.
+
+Transfers run against a local fake of the Drive v3 media endpoints that
+supports range downloads, resumable upload sessions and injected failures.
+"""
+
+import pytest
+import asyncio
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from utils.drive_transfer import PART_SUFFIX, DriveTransfer, UploadSessionStore, summarize
+
+CHUNK = 256 * 1024
+
+
+class FakeDrive:
+    """State shared by the fake server's request handlers."""
+
+    def __init__(self):
+        self.files = {}
+        self.sessions = {}
+        self.lock = threading.Lock()
+        # (method, path prefix, action) consumed in order; action is a status
+        # to return, 'drop' (hang up mid-body) or 'pass' (serve normally)
+        self.failures = []
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self.partial_commit = False
+        self.delay = 0.0
+
+    def take_failure(self, method, path):
+        with self.lock:
+            for i, (fail_method, prefix, action) in enumerate(self.failures):
+                if fail_method == method and path.startswith(prefix):
+                    del self.failures[i]
+                    return action
+        return None
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def drive(self) -> FakeDrive:
+        return self.server.drive
+
+    def _send(self, status, body=b'', headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, data):
+        self._send(status, json.dumps(data).encode(), {'Content-Type': 'application/json'})
+
+    def _body(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return self.rfile.read(length) if length else b''
+
+    def _handle(self, method):
+        url = urlparse(self.path)
+        body = self._body()
+        with self.drive.lock:
+            self.drive.requests.append((method, url.path))
+            self.drive.active += 1
+            self.drive.max_active = max(self.drive.max_active, self.drive.active)
+        try:
+            time.sleep(self.drive.delay)
+            failure = self.drive.take_failure(method, url.path)
+            if isinstance(failure, int):
+                return self._send(failure, b'{"error": "injected"}')
+            getattr(self, f'_{method.lower()}')(url, body, failure)
+        finally:
+            with self.drive.lock:
+                self.drive.active -= 1
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def _get(self, url, body, failure):
+        file_id = url.path.rsplit('/', 1)[1]
+        data = self.drive.files.get(file_id)
+        if data is None or parse_qs(url.query).get('alt') != ['media']:
+            return self._send(404)
+
+        start, end = self.headers['Range'].split('=')[1].split('-')
+        start, end = int(start), min(int(end), len(data) - 1)
+        if start >= len(data):
+            return self._send(416, headers={'Content-Range': f"bytes */{len(data)}"})
+
+        content = data[start:end + 1]
+        self.send_response(206)
+        self.send_header('Content-Range', f"bytes {start}-{end}/{len(data)}")
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        if failure == 'drop':
+            # Send half the promised body, then hang up
+            self.wfile.write(content[:len(content) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            self.connection.shutdown(2)
+            return
+        self.wfile.write(content)
+
+    def _start_session(self, file_id, name):
+        session_id = f"s{len(self.drive.sessions)}"
+        self.drive.sessions[session_id] = {
+            'file_id': file_id, 'name': name, 'data': b'',
+            'size': int(self.headers['X-Upload-Content-Length'])
+        }
+        host, port = self.server.server_address
+        self._send(200, headers={'Location': f"http://{host}:{port}/session/{session_id}"})
+
+    def _post(self, url, body, failure):
+        metadata = json.loads(body)
+        self._start_session(f"new-{metadata['name']}", metadata['name'])
+
+    def _patch(self, url, body, failure):
+        file_id = url.path.rsplit('/', 1)[1]
+        self._start_session(file_id, file_id)
+
+    def _put(self, url, body, failure):
+        session = self.drive.sessions.get(url.path.rsplit('/', 1)[1])
+        if session is None:
+            return self._send(404)
+
+        content_range = self.headers['Content-Range']
+        if content_range.startswith('bytes */'):
+            if len(session['data']) == session['size']:
+                return self._send_json(200, {'id': session['file_id'], 'name': session['name']})
+        else:
+            start = int(content_range.split(' ')[1].split('-')[0])
+            assert start == len(session['data']), "chunk does not continue the upload"
+            if self.drive.partial_commit and len(body) > 1:
+                # Commit only part of the chunk, like a server under load may
+                body = body[:len(body) // 2]
+            session['data'] += body
+
+        if len(session['data']) == session['size']:
+            self.drive.files[session['file_id']] = session['data']
+            return self._send_json(200, {'id': session['file_id'], 'name': session['name']})
+
+        headers = {'Range': f"bytes=0-{len(session['data']) - 1}"} if session['data'] else {}
+        self._send(308, headers=headers)
+
+
+@pytest.fixture
+def fake_drive():
+    """Run a fake Drive server on a free local port."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    server.drive = FakeDrive()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+
+    server.drive.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server.drive
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+def make_transfer(fake_drive, **kwargs):
+    options = dict(base_url=fake_drive.url, chunk_size=CHUNK, backoff_seconds=0.01, timeout=5)
+    options.update(kwargs)
+    return DriveTransfer(**options)
+
+
+class TestDownload:
+    """Tests for range downloads."""
+
+    def test_chunked_download(self, fake_drive, temp_dir):
+        """Test a multi-chunk file is downloaded intact."""
+        data = os.urandom(3 * CHUNK + 123)
+        fake_drive.files['f1'] = data
+
+        with make_transfer(fake_drive) as transfer:
+            result = transfer.download_file('f1', temp_dir / 'f1.mp3')
+
+        assert result.ok
+        assert (temp_dir / 'f1.mp3').read_bytes() == data
+        assert result.bytes_transferred == len(data)
+        assert [m for m, _ in fake_drive.requests] == ['GET'] * 4
+
+    def test_resume_existing_part(self, fake_drive, temp_dir):
+        """Test a part file left by an earlier run is continued, not restarted."""
+        data = os.urandom(2 * CHUNK)
+        fake_drive.files['f1'] = data
+        (temp_dir / f"f1.mp3{PART_SUFFIX}").write_bytes(data[:CHUNK])
+
+        with make_transfer(fake_drive) as transfer:
+            result = transfer.download_file('f1', temp_dir / 'f1.mp3')
+
+        assert (temp_dir / 'f1.mp3').read_bytes() == data
+        assert result.bytes_transferred == CHUNK
+        assert len(fake_drive.requests) == 1
+        assert not (temp_dir / f"f1.mp3{PART_SUFFIX}").exists()
+
+    def test_retry_after_server_errors(self, fake_drive, temp_dir):
+        """Test 503/429 responses and a dropped connection are retried."""
+        data = os.urandom(2 * CHUNK)
+        fake_drive.files['f1'] = data
+        fake_drive.failures = [
+            ('GET', '/drive/v3/files/f1', 503),
+            ('GET', '/drive/v3/files/f1', 'drop'),
+            ('GET', '/drive/v3/files/f1', 429),
+        ]
+
+        with make_transfer(fake_drive) as transfer:
+            result = transfer.download_file('f1', temp_dir / 'f1.mp3')
+
+        assert result.ok
+        assert result.attempts == 4
+        assert (temp_dir / 'f1.mp3').read_bytes() == data
+
+    def test_gives_up_and_keeps_part(self, fake_drive, temp_dir):
+        """Test persistent failures are reported and progress is kept for later."""
+        fake_drive.files['f1'] = os.urandom(2 * CHUNK)
+        # First chunk succeeds, then every request fails
+        fake_drive.failures = [('GET', '/drive/v3/files/f1', 'pass')] + \
+            [('GET', '/drive/v3/files/f1', 503)] * 3
+
+        with make_transfer(fake_drive, max_retries=2) as transfer:
+            result = transfer.download_file('f1', temp_dir / 'f1.mp3')
+
+        assert not result.ok
+        assert result.attempts == 3
+        assert (temp_dir / f"f1.mp3{PART_SUFFIX}").stat().st_size == CHUNK
+        assert not (temp_dir / 'f1.mp3').exists()
+
+    def test_missing_file_not_retried(self, fake_drive, temp_dir):
+        """Test permanent errors fail immediately."""
+        with make_transfer(fake_drive) as transfer:
+            result = transfer.download_file('nope', temp_dir / 'nope.mp3')
+
+        assert not result.ok
+        assert result.attempts == 1
+        assert '404' in result.error
+        assert list(temp_dir.iterdir()) == []
+
+    def test_download_to_spooled_file(self, fake_drive, temp_dir):
+        """Test downloading into memory resumes from the bytes already received."""
+        data = os.urandom(3 * CHUNK)
+        fake_drive.files['f1'] = data
+        fake_drive.failures = [('GET', '/drive/v3/files/f1', 'pass'), ('GET', '/drive/v3/files/f1', 'drop')]
+
+        with make_transfer(fake_drive) as transfer, \
+                tempfile.SpooledTemporaryFile(max_size=4 * CHUNK, dir=temp_dir) as spool:
+            result = transfer.download_to('f1', spool, name='f1.mp3')
+            spool.seek(0)
+            received = spool.read()
+
+        assert result.ok
+        assert result.path == Path('f1.mp3')
+        assert result.attempts == 2
+        assert received == data
+        assert result.bytes_transferred == len(data)
+        assert list(temp_dir.iterdir()) == []
+
+    def test_download_many_concurrent(self, fake_drive, temp_dir):
+        """Test a batch downloads in parallel up to the concurrency limit."""
+        for i in range(12):
+            fake_drive.files[f"f{i}"] = os.urandom(CHUNK // 2 + i)
+        fake_drive.delay = 0.05
+
+        with make_transfer(fake_drive, concurrency=4) as transfer:
+            results = asyncio.run(transfer.download_many(
+                (f"f{i}", temp_dir / f"f{i}.mp3") for i in range(12)
+            ))
+
+        assert [r.file_id for r in results] == [f"f{i}" for i in range(12)]
+        assert all(r.ok for r in results)
+        assert all((temp_dir / f"f{i}.mp3").read_bytes() == fake_drive.files[f"f{i}"] for i in range(12))
+        assert 1 < fake_drive.max_active <= 4
+        assert '12/12 transferred' in summarize(results, 1.0)
+
+
+class TestUpload:
+    """Tests for resumable uploads."""
+
+    def test_create_in_chunks(self, fake_drive, temp_dir):
+        """Test a new file is created through a resumable session."""
+        data = os.urandom(2 * CHUNK + 7)
+        path = temp_dir / 'new.mp3'
+        path.write_bytes(data)
+
+        with make_transfer(fake_drive) as transfer:
+            result = transfer.upload_file(path, folder_id='folder')
+
+        assert result.ok
+        assert result.file_id == 'new-new.mp3'
+        assert fake_drive.files['new-new.mp3'] == data
+        assert [m for m, _ in fake_drive.requests] == ['POST', 'PUT', 'PUT', 'PUT']
+
+    def test_update_existing(self, fake_drive, temp_dir):
+        """Test updating keeps the file ID."""
+        path = temp_dir / 'conv.mp3'
+        path.write_bytes(b"prefixed")
+
+        with make_transfer(fake_drive) as transfer:
+            result = transfer.upload_file(path, file_id='abc')
+
+        assert result.file_id == 'abc'
+        assert fake_drive.files['abc'] == b"prefixed"
+        assert fake_drive.requests[0] == ('PATCH', '/upload/drive/v3/files/abc')
+
+    def test_resume_after_error(self, fake_drive, temp_dir):
+        """Test a failed chunk is followed by a status query and only the rest is sent."""
+        data = os.urandom(3 * CHUNK)
+        path = temp_dir / 'big.mp3'
+        path.write_bytes(data)
+        fake_drive.failures = [('PUT', '/session/', 'pass'), ('PUT', '/session/', 503)]
+
+        with make_transfer(fake_drive) as transfer:
+            result = transfer.upload_file(path, file_id='big')
+
+        assert result.ok
+        assert result.attempts == 2
+        assert fake_drive.files['big'] == data
+        assert result.bytes_transferred == len(data)
+
+    def test_partial_commit(self, fake_drive, temp_dir):
+        """Test chunks continue from the offset the server reports."""
+        data = os.urandom(2 * CHUNK)
+        path = temp_dir / 'big.mp3'
+        path.write_bytes(data)
+        fake_drive.partial_commit = True
+
+        with make_transfer(fake_drive) as transfer:
+            result = transfer.upload_file(path, file_id='big')
+
+        assert result.ok
+        assert fake_drive.files['big'] == data
+
+    def test_expired_session_restarts(self, fake_drive, temp_dir):
+        """Test a resumed session that no longer exists starts a new one."""
+        path = temp_dir / 'conv.mp3'
+        path.write_bytes(b"data")
+
+        with make_transfer(fake_drive) as transfer:
+            result = transfer.upload_file(
+                path, file_id='abc', session_uri=f"{fake_drive.url}/session/gone"
+            )
+
+        assert result.ok
+        assert fake_drive.files['abc'] == b"data"
+
+    def test_upload_stream(self, fake_drive):
+        """Test uploading from a file object, resuming after an error."""
+        data = os.urandom(2 * CHUNK + 99)
+        fake_drive.failures = [('PUT', '/session/', 'pass'), ('PUT', '/session/', 'drop')]
+
+        with make_transfer(fake_drive) as transfer:
+            result = transfer.upload_stream(io.BytesIO(data), len(data), 'conv.mp3', file_id='abc')
+
+        assert result.ok
+        assert result.path == Path('conv.mp3')
+        assert fake_drive.files['abc'] == data
+
+    def test_upload_many(self, fake_drive, temp_dir):
+        """Test a batch of uploads."""
+        items = []
+        for i in range(6):
+            path = temp_dir / f"f{i}.mp3"
+            path.write_bytes(os.urandom(1000 + i))
+            items.append({'file_path': path, 'file_id': f"f{i}"})
+
+        with make_transfer(fake_drive, concurrency=3) as transfer:
+            results = asyncio.run(transfer.upload_many(items))
+
+        assert all(r.ok for r in results)
+        assert all(fake_drive.files[f"f{i}"] == (temp_dir / f"f{i}.mp3").read_bytes() for i in range(6))
+
+
+class TestUploadSessions:
+    """Tests for persisted upload sessions."""
+
+    def test_crashed_batch_resumes_mid_file(self, fake_drive, temp_dir):
+        """Test a session recorded by a failed run is continued by the next one."""
+        data = os.urandom(3 * CHUNK)
+        path = temp_dir / 'big.mp3'
+        path.write_bytes(data)
+        store_path = temp_dir / 'sessions.json'
+        fake_drive.failures = [('PUT', '/session/', 'pass'), ('PUT', '/session/', 503)]
+
+        with make_transfer(fake_drive, max_retries=0) as transfer:
+            [failed] = asyncio.run(transfer.upload_many(
+                [{'file_path': path, 'file_id': 'big'}], sessions=UploadSessionStore(store_path)
+            ))
+
+        assert not failed.ok
+        assert json.loads(store_path.read_text())['big']['session_uri'] == failed.metadata['session_uri']
+
+        fake_drive.requests = []
+        with make_transfer(fake_drive) as transfer:
+            [result] = asyncio.run(transfer.upload_many(
+                [{'file_path': path, 'file_id': 'big'}], sessions=UploadSessionStore(store_path)
+            ))
+
+        assert result.ok
+        assert result.resumed_from == CHUNK
+        assert result.bytes_transferred == 2 * CHUNK
+        assert fake_drive.files['big'] == data
+        assert 'PATCH' not in [m for m, _ in fake_drive.requests]
+        assert json.loads(store_path.read_text()) == {}
+
+    def test_changed_file_starts_new_session(self, fake_drive, temp_dir):
+        """Test a recorded session is not reused once the local file changes."""
+        path = temp_dir / 'conv.mp3'
+        path.write_bytes(b"new content")
+        store = UploadSessionStore(temp_dir / 'sessions.json')
+        store.save('abc', path, f"{fake_drive.url}/session/stale")
+        os.utime(path, ns=(0, 0))
+
+        assert store.get('abc', path) is None
+
+        with make_transfer(fake_drive) as transfer:
+            [result] = asyncio.run(transfer.upload_many([{'file_path': path, 'file_id': 'abc'}], sessions=store))
+
+        assert result.ok
+        assert result.resumed_from == 0
+        assert fake_drive.requests[0] == ('PATCH', '/upload/drive/v3/files/abc')
+        assert len(store) == 0
+
+    def test_missing_file_reported(self, fake_drive, temp_dir):
+        """Test a missing local file fails that upload only."""
+        path = temp_dir / 'ok.mp3'
+        path.write_bytes(b"data")
+
+        with make_transfer(fake_drive) as transfer:
+            results = asyncio.run(transfer.upload_many([
+                {'file_path': temp_dir / 'missing.mp3', 'file_id': 'missing'},
+                {'file_path': path, 'file_id': 'ok'},
+            ], sessions=UploadSessionStore(temp_dir / 'sessions.json')))
+
+        assert [r.ok for r in results] == [False, True]
+        assert fake_drive.requests[0][0] == 'PATCH'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -9,7 +9,7 @@ import sys
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
-from utils.file_parser import TOEFLFileParser, TOEFLFileInfo
+from utils.file_parser import TOEFLFileParser, TOEFLFileInfo, statement_base, statement_output_dir
 
 
 class TestTOEFLFileParser:
@@ -189,5 +189,23 @@ class TestTOEFLFileParser:
             assert result.version == version
 
 
+
+class TestStatementPaths:
+    """Tests for names derived from module recordings."""
+
+    recording = "input/02.03.02, Listen and Choose, Module 2 (no pauses).mp3"
+
+    def test_statement_base(self):
+        """Test the suffix and extension are dropped."""
+        assert statement_base(self.recording) == "02.03.02, Listen and Choose, Module 2"
+        assert statement_base("Module 3.mp3") == "Module 3"
+
+    def test_statement_output_dir(self):
+        """Test the output directory uses the given subdirectory."""
+        assert statement_output_dir(self.recording, 'statements_improved') == str(
+            Path('output') / 'statements_improved' / '02.03.02, Listen and Choose, Module 2'
+        )
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,183 @@
+"""
+Unit tests for media_metadata module.
+
+ffprobe is mocked so these tests run without ffmpeg installed.
+"""
+
+import json
+import subprocess
+import pytest
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from utils.media_metadata import MediaMetadataService, MediaProbeError
+
+
+FFPROBE_OUTPUT = json.dumps({
+    'streams': [{'codec_name': 'mp3', 'sample_rate': '44100', 'channels': 2}],
+    'format': {'format_name': 'mp3', 'duration': '2.500000', 'bit_rate': '128000'}
+})
+
+
+def ffprobe_result(stdout=FFPROBE_OUTPUT, returncode=0, stderr=''):
+    """Build a fake CompletedProcess for ffprobe."""
+    return subprocess.CompletedProcess(
+        args=['ffprobe'], returncode=returncode, stdout=stdout, stderr=stderr
+    )
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def audio_files(temp_dir):
+    """Create placeholder audio files."""
+    files = []
+    for i in range(3):
+        path = temp_dir / f"statement_{i}.mp3"
+        path.write_bytes(b"\x00" * (100 + i))
+        files.append(path)
+    return files
+
+
+@pytest.fixture
+def service(temp_dir):
+    """Create a service with a cache file in the temp directory."""
+    return MediaMetadataService(cache_file=temp_dir / "cache.json")
+
+
+class TestMediaMetadataService:
+    """Tests for MediaMetadataService."""
+
+    def test_probe_parses_ffprobe_output(self, service, audio_files):
+        """Test metadata is parsed from ffprobe JSON."""
+        with patch('utils.media_metadata.subprocess.run', return_value=ffprobe_result()):
+            info = service.probe(audio_files[0])
+
+        assert info.duration == pytest.approx(2.5)
+        assert info.codec_name == 'mp3'
+        assert info.sample_rate == 44100
+        assert info.channels == 2
+        assert info.bit_rate == 128000
+
+    def test_probe_uses_cache(self, service, audio_files):
+        """Test repeat lookups do not spawn ffprobe."""
+        with patch('utils.media_metadata.subprocess.run', return_value=ffprobe_result()) as mock_run:
+            service.probe(audio_files[0])
+            service.probe(audio_files[0])
+
+        assert mock_run.call_count == 1
+
+    def test_probe_reprobes_modified_file(self, service, audio_files):
+        """Test a changed file is probed again."""
+        with patch('utils.media_metadata.subprocess.run', return_value=ffprobe_result()) as mock_run:
+            service.probe(audio_files[0])
+            audio_files[0].write_bytes(b"\x01" * 500)
+            service.probe(audio_files[0])
+
+        assert mock_run.call_count == 2
+
+    def test_probe_missing_file(self, service):
+        """Test probing a nonexistent file raises error."""
+        with pytest.raises(MediaProbeError, match="not found"):
+            service.probe("/nonexistent/file.mp3")
+
+    def test_probe_ffprobe_failure(self, service, audio_files):
+        """Test ffprobe errors are raised as MediaProbeError."""
+        failure = ffprobe_result(stdout='', returncode=1, stderr='Invalid data')
+
+        with patch('utils.media_metadata.subprocess.run', return_value=failure):
+            with pytest.raises(MediaProbeError, match="Invalid data"):
+                service.probe(audio_files[0])
+
+    def test_probe_many(self, service, audio_files):
+        """Test batch probing returns an entry per path."""
+        with patch('utils.media_metadata.subprocess.run', return_value=ffprobe_result()) as mock_run:
+            results = service.probe_many(audio_files)
+
+        assert mock_run.call_count == 3
+        assert set(results) == {str(p) for p in audio_files}
+        assert all(info.duration == pytest.approx(2.5) for info in results.values())
+
+    def test_probe_many_missing_file(self, service, audio_files):
+        """Test missing files map to None."""
+        with patch('utils.media_metadata.subprocess.run', return_value=ffprobe_result()):
+            results = service.probe_many([audio_files[0], "/nonexistent/file.mp3"])
+
+        assert results[str(audio_files[0])] is not None
+        assert results["/nonexistent/file.mp3"] is None
+
+    def test_cache_persists_across_instances(self, temp_dir, audio_files):
+        """Test a new service reuses the on-disk cache."""
+        cache_file = temp_dir / "cache.json"
+
+        with patch('utils.media_metadata.subprocess.run', return_value=ffprobe_result()):
+            MediaMetadataService(cache_file=cache_file).probe_many(audio_files)
+
+        assert cache_file.exists()
+
+        with patch('utils.media_metadata.subprocess.run') as mock_run:
+            results = MediaMetadataService(cache_file=cache_file).probe_many(audio_files)
+
+        mock_run.assert_not_called()
+        assert all(info is not None for info in results.values())
+
+    def test_save_drops_stale_entries(self, temp_dir, audio_files):
+        """Test deleted and modified files are evicted from the saved cache."""
+        cache_file = temp_dir / "cache.json"
+
+        with patch('utils.media_metadata.subprocess.run', return_value=ffprobe_result()):
+            MediaMetadataService(cache_file=cache_file).probe_many(audio_files)
+
+        audio_files[0].unlink()
+        audio_files[1].write_bytes(b"\x01" * 500)
+
+        new_file = temp_dir / "new.mp3"
+        new_file.write_bytes(b"\x02" * 10)
+
+        service = MediaMetadataService(cache_file=cache_file)
+        with patch('utils.media_metadata.subprocess.run', return_value=ffprobe_result()):
+            service.probe(new_file)
+        service.save()
+
+        entries = json.loads(cache_file.read_text())['entries']
+        assert set(entries) == {str(audio_files[2].resolve()), str(new_file.resolve())}
+
+    def test_corrupt_cache_is_ignored(self, temp_dir, audio_files):
+        """Test an unreadable cache file starts an empty cache."""
+        cache_file = temp_dir / "cache.json"
+        cache_file.write_text("{not json")
+
+        service = MediaMetadataService(cache_file=cache_file)
+
+        with patch('utils.media_metadata.subprocess.run', return_value=ffprobe_result()) as mock_run:
+            service.probe(audio_files[0])
+
+        assert mock_run.call_count == 1
+
+    def test_get_duration_default(self, service):
+        """Test get_duration returns default on failure."""
+        assert service.get_duration("/nonexistent/file.mp3") == 0.0
+        assert service.get_duration("/nonexistent/file.mp3", default=-1.0) == -1.0
+
+    def test_default_cache_independent_of_cwd(self, temp_dir, monkeypatch):
+        """Test the default cache file resolves against the project root."""
+        monkeypatch.delenv('MEDIA_CACHE_FILE', raising=False)
+        monkeypatch.chdir(temp_dir)
+
+        service = MediaMetadataService()
+
+        assert service.cache_file == Path(__file__).resolve().parent.parent / 'data' / 'cache' / 'media_metadata.json'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,141 @@
+"""
+Tests for mp3_frames module.
+
+Note: Fixture generation requires ffmpeg to be installed.
+"""
+
+import pytest
+import tempfile
+import subprocess
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from utils.mp3_frames import Mp3FrameError, Mp3FrameIndex, parse_frame_header
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def sample_audio(temp_dir, make_tone):
+    """Create a 3 second CBR tone with ID3v2 tag and Info header."""
+    return make_tone(temp_dir / "sample.mp3", 3)
+
+
+class TestParseFrameHeader:
+    """Tests for frame header decoding."""
+
+    def test_mpeg1_layer3(self):
+        """Test a 128 kbps 44.1 kHz header."""
+        header = parse_frame_header(b'\xff\xfb\x90\x64', 0)
+
+        assert header.version == '1'
+        assert header.layer == 3
+        assert header.bitrate == 128000
+        assert header.sample_rate == 44100
+        assert header.samples_per_frame == 1152
+        assert header.frame_length == 417
+
+    def test_padding(self):
+        """Test padding bit adds one byte."""
+        header = parse_frame_header(b'\xff\xfb\x92\x64', 0)
+        assert header.frame_length == 418
+
+    def test_invalid_sync(self):
+        """Test non-header bytes are rejected."""
+        assert parse_frame_header(b'ID3\x04', 0) is None
+        assert parse_frame_header(b'\xff\xfb', 0) is None
+
+
+class TestMp3FrameIndex:
+    """Tests for Mp3FrameIndex."""
+
+    def test_duration_matches_frame_count(self, sample_audio):
+        """Test index covers the whole stream."""
+        index = Mp3FrameIndex.from_file(sample_audio)
+
+        assert index.sample_rate == 44100
+        assert index.duration == pytest.approx(index.frame_count * 1152 / 44100)
+        assert 2.9 < index.duration < 3.2
+
+    def test_skips_id3_and_info_frame(self, sample_audio):
+        """Test the first indexed frame follows the ID3v2 tag and Info frame."""
+        data = sample_audio.read_bytes()
+        index = Mp3FrameIndex.build(data)
+
+        assert data[:3] == b'ID3'
+        first = index.offsets[0]
+        assert b'Info' not in data[first:first + 64]
+        assert index.end_offset <= len(data)
+
+    def test_byte_range_snaps_to_frames(self, sample_audio):
+        """Test cut points land on frame boundaries with exact durations."""
+        index = Mp3FrameIndex.from_file(sample_audio)
+        frame = 1152 / 44100
+
+        start, end, duration = index.byte_range(1.0, 2.0)
+
+        assert start in index.offsets
+        assert end in index.offsets
+        assert duration == pytest.approx(round(duration / frame) * frame)
+        assert abs(duration - 1.0) <= frame
+
+    def test_byte_range_to_end_of_stream(self, sample_audio):
+        """Test a range past the end stops at the last frame."""
+        index = Mp3FrameIndex.from_file(sample_audio)
+
+        _, end, duration = index.byte_range(2.0, 99.0)
+
+        assert end == index.end_offset
+        assert duration == pytest.approx(index.duration - index.frame_time(index.nearest_boundary(2.0)))
+
+    def test_empty_range(self, sample_audio):
+        """Test a range shorter than half a frame raises error."""
+        index = Mp3FrameIndex.from_file(sample_audio)
+
+        with pytest.raises(Mp3FrameError, match="no audio frames"):
+            index.byte_range(1.0, 1.001)
+
+    def test_slice_is_decodable(self, sample_audio, temp_dir):
+        """Test sliced bytes form a valid MP3 of the expected length."""
+        data = sample_audio.read_bytes()
+        index = Mp3FrameIndex.build(data)
+        output_file = temp_dir / "slice.mp3"
+
+        output_file.write_bytes(index.slice(data, 0.5, 1.5))
+
+        assert Mp3FrameIndex.from_file(output_file).duration == pytest.approx(
+            index.byte_range(0.5, 1.5)[2]
+        )
+        result = subprocess.run(
+            ['ffmpeg', '-v', 'error', '-i', str(output_file), '-f', 'null', '-'],
+            capture_output=True, text=True
+        )
+        assert result.returncode == 0
+
+    def test_not_mp3(self, temp_dir):
+        """Test non-MP3 data raises error."""
+        invalid_file = temp_dir / "invalid.mp3"
+        invalid_file.write_bytes(b"not audio" * 100)
+
+        with pytest.raises(Mp3FrameError):
+            Mp3FrameIndex.from_file(invalid_file)
+
+    def test_empty_file(self, temp_dir):
+        """Test empty file raises error."""
+        empty_file = temp_dir / "empty.mp3"
+        empty_file.write_bytes(b"")
+
+        with pytest.raises(Mp3FrameError, match="Empty"):
+            Mp3FrameIndex.from_file(empty_file)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,192 @@
+"""
+Tests for mp3_prefix module.
+
+Note: Fixture generation requires ffmpeg to be installed.
+"""
+
+import pytest
+import tempfile
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from utils.mp3_frames import Mp3FrameIndex
+from utils.mp3_prefix import Mp3PrefixEngine, Mp3PrefixError, NarratorFrames, PartsReader, prefix_or_fallback
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def engine(temp_dir, make_tone):
+    """Engine with a 1 second narrator."""
+    narrator = make_tone(temp_dir / "narrator.mp3", 1, frequency=300)
+    return Mp3PrefixEngine({'daniel': narrator})
+
+
+class TestNarratorFrames:
+    """Tests for narrator loading."""
+
+    def test_strips_headers(self, temp_dir, make_tone):
+        """Test only audio frames are kept in memory."""
+        path = make_tone(temp_dir / "narrator.mp3", 1)
+        index = Mp3FrameIndex.from_file(path)
+
+        narrator = NarratorFrames.from_file('daniel', path)
+
+        assert narrator.frame_count == index.frame_count
+        assert narrator.duration == index.duration
+        assert narrator.frames[:2] == b'\xff\xfb'
+        assert len(narrator.frames) == index.end_offset - index.offsets[0]
+        assert narrator.format.sample_rate == 44100
+        assert narrator.format.bitrate == 128000
+
+    def test_invalid_narrator(self, temp_dir):
+        """Test non-MP3 and missing narrator files are rejected."""
+        bad = temp_dir / "narrator.mp3"
+        bad.write_bytes(b"not audio" * 100)
+
+        with pytest.raises(Mp3PrefixError):
+            Mp3PrefixEngine({'daniel': bad})
+        with pytest.raises(Mp3PrefixError):
+            Mp3PrefixEngine({'daniel': temp_dir / "missing.mp3"})
+
+
+class TestPrefix:
+    """Tests for prefixing conversations."""
+
+    def test_output_is_narrator_then_conversation(self, temp_dir, engine, make_tone):
+        """Test output frames are the narrator's followed by the conversation's."""
+        conversation = make_tone(temp_dir / "conversation.mp3", 2)
+        output = temp_dir / "out" / "conversation.mp3"
+
+        result = engine.prefix('daniel', conversation, output)
+
+        narrator = engine.narrators['daniel']
+        conversation_index = Mp3FrameIndex.from_file(conversation)
+        output_index = Mp3FrameIndex.from_file(output)
+
+        assert output_index.frame_count == narrator.frame_count + conversation_index.frame_count
+        assert output_index.duration == pytest.approx(result.duration)
+        assert result.conversation_duration == conversation_index.duration
+        assert result.bytes_written == output.stat().st_size
+
+        data = output.read_bytes()
+        start = output_index.offsets[0]
+        assert data[start:start + len(narrator.frames)] == narrator.frames
+
+    def test_conversation_tag_kept(self, temp_dir, engine, make_tone):
+        """Test the conversation's ID3v2 tag leads the output."""
+        conversation = make_tone(temp_dir / "conversation.mp3", 1, extra_args=('-metadata', 'title=Module 1'))
+        output = temp_dir / "output.mp3"
+
+        engine.prefix('daniel', conversation, output)
+
+        data = output.read_bytes()
+        assert data[:3] == b'ID3'
+        assert b'Module 1' in data[:Mp3FrameIndex.from_file(output).offsets[0]]
+
+    def test_sample_rate_mismatch(self, temp_dir, engine, make_tone):
+        """Test incompatible streams are rejected before writing."""
+        conversation = make_tone(temp_dir / "conversation.mp3", 1, sample_rate=48000)
+        output = temp_dir / "output.mp3"
+
+        with pytest.raises(Mp3PrefixError, match='44100 Hz vs 48000 Hz'):
+            engine.prefix('daniel', conversation, output)
+
+        assert sorted(p.name for p in temp_dir.iterdir()) == ['conversation.mp3', 'narrator.mp3']
+
+    def test_bitrate_mismatch(self, temp_dir, engine, make_tone):
+        """Test bitrate differences are allowed unless strict."""
+        conversation = make_tone(temp_dir / "conversation.mp3", 1, bitrate='64k')
+
+        engine.prefix('daniel', conversation, temp_dir / "output.mp3")
+
+        engine.strict_bitrate = True
+        with pytest.raises(Mp3PrefixError, match='128 vs 64 kbps'):
+            engine.prefix('daniel', conversation, temp_dir / "strict.mp3")
+
+    def test_invalid_inputs(self, temp_dir, engine, make_tone):
+        """Test unknown narrators and empty files raise Mp3PrefixError."""
+        conversation = make_tone(temp_dir / "conversation.mp3", 1)
+        empty = temp_dir / "empty.mp3"
+        empty.touch()
+
+        with pytest.raises(Mp3PrefixError, match='Unknown narrator'):
+            engine.prefix('matilda', conversation, temp_dir / "output.mp3")
+        with pytest.raises(Mp3PrefixError, match='Empty'):
+            engine.prefix('daniel', empty, temp_dir / "output.mp3")
+        with pytest.raises(Mp3PrefixError):
+            engine.prefix('daniel', temp_dir / "missing.mp3", temp_dir / "output.mp3")
+
+
+class TestPrefixOrFallback:
+    """Tests for prefix_or_fallback."""
+
+    def test_engine_used(self, temp_dir, engine, make_tone):
+        """Test compatible files are spliced without calling the fallback."""
+        conversation = make_tone(temp_dir / "conversation.mp3", 1)
+        calls = []
+
+        assert prefix_or_fallback(engine, 'daniel', temp_dir / "narrator.mp3", conversation,
+                                  temp_dir / "output.mp3", lambda *args: calls.append(args))
+        assert calls == []
+        assert (temp_dir / "output.mp3").exists()
+
+    def test_fallback_on_mismatch(self, temp_dir, engine, make_tone):
+        """Test incompatible files and a missing engine go to the fallback."""
+        conversation = make_tone(temp_dir / "conversation.mp3", 1, sample_rate=48000)
+        narrator = temp_dir / "narrator.mp3"
+        output = temp_dir / "output.mp3"
+        calls = []
+
+        def fallback(inputs, output_path):
+            calls.append((inputs, output_path))
+            return False
+
+        assert not prefix_or_fallback(engine, 'daniel', narrator, conversation, output, fallback)
+        assert not prefix_or_fallback(None, 'daniel', str(narrator), str(conversation), str(output), fallback)
+        assert calls == [([narrator, conversation], output)] * 2
+
+
+class TestStreaming:
+    """Tests for prefix_parts and PartsReader."""
+
+    def test_parts_match_file_output(self, temp_dir, engine, make_tone):
+        """Test streamed parts hold the same bytes prefix() writes."""
+        conversation = make_tone(temp_dir / "conversation.mp3", 2, extra_args=('-metadata', 'title=Module 1'))
+        output = temp_dir / "output.mp3"
+        engine.prefix('daniel', conversation, output)
+
+        parts, result = engine.prefix_parts('daniel', conversation.read_bytes())
+
+        assert result.output_path is None
+        assert b''.join(parts) == output.read_bytes()
+        assert result.bytes_written == output.stat().st_size
+
+    def test_reader_seek_and_read(self):
+        """Test reads that cross part boundaries from arbitrary offsets."""
+        parts = [memoryview(b"abc"), memoryview(b""), memoryview(b"defgh"), memoryview(b"ij")]
+
+        with PartsReader(parts) as reader:
+            assert reader.size == 10
+            assert reader.read(4) == b"abcd"
+            assert reader.read() == b"efghij"
+            assert reader.read(3) == b""
+
+            reader.seek(2)
+            assert reader.read(7) == b"cdefghi"
+            reader.seek(-2, 2)
+            assert reader.read() == b"ij"
+            reader.seek(20)
+            assert reader.read(1) == b""
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,137 @@
+"""
+Tests for pipeline module.
+"""
+
+import pytest
+import threading
+import time
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from utils.pipeline import Pipeline, PipelineStage
+
+
+class TestPipeline:
+    """Tests for the staged executor."""
+
+    def test_results_in_input_order(self):
+        """Test every stage is applied and results keep input order."""
+        def slow_double(x):
+            # Later items finish first
+            time.sleep(0.01 * (5 - x))
+            return x * 2
+
+        pipeline = Pipeline([
+            PipelineStage('double', slow_double, workers=5),
+            PipelineStage('inc', lambda x: x + 1, workers=2),
+        ])
+
+        results = pipeline.run(range(5))
+
+        assert [r.value for r in results] == [1, 3, 5, 7, 9]
+        assert all(r.ok for r in results)
+        assert pipeline.metrics['double'].processed == 5
+        assert pipeline.metrics['inc'].processed == 5
+
+    def test_failure_stops_item_only(self):
+        """Test a failing item skips later stages and the others carry on."""
+        seen = []
+
+        def check(x):
+            if x == 2:
+                raise ValueError("bad item")
+            return x
+
+        pipeline = Pipeline([
+            PipelineStage('check', check, workers=2),
+            PipelineStage('record', seen.append, workers=1),
+        ])
+
+        results = pipeline.run(range(4))
+
+        assert sorted(seen) == [0, 1, 3]
+        assert not results[2].ok
+        assert results[2].failed_stage == 'check'
+        assert isinstance(results[2].error, ValueError)
+        assert pipeline.metrics['check'].failed == 1
+
+    def test_stages_overlap(self):
+        """Test different items are in different stages at the same time."""
+        active = set()
+        overlapped = threading.Event()
+        lock = threading.Lock()
+
+        def stage(name):
+            def run(x):
+                with lock:
+                    active.add(name)
+                    if len(active) > 1:
+                        overlapped.set()
+                time.sleep(0.02)
+                with lock:
+                    active.discard(name)
+                return x
+            return run
+
+        Pipeline([
+            PipelineStage('network', stage('network'), workers=1),
+            PipelineStage('encode', stage('encode'), workers=1),
+        ]).run(range(5))
+
+        assert overlapped.is_set()
+
+    def test_bounded_queue(self):
+        """Test a fast stage cannot run far ahead of a slow one."""
+        def slow(x):
+            time.sleep(0.01)
+            return x
+
+        pipeline = Pipeline([
+            PipelineStage('fast', lambda x: x, workers=1),
+            PipelineStage('slow', slow, workers=1, queue_size=2),
+        ])
+        pipeline.run(range(20))
+
+        assert pipeline.metrics['slow'].max_queue_depth <= 2
+        assert pipeline.metrics['fast'].blocked_seconds > 0
+
+    def test_on_result_called_per_item(self):
+        """Test the progress callback runs once per item in the calling thread."""
+        threads = []
+        pipeline = Pipeline([PipelineStage('id', lambda x: x, workers=3)])
+
+        pipeline.run(range(6), on_result=lambda r: threads.append(threading.current_thread()))
+
+        assert threads == [threading.current_thread()] * 6
+
+    def test_empty_input(self):
+        """Test an empty batch finishes."""
+        assert Pipeline([PipelineStage('id', lambda x: x, workers=2)]).run([]) == []
+
+    def test_invalid_stages(self):
+        """Test stages need workers."""
+        with pytest.raises(ValueError):
+            Pipeline([])
+        with pytest.raises(ValueError):
+            Pipeline([PipelineStage('id', lambda x: x, workers=0)])
+
+    def test_format_metrics(self):
+        """Test the metrics table lists each stage."""
+        pipeline = Pipeline([
+            PipelineStage('download', lambda x: x),
+            PipelineStage('upload', lambda x: x),
+        ])
+        pipeline.run(range(3))
+
+        table = pipeline.format_metrics()
+
+        assert 'download' in table
+        assert 'upload' in table
+        assert 'Wall time' in table
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,192 @@
+"""
+Tests for reprocess_statements module.
+
+A fake splitter stands in for SpeakerAwareSplitter.
+"""
+
+import pytest
+import tempfile
+from pathlib import Path
+import sys
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import reprocess_statements
+from reprocess_statements import analyze_statements, reprocess_directory
+from scripts.utils.statement_manifest import StatementManifest
+
+
+class FakeSplitter:
+    """Records calls and writes a fixed number of statements."""
+
+    def __init__(self, count=3, issues=None, params=None):
+        self.count = count
+        self.issues = issues or []
+        self.params = params or {'silence_threshold_db': -50}
+        self.calls = []
+
+    def process_file(self, input_file, output_dir):
+        self.calls.append((input_file, output_dir))
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        files = []
+        for i in range(1, self.count + 1):
+            path = output_dir / f"Module 1, Statement {i:03d}.mp3"
+            path.write_bytes(b"audio")
+            files.append(str(path))
+
+        return files, {'issues': self.issues}
+
+
+@pytest.fixture
+def workspace(monkeypatch):
+    """Create input/ and output/statements/ layout and chdir into it."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        monkeypatch.chdir(root)
+
+        (root / 'input').mkdir()
+        (root / 'input' / 'Module 1 (no pauses).mp3').write_bytes(b"source")
+
+        module_dir = root / 'output' / 'statements' / 'Module 1'
+        module_dir.mkdir(parents=True)
+        (module_dir / 'Module 1, Statement 001.mp3').write_bytes(b"old")
+
+        yield module_dir
+
+
+class TestReprocessDirectory:
+    """Tests for reprocess_directory."""
+
+    def test_shared_splitter_success(self, workspace):
+        """Test statements are regenerated in-process and the old set is kept as a snapshot."""
+        splitter = FakeSplitter(count=3)
+
+        assert reprocess_directory(workspace, splitter=splitter) is True
+
+        assert len(splitter.calls) == 1
+        assert Path(splitter.calls[0][1]).parent == workspace.parent
+        assert len(list(workspace.glob('*.mp3'))) == 3
+
+        snapshots = list((workspace.parent / '.generations' / 'Module 1').iterdir())
+        assert len(snapshots) == 1
+        assert [p.read_bytes() for p in snapshots[0].glob('*.mp3')] == [b"old"]
+
+    def test_issues_leave_statements_untouched(self, workspace):
+        """Test validation issues count as failure and the original statements are never moved."""
+        inode = (workspace / 'Module 1, Statement 001.mp3').stat().st_ino
+        splitter = FakeSplitter(count=2, issues=['Very short (0.4s)'])
+
+        assert reprocess_directory(workspace, splitter=splitter) is False
+
+        assert [p.read_bytes() for p in workspace.glob('*.mp3')] == [b"old"]
+        assert (workspace / 'Module 1, Statement 001.mp3').stat().st_ino == inode
+        assert sorted(p.name for p in workspace.parent.iterdir()) == ['Module 1']
+
+    def test_splitter_exception_discards_stage(self, workspace):
+        """Test a crashing splitter leaves no stage behind."""
+        class CrashingSplitter(FakeSplitter):
+            def process_file(self, input_file, output_dir):
+                super().process_file(input_file, output_dir)
+                raise RuntimeError("decoder crashed")
+
+        assert reprocess_directory(workspace, splitter=CrashingSplitter()) is False
+
+        assert sorted(p.name for p in workspace.parent.iterdir()) == ['Module 1']
+
+    def test_dry_run_needs_no_splitter(self, workspace):
+        """Test dry runs do not touch the directory."""
+        assert reprocess_directory(workspace, dry_run=True) is True
+        assert sorted(p.name for p in workspace.parent.iterdir()) == ['Module 1']
+
+    def test_analysis_ignores_hidden_directories(self, workspace, monkeypatch):
+        """Test stages and snapshots are not analyzed as modules."""
+        monkeypatch.setattr(
+            reprocess_statements, 'probe_durations',
+            lambda module_dir, names: {name: 2.0 for name in names}
+        )
+        reprocess_directory(workspace, splitter=FakeSplitter(count=3))
+
+        results = analyze_statements(workspace.parent)
+
+        assert list(results) == ['Module 1']
+
+
+class TestManifest:
+    """Tests for skipping unchanged modules and reusing durations."""
+
+    def test_unchanged_module_skipped(self, workspace):
+        """Test a second run with the same source and parameters does nothing."""
+        manifest = StatementManifest.for_statements(workspace.parent)
+        splitter = FakeSplitter(count=3)
+
+        assert reprocess_directory(workspace, splitter=splitter, manifest=manifest)
+        assert reprocess_directory(workspace, splitter=splitter, manifest=manifest)
+
+        assert len(splitter.calls) == 1
+        assert StatementManifest.for_statements(workspace.parent).cached_durations(
+            'Module 1', reprocess_statements.output_fingerprint(workspace)
+        ) is not None
+
+    def test_changed_params_reprocessed(self, workspace):
+        """Test different splitter parameters trigger a new split."""
+        manifest = StatementManifest.for_statements(workspace.parent)
+        reprocess_directory(workspace, splitter=FakeSplitter(), manifest=manifest)
+
+        splitter = FakeSplitter(params={'silence_threshold_db': -40})
+        reprocess_directory(workspace, splitter=splitter, manifest=manifest)
+
+        assert len(splitter.calls) == 1
+
+    def test_changed_source_reprocessed(self, workspace):
+        """Test new source content triggers a new split but a touch does not."""
+        manifest = StatementManifest.for_statements(workspace.parent)
+        splitter = FakeSplitter()
+        source = Path('input') / 'Module 1 (no pauses).mp3'
+        reprocess_directory(workspace, splitter=splitter, manifest=manifest)
+
+        source.write_bytes(b"source")
+        reprocess_directory(workspace, splitter=splitter, manifest=manifest)
+        assert len(splitter.calls) == 1
+
+        source.write_bytes(b"edited")
+        reprocess_directory(workspace, splitter=splitter, manifest=manifest)
+        assert len(splitter.calls) == 2
+
+    def test_force(self, workspace):
+        """Test --force reprocesses unchanged modules."""
+        manifest = StatementManifest.for_statements(workspace.parent)
+        splitter = FakeSplitter()
+        reprocess_directory(workspace, splitter=splitter, manifest=manifest)
+        reprocess_directory(workspace, splitter=splitter, manifest=manifest, force=True)
+
+        assert len(splitter.calls) == 2
+
+    def test_analysis_reuses_durations(self, workspace, monkeypatch):
+        """Test unchanged directories are not probed again."""
+        probed = []
+
+        def fake_probe(module_dir, names):
+            probed.append(module_dir.name)
+            return {name: 7.0 for name in names}
+
+        monkeypatch.setattr(reprocess_statements, 'probe_durations', fake_probe)
+        statements_dir = workspace.parent
+
+        first = analyze_statements(statements_dir, StatementManifest.for_statements(statements_dir))
+        second = analyze_statements(statements_dir, StatementManifest.for_statements(statements_dir))
+
+        assert probed == ['Module 1']
+        assert first['Module 1']['max_duration'] == second['Module 1']['max_duration'] == 7.0
+        assert second['Module 1']['suspicious']
+
+        (workspace / 'Module 1, Statement 002.mp3').write_bytes(b"new")
+        analyze_statements(statements_dir, StatementManifest.for_statements(statements_dir))
+
+        assert probed == ['Module 1', 'Module 1']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
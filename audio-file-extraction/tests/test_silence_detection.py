@@ -0,0 +1,226 @@
+"""
+Tests for silence_detection module.
+
+Note: File-based tests require ffmpeg to be installed.
+"""
+
+import argparse
+import pytest
+import tempfile
+import subprocess
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from utils.silence_detection import (
+    SilenceDetectionError,
+    SilenceDetector,
+    SilenceIndex,
+    combine_sweeps,
+    detect_silences,
+    detect_silences_multi,
+    frame_levels,
+    iter_silences,
+    parse_float_list,
+    run_sweep,
+    sweep_envelope,
+)
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def gapped_audio(temp_dir):
+    """Create a 4 second tone with silences at 1-1.5s, 2.2-2.3s and 3.5-4s."""
+    output_file = temp_dir / "gapped.wav"
+    expression = (
+        "if(between(t,1,1.5)+between(t,2.2,2.3)+gte(t,3.5),0,"
+        "0.5*sin(2*PI*440*t))"
+    )
+
+    subprocess.run([
+        'ffmpeg',
+        '-f', 'lavfi',
+        '-i', f"aevalsrc='{expression}':d=4:s=16000",
+        '-y',
+        str(output_file)
+    ], capture_output=True, check=True)
+
+    return output_file
+
+
+def levels_from_mask(mask):
+    """Build dB levels where True frames are silent."""
+    return np.where(np.array(mask, dtype=bool), -90.0, -10.0)
+
+
+class TestSilenceDetector:
+    """Tests for SilenceDetector on synthetic levels."""
+
+    def test_interval_across_blocks(self):
+        """Test a silence spanning two blocks is reported once."""
+        detector = SilenceDetector(threshold_db=-50, min_duration=0.05, frame_seconds=0.01)
+        blocks = [
+            levels_from_mask([0] * 10 + [1] * 4),
+            levels_from_mask([1] * 4 + [0] * 10),
+        ]
+
+        assert list(iter_silences(blocks, detector)) == [(0.1, 0.18)]
+
+    def test_short_silence_ignored(self):
+        """Test silences below min_duration are dropped."""
+        detector = SilenceDetector(threshold_db=-50, min_duration=0.2, frame_seconds=0.01)
+        blocks = [levels_from_mask([0] * 10 + [1] * 5 + [0] * 10)]
+
+        assert list(iter_silences(blocks, detector)) == []
+
+    def test_leading_silence(self):
+        """Test silence at the start of the stream is reported."""
+        detector = SilenceDetector(threshold_db=-50, min_duration=0.05, frame_seconds=0.01)
+        blocks = [levels_from_mask([1] * 10 + [0] * 10)]
+
+        assert list(iter_silences(blocks, detector)) == [(0.0, 0.1)]
+
+    def test_trailing_silence(self):
+        """Test open silence at end of stream is only reported on request."""
+        mask = [0] * 10 + [1] * 10
+
+        detector = SilenceDetector(threshold_db=-50, min_duration=0.05, frame_seconds=0.01)
+        assert list(iter_silences([levels_from_mask(mask)], detector)) == []
+
+        detector = SilenceDetector(
+            threshold_db=-50, min_duration=0.05, frame_seconds=0.01, include_trailing=True
+        )
+        assert list(iter_silences([levels_from_mask(mask)], detector)) == [(0.1, 0.2)]
+
+
+class TestFrameLevels:
+    """Tests for frame_levels."""
+
+    def test_frames_span_chunks(self):
+        """Test frames are formed across chunk boundaries."""
+        chunks = [np.full(150, 0.5, dtype=np.float32), np.zeros(250, dtype=np.float32)]
+
+        levels = np.concatenate(list(frame_levels(chunks, sample_rate=10000, frame_seconds=0.01)))
+
+        assert levels.size == 4
+        assert levels[0] == pytest.approx(20 * np.log10(0.5))
+        assert levels[2] < -100
+
+
+class TestSweepEnvelope:
+    """Tests for grid sweeps over an envelope."""
+
+    def test_matches_detector(self):
+        """Test each grid cell agrees with a streaming detector run."""
+        rng = np.random.default_rng(0)
+        levels = rng.uniform(-80, -20, size=2000)
+        thresholds = [-70, -50, -30]
+        durations = [0.01, 0.03, 0.05]
+
+        results = sweep_envelope(levels, thresholds, durations, frame_seconds=0.01)
+
+        assert len(results) == 9
+        for result in results:
+            detector = SilenceDetector(result.threshold_db, result.min_duration, frame_seconds=0.01)
+            silences = list(iter_silences([levels], detector))
+            assert result.silence_count == len(silences)
+            assert result.segment_count == len(silences) + 1
+
+    def test_segment_stats(self):
+        """Test segments split at silence midpoints."""
+        levels = levels_from_mask([0] * 100 + [1] * 20 + [0] * 280)
+
+        (result,) = sweep_envelope(levels, [-50], [0.1], frame_seconds=0.01, short_segment=1.5)
+
+        assert result.segment_count == 2
+        assert result.min_segment == pytest.approx(1.1)
+        assert result.max_segment == pytest.approx(2.9)
+        assert result.short_segments == 1
+
+    def test_combine_sweeps(self):
+        """Test per-file results aggregate across files."""
+        levels = levels_from_mask([0] * 100 + [1] * 20 + [0] * 280)
+        sweep = sweep_envelope(levels, [-50], [0.1], frame_seconds=0.01)
+
+        (combined,) = combine_sweeps([sweep, sweep])
+
+        assert combined.segment_count == 4
+        assert combined.silence_count == 2
+        assert combined.mean_segment == pytest.approx(2.0)
+
+    def test_parse_float_list(self):
+        """Test comma-separated sweep values parse, and junk is an argparse error."""
+        assert parse_float_list("-60,-50, -40") == [-60.0, -50.0, -40.0]
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_float_list("-60,loud")
+
+    def test_run_sweep(self, gapped_audio, capsys):
+        """Test a sweep prints one table row per setting."""
+        assert run_sweep(gapped_audio, [-50], [0.05, 0.2], short_segment=1.0)
+
+        output = capsys.readouterr().out
+        assert "gapped.wav" in output
+        assert "0.05s" in output and "0.20s" in output
+
+    def test_run_sweep_no_files(self, temp_dir, capsys):
+        """Test an empty directory reports failure."""
+        assert not run_sweep(temp_dir, [-50], [0.2], short_segment=1.0)
+        assert "No MP3 files" in capsys.readouterr().out
+
+
+class TestSilenceIndex:
+    """Tests for silence lookups."""
+
+    def test_nearest_within_window(self):
+        """Test the closest midpoint is returned only inside the window."""
+        index = SilenceIndex([(1.0, 1.2), (2.0, 2.4), (5.0, 5.2)])
+
+        assert index.nearest(2.1, window=0.5) == (2.0, 2.4)
+        assert index.nearest(3.5, window=0.5) is None
+
+    def test_longest_within_range(self):
+        """Test the longest period starting strictly inside the range is returned."""
+        index = SilenceIndex([(4.0, 4.2), (1.0, 1.5), (2.0, 2.5), (3.0, 3.2)])
+
+        assert index.longest_within(0.5, 4.0) == (1.0, 1.5)
+        assert index.longest_within(1.0, 2.0) is None
+
+
+class TestDetectSilences:
+    """Tests for file-based detection."""
+
+    def test_detect_silences(self, gapped_audio):
+        """Test silences are found at the expected times."""
+        silences = list(detect_silences(gapped_audio, threshold_db=-50, min_duration=0.2))
+
+        assert len(silences) == 1
+        assert silences[0] == pytest.approx((1.0, 1.5), abs=0.02)
+
+    def test_detect_silences_multi(self, gapped_audio):
+        """Test several settings are served from one decode."""
+        results = detect_silences_multi(gapped_audio, [(-50, 0.2), (-50, 0.05)])
+
+        assert len(results[(-50, 0.2)]) == 1
+        assert len(results[(-50, 0.05)]) == 2
+
+    def test_invalid_file(self, temp_dir):
+        """Test undecodable input raises error."""
+        invalid_file = temp_dir / "invalid.mp3"
+        invalid_file.write_text("not audio")
+
+        with pytest.raises(SilenceDetectionError):
+            list(detect_silences(invalid_file))
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
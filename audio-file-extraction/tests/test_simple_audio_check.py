@@ -0,0 +1,112 @@
+"""
+Tests for simple_audio_check directory analysis.
+
+ffprobe is mocked; silence detection requires ffmpeg to be installed.
+"""
+
+import json
+import pytest
+import tempfile
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import simple_audio_check
+from simple_audio_check import analyze_directory, check_file, speech_segments_between
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def audio_dir(temp_dir):
+    """Create two 3 second tones with a silence at 1-1.5s."""
+    for name in ('a.mp3', 'b.mp3'):
+        subprocess.run([
+            'ffmpeg',
+            '-f', 'lavfi',
+            '-i', "aevalsrc='if(between(t,1,1.5),0,0.5*sin(2*PI*440*t))':d=3:s=16000",
+            '-acodec', 'libmp3lame',
+            '-y',
+            str(temp_dir / name)
+        ], capture_output=True, check=True)
+
+    return temp_dir
+
+
+def fake_info(file_path, timeout=None):
+    """Stand-in for ffprobe output."""
+    return {'format': {'duration': '3.0', 'bit_rate': '128000', 'size': '48000'}}
+
+
+class TestSpeechSegments:
+    """Tests for speech_segments_between."""
+
+    def test_segments_between_silences(self):
+        """Test speech is the complement of silences."""
+        silences = [{'start': 1.0, 'end': 1.5}, {'start': 2.5, 'end': 3.0}]
+
+        segments = speech_segments_between(silences, 3.0)
+
+        assert [(s['start'], s['end']) for s in segments] == [(0, 1.0), (1.5, 2.5)]
+
+
+class TestCheckFile:
+    """Tests for check_file."""
+
+    def test_ffprobe_failure_is_reported(self, temp_dir):
+        """Test probe failures are returned instead of raised."""
+        failure = subprocess.CalledProcessError(1, 'ffprobe')
+        with patch.object(simple_audio_check, 'get_audio_info', side_effect=failure):
+            result = check_file(temp_dir / "missing.mp3")
+
+        assert result['error'].startswith('ffprobe failed')
+        assert 'duration' not in result
+
+    def test_detects_silence(self, audio_dir):
+        """Test a successful check includes silences and speech segments."""
+        with patch.object(simple_audio_check, 'get_audio_info', side_effect=fake_info):
+            result = check_file(audio_dir / "a.mp3")
+
+        assert result['error'] is None
+        assert result['silence_count'] == 1
+        assert len(result['speech_segments']) == 2
+
+    def test_failure_not_printed(self, temp_dir, capsys):
+        """Test errors are only returned, so callers report them once."""
+        invalid_file = temp_dir / "invalid.mp3"
+        invalid_file.write_text("not audio")
+
+        with patch.object(simple_audio_check, 'get_audio_info', side_effect=fake_info):
+            result = check_file(invalid_file)
+
+        assert result['error']
+        assert result['silence_count'] == 0
+        assert capsys.readouterr().out == ''
+
+
+class TestAnalyzeDirectory:
+    """Tests for analyze_directory reporting."""
+
+    def test_report_has_line_per_file(self, audio_dir, temp_dir):
+        """Test every file gets a JSON line in the report."""
+        report_path = temp_dir / "report.jsonl"
+
+        with patch.object(simple_audio_check, 'get_audio_info', side_effect=fake_info):
+            analyze_directory(audio_dir, report_path=report_path)
+
+        records = [json.loads(line) for line in report_path.read_text().splitlines()]
+        assert sorted(r['filename'] for r in records) == ['a.mp3', 'b.mp3']
+        assert all(r['silence_count'] == 1 for r in records)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,150 @@
+"""
+Tests for speaker_change module.
+
+Speakers are synthesized as harmonic tones with different pitch and
+formants, which is enough for MFCC statistics to tell them apart.
+
+Note: File-based tests require ffmpeg to be installed.
+"""
+
+import pytest
+import tempfile
+import wave
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from utils.speaker_change import (
+    MfccExtractor,
+    SpectralChangeDetector,
+    bic_scores,
+    cosine_scores,
+)
+
+SAMPLE_RATE = 16000
+
+
+def synthetic_voice(f0, formants, seconds, seed=0):
+    """Harmonic source shaped by formant peaks with syllable-rate modulation."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    source = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 30) if f0 * k < 7000)
+
+    spectrum = np.fft.rfft(source)
+    freqs = np.fft.rfftfreq(source.size, 1 / SAMPLE_RATE)
+    shape = sum(np.exp(-((freqs - f) / 120) ** 2) for f in formants) + 0.01
+
+    voice = np.fft.irfft(spectrum * shape, source.size) * (0.6 + 0.4 * np.sin(2 * np.pi * 3 * t))
+    noise = np.random.default_rng(seed).standard_normal(voice.size)
+    return (voice / np.abs(voice).max() * 0.5 + 0.01 * noise).astype(np.float32)
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def conversation():
+    """Speaker A 0-5s, pause, speaker B 5.3-10.3s, pause, speaker A 10.6-15.6s."""
+    pause = np.zeros(int(0.3 * SAMPLE_RATE), dtype=np.float32)
+    return np.concatenate([
+        synthetic_voice(120, [500, 1500, 2500], 5, seed=1),
+        pause,
+        synthetic_voice(220, [800, 1200, 2900], 5, seed=2),
+        pause,
+        synthetic_voice(120, [500, 1500, 2500], 5, seed=3),
+    ])
+
+
+class TestMfccExtractor:
+    """Tests for streaming feature extraction."""
+
+    def test_chunking_does_not_change_features(self, conversation):
+        """Test features are the same however the samples are chunked."""
+        whole = MfccExtractor().feed(conversation)
+
+        extractor = MfccExtractor()
+        chunks = np.array_split(conversation, [1000, 1003, 50000, 123457])
+        streamed = np.concatenate([extractor.feed(chunk) for chunk in chunks])
+
+        assert streamed.shape == whole.shape
+        assert np.allclose(streamed, whole, atol=1e-3)
+
+    def test_frame_rate(self):
+        """Test one frame per 10 ms hop."""
+        features = MfccExtractor().feed(np.zeros(SAMPLE_RATE, dtype=np.float32))
+
+        assert features.shape == (98, 14)
+
+
+class TestScores:
+    """Tests for change point scores."""
+
+    def test_peak_at_distribution_change(self):
+        """Test both scores peak where the feature distribution shifts."""
+        rng = np.random.default_rng(0)
+        features = np.vstack((
+            rng.normal(0.0, 1.0, (300, 4)) + [2, 0, 0, 0],
+            rng.normal(0.0, 1.0, (300, 4)) + [-2, 0, 0, 0],
+        ))
+
+        bic = bic_scores(features, 100)
+        cosine = cosine_scores(features, 100)
+
+        assert abs(100 + int(np.argmax(bic)) - 300) <= 5
+        # Cosine distance saturates near the change, so its peak is flatter
+        assert abs(100 + int(np.argmax(cosine)) - 300) <= 20
+        assert bic.max() > 0
+
+    def test_short_input(self):
+        """Test inputs shorter than two windows have no scores."""
+        assert bic_scores(np.zeros((10, 3)), 10).size == 0
+        assert cosine_scores(np.zeros((10, 3)), 10).size == 0
+
+
+class TestSpectralChangeDetector:
+    """Tests for speaker turn detection."""
+
+    @pytest.mark.parametrize('method', ['bic', 'cosine'])
+    def test_alternating_speakers(self, conversation, method):
+        """Test turns change at the pauses and the returning speaker keeps its label."""
+        turns = SpectralChangeDetector(method=method).detect_samples(conversation)
+
+        assert len(turns) == 3
+        assert turns[0][2] == turns[2][2] != turns[1][2]
+        assert turns[1][0] == pytest.approx(5.3, abs=0.5)
+        assert turns[2][0] == pytest.approx(10.6, abs=0.5)
+
+    def test_uniform_audio_single_turn(self):
+        """Test audio without changes is one turn."""
+        turns = SpectralChangeDetector().detect_samples(np.zeros(SAMPLE_RATE * 3, dtype=np.float32))
+
+        assert len(turns) == 1
+
+    def test_unknown_method(self):
+        """Test unknown scoring methods are rejected."""
+        with pytest.raises(ValueError):
+            SpectralChangeDetector(method='gmm')
+
+    def test_detect_file(self, temp_dir, conversation):
+        """Test detection through the ffmpeg decode path."""
+        path = temp_dir / "conversation.wav"
+        with wave.open(str(path), 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(SAMPLE_RATE)
+            wav.writeframes((conversation * 32767).astype('<i2').tobytes())
+
+        turns = SpectralChangeDetector().detect(path)
+
+        assert [label for _, _, label in turns] == ['SPEAKER_00', 'SPEAKER_01', 'SPEAKER_00']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,290 @@
+"""
+Tests for split_with_speaker_detection module.
+
+The diarization pipeline is replaced by a fake, so these tests run
+without pyannote.audio or a HuggingFace token.
+"""
+
+import pytest
+import random
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+import sys
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import split_with_speaker_detection
+from split_with_speaker_detection import SpeakerAwareSplitter
+from scripts.utils import diarization_cache
+from scripts.utils.diarization_cache import DiarizationCache
+
+
+class FakeTurn:
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+
+class FakeDiarization:
+    def __init__(self, turns):
+        self.turns = turns
+
+    def itertracks(self, yield_label=False):
+        for start, end, speaker in self.turns:
+            yield FakeTurn(start, end), None, speaker
+
+
+class FakePipeline:
+    """Counts calls and returns fixed speaker turns."""
+
+    def __init__(self, turns):
+        self.turns = turns
+        self.calls = 0
+
+    def __call__(self, input_file):
+        self.calls += 1
+        return FakeDiarization(self.turns)
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def audio_file(temp_dir):
+    """Create placeholder audio content."""
+    path = temp_dir / "module.mp3"
+    path.write_bytes(b"\xff\xfb" + b"\x00" * 1000)
+    return path
+
+
+def make_splitter(cache=None, use_cache=True, pipeline=None):
+    """Build a splitter with speaker detection forced on and a fake pipeline."""
+    splitter = SpeakerAwareSplitter(
+        use_speaker_detection=False,
+        diarization_cache=cache,
+        use_diarization_cache=use_cache
+    )
+    splitter.use_speaker_detection = True
+    splitter.pipeline = pipeline
+    return splitter
+
+
+def reference_merge_split_signals(speaker_segments, silence_periods, audio_duration, min_segment):
+    """Linear-scan merge_split_signals as it was before SilenceIndex."""
+    def find_nearest_silence(timestamp, window=0.5):
+        candidates = [
+            (s_start, s_end) for s_start, s_end in silence_periods
+            if abs((s_start + s_end) / 2.0 - timestamp) <= window
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda x: abs((x[0] + x[1]) / 2.0 - timestamp))
+
+    def segments_from_splits(points):
+        if not points:
+            return [(0, audio_duration)]
+        segments = []
+        prev_time = 0
+        for split_time in points:
+            segments.append((prev_time, split_time))
+            prev_time = split_time
+        segments.append((prev_time, audio_duration))
+        return segments
+
+    split_points = []
+
+    if not speaker_segments:
+        for silence_start, silence_end in silence_periods:
+            split_points.append((silence_start + silence_end) / 2.0)
+    else:
+        for i in range(1, len(speaker_segments)):
+            if speaker_segments[i - 1][1] != speaker_segments[i][1]:
+                nearby_silence = find_nearest_silence(speaker_segments[i][0])
+                if nearby_silence:
+                    split_points.append((nearby_silence[0] + nearby_silence[1]) / 2.0)
+                else:
+                    split_points.append(speaker_segments[i][0])
+
+        additional_splits = []
+        for seg_start, seg_end in segments_from_splits(split_points):
+            if seg_end - seg_start > 6.0:
+                internal_silences = [
+                    (s_start, s_end) for s_start, s_end in silence_periods
+                    if seg_start < s_start < seg_end
+                ]
+                if internal_silences:
+                    longest_silence = max(internal_silences, key=lambda x: x[1] - x[0])
+                    additional_splits.append((longest_silence[0] + longest_silence[1]) / 2.0)
+
+        split_points.extend(additional_splits)
+
+    split_points = sorted(set(split_points))
+    if not split_points:
+        return split_points
+
+    segments = segments_from_splits(split_points)
+    merged_splits = []
+    for i, (seg_start, seg_end) in enumerate(segments):
+        if seg_end - seg_start < min_segment and i < len(segments) - 1:
+            continue
+        if seg_end < audio_duration:
+            merged_splits.append(seg_end)
+    return merged_splits
+
+
+def random_signals(rng, shuffle=False):
+    """Generate detector-like silences and diarization changes on a 10 ms grid."""
+    audio_duration = round(rng.uniform(5, 120), 2)
+
+    silence_periods = []
+    position = 0.0
+    while True:
+        position += round(rng.uniform(0.05, 8.0), 2)
+        length = round(rng.choice([0.2, 0.3, 0.5, rng.uniform(0.1, 2.0)]), 2)
+        if position + length >= audio_duration:
+            break
+        silence_periods.append((round(position, 2), round(position + length, 2)))
+        position += length
+
+    speaker_segments = []
+    if rng.random() > 0.1:
+        time = 0.0
+        while time < audio_duration:
+            speaker_segments.append((round(time, 2), rng.choice('ABC')))
+            time += rng.uniform(0.3, 12.0)
+
+    if shuffle:
+        rng.shuffle(silence_periods)
+
+    return speaker_segments, silence_periods, audio_duration
+
+
+class TestMergeSplitSignals:
+    """Property tests against the previous linear-scan implementation."""
+
+    @pytest.mark.parametrize('shuffle', [False, True])
+    def test_matches_reference(self, shuffle):
+        """Test split points are identical on random inputs."""
+        rng = random.Random(1234)
+        splitter = make_splitter()
+
+        for _ in range(300):
+            speaker_segments, silence_periods, audio_duration = random_signals(rng, shuffle)
+
+            expected = reference_merge_split_signals(
+                speaker_segments, silence_periods, audio_duration, splitter.min_segment_duration
+            )
+            actual = splitter.merge_split_signals(speaker_segments, silence_periods, audio_duration)
+
+            assert actual == expected
+
+    def test_equidistant_silences(self):
+        """Test a change halfway between two silences uses the first listed one."""
+        splitter = make_splitter()
+        speaker_segments = [(0.0, 'A'), (5.0, 'B')]
+        silence_periods = [(4.5, 4.7), (5.3, 5.5)]
+
+        for periods in (silence_periods, silence_periods[::-1]):
+            expected = reference_merge_split_signals(speaker_segments, periods, 10.0, 1.5)
+            assert splitter.merge_split_signals(speaker_segments, periods, 10.0) == expected
+
+
+class TestDetectSpeakerChanges:
+    """Tests for cached diarization."""
+
+    def test_cache_avoids_second_run(self, temp_dir, audio_file):
+        """Test the model runs once per audio file."""
+        pipeline = FakePipeline([(0.0, 2.0, 'A'), (2.2, 4.0, 'B')])
+        cache = DiarizationCache(temp_dir / "cache")
+
+        first = make_splitter(cache, pipeline=pipeline).detect_speaker_changes(str(audio_file))
+        second = make_splitter(cache, pipeline=pipeline).detect_speaker_changes(str(audio_file))
+
+        assert first == second == [(0.0, 'A'), (2.2, 'B')]
+        assert pipeline.calls == 1
+
+    def test_miss_hashes_audio_once(self, temp_dir, audio_file, monkeypatch):
+        """Test a cache miss reuses the lookup key for the store."""
+        hashed = []
+        original = diarization_cache.hash_audio
+        monkeypatch.setattr(diarization_cache, 'hash_audio', lambda path: hashed.append(path) or original(path))
+        cache = DiarizationCache(temp_dir / "cache")
+
+        make_splitter(cache, pipeline=FakePipeline([(0.0, 2.0, 'A')])).detect_speaker_changes(str(audio_file))
+
+        assert hashed == [str(audio_file)]
+        assert cache.get(audio_file, make_splitter(cache).pipeline_id) == [(0.0, 2.0, 'A')]
+
+    def test_cache_disabled(self, temp_dir, audio_file):
+        """Test disabling the cache always runs the model."""
+        pipeline = FakePipeline([(0.0, 2.0, 'A')])
+
+        splitter = make_splitter(use_cache=False, pipeline=pipeline)
+        splitter.detect_speaker_changes(str(audio_file))
+        splitter.detect_speaker_changes(str(audio_file))
+
+        assert pipeline.calls == 2
+
+    def test_spectral_backend_needs_no_model(self, temp_dir, audio_file):
+        """Test the spectral backend runs without pyannote, a token or the cache."""
+        cache = DiarizationCache(temp_dir / "cache")
+        splitter = SpeakerAwareSplitter(speaker_backend='spectral', diarization_cache=cache)
+        splitter.spectral_detector.detect = lambda path: [(0.0, 2.0, 'A'), (2.5, 4.0, 'B')]
+
+        assert splitter.use_speaker_detection
+        assert splitter.detect_speaker_changes(str(audio_file)) == [(0.0, 'A'), (2.5, 'B')]
+        assert not (temp_dir / "cache").exists()
+
+    def test_auto_backend_falls_back_to_spectral(self):
+        """Test auto uses the spectral detector when pyannote cannot run."""
+        splitter = SpeakerAwareSplitter(speaker_backend='auto', hf_token=None)
+
+        if not splitter.use_speaker_detection or splitter.spectral_detector is None:
+            pytest.skip("pyannote.audio and a token are available")
+        assert splitter.pipeline is None
+
+    def test_params_describe_speaker_source(self):
+        """Test manifest parameters name the speaker change source actually in use."""
+        assert SpeakerAwareSplitter(use_speaker_detection=False).params['speaker_detection'] == 'none'
+        assert SpeakerAwareSplitter(
+            speaker_backend='spectral', spectral_method='cosine'
+        ).params['speaker_detection'] == 'spectral:cosine'
+
+    def test_params_survive_failed_model_load(self, monkeypatch):
+        """Test a lazy load failure does not change manifest parameters."""
+        module = split_with_speaker_detection
+        def from_pretrained(*args, **kwargs):
+            raise OSError("model download failed")
+
+        monkeypatch.setattr(module, 'PYANNOTE_AVAILABLE', True)
+        monkeypatch.setattr(module, 'Pipeline', SimpleNamespace(from_pretrained=from_pretrained), raising=False)
+        monkeypatch.setattr(module, 'pyannote', SimpleNamespace(audio=SimpleNamespace(__version__='3.1.1')), raising=False)
+        splitter = SpeakerAwareSplitter(hf_token='token', speaker_backend='auto', use_diarization_cache=False)
+        params = splitter.params
+
+        assert not splitter.load_pipeline()
+
+        assert splitter.spectral_detector is not None
+        assert splitter.params == params
+        assert params['speaker_detection'] == f"{module.PIPELINE_NAME}@3.1.1"
+
+    def test_windowed_runs_cached_separately(self):
+        """Test windowed and whole-file results use different cache keys."""
+        whole = make_splitter()
+        windowed = SpeakerAwareSplitter(
+            use_speaker_detection=False,
+            diarization_window=300,
+            diarization_overlap=30
+        )
+
+        assert windowed.pipeline_id == whole.pipeline_id + "+window300/30"
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
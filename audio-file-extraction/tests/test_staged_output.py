@@ -0,0 +1,224 @@
+"""
+Tests for staged_output module.
+"""
+
+import pytest
+import tempfile
+from pathlib import Path
+import subprocess
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from utils import staged_output
+from utils.staged_output import (
+    StagedOutput,
+    StagedOutputError,
+    escape_segment_pattern,
+    exchange_paths,
+)
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def target(temp_dir):
+    """Published directory holding one old statement."""
+    target = temp_dir / 'Module 1'
+    target.mkdir()
+    (target / 'Statement 001.mp3').write_bytes(b"old")
+    return target
+
+
+def dead_pid():
+    """Process id of a process that has already exited."""
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def contents(directory):
+    """Map file names to bytes."""
+    return {p.name: p.read_bytes() for p in sorted(directory.iterdir()) if p.is_file()}
+
+
+class TestCommit:
+    """Tests for publishing a stage."""
+
+    def test_new_target(self, temp_dir):
+        """Test a stage becomes the target when none exists yet."""
+        target = temp_dir / 'out' / 'Module 1'
+
+        with StagedOutput(target) as stage:
+            assert stage.path.parent == target.parent
+            (stage.path / 'a.mp3').write_bytes(b"new")
+            assert stage.commit() is None
+
+        assert contents(target) == {'a.mp3': b"new"}
+        assert sorted(p.name for p in target.parent.iterdir()) == ['Module 1']
+
+    def test_replaces_target_and_keeps_snapshot(self, target):
+        """Test the previous generation is moved into a snapshot."""
+        with StagedOutput(target) as stage:
+            (stage.path / 'Statement 001.mp3').write_bytes(b"new")
+            (stage.path / 'Statement 002.mp3').write_bytes(b"new")
+            snapshot = stage.commit()
+
+        assert contents(target) == {'Statement 001.mp3': b"new", 'Statement 002.mp3': b"new"}
+        assert contents(snapshot) == {'Statement 001.mp3': b"old"}
+        assert snapshot.parent == target.parent / '.generations' / 'Module 1'
+
+    def test_fallback_without_exchange(self, target, monkeypatch):
+        """Test two-rename publishing where atomic exchange is unavailable."""
+        monkeypatch.setattr(staged_output, '_libc', None)
+
+        with StagedOutput(target) as stage:
+            (stage.path / 'Statement 001.mp3').write_bytes(b"new")
+            snapshot = stage.commit()
+
+        assert contents(target) == {'Statement 001.mp3': b"new"}
+        assert contents(snapshot) == {'Statement 001.mp3': b"old"}
+        assert sorted(p.name for p in target.parent.iterdir()) == ['.generations', 'Module 1']
+
+    def test_snapshots_pruned(self, target):
+        """Test only keep_generations snapshots are kept."""
+        for i in range(4):
+            with StagedOutput(target, keep_generations=2) as stage:
+                (stage.path / 'Statement 001.mp3').write_bytes(str(i).encode())
+                stage.commit()
+
+        snapshots = StagedOutput(target).snapshots()
+        assert [contents(s)['Statement 001.mp3'] for s in snapshots] == [b"1", b"2"]
+
+    def test_snapshot_names_are_utc(self, target, monkeypatch):
+        """Test snapshot names sort by age even across a DST fall-back hour."""
+        # 05:30 UTC on 2024-11-03 is the repeated 01:30 hour in US Eastern time
+        stamps = iter([1730611800 * 10**9 + 5, 1730615400 * 10**9])
+        monkeypatch.setattr(staged_output.time, 'time_ns', lambda: next(stamps))
+
+        names = []
+        for i in range(2):
+            with StagedOutput(target, keep_generations=2) as stage:
+                (stage.path / 'Statement 001.mp3').write_bytes(str(i).encode())
+                names.append(stage.commit().name)
+
+        assert names == ['20241103-053000.000000005', '20241103-063000.000000000']
+        assert [s.name for s in StagedOutput(target).snapshots()] == names
+
+    def test_no_snapshots(self, target):
+        """Test keep_generations=0 deletes the displaced generation."""
+        with StagedOutput(target, keep_generations=0) as stage:
+            assert stage.commit() is None
+
+        assert not (target.parent / '.generations').exists()
+
+    def test_commit_twice(self, target):
+        """Test a stage can only be published once."""
+        with StagedOutput(target) as stage:
+            stage.commit()
+            with pytest.raises(StagedOutputError):
+                stage.commit()
+
+
+class TestDiscard:
+    """Tests for abandoning a stage."""
+
+    def test_exception_leaves_target(self, target):
+        """Test an exception inside the block discards the stage only."""
+        with pytest.raises(RuntimeError):
+            with StagedOutput(target) as stage:
+                (stage.path / 'Statement 001.mp3').write_bytes(b"partial")
+                raise RuntimeError("split failed")
+
+        assert contents(target) == {'Statement 001.mp3': b"old"}
+        assert sorted(p.name for p in target.parent.iterdir()) == ['Module 1']
+
+
+class TestRecover:
+    """Tests for cleaning up after crashed processes."""
+
+    def test_abandoned_stage_removed(self, target):
+        """Test stages of dead processes are deleted."""
+        abandoned = target.parent / f".Module 1.stage-{dead_pid()}-1"
+        abandoned.mkdir()
+
+        with StagedOutput(target):
+            pass
+
+        assert not abandoned.exists()
+
+    def test_interrupted_publish_restored(self, target):
+        """Test a displaced directory is put back if the target is missing."""
+        displaced = target.parent / f".Module 1.displaced-{dead_pid()}-1"
+        target.rename(displaced)
+
+        StagedOutput(target).recover()
+
+        assert contents(target) == {'Statement 001.mp3': b"old"}
+        assert not displaced.exists()
+
+    def test_live_stage_kept(self, target):
+        """Test stages of running processes are left alone."""
+        process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+        try:
+            live = target.parent / f".Module 1.stage-{process.pid}-1"
+            live.mkdir()
+
+            StagedOutput(target).recover()
+
+            assert live.exists()
+        finally:
+            process.kill()
+            process.wait()
+
+
+class TestRestore:
+    """Tests for republishing snapshots."""
+
+    def test_restore_hardlinks_snapshot(self, target):
+        """Test restoring links the snapshot's files instead of copying them."""
+        with StagedOutput(target, keep_generations=2) as stage:
+            (stage.path / 'Statement 001.mp3').write_bytes(b"new")
+            snapshot = stage.commit()
+
+        StagedOutput(target, keep_generations=2).restore()
+
+        assert contents(target) == {'Statement 001.mp3': b"old"}
+        assert (target / 'Statement 001.mp3').stat().st_ino == \
+            (snapshot / 'Statement 001.mp3').stat().st_ino
+
+    def test_restore_without_snapshots(self, target):
+        """Test restoring with nothing to restore fails."""
+        with pytest.raises(StagedOutputError):
+            StagedOutput(target).restore()
+
+
+class TestHelpers:
+    """Tests for module helpers."""
+
+    def test_escape_segment_pattern(self):
+        """Test literal percent signs survive ffmpeg's pattern expansion."""
+        assert escape_segment_pattern("100% Module 1") == "100%% Module 1"
+        assert escape_segment_pattern("Module 1") == "Module 1"
+
+    def test_exchange_paths(self, temp_dir):
+        """Test two paths swap places (or exchange is reported unsupported)."""
+        first = temp_dir / 'first'
+        second = temp_dir / 'second'
+        first.write_bytes(b"1")
+        second.write_bytes(b"2")
+
+        if exchange_paths(first, second):
+            assert (first.read_bytes(), second.read_bytes()) == (b"2", b"1")
+        else:
+            assert (first.read_bytes(), second.read_bytes()) == (b"1", b"2")
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,95 @@
+"""
+Tests for statement_manifest module.
+"""
+
+import pytest
+import tempfile
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from utils.statement_manifest import StatementManifest, output_fingerprint
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def module_dir(temp_dir):
+    """Create a statement directory with two outputs."""
+    path = temp_dir / "statements" / "Module 1"
+    path.mkdir(parents=True)
+    (path / "Statement 001.mp3").write_bytes(b"one")
+    (path / "Statement 002.mp3").write_bytes(b"two")
+    return path
+
+
+class TestCachedDurations:
+    """Tests for output change detection."""
+
+    def test_round_trip(self, module_dir):
+        """Test recorded durations survive a save and reload."""
+        manifest = StatementManifest.for_statements(module_dir.parent)
+        fingerprint = output_fingerprint(module_dir)
+        manifest.record_outputs("Module 1", fingerprint, {"Statement 001.mp3": 1.5})
+        manifest.save()
+
+        reloaded = StatementManifest.for_statements(module_dir.parent)
+        assert reloaded.cached_durations("Module 1", fingerprint) == {
+            "Statement 001.mp3": 1.5,
+            "Statement 002.mp3": None,
+        }
+
+    def test_modified_output_invalidates(self, module_dir):
+        """Test a rewritten or removed file invalidates recorded durations."""
+        manifest = StatementManifest.for_statements(module_dir.parent)
+        manifest.record_outputs("Module 1", output_fingerprint(module_dir), {})
+
+        (module_dir / "Statement 001.mp3").write_bytes(b"longer")
+        assert manifest.cached_durations("Module 1", output_fingerprint(module_dir)) is None
+
+        manifest.record_outputs("Module 1", output_fingerprint(module_dir), {})
+        (module_dir / "Statement 002.mp3").unlink()
+        assert manifest.cached_durations("Module 1", output_fingerprint(module_dir)) is None
+
+    def test_unreadable_manifest_ignored(self, module_dir):
+        """Test a corrupt manifest starts empty."""
+        (module_dir.parent / ".manifest.json").write_text("{not json")
+
+        manifest = StatementManifest.for_statements(module_dir.parent)
+
+        assert manifest.cached_durations("Module 1", output_fingerprint(module_dir)) is None
+
+
+class TestIsCurrent:
+    """Tests for source and parameter tracking."""
+
+    def test_source_and_params(self, temp_dir, module_dir):
+        """Test only matching source content and parameters count as current."""
+        source = temp_dir / "Module 1 (no pauses).mp3"
+        source.write_bytes(b"source")
+        manifest = StatementManifest.for_statements(module_dir.parent)
+        manifest.record_run("Module 1", module_dir, source, {'threshold': -50}, {})
+
+        assert manifest.is_current("Module 1", module_dir, source, {'threshold': -50})
+        assert not manifest.is_current("Module 1", module_dir, source, {'threshold': -45})
+
+        source.write_bytes(b"change")
+        assert not manifest.is_current("Module 1", module_dir, source, {'threshold': -50})
+
+    def test_unknown_module(self, temp_dir, module_dir):
+        """Test modules never split through the manifest are not current."""
+        manifest = StatementManifest.for_statements(module_dir.parent)
+        manifest.record_outputs("Module 1", output_fingerprint(module_dir), {})
+
+        assert not manifest.is_current("Module 1", module_dir, temp_dir / "missing.mp3", {})
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
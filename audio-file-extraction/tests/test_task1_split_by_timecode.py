@@ -0,0 +1,190 @@
+"""
+Tests for task1_split_by_timecode module.
+
+Note: Splitting tests require ffmpeg to be installed.
+"""
+
+import pytest
+import tempfile
+from pathlib import Path
+import sys
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.task1_split_by_timecode import (
+    TimecodeProcessor,
+    TimecodeEntry,
+    process_file_pair,
+)
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def source_audio(temp_dir, make_tone):
+    """Create a 6 second tone to split."""
+    return make_tone(temp_dir / "source.mp3", 6)
+
+
+def make_entry(start: float, end: float) -> TimecodeEntry:
+    """Build a TimecodeEntry from seconds."""
+    return TimecodeEntry(
+        speaker="Speaker 1",
+        start_time="",
+        end_time="",
+        text="",
+        start_seconds=start,
+        end_seconds=end,
+        duration=end - start
+    )
+
+
+class TestTimecodeProcessor:
+    """Tests for TimecodeProcessor."""
+
+    def test_timecode_to_seconds(self):
+        """Test SMPTE timecode conversion."""
+        processor = TimecodeProcessor(fps=30)
+
+        assert processor.timecode_to_seconds("00:00:02:15") == pytest.approx(2.5)
+        assert processor.timecode_to_seconds("01:01:01:00") == pytest.approx(3661.0)
+
+    def test_timecode_to_seconds_invalid(self):
+        """Test invalid timecode raises error."""
+        processor = TimecodeProcessor()
+
+        with pytest.raises(ValueError):
+            processor.timecode_to_seconds("00:02:15")
+
+    def test_build_segment_plan_with_gaps(self):
+        """Test cut times include gap boundaries."""
+        entries = [make_entry(0.5, 1.5), make_entry(2.0, 3.0)]
+
+        cut_times, segment_indices = TimecodeProcessor._build_segment_plan(entries)
+
+        assert cut_times == [0.5, 1.5, 2.0, 3.0]
+        assert segment_indices == [1, 3]
+
+    def test_build_segment_plan_contiguous(self):
+        """Test contiguous entries share boundaries."""
+        entries = [make_entry(0.0, 1.0), make_entry(1.0, 2.5)]
+
+        cut_times, segment_indices = TimecodeProcessor._build_segment_plan(entries)
+
+        assert cut_times == [1.0, 2.5]
+        assert segment_indices == [0, 1]
+
+    def test_entries_are_sequential(self):
+        """Test overlap detection."""
+        assert TimecodeProcessor._entries_are_sequential(
+            [make_entry(0.0, 1.0), make_entry(1.0, 2.0)]
+        )
+        assert not TimecodeProcessor._entries_are_sequential(
+            [make_entry(0.0, 1.5), make_entry(1.0, 2.0)]
+        )
+
+    def test_split_audio_unknown_method(self, temp_dir):
+        """Test unsupported split method raises error."""
+        processor = TimecodeProcessor()
+
+        with pytest.raises(ValueError, match="Unknown split method"):
+            processor.split_audio(
+                input_audio=temp_dir / "missing.mp3",
+                entries=[make_entry(0.0, 1.0)],
+                output_dir=temp_dir,
+                base_name="Module",
+                method="bogus"
+            )
+
+    def test_split_audio_single_pass(self, source_audio, temp_dir):
+        """Test single-pass splitting creates one file per entry."""
+        processor = TimecodeProcessor()
+        entries = [make_entry(0.5, 1.5), make_entry(2.0, 3.0), make_entry(3.0, 5.0)]
+        output_dir = temp_dir / "out"
+
+        output_files = processor.split_audio(
+            input_audio=source_audio,
+            entries=entries,
+            output_dir=output_dir,
+            base_name="Module 1",
+            method="single-pass"
+        )
+
+        assert [p.name for p in output_files] == [
+            "Module 1, Statement 001.mp3",
+            "Module 1, Statement 002.mp3",
+            "Module 1, Statement 003.mp3",
+        ]
+        for path in output_files:
+            assert path.exists()
+            assert path.stat().st_size > 0
+
+        # Gap segments and the segment list are cleaned up
+        assert sorted(p.name for p in output_dir.iterdir()) == [p.name for p in output_files]
+
+    def test_split_audio_frame_index(self, source_audio, temp_dir):
+        """Test frame-index splitting slices overlapping entries from one index."""
+        processor = TimecodeProcessor()
+        entries = [make_entry(0.5, 1.5), make_entry(1.0, 3.0)]
+        output_dir = temp_dir / "out"
+
+        output_files = processor.split_audio(
+            input_audio=source_audio,
+            entries=entries,
+            output_dir=output_dir,
+            base_name="Module 1",
+            method="frame-index"
+        )
+
+        assert len(output_files) == 2
+        for path in output_files:
+            assert path.read_bytes()[:2] == b'\xff\xfb'
+
+
+class TestProcessFilePair:
+    """Tests for process_file_pair."""
+
+    def test_missing_csv_is_reported(self, temp_dir):
+        """Test errors are captured on the result instead of raised."""
+        result = process_file_pair(
+            TimecodeProcessor(),
+            mp3_file=temp_dir / "Module 1 (no pauses).mp3",
+            csv_file=temp_dir / "Module 1 (no pauses).csv",
+            output_dir=temp_dir / "out"
+        )
+
+        assert result.success is False
+        assert "CSV file not found" in result.error
+        assert result.statements == 0
+
+    def test_dry_run_counts_statements(self, temp_dir):
+        """Test a dry run reports one statement per CSV row."""
+        csv_file = temp_dir / "Module 1 (no pauses).csv"
+        csv_file.write_text(
+            '"Speaker Name","Start Time","End Time","Text"\n'
+            '"Speaker 1","00:00:00:00","00:00:02:15","First"\n'
+            '"Speaker 2","00:00:03:00","00:00:05:00","Second"\n'
+        )
+        mp3_file = temp_dir / "Module 1 (no pauses).mp3"
+        mp3_file.write_bytes(b"")
+
+        result = process_file_pair(
+            TimecodeProcessor(),
+            mp3_file=mp3_file,
+            csv_file=csv_file,
+            output_dir=temp_dir / "out",
+            dry_run=True
+        )
+
+        assert result.success is True
+        assert result.statements == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,175 @@
+"""
+Tests for task2_add_prefix module.
+
+A fake Drive manager serves local files; concatenation and validation use
+the PyAV backend.
+
+Note: Requires ffmpeg (to create test audio) and PyAV.
+"""
+
+import pytest
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+import sys
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import task2_add_prefix
+from scripts.task2_add_prefix import Task2Processor
+from scripts.utils.drive_cache import DriveBlobCache
+from scripts.utils.drive_manager import GoogleDriveManager
+from utils.audio_backends import PYAV_AVAILABLE, get_backend  # Same modules task2_add_prefix imports
+
+pytestmark = pytest.mark.skipif(not PYAV_AVAILABLE, reason="PyAV not installed")
+
+
+class FakeDrive:
+    """Drive manager that copies files from a local 'remote' directory."""
+
+    remote_dir = None
+    uploads = []
+    threads = set()
+    fail_download = set()
+    downloads = []
+    lock = threading.Lock()
+
+    download_file_cached = GoogleDriveManager.download_file_cached
+
+    def get_file_metadata(self, file_id, fields=None):
+        data = (FakeDrive.remote_dir / file_id).read_bytes()
+        return {'id': file_id, 'size': str(len(data)), 'md5Checksum': str(hash(data))}
+
+    def download_file(self, file_id, output_path, show_progress=True):
+        with FakeDrive.lock:
+            FakeDrive.threads.add(threading.current_thread().name)
+            FakeDrive.downloads.append(file_id)
+        if file_id in FakeDrive.fail_download:
+            raise task2_add_prefix.DriveManagerError(f"404 {file_id}")
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(FakeDrive.remote_dir / file_id, output_path)
+
+    def upload_file(self, file_path, mime_type='audio/mpeg', update_existing=True):
+        with FakeDrive.lock:
+            FakeDrive.uploads.append((Path(file_path).name, Path(file_path).read_bytes()))
+        return {'id': Path(file_path).name}
+
+
+@pytest.fixture
+def processor(monkeypatch, make_tone):
+    """Task2Processor wired to a fake Drive holding narrators and four conversations."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        remote = root / 'remote'
+        remote.mkdir()
+
+        make_tone(remote / 'daniel', 1, frequency=300)
+        make_tone(remote / 'matilda', 1, frequency=500)
+        for i in range(4):
+            make_tone(remote / f'conv{i}', 2, frequency=700)
+
+        FakeDrive.remote_dir = remote
+        FakeDrive.uploads = []
+        FakeDrive.threads = set()
+        FakeDrive.fail_download = set()
+        FakeDrive.downloads = []
+
+        monkeypatch.setattr(task2_add_prefix, 'GoogleDriveManager', FakeDrive)
+        monkeypatch.setattr(task2_add_prefix.AudioProcessor, '_backend', get_backend('pyav'))
+        monkeypatch.setenv('NARRATOR_DANIEL_FILE_ID', 'daniel')
+        monkeypatch.setenv('NARRATOR_MATILDA_FILE_ID', 'matilda')
+        monkeypatch.setenv('TEMP_DIR', str(root / 'temp'))
+        monkeypatch.setenv('PROCESSED_DIR', str(root / 'processed'))
+
+        processor = Task2Processor(download_workers=2, concat_workers=2, upload_workers=2)
+        files = [{'id': f'conv{i}', 'name': f'Conversation {i}.mp3'} for i in range(4)]
+        monkeypatch.setattr(processor, 'get_conversation_files', lambda: files)
+
+        yield processor
+
+
+class TestProcessAllFiles:
+    """Tests for the download/concat/upload pipeline."""
+
+    def test_all_files_prefixed_and_uploaded(self, processor):
+        """Test each conversation is uploaded with its narrator prefix and temp files are removed."""
+        processor.process_all_files()
+
+        assert processor.processing_stats['successful'] == 4
+        assert sorted(name for name, _ in FakeDrive.uploads) == [
+            f'Conversation {i}.mp3' for i in range(4)
+        ]
+
+        # Uploaded files are narrator (1s) + conversation (2s)
+        uploaded = dict(FakeDrive.uploads)
+        path = processor.temp_dir / 'check.mp3'
+        path.write_bytes(uploaded['Conversation 0.mp3'])
+        assert processor.audio_processor.get_audio_duration(str(path)) == pytest.approx(3.0, abs=0.15)
+        path.unlink()
+
+        leftovers = [p.name for p in processor.temp_dir.iterdir() if not p.name.startswith('narrator_')]
+        assert leftovers == []
+        assert [p.name for p in processor.processed_dir.iterdir()] == ['task2_processing_report.txt']
+
+    def test_network_work_in_worker_threads(self, processor):
+        """Test downloads run on pipeline threads with their own Drive managers."""
+        processor.process_all_files()
+
+        conversation_threads = FakeDrive.threads - {threading.main_thread().name}
+        assert conversation_threads
+        assert all(name.startswith('pipeline-download') for name in conversation_threads)
+
+    def test_failed_download_reported(self, processor):
+        """Test one failed download fails that file only."""
+        FakeDrive.fail_download = {'conv1'}
+
+        processor.process_all_files()
+
+        assert processor.processing_stats == {'total': 4, 'successful': 3, 'failed': 1, 'skipped': 0}
+        report = (processor.processed_dir / 'task2_processing_report.txt').read_text()
+        assert '✗ Conversation 1.mp3' in report
+        assert 'download: 404 conv1' in report
+        assert 'Pipeline Metrics' in report
+
+    def test_dry_run_skips_upload(self, processor):
+        """Test dry runs prefix files without uploading."""
+        processor.dry_run = True
+
+        processor.process_all_files(limit=2)
+
+        assert processor.processing_stats['successful'] == 2
+        assert FakeDrive.uploads == []
+
+    def test_frame_prefix_and_ffmpeg_fallback(self, processor):
+        """Test narrators are spliced as frames by default and with ffmpeg when disabled."""
+        processor.process_all_files(limit=2)
+        assert processor.prefix_engine is not None
+        frame_outputs = sorted(FakeDrive.uploads)
+
+        FakeDrive.uploads = []
+        processor.frame_prefix = False
+        processor.prefix_engine = None
+        processor.process_all_files(limit=2)
+
+        assert processor.prefix_engine is None
+        assert len(FakeDrive.uploads) == 2
+        assert sorted(name for name, _ in FakeDrive.uploads) == [name for name, _ in frame_outputs]
+
+    def test_download_cache_reused_across_runs(self, processor):
+        """Test a second run links unchanged files from the cache instead of downloading."""
+        processor.download_cache = DriveBlobCache(processor.temp_dir.parent / 'cache')
+
+        processor.process_all_files()
+        first_downloads = sorted(FakeDrive.downloads)
+        FakeDrive.downloads = []
+        processor.process_all_files()
+
+        assert first_downloads == ['conv0', 'conv1', 'conv2', 'conv3', 'daniel', 'matilda']
+        assert FakeDrive.downloads == []
+        assert len(FakeDrive.uploads) == 8
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,121 @@
+"""
+Tests for task2_mcp_orchestrator streaming mode.
+
+A fake transfer client serves and receives file content in memory.
+
+Note: Requires ffmpeg (to create test audio).
+"""
+
+import pytest
+import subprocess
+import tempfile
+from pathlib import Path
+import sys
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import task2_mcp_orchestrator as orchestrator
+from scripts.utils.drive_transfer import TransferResult
+from scripts.utils.mp3_frames import Mp3FrameIndex
+from scripts.utils.mp3_prefix import Mp3PrefixEngine
+
+
+class FakeTransfer:
+    """Transfer client holding Drive files in a dictionary."""
+
+    def __init__(self, files):
+        self.files = files
+        self.uploads = {}
+
+    def download_to(self, file_id, fileobj, name=None):
+        if file_id not in self.files:
+            return TransferResult(path=Path(name or file_id), file_id=file_id, error="HTTP 404")
+        fileobj.write(self.files[file_id])
+        return TransferResult(path=Path(name or file_id), file_id=file_id,
+                              bytes_transferred=len(self.files[file_id]))
+
+    def upload_stream(self, fileobj, size, name, file_id=None, **kwargs):
+        fileobj.seek(0)
+        self.uploads[file_id] = fileobj.read(size)
+        return TransferResult(path=Path(name), file_id=file_id, bytes_transferred=size, seconds=0.01)
+
+
+@pytest.fixture
+def setup(monkeypatch, make_tone):
+    """Engine with one narrator and a fake transfer holding one conversation."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        monkeypatch.setattr(orchestrator, 'TEMP_DIR', root / 'temp')
+        (root / 'temp').mkdir()
+
+        engine = Mp3PrefixEngine({'daniel': make_tone(root / 'daniel.mp3', 1, frequency=300)})
+        conversation = make_tone(root / 'conversation.mp3', 2, frequency=700).read_bytes()
+        transfer = FakeTransfer({'conv': conversation})
+
+        yield root, engine, transfer
+
+
+class TestStreamProcessFile:
+    """Tests for Drive-to-Drive streaming."""
+
+    @pytest.mark.parametrize('spool_bytes', [64 * 1024 * 1024, 1024])
+    def test_uploads_prefixed_file(self, setup, spool_bytes):
+        """Test the prefixed file is uploaded over the original, in memory or spilled."""
+        root, engine, transfer = setup
+
+        result = orchestrator.stream_process_file(
+            'Conversation.mp3', 'conv', 'daniel', engine, transfer, spool_bytes=spool_bytes
+        )
+
+        assert result['success'] and result['uploaded']
+        uploaded = root / 'uploaded.mp3'
+        uploaded.write_bytes(transfer.uploads['conv'])
+        assert Mp3FrameIndex.from_file(uploaded).duration == pytest.approx(result['output_duration'])
+        assert result['output_duration'] == pytest.approx(
+            result['original_duration'] + result['narrator_duration']
+        )
+        assert list((root / 'temp').iterdir()) == []
+
+    def test_dry_run_does_not_upload(self, setup):
+        """Test dry runs measure the output without uploading."""
+        root, engine, transfer = setup
+
+        result = orchestrator.stream_process_file('Conversation.mp3', 'conv', 'daniel', engine, transfer, dry_run=True)
+
+        assert result['success'] and not result['uploaded']
+        assert transfer.uploads == {}
+
+    def test_failures_reported(self, setup, make_tone):
+        """Test download and format failures are reported without uploading."""
+        root, engine, transfer = setup
+        transfer.files['wide'] = make_tone(root / 'wide.mp3', 1, frequency=700, sample_rate=48000).read_bytes()
+
+        missing = orchestrator.stream_process_file('Missing.mp3', 'nope', 'daniel', engine, transfer)
+        incompatible = orchestrator.stream_process_file('Wide.mp3', 'wide', 'daniel', engine, transfer)
+
+        assert 'Download failed: HTTP 404' in missing['message']
+        assert 'without --stream' in incompatible['message']
+        assert not missing['success'] and not incompatible['success']
+        assert transfer.uploads == {}
+
+
+class TestImports:
+    """Tests for module-level imports."""
+
+    def test_drive_transfer_not_imported(self):
+        """Test the MCP/curl path loads without the DriveTransfer client."""
+        code = (
+            "import sys; "
+            f"sys.path.insert(0, {str(Path(__file__).parent.parent)!r}); "
+            "import task2_mcp_orchestrator; "
+            "assert 'scripts.utils.drive_transfer' not in sys.modules"
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = subprocess.run([sys.executable, '-c', code], cwd=tmpdir, capture_output=True, text=True)
+
+        assert result.returncode == 0, result.stderr
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,94 @@
+"""
+Tests for upload_to_drive bulk uploads.
+
+Uploads run against the local Drive stand-in from test_drive_transfer.
+"""
+
+import pytest
+import json
+import os
+import tempfile
+from pathlib import Path
+import sys
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import upload_to_drive
+from scripts.utils.drive_transfer import DriveTransfer, UploadSessionStore
+from tests.test_drive_transfer import CHUNK, fake_drive  # noqa: F401 (fixture)
+
+
+@pytest.fixture
+def processed(monkeypatch):
+    """Processed directory holding five prefixed files and their report entries."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        monkeypatch.setattr(upload_to_drive, 'PROCESSED_DIR', root)
+
+        files = []
+        for i in range(5):
+            name = f"0{i}.01, Listen to a Conversation.mp3"
+            (root / name).write_bytes(os.urandom(CHUNK + i))
+            files.append({'filename': name, 'file_id': f"id{i}", 'narrator': ('daniel', 'matilda')[i % 2]})
+
+        yield root, files
+
+
+class TestUploadFiles:
+    """Tests for the concurrent uploader and its report."""
+
+    def test_uploads_and_reports(self, fake_drive, processed):
+        """Test every file replaces its Drive original and gets throughput and latency figures."""
+        root, files = processed
+        fake_drive.delay = 0.02
+
+        with DriveTransfer(base_url=fake_drive.url, concurrency=3, chunk_size=CHUNK) as transfer:
+            report = upload_to_drive.upload_files(files, transfer, UploadSessionStore(root / 'sessions.json'))
+
+        assert (report['total'], report['successful'], report['failed']) == (5, 5, 0)
+        assert report['concurrency'] == 3
+        assert 1 < fake_drive.max_active <= 3
+        assert all(fake_drive.files[f['file_id']] == (root / f['filename']).read_bytes() for f in files)
+
+        entry = report['results'][0]
+        assert entry['bytes_sent'] == CHUNK
+        assert entry['seconds'] > 0 and entry['mib_per_second'] > 0
+        assert 0 < report['latency_p50_seconds'] <= report['latency_p95_seconds']
+        assert '5/5 transferred' in report['summary']
+        json.dumps(report)
+
+    def test_failed_upload_resumed_next_run(self, fake_drive, processed):
+        """Test a failed upload keeps its session and the rerun completes it."""
+        root, files = processed
+        sessions_file = root / 'sessions.json'
+        big = root / files[0]['filename']
+        big.write_bytes(os.urandom(3 * CHUNK))
+        fake_drive.failures = [('PUT', '/session/', 'pass'), ('PUT', '/session/', 503)]
+
+        with DriveTransfer(base_url=fake_drive.url, concurrency=1, chunk_size=CHUNK,
+                           max_retries=0, backoff_seconds=0.01) as transfer:
+            first = upload_to_drive.upload_files(files[:1], transfer, UploadSessionStore(sessions_file))
+
+        assert first['failed'] == 1
+        assert first['results'][0]['session_uri']
+
+        with DriveTransfer(base_url=fake_drive.url, chunk_size=CHUNK) as transfer:
+            second = upload_to_drive.upload_files(files[:1], transfer, UploadSessionStore(sessions_file))
+
+        assert second['successful'] == 1
+        assert second['results'][0]['resumed_from'] == CHUNK
+        assert fake_drive.files['id0'] == big.read_bytes()
+
+
+class TestPercentile:
+    """Tests for latency percentiles."""
+
+    def test_nearest_rank(self):
+        assert upload_to_drive.percentile([], 0.5) == 0.0
+        assert upload_to_drive.percentile([3.0, 1.0, 2.0], 0.5) == 2.0
+        assert upload_to_drive.percentile([float(i) for i in range(1, 21)], 0.95) == 19.0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -5,34 +5,51 @@ Upload processed files to Google Drive with version management.
 This script UPDATES existing files (preserving file IDs and sharing links)
 rather than creating new files.
 
-Requires: Google Drive API credentials (token.json or credentials.json)
+Files are sent through concurrent resumable upload sessions. Each session
+URI is saved to data/processed/task2_upload_sessions.json as soon as it is
+opened, so rerunning after a crash continues interrupted files from the
+last committed byte. The upload report records per-file throughput and
+latency.
+
+Requires: Google Drive API credentials (token.json or credentials.json).
+With --api-url (or DRIVE_API_URL) uploads go to another endpoint, such as
+a local stand-in for the Drive API, without credentials.
 """
 
+import asyncio
 import os
 import sys
 import json
+import time
 from pathlib import Path
-from typing import Dict, List
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from typing import Dict, List, Optional
 from google.oauth2.service_account import Credentials as ServiceAccountCredentials
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 import pickle
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from scripts.utils.drive_transfer import DriveTransfer, TransferResult, UploadSessionStore, summarize
+
 # Scopes
 SCOPES = ['https://www.googleapis.com/auth/drive.file']
 
 # Paths
 PROCESSED_DIR = Path('data/processed')
 REPORT_FILE = PROCESSED_DIR / 'task2_processing_report.json'
+UPLOAD_REPORT_FILE = PROCESSED_DIR / 'task2_upload_report.json'
+SESSIONS_FILE = PROCESSED_DIR / 'task2_upload_sessions.json'
 TOKEN_FILE = Path('token.json')
 CREDENTIALS_FILE = Path('credentials.json')
 
+# Concurrent upload sessions
+DEFAULT_CONCURRENCY = 4
 
-def authenticate_drive() -> any:
-    """Authenticate with Google Drive API."""
+
+def load_credentials() -> Credentials:
+    """Load, refresh or create Google Drive API credentials."""
     creds = None
 
     # Check for existing token
@@ -62,52 +79,97 @@ def authenticate_drive() -> any:
             pickle.dump(creds, token)
         print(f"Credentials saved to {TOKEN_FILE}")
 
-    # Build service
-    service = build('drive', 'v3', credentials=creds)
     print("✓ Google Drive API authenticated")
-    return service
+    return creds
+
 
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of values (0.0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
 
-def upload_file_update(service: any, file_path: Path, file_id: str) -> Dict:
+
+def upload_entry(result: Dict, transfer: TransferResult) -> Dict:
     """
-    Update an existing file in Google Drive (version management).
+    Build the upload report entry for one file.
 
     Args:
-        service: Google Drive API service
-        file_path: Local file path
-        file_id: Existing Drive file ID to update
+        result: Processing report entry (filename, file_id, narrator)
+        transfer: Outcome of the upload
 
     Returns:
-        Updated file metadata
+        Report entry with Drive metadata or error, throughput and latency
+    """
+    entry = {
+        'filename': result['filename'],
+        'file_id': result['file_id'],
+        'narrator': result['narrator'],
+        'success': transfer.ok,
+        'bytes_sent': transfer.bytes_transferred,
+        'resumed_from': transfer.resumed_from,
+        'seconds': round(transfer.seconds, 3),
+        'mib_per_second': round(transfer.throughput / 1024 / 1024, 3),
+        'attempts': transfer.attempts
+    }
+
+    if transfer.ok:
+        metadata = transfer.metadata or {}
+        entry.update({
+            'name': metadata.get('name'),
+            'size': metadata.get('size'),
+            'version': metadata.get('version'),
+            'modified': metadata.get('modifiedTime'),
+            'link': metadata.get('webViewLink')
+        })
+    else:
+        entry['error'] = transfer.error
+        if transfer.metadata and transfer.metadata.get('session_uri'):
+            entry['session_uri'] = transfer.metadata['session_uri']
+
+    return entry
+
+
+def upload_files(
+    files: List[Dict],
+    transfer: DriveTransfer,
+    sessions: Optional[UploadSessionStore] = None
+) -> Dict:
     """
-    media = MediaFileUpload(
-        str(file_path),
-        mimetype='audio/mpeg',
-        resumable=True
-    )
-
-    try:
-        updated_file = service.files().update(
-            fileId=file_id,
-            media_body=media,
-            fields='id, name, size, modifiedTime, version, webViewLink'
-        ).execute()
-
-        return {
-            'success': True,
-            'file_id': updated_file['id'],
-            'name': updated_file['name'],
-            'size': updated_file.get('size'),
-            'version': updated_file.get('version'),
-            'modified': updated_file.get('modifiedTime'),
-            'link': updated_file.get('webViewLink')
-        }
-
-    except Exception as e:
-        return {
-            'success': False,
-            'error': str(e)
-        }
+    Upload processed files over their Drive originals concurrently.
+
+    Args:
+        files: Processing report entries (filename, file_id, narrator)
+        transfer: Transfer client (its concurrency bounds open sessions)
+        sessions: Session store for resuming interrupted uploads
+
+    Returns:
+        Upload report dictionary
+    """
+    items = [
+        {'file_path': PROCESSED_DIR / r['filename'], 'file_id': r['file_id']}
+        for r in files
+    ]
+
+    started = time.monotonic()
+    transfers = asyncio.run(transfer.upload_many(items, sessions=sessions))
+    wall_seconds = time.monotonic() - started
+
+    results = [upload_entry(r, t) for r, t in zip(files, transfers)]
+    latencies = [r['seconds'] for r in results if r['success']]
+
+    return {
+        'total': len(results),
+        'successful': sum(1 for r in results if r['success']),
+        'failed': sum(1 for r in results if not r['success']),
+        'concurrency': transfer.concurrency,
+        'wall_seconds': round(wall_seconds, 3),
+        'latency_p50_seconds': percentile(latencies, 0.5),
+        'latency_p95_seconds': percentile(latencies, 0.95),
+        'summary': summarize(transfers, wall_seconds),
+        'results': results
+    }
 
 
 def main():
@@ -115,6 +177,10 @@ def main():
 
     parser = argparse.ArgumentParser(description='Upload processed files to Google Drive')
     parser.add_argument('--dry-run', action='store_true', help='Show what would be uploaded without actually uploading')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'Concurrent resumable upload sessions (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--api-url', default=os.getenv('DRIVE_API_URL'),
+                        help='Drive API root to upload to without credentials (e.g. a local stand-in)')
 
     args = parser.parse_args()
 
@@ -127,7 +193,8 @@ def main():
     with open(REPORT_FILE, 'r') as f:
         report = json.load(f)
 
-    successful_files = [r for r in report['results'] if r['success']]
+    # Files processed with --stream were uploaded by the orchestrator itself
+    successful_files = [r for r in report['results'] if r['success'] and not r.get('uploaded')]
 
     print("=" * 80)
     print(f"UPLOADING {len(successful_files)} FILES TO GOOGLE DRIVE")
@@ -146,48 +213,33 @@ def main():
         print(f"\nTotal files: {len(successful_files)}")
         return
 
-    # Authenticate
-    print("\nAuthenticating with Google Drive...")
-    service = authenticate_drive()
-
-    # Upload files
-    upload_results = []
-
-    for idx, result in enumerate(successful_files, 1):
-        file_path = PROCESSED_DIR / result['filename']
-        file_id = result['file_id']
-
-        print(f"\n[{idx}/{len(successful_files)}] Uploading: {result['filename']}")
-        print(f"  File ID: {file_id}")
-        print(f"  Size: {file_path.stat().st_size:,} bytes")
-
-        upload_result = upload_file_update(service, file_path, file_id)
-
-        if upload_result['success']:
-            print(f"  ✓ SUCCESS")
-            print(f"    Version: {upload_result.get('version')}")
-            print(f"    Modified: {upload_result.get('modified')}")
-            print(f"    Link: {upload_result.get('link')}")
+    sessions = UploadSessionStore(SESSIONS_FILE)
+    if len(sessions):
+        print(f"\n{len(sessions)} interrupted upload session(s) on record; resuming where possible")
+
+    if args.api_url:
+        transfer = DriveTransfer(base_url=args.api_url, concurrency=args.concurrency)
+    else:
+        print("\nAuthenticating with Google Drive...")
+        transfer = DriveTransfer(credentials=load_credentials(), concurrency=args.concurrency)
+
+    print(f"\nUploading with {args.concurrency} concurrent sessions...")
+    with transfer:
+        upload_report = upload_files(successful_files, transfer, sessions)
+
+    for idx, r in enumerate(upload_report['results'], 1):
+        print(f"\n[{idx}/{upload_report['total']}] {r['filename']}")
+        print(f"  File ID: {r['file_id']}")
+        if r['success']:
+            resumed = f", resumed at byte {r['resumed_from']:,}" if r['resumed_from'] else ""
+            print(f"  ✓ SUCCESS ({r['seconds']:.1f}s, {r['mib_per_second']:.2f} MiB/s{resumed})")
+            print(f"    Version: {r.get('version')}")
+            print(f"    Modified: {r.get('modified')}")
+            print(f"    Link: {r.get('link')}")
         else:
-            print(f"  ✗ FAILED: {upload_result.get('error')}")
-
-        upload_results.append({
-            'filename': result['filename'],
-            'file_id': file_id,
-            'narrator': result['narrator'],
-            **upload_result
-        })
-
-    # Generate upload report
-    upload_report = {
-        'total': len(upload_results),
-        'successful': sum(1 for r in upload_results if r['success']),
-        'failed': sum(1 for r in upload_results if not r['success']),
-        'results': upload_results
-    }
+            print(f"  ✗ FAILED: {r.get('error')}")
 
-    upload_report_file = PROCESSED_DIR / 'task2_upload_report.json'
-    with open(upload_report_file, 'w') as f:
+    with open(UPLOAD_REPORT_FILE, 'w') as f:
         json.dump(upload_report, f, indent=2)
 
     # Summary
@@ -197,13 +249,16 @@ def main():
     print(f"Total: {upload_report['total']}")
     print(f"Successful: {upload_report['successful']}")
     print(f"Failed: {upload_report['failed']}")
-    print(f"\nUpload report saved: {upload_report_file}")
+    print(f"Throughput: {upload_report['summary']}")
+    print(f"Latency: p50 {upload_report['latency_p50_seconds']:.1f}s, p95 {upload_report['latency_p95_seconds']:.1f}s")
+    print(f"\nUpload report saved: {UPLOAD_REPORT_FILE}")
 
     if upload_report['failed'] > 0:
         print("\nFailed uploads:")
-        for r in upload_results:
+        for r in upload_report['results']:
             if not r['success']:
                 print(f"  ✗ {r['filename']}: {r.get('error')}")
+        print("\nRerun to resume the failed uploads from their saved sessions.")
 
     print("\n" + "=" * 80)
     print("TASK 2 COMPLETE!")